@@ -0,0 +1 @@
+# benchmarks for the importers, run on synthetic files (see run_benchmarks.py)
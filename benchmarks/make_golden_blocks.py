@@ -0,0 +1,97 @@
+import importlib.metadata
+import io
+import json
+import os
+import random
+import struct
+
+import numpy
+
+# writes golden_blocks.json: random blocks of each texture format together with what a third-party decoder makes of them
+# texture_conformance checks both the reference decoders and the importers against these, so that neither is only ever checked against code from this repo
+# this doesn't need Blender, but does need all of these (none of which the addon or the rest of the benchmarks use):
+# 	Pillow (BC1-3), texture2ddecoder (BC4, BC5, BC7), retro-data-structures (the GX formats, via its Metroid Prime TXTR decoder)
+# 	python -m benchmarks.make_golden_blocks
+# the output only changes if the seed, the block counts or one of those decoders does, so it's checked in rather than made on the fly
+
+from PIL import Image
+import texture2ddecoder
+from retro_data_structures.formats import txtr
+
+goldenPath = os.path.join(os.path.dirname(os.path.abspath(__file__)),"golden_blocks.json")
+blocksPerFormat = 16
+
+def package_source(package):
+	return package+" "+importlib.metadata.version(package)
+
+# Pillow's BCn decoder gives RGBA straight out
+def pillow_bcn(n):
+	return lambda block: Image.frombytes("RGBA",(4,4),block,"bcn",n).tobytes()
+
+# texture2ddecoder gives BGRA
+def texture2ddecoder_bcn(decoder):
+	return lambda block: numpy.frombuffer(decoder(block,4,4),dtype=numpy.uint8).reshape(-1,4)[:,[2,1,0,3]].tobytes()
+
+# TXTR data is the block as a whole (one-block) image, after a palette if there is one
+# retro-data-structures reads palette colours as intensity then alpha, the other way around to IA8 textures, so the palette that's kept is what it actually used
+def retro_gx(imageFormat,blockWidth,blockHeight):
+	def decode(block,palette=None):
+		data = block
+		if palette is not None:
+			data = struct.pack(">L2H",0,len(palette)//2,1)+palette+block
+		return txtr._extract_image(io.BytesIO(data),blockWidth,blockHeight,imageFormat,force_flip=False).tobytes()
+	return decode
+
+def retro_palette(palette):
+	return bytes(palette[i] if c < 3 else palette[i+1] for i in range(0,len(palette),2) for c in range(4))
+
+# [name, bytes per block, source, block decoder, palette size]
+goldenFormats = [
+				["BC1",8,"Pillow",pillow_bcn(1),0],
+				["BC2",16,"Pillow",pillow_bcn(2),0],
+				["BC3",16,"Pillow",pillow_bcn(3),0],
+				["BC4",8,"texture2ddecoder",texture2ddecoder_bcn(texture2ddecoder.decode_bc4),0],
+				["BC5",16,"texture2ddecoder",texture2ddecoder_bcn(texture2ddecoder.decode_bc5),0],
+				["BC7",16,"texture2ddecoder",texture2ddecoder_bcn(texture2ddecoder.decode_bc7),0],
+				["I4",32,"retro-data-structures",retro_gx(txtr.ImageFormat.I4,8,8),0],
+				["I8",32,"retro-data-structures",retro_gx(txtr.ImageFormat.I8,8,4),0],
+				["IA4",32,"retro-data-structures",retro_gx(txtr.ImageFormat.IA4,8,4),0],
+				["IA8",32,"retro-data-structures",retro_gx(txtr.ImageFormat.IA8,4,4),0],
+				["RGB565",32,"retro-data-structures",retro_gx(txtr.ImageFormat.RGB565,4,4),0],
+				["RGB5A3",32,"retro-data-structures",retro_gx(txtr.ImageFormat.RGB5A3,4,4),0],
+				["RGBA32",64,"retro-data-structures",retro_gx(txtr.ImageFormat.RGBA8,4,4),0],
+				["C4",32,"retro-data-structures",retro_gx(txtr.ImageFormat.C4,8,8),16],
+				["C8",32,"retro-data-structures",retro_gx(txtr.ImageFormat.C8,8,4),256],
+				["CMPR",32,"retro-data-structures",retro_gx(txtr.ImageFormat.CMPR,8,8),0],
+				]
+
+# BC7 blocks go through every mode in turn (8 being the reserved one), since random first bytes would be mostly mode 0
+def random_block(rng,name,size,i):
+	block = bytearray(rng.randbytes(size))
+	if name == "BC7":
+		mode = i % 9
+		block[0] = 0 if mode == 8 else (block[0] & (0xFF << (mode+1)) & 0xFF) | (1 << mode)
+	return bytes(block)
+
+def make_golden_blocks(seed=24):
+	rng = random.Random(seed)
+	golden = {}
+	for name,bytesPerBlock,source,decoder,paletteSize in goldenFormats:
+		blockCount = 18 if name == "BC7" else blocksPerFormat
+		blocks = [random_block(rng,name,bytesPerBlock,i) for i in range(blockCount)]
+		entry = {"source":package_source(source),"blocks":[block.hex() for block in blocks]}
+		if paletteSize:
+			palette = rng.randbytes(paletteSize*2)
+			entry["palette"] = retro_palette(palette).hex()
+			entry["pixels"] = [decoder(block,palette).hex() for block in blocks]
+		else:
+			entry["pixels"] = [decoder(block).hex() for block in blocks]
+		golden[name] = entry
+	return golden
+
+if __name__ == "__main__":
+	golden = make_golden_blocks()
+	with open(goldenPath,"w") as f:
+		json.dump(golden,f,indent="\t")
+		f.write("\n")
+	print(f"{sum(len(entry['blocks']) for entry in golden.values())} blocks of {len(golden)} formats written to {goldenPath}")
@@ -0,0 +1,352 @@
+import fractions
+import math
+import numpy
+
+# slow but simple texture decoders, one pixel at a time, written straight from the format descriptions
+# these are what the addon's array decoders (see utils_img) get checked against in texture_conformance, so none of their code is shared
+# (the BC7 partition/anchor/weight tables are the exception, since those are just data copied out of the spec anyway)
+# they follow the addon's conventions wherever a format leaves something open:
+# 	every value is worked out exactly, then rounded to a byte once, the same way Blender does it
+# 	BC4 is shown as grey, BC5's blue is 0 (or reconstructed from the exact red and green), BC7's reserved mode 8 and out-of-range palette indexes are transparent black
+# everything comes back as a top-down (height,width,4) uint8 array
+# references:
+# 	https://learn.microsoft.com/en-us/windows/win32/direct3d10/d3d10-graphics-programming-guide-resources-block-compression
+# 	https://learn.microsoft.com/en-us/windows/win32/direct3d11/bc7-format
+# 	https://wiki.tockdom.com/wiki/Image_Formats
+# 	https://github.com/ScanMountGoat/tegra_swizzle
+
+from monado_forge.utils_img import bc7ModeData,bc7Weights,bc7PartitionMaps,bc7AnchorIndexes
+
+# a 0.0-1.0 value (ideally a Fraction, so that it's exact up to this point) as Blender would store it: to float32, then *255+0.5 and floored, in float32
+def blender_byte(value):
+	value = numpy.float32(min(max(float(value),0.0),1.0))
+	return int(numpy.floor(value*numpy.float32(255.0)+numpy.float32(0.5)))
+
+def n_bit_unit(value,bits):
+	return fractions.Fraction(value,(1 << bits)-1)
+
+# Tegra block linear, one byte at a time (see utils_swizzle for the layout)
+# rowCount is in rows of blocks, x is in bytes
+def tegra_block_height(rowCount):
+	heightAndHalf = rowCount + rowCount // 2
+	if heightAndHalf >= 128:
+		return 16
+	if heightAndHalf >= 64:
+		return 8
+	if heightAndHalf >= 32:
+		return 4
+	if heightAndHalf >= 16:
+		return 2
+	return 1
+
+def tegra_address(x,y,gobCountX,blockHeight):
+	gobAddressY = (y // (8*blockHeight))*512*blockHeight*gobCountX + ((y % (8*blockHeight)) // 8)*512
+	gobAddressX = (x // 64)*512*blockHeight
+	return gobAddressY + gobAddressX + ((x % 64) // 32)*256 + ((y % 8) // 2)*64 + ((x % 32) // 16)*32 + (y % 2)*16 + (x % 16)
+
+# the blocks of a swizzled image as a row-major list of bytes objects (anything beyond the end of the data is zeroes)
+def tegra_unswizzle(data,blockCountX,blockCountY,bytesPerBlock):
+	gobCountX = -(-(blockCountX*bytesPerBlock) // 64)
+	blockHeight = tegra_block_height(blockCountY)
+	blocks = []
+	for by in range(blockCountY):
+		for bx in range(blockCountX):
+			block = bytearray(bytesPerBlock)
+			for i in range(bytesPerBlock):
+				address = tegra_address(bx*bytesPerBlock+i,by,gobCountX,blockHeight)
+				if address < len(data):
+					block[i] = data[address]
+			blocks.append(bytes(block))
+	return blocks
+
+# the other way: row-major blocks to swizzled data, padded out to the full surface size
+def tegra_swizzle(blocks,blockCountX,blockCountY,bytesPerBlock):
+	gobCountX = -(-(blockCountX*bytesPerBlock) // 64)
+	blockHeight = tegra_block_height(blockCountY)
+	data = bytearray(tegra_surface_size(blockCountX,blockCountY,bytesPerBlock))
+	for by in range(blockCountY):
+		for bx in range(blockCountX):
+			for i in range(bytesPerBlock):
+				data[tegra_address(bx*bytesPerBlock+i,by,gobCountX,blockHeight)] = blocks[by*blockCountX+bx][i]
+	return bytes(data)
+
+# the swizzled size of an image, padding and all
+def tegra_surface_size(blockCountX,blockCountY,bytesPerBlock):
+	blockHeight = tegra_block_height(blockCountY)
+	gobCountX = -(-(blockCountX*bytesPerBlock) // 64)
+	gobCountY = -(-(-(-blockCountY // 8)) // blockHeight)*blockHeight
+	return gobCountX*gobCountY*512
+
+# BC1 colour: each block gives 16 [r,g,b,a] pixels, top-down row-major
+def rgb565_unit(colour):
+	return [n_bit_unit(colour >> 11,5),n_bit_unit((colour >> 5) & 0x3F,6),n_bit_unit(colour & 0x1F,5)]
+
+def bc1_palette(endpoint0,endpoint1,fourColourOnly=False):
+	c0 = rgb565_unit(endpoint0)
+	c1 = rgb565_unit(endpoint1)
+	one = fractions.Fraction(1)
+	if endpoint0 > endpoint1 or fourColourOnly:
+		return [c0+[one],c1+[one],[(2*a+b)/3 for a,b in zip(c0,c1)]+[one],[(a+2*b)/3 for a,b in zip(c0,c1)]+[one]]
+	return [c0+[one],c1+[one],[(a+b)/2 for a,b in zip(c0,c1)]+[one],[0,0,0,0]]
+
+def bc1_colour_block(block,fourColourOnly=False):
+	palette = [[blender_byte(v) for v in colour] for colour in bc1_palette(block[0] | (block[1] << 8),block[2] | (block[3] << 8),fourColourOnly)]
+	return [list(palette[(block[4+i//4] >> (2*(i % 4))) & 0b11]) for i in range(16)]
+
+# BC4 channel: the 16 exact values (as fractions of 255)
+def bc4_channel_values(block):
+	a0 = block[0]
+	a1 = block[1]
+	if a0 > a1:
+		ramp = [a0,a1]+[fractions.Fraction((7-k)*a0+k*a1,7) for k in range(1,7)]
+	else:
+		ramp = [a0,a1]+[fractions.Fraction((5-k)*a0+k*a1,5) for k in range(1,5)]+[0,255]
+	indexBits = int.from_bytes(block[2:8],"little")
+	return [fractions.Fraction(ramp[(indexBits >> (3*i)) & 0b111]) for i in range(16)]
+
+def bc1_block(block):
+	return bc1_colour_block(block)
+
+def bc2_block(block):
+	pixels = bc1_colour_block(block[8:16],fourColourOnly=True)
+	for i in range(16):
+		pixels[i][3] = blender_byte(n_bit_unit((block[i//2] >> (4*(i % 2))) & 0b1111,4))
+	return pixels
+
+def bc3_block(block):
+	pixels = bc1_colour_block(block[8:16],fourColourOnly=True)
+	for i,value in enumerate(bc4_channel_values(block[0:8])):
+		pixels[i][3] = blender_byte(value/255)
+	return pixels
+
+def bc4_block(block):
+	return [[blender_byte(value/255)]*3+[255] for value in bc4_channel_values(block)]
+
+def bc5_block(block,blueBC5=False):
+	pixels = []
+	for red,green in zip(bc4_channel_values(block[0:8]),bc4_channel_values(block[8:16])):
+		blue = 0
+		if blueBC5: # as a normal map: the blue that makes the vector's length 1 (or 0.5 if there isn't one)
+			r = (red-128)/128
+			g = (green-128)/128
+			blue = blender_byte(math.sqrt(max(float(1-r*r-g*g),0.0))/2+0.5)
+		pixels.append([blender_byte(red/255),blender_byte(green/255),blue,255])
+	return pixels
+
+def bc7_block(block):
+	bits = int.from_bytes(block,"little")
+	if block[0] == 0: # reserved mode 8
+		return [[0,0,0,0] for i in range(16)]
+	mode = (block[0] & -block[0]).bit_length()-1
+	subsetCount,partitionBits,rotationBits,indexSelectionBits,colourBits,alphaBits,endpointPBits,sharedPBits,indexBits,index2Bits = bc7ModeData[mode]
+	position = mode+1
+	def read(count):
+		nonlocal position
+		value = (bits >> position) & ((1 << count)-1)
+		position += count
+		return value
+	partition = read(partitionBits)
+	rotation = read(rotationBits)
+	indexSelection = read(indexSelectionBits)
+	# [subset][endpoint][channel]
+	endpoints = [[[0,0,0,255],[0,0,0,255]] for s in range(subsetCount)]
+	for c in range(3):
+		for s in range(subsetCount):
+			for e in range(2):
+				endpoints[s][e][c] = read(colourBits)
+	if alphaBits > 0:
+		for s in range(subsetCount):
+			for e in range(2):
+				endpoints[s][e][3] = read(alphaBits)
+	channels = 4 if alphaBits > 0 else 3
+	precisions = [colourBits]*3+[alphaBits]
+	if endpointPBits > 0:
+		for s in range(subsetCount):
+			for e in range(2):
+				p = read(1)
+				for c in range(channels):
+					endpoints[s][e][c] = (endpoints[s][e][c] << 1) | p
+		precisions = [p+1 for p in precisions]
+	if sharedPBits > 0:
+		for s in range(subsetCount):
+			p = read(1)
+			for e in range(2):
+				for c in range(channels):
+					endpoints[s][e][c] = (endpoints[s][e][c] << 1) | p
+		precisions = [p+1 for p in precisions]
+	for s in range(subsetCount):
+		for e in range(2):
+			for c in range(channels):
+				n = precisions[c]
+				endpoints[s][e][c] = (endpoints[s][e][c] << (8-n)) | (endpoints[s][e][c] >> (2*n-8))
+	if subsetCount == 1:
+		subsets = [0]*16
+		anchors = [0]
+	elif subsetCount == 2:
+		subsets = [(bc7PartitionMaps[2][partition] >> i) & 0b1 for i in range(16)]
+		anchors = [0,bc7AnchorIndexes["2/2"][partition]]
+	else:
+		subsets = [(bc7PartitionMaps[3][partition] >> (2*i)) & 0b11 for i in range(16)]
+		anchors = [0,bc7AnchorIndexes["2/3"][partition],bc7AnchorIndexes["3/3"][partition]]
+	indexes = [read(indexBits-(1 if anchors[subsets[i]] == i else 0)) for i in range(16)]
+	indexes2 = [read(index2Bits-(1 if i == 0 else 0)) for i in range(16)] if index2Bits > 0 else indexes
+	colourIndexes,colourIndexBits,alphaIndexes,alphaIndexBits = indexes,indexBits,indexes2,index2Bits or indexBits
+	if indexSelection:
+		colourIndexes,colourIndexBits,alphaIndexes,alphaIndexBits = indexes2,index2Bits,indexes,indexBits
+	pixels = []
+	for i in range(16):
+		e0,e1 = endpoints[subsets[i]]
+		pixel = []
+		for c in range(4):
+			weight = bc7Weights[alphaIndexBits][alphaIndexes[i]] if c == 3 else bc7Weights[colourIndexBits][colourIndexes[i]]
+			pixel.append(((64-weight)*e0[c] + weight*e1[c] + 32) >> 6)
+		if rotation > 0:
+			pixel[rotation-1],pixel[3] = pixel[3],pixel[rotation-1]
+		pixels.append(pixel)
+	return pixels
+
+def rgba8_block(block):
+	return [list(block)]
+
+# GX formats: big-endian, 4-bit values have the first pixel in the top nibble
+def gx_nibble(block,i):
+	return (block[i//2] >> (0 if i % 2 else 4)) & 0b1111
+
+def gx_u16(block,i):
+	return (block[2*i] << 8) | block[2*i+1]
+
+def cmpr_block(block):
+	# four BC1 sub-blocks in [[0,1],[2,3]] order, with big-endian endpoints and each row's pixels in the opposite order
+	pixels = [None]*64
+	for s in range(4):
+		sub = block[s*8:s*8+8]
+		palette = [[blender_byte(v) for v in colour] for colour in bc1_palette((sub[0] << 8) | sub[1],(sub[2] << 8) | sub[3])]
+		for i in range(16):
+			row = i // 4
+			column = i % 4
+			x = (s % 2)*4 + column
+			y = (s // 2)*4 + row
+			pixels[y*8+x] = list(palette[(sub[4+row] >> (6-2*column)) & 0b11])
+	return pixels
+
+def i4_block(block):
+	return [[blender_byte(n_bit_unit(gx_nibble(block,i),4))]*3+[255] for i in range(64)]
+
+def i8_block(block):
+	return [[v,v,v,255] for v in block]
+
+def ia4_block(block):
+	return [[blender_byte(n_bit_unit(v & 0b1111,4))]*3+[blender_byte(n_bit_unit(v >> 4,4))] for v in block]
+
+def ia8_block(block):
+	return [[block[2*i+1]]*3+[block[2*i]] for i in range(16)]
+
+def rgb565_colour(colour):
+	return [blender_byte(v) for v in rgb565_unit(colour)]+[255]
+
+def rgb5a3_colour(colour):
+	if colour & 0x8000:
+		return [blender_byte(n_bit_unit((colour >> shift) & 0b11111,5)) for shift in [10,5,0]]+[255]
+	return [blender_byte(n_bit_unit((colour >> shift) & 0b1111,4)) for shift in [8,4,0]]+[blender_byte(n_bit_unit((colour >> 12) & 0b111,3))]
+
+def rgb565_block(block):
+	return [rgb565_colour(gx_u16(block,i)) for i in range(16)]
+
+def rgb5a3_block(block):
+	return [rgb5a3_colour(gx_u16(block,i)) for i in range(16)]
+
+def rgba32_block(block):
+	return [[block[2*i+1],block[32+2*i],block[32+2*i+1],block[2*i]] for i in range(16)]
+
+def palette_colour(palette,index):
+	return list(palette[index]) if index < len(palette) else [0,0,0,0]
+
+# [name, block width, block height, bytes per block, block decoder]
+# the palette formats' decoders take the palette as well
+wismtFormats = {
+				37:["R8G8B8A8",1,1,4,rgba8_block],
+				66:["BC1",4,4,8,bc1_block],
+				67:["BC2",4,4,16,bc2_block],
+				68:["BC3",4,4,16,bc3_block],
+				73:["BC4",4,4,8,bc4_block],
+				75:["BC5",4,4,16,bc5_block],
+				77:["BC7",4,4,16,bc7_block],
+				}
+brresFormats = {
+				 0:["I4",8,8,32,i4_block],
+				 1:["I8",8,4,32,i8_block],
+				 2:["IA4",8,4,32,ia4_block],
+				 3:["IA8",4,4,32,ia8_block],
+				 4:["RGB565",4,4,32,rgb565_block],
+				 5:["RGB5A3",4,4,32,rgb5a3_block],
+				 6:["RGBA32",4,4,64,rgba32_block],
+				 8:["C4",8,8,32,lambda block,palette: [palette_colour(palette,gx_nibble(block,i)) for i in range(64)]],
+				 9:["C8",8,4,32,lambda block,palette: [palette_colour(palette,v) for v in block]],
+				10:["C14X2",4,4,32,lambda block,palette: [palette_colour(palette,gx_u16(block,i) & 0x3FFF) for i in range(16)]],
+				14:["CMPR",8,8,32,cmpr_block],
+				}
+
+# decoded blocks (row-major) to a top-down image, cropped to size
+def assemble_blocks(blockPixels,blockCountX,blockWidth,blockHeight,imgWidth,imgHeight):
+	image = numpy.zeros([imgHeight,imgWidth,4],dtype=numpy.uint8)
+	for y in range(imgHeight):
+		for x in range(imgWidth):
+			image[y,x] = blockPixels[(y // blockHeight)*blockCountX + x // blockWidth][(y % blockHeight)*blockWidth + x % blockWidth]
+	return image
+
+def block_counts(imgWidth,imgHeight,blockWidth,blockHeight):
+	return -(-imgWidth // blockWidth),-(-imgHeight // blockHeight)
+
+def wismt_texture(imgType,imgWidth,imgHeight,rawData,blueBC5=False):
+	name,blockWidth,blockHeight,bytesPerBlock,decoder = wismtFormats[imgType]
+	blockCountX,blockCountY = block_counts(imgWidth,imgHeight,blockWidth,blockHeight)
+	blocks = tegra_unswizzle(rawData,blockCountX,blockCountY,bytesPerBlock)
+	if name == "BC5":
+		blockPixels = [decoder(block,blueBC5) for block in blocks]
+	else:
+		blockPixels = [decoder(block) for block in blocks]
+	return assemble_blocks(blockPixels,blockCountX,blockWidth,blockHeight,imgWidth,imgHeight)
+
+def brres_texture(imgType,imgWidth,imgHeight,rawData,palette=None):
+	name,blockWidth,blockHeight,bytesPerBlock,decoder = brresFormats[imgType]
+	blockCountX,blockCountY = block_counts(imgWidth,imgHeight,blockWidth,blockHeight)
+	rawData = bytes(rawData).ljust(blockCountX*blockCountY*bytesPerBlock,b"\x00")
+	blocks = [rawData[i*bytesPerBlock:(i+1)*bytesPerBlock] for i in range(blockCountX*blockCountY)]
+	if name in ["C4","C8","C14X2"]:
+		palette = [tuple(int(v) for v in colour) for colour in palette]
+		blockPixels = [decoder(block,palette) for block in blocks]
+	else:
+		blockPixels = [decoder(block) for block in blocks]
+	return assemble_blocks(blockPixels,blockCountX,blockWidth,blockHeight,imgWidth,imgHeight)
+
+# hand-worked blocks, to make sure the decoders above are right before anything gets compared against them
+# [decoder, block, {pixel index: expected [r,g,b,a]}]
+knownBlocks = [
+				[bc1_block,bytes([0x00,0xF8,0x00,0x00,0x00,0x00,0x00,0x00]),{0:[255,0,0,255],15:[255,0,0,255]}], # solid red
+				[bc1_block,bytes([0xFF,0xFF,0x00,0x00,0xAA,0xAA,0xAA,0xAA]),{0:[170,170,170,255]}], # 2/3 of the way from white to black
+				[bc1_block,bytes([0x00,0x00,0xFF,0xFF,0xE4,0xE4,0xE4,0xE4]),{0:[0,0,0,255],1:[255,255,255,255],2:[128,128,128,255],3:[0,0,0,0]}], # 3 colours + transparent
+				[bc2_block,bytes([0x5F,0,0,0,0,0,0,0,0xE0,0x07,0,0,0,0,0,0]),{0:[0,255,0,255],1:[0,255,0,85]}],
+				[bc3_block,bytes([0xFF,0x00,0x88,0,0,0,0,0,0x1F,0x00,0,0,0,0,0,0]),{0:[0,0,255,255],1:[0,0,255,0],2:[0,0,255,219]}],
+				[bc4_block,bytes([0x00,0xFF,0x3E,0x22,0,0,0,0]),{0:[0,0,0,255],1:[255,255,255,255],2:[0,0,0,255],3:[255,255,255,255],4:[51,51,51,255]}], # six-value ramp, with 0 and 255 on the end
+				[lambda block: bc5_block(block,True),bytes([0x80,0,0,0,0,0,0,0,0x80,0,0,0,0,0,0,0]),{0:[128,128,255,255]}], # flat normal
+				[lambda block: bc5_block(block,True),bytes([0xFF,0,0,0,0,0,0,0,0xFF,0,0,0,0,0,0,0]),{0:[255,255,128,255]}], # too long to be a normal
+				[bc7_block,bytes(16),{0:[0,0,0,0],15:[0,0,0,0]}], # reserved mode 8
+				[bc7_block,bytes([0xC0]+[0xFF]*15),{0:[255,255,255,255],15:[255,255,255,255]}], # mode 6, every bit set
+				[bc7_block,bytes([0x40]+[0x00]*15),{0:[0,0,0,0]}], # mode 6, every bit clear
+				[cmpr_block,bytes([0xF8,0x00,0x00,0x00,0x40,0,0,0]*4),{0:[0,0,0,255],1:[255,0,0,255],4:[0,0,0,255],63:[255,0,0,255]}],
+				[i4_block,bytes([0xF0]+[0]*31),{0:[255,255,255,255],1:[0,0,0,255]}],
+				[ia4_block,bytes([0xF0,0x0F]+[0]*30),{0:[0,0,0,255],1:[255,255,255,0]}],
+				[ia8_block,bytes([0x40,0xC0]+[0]*30),{0:[192,192,192,64]}],
+				[rgb565_block,bytes([0x07,0xE0]+[0]*30),{0:[0,255,0,255],1:[0,0,0,255]}],
+				[rgb5a3_block,bytes([0xFC,0x00,0x3F,0x00]+[0]*28),{0:[255,0,0,255],1:[255,0,0,109]}],
+				[rgba32_block,bytes([0x80,0x10]+[0]*30+[0x20,0x30]+[0]*30),{0:[0x10,0x20,0x30,0x80]}],
+				]
+
+def check_known_blocks():
+	failures = []
+	for decoder,block,expected in knownBlocks:
+		pixels = decoder(block)
+		for i,colour in expected.items():
+			if pixels[i] != colour:
+				failures.append(f"{getattr(decoder,'__name__','?')} {block.hex()} pixel {i}: {pixels[i]} != {colour}")
+	return failures
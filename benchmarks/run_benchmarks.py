@@ -0,0 +1,274 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+# times the importers' parsing stages on synthetic files, outside of the Blender UI
+# needs the bpy module (textures still become Blender images), so run it either with the standalone bpy package:
+# 	python -m benchmarks.run_benchmarks [options]
+# or inside Blender itself:
+# 	blender --background --python benchmarks/run_benchmarks.py -- [options]
+# results are printed, and also written as JSON if --output is given; pass an older JSON file to --compare to see the difference
+
+repoRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repoRoot not in sys.path:
+	sys.path.insert(0,repoRoot)
+
+import bpy
+import numpy
+
+import monado_forge
+from monado_forge import import_funcs_brres
+from monado_forge import import_funcs_sar1
+from monado_forge import main_ui
+from monado_forge import import_ui
+from monado_forge import utils_img
+from monado_forge.utils import print_warning
+from benchmarks import synthetic
+
+# stands in for context.scene.monado_forge_main/_import, with every setting at its UI default unless overridden
+def stub_settings(propertyGroup,overrides):
+	settings = SimpleNamespace()
+	for name,prop in propertyGroup.__annotations__.items():
+		value = prop.keywords.get("default")
+		items = prop.keywords.get("items")
+		if items is not None and isinstance(value,int): # enum defaults are given by position
+			if callable(items):
+				items = items(None,None)
+			value = items[value][0]
+		setattr(settings,name,value)
+	for name,value in overrides.items():
+		if not hasattr(settings,name):
+			raise KeyError("no such setting: "+name)
+		setattr(settings,name,value)
+	return settings
+
+def stub_context(mainOverrides={},importOverrides={}):
+	# things that would make the timings about something else (console spam, writing PNGs) are off by default
+	mainSettings = {"printProgress":False}
+	mainSettings.update(mainOverrides)
+	importSettings = {"autoSaveTextures":False}
+	importSettings.update(importOverrides)
+	scene = SimpleNamespace(
+							monado_forge_main=stub_settings(main_ui.MonadoForgeProperties,mainSettings),
+							monado_forge_import=stub_settings(import_ui.MonadoForgeViewImportProperties,importSettings),
+							)
+	return SimpleNamespace(scene=scene)
+
+# adds up the time spent inside particular functions (e.g. texture decoding) while a stage runs
+# some of these get called from worker threads (i.e. texture decoding with --texture-workers other than 1), so the totals can come out larger than the stage itself
+class SubstageTimer():
+	def __init__(self):
+		self.totals = {}
+		self.counts = {}
+		self._patched = []
+		self._lock = threading.Lock()
+	def wrap(self,module,name):
+		original = getattr(module,name)
+		def timed(*args,**kwargs):
+			start = time.perf_counter()
+			try:
+				return original(*args,**kwargs)
+			finally:
+				elapsed = time.perf_counter()-start
+				with self._lock:
+					self.totals[name] = self.totals.get(name,0.0)+elapsed
+					self.counts[name] = self.counts.get(name,0)+1
+		setattr(module,name,timed)
+		self._patched.append([module,name,original])
+	def restore(self):
+		for module,name,original in reversed(self._patched):
+			setattr(module,name,original)
+		self._patched = []
+	def reset(self):
+		self.totals = {}
+		self.counts = {}
+
+def count_vertices(results):
+	if results is None:
+		return 0
+	return sum(len(m.vertices) for m in results.meshes)
+
+# bpy.data keeps everything made by previous runs, which would otherwise make later repeats do different work (e.g. name clashes)
+def remove_new_images(existingNames):
+	for image in list(bpy.data.images):
+		if image.name not in existingNames:
+			bpy.data.images.remove(image)
+
+def run_stage(name,func,path,repeat,substages=[],countVerts=count_vertices):
+	timer = SubstageTimer()
+	for module,funcName in substages:
+		timer.wrap(module,funcName)
+	existingImages = set(image.name for image in bpy.data.images)
+	times = []
+	substageTimes = {}
+	result = None
+	try:
+		for i in range(repeat):
+			remove_new_images(existingImages)
+			timer.reset()
+			with open(path,"rb") as f:
+				start = time.perf_counter()
+				result = func(f)
+				times.append(time.perf_counter()-start)
+			for funcName,total in timer.totals.items():
+				substageTimes.setdefault(funcName,[]).append(total)
+	finally:
+		timer.restore()
+	fileSize = os.path.getsize(path)
+	vertexCount = countVerts(result)
+	best = min(times)
+	stage = {
+			"seconds":times,
+			"best":best,
+			"median":statistics.median(times),
+			"mean":statistics.mean(times),
+			"bytes":fileSize,
+			"MB/s":fileSize/(1024*1024)/best if best > 0 else None,
+			"vertices":vertexCount,
+			"verts/s":vertexCount/best if best > 0 and vertexCount else None,
+			"substages":{k:{"best":min(v),"median":statistics.median(v),"calls":timer.counts.get(k,0)} for k,v in substageTimes.items()},
+			}
+	print(f"{name:<10} best {best*1000:9.2f}ms  median {stage['median']*1000:9.2f}ms  {stage['MB/s']:8.2f} MB/s"+(f"  {stage['verts/s']:12.0f} verts/s" if stage["verts/s"] else ""))
+	for k,v in stage["substages"].items():
+		print(f"  {k:<24} best {v['best']*1000:9.2f}ms  ({v['calls']} calls)")
+	return stage,result
+
+# "BC7:512x512" -> ["BC7",512,512]
+def parse_texture_spec(spec,formatNames):
+	try:
+		formatName,size = spec.split(":")
+		width,height = [int(x) for x in size.lower().split("x")]
+	except ValueError:
+		raise argparse.ArgumentTypeError("texture must be given as FORMAT:WIDTHxHEIGHT, not "+spec)
+	formatName = formatName.upper()
+	if formatName not in formatNames:
+		raise argparse.ArgumentTypeError("unknown texture format "+formatName+" (known: "+", ".join(formatNames)+")")
+	return [formatName,width,height]
+
+def main(argv):
+	# short names for the formats, e.g. "BC7" for "BC7_UNORM"
+	modernFormats = {v[0].split("_")[0]:k for k,v in utils_img.modernImageFormats.items()}
+	modernFormats["RGBA8"] = 37
+	gxFormats = {v[0]:k for k,v in utils_img.brresImageFormats.items()}
+	parser = argparse.ArgumentParser(description="Time Monado Forge's importers on synthetic files.")
+	parser.add_argument("--vertices",type=int,default=20000,help="vertices per vertex table (.wismt)")
+	parser.add_argument("--faces",type=int,default=None,help="triangles per face table (.wismt, default 1.8x vertices)")
+	parser.add_argument("--tables",type=int,default=4,help="number of vertex/face table pairs (.wismt)")
+	parser.add_argument("--bones",type=int,default=64,help="bones in the .arc skeleton and the .wimdo")
+	parser.add_argument("--textures",nargs="*",default=["BC1:512x512","BC3:512x512","BC5:512x512","BC7:512x512","RGBA8:256x256"],help="cached .wismt textures, as FORMAT:WIDTHxHEIGHT")
+	parser.add_argument("--uncached",type=int,default=0,help="number of the cached textures to also give medium and high resolution subfiles")
+	parser.add_argument("--brres-positions",type=int,default=20000,help="positions in the .brres model")
+	parser.add_argument("--brres-triangles",type=int,default=30000,help="triangles in the .brres model")
+	parser.add_argument("--gx-textures",nargs="*",default=[f+":256x256" for f in ["I4","I8","IA4","IA8","RGB565","RGB5A3","RGBA32","C4","C8","C14X2","CMPR"]],help="brres textures, as FORMAT:WIDTHxHEIGHT")
+	parser.add_argument("--texture-workers",type=int,default=0,help="texture decode threads for the .wismt (0 = one per CPU, 1 = decode on the main thread)")
+	parser.add_argument("--worker-scaling",type=int,nargs="*",default=[],help="also time the .wismt with each of these texture decode thread counts, and how they compare to the first")
+	parser.add_argument("--stages",nargs="*",default=["skel","wimdo","wismt","brres"],choices=["skel","wimdo","wismt","brres"])
+	parser.add_argument("--repeat",type=int,default=3)
+	parser.add_argument("--seed",type=int,default=1)
+	parser.add_argument("--workdir",default=None,help="where to write the synthetic files (default: a temporary folder)")
+	parser.add_argument("--output",default=None,help="JSON file to write the results to")
+	parser.add_argument("--compare",default=None,help="JSON file from an earlier run to compare against")
+	args = parser.parse_args(argv)
+
+	cachedTextures = []
+	for i,spec in enumerate(args.textures):
+		formatName,width,height = parse_texture_spec(spec,modernFormats)
+		cachedTextures.append([f"tex{i:02d}_{formatName.lower()}",modernFormats[formatName],width,height])
+	uncachedTextures = [[i,cachedTextures[i][2],cachedTextures[i][3]] for i in range(min(args.uncached,len(cachedTextures)))]
+	brresTextures = []
+	for i,spec in enumerate(args.gx_textures):
+		formatName,width,height = parse_texture_spec(spec,gxFormats)
+		fmt = gxFormats[formatName]
+		paletteFormat = {8:0,9:2,10:2}.get(fmt) # IA8 for C4, RGB5A3 for the others
+		brresTextures.append([f"gx{i:02d}_{formatName.lower()}",fmt,width,height,paletteFormat])
+	wismtSpec = synthetic.WismtModelSpec(
+										vertexCount=args.vertices,
+										faceCount=args.faces if args.faces is not None else args.vertices*18//10,
+										tableCount=args.tables,
+										boneCount=args.bones,
+										)
+	brresSpec = synthetic.BrresModelSpec(positionCount=args.brres_positions,triangleCount=args.brres_triangles)
+
+	workdir = args.workdir or tempfile.mkdtemp(prefix="monado_forge_bench_")
+	print("Generating synthetic files in "+workdir)
+	start = time.perf_counter()
+	paths = synthetic.write_synthetic_set(workdir,args.bones,wismtSpec,cachedTextures,uncachedTextures,brresSpec,brresTextures,seed=args.seed)
+	print(f"Generated in {time.perf_counter()-start:.2f}s")
+
+	xcContext = stub_context({"game":"XC2","textureDecodeWorkers":args.texture_workers})
+	brresContext = stub_context({"game":"XC1"})
+	stages = {}
+	skeleton = None
+	wimdoResults = None
+	if "skel" in args.stages:
+		stages["skel"],skeleton = run_stage("skel",lambda f: import_funcs_sar1.import_sar1_skel_subfile(f,xcContext),paths["arc"],args.repeat,countVerts=lambda r: 0)
+	if "wimdo" in args.stages or "wismt" in args.stages or args.worker_scaling:
+		# the .wismt can't be read without the .wimdo's results, so it gets run regardless
+		wimdoStage,wimdoResults = run_stage("wimdo",lambda f: import_funcs_sar1.import_wimdo(f,xcContext,externalSkeleton=skeleton),paths["wimdo"],args.repeat if "wimdo" in args.stages else 1,countVerts=lambda r: 0)
+		if "wimdo" in args.stages:
+			stages["wimdo"] = wimdoStage
+	if "wismt" in args.stages:
+		stages["wismt"],result = run_stage("wismt",lambda f: import_funcs_sar1.import_wismt(f,wimdoResults,xcContext),paths["wismt"],args.repeat,
+											substages=[[import_funcs_sar1,"inflate_xbc1"],[utils_img,"decode_texture_wismt"],[import_funcs_sar1,"create_texture_wismt"]])
+	# how well texture decoding spreads over more threads (only meaningful with textures big and numerous enough to dominate the import)
+	workerScaling = {}
+	for workerCount in args.worker_scaling:
+		scalingContext = stub_context({"game":"XC2","textureDecodeWorkers":workerCount})
+		stage,result = run_stage(f"wismt x{workerCount}",lambda f: import_funcs_sar1.import_wismt(f,wimdoResults,scalingContext),paths["wismt"],args.repeat)
+		workerScaling[workerCount] = stage
+	if workerScaling:
+		baseCount = args.worker_scaling[0]
+		baseBest = workerScaling[baseCount]["best"]
+		print(f"Texture decode thread scaling (best times, relative to {baseCount}, on {os.cpu_count()} CPUs):")
+		for workerCount,stage in workerScaling.items():
+			speedup = baseBest/stage["best"]
+			stage["speedup"] = speedup
+			stage["efficiency"] = speedup*baseCount/workerCount
+			print(f"  {workerCount:>3} threads {stage['best']*1000:9.2f}ms  x{speedup:.2f}  ({stage['efficiency']*100:.0f}% of linear)")
+	if "brres" in args.stages:
+		stages["brres"],result = run_stage("brres",lambda f: import_funcs_brres.import_brres_root(f,brresContext),paths["brres"],args.repeat,
+											substages=[[import_funcs_brres,"parse_mdl0"],[import_funcs_brres,"parse_plt0"],[import_funcs_brres,"parse_texture_brres"]])
+
+	report = {
+				"timestamp":time.strftime("%Y-%m-%dT%H:%M:%S"),
+				"environment":{
+								"addonVersion":list(monado_forge.bl_info["version"]),
+								"blender":bpy.app.version_string,
+								"python":platform.python_version(),
+								"numpy":numpy.__version__,
+								"platform":platform.platform(),
+								"cpus":os.cpu_count(),
+								},
+				"parameters":vars(args),
+				"stages":stages,
+				"workerScaling":workerScaling,
+				}
+	if args.output:
+		with open(args.output,"w") as f:
+			json.dump(report,f,indent="\t")
+		print("Results written to "+args.output)
+	if args.compare:
+		with open(args.compare,"r") as f:
+			previous = json.load(f)
+		ignored = ["output","compare","workdir","repeat","stages"]
+		if {k:v for k,v in previous["parameters"].items() if k not in ignored} != {k:v for k,v in vars(args).items() if k not in ignored}:
+			print_warning("the earlier run used different parameters, so the comparison isn't like-for-like")
+		print("Compared to "+args.compare+" (best times; >1 is faster now):")
+		for name,stage in stages.items():
+			if name in previous["stages"]:
+				before = previous["stages"][name]["best"]
+				print(f"  {name:<10} {before*1000:9.2f}ms -> {stage['best']*1000:9.2f}ms  x{before/stage['best']:.2f}")
+	return report
+
+if __name__ == "__main__":
+	argv = sys.argv[1:]
+	if "--" in argv: # running inside Blender, which keeps its own arguments before the --
+		argv = argv[argv.index("--")+1:]
+	main(argv)
@@ -0,0 +1,835 @@
+import os
+import random
+import struct
+import zlib
+
+# synthetic (but structurally valid) Xenoblade files, for timing the importers without needing real game data
+# the contents are random (seeded, so the same parameters always give the same files), they only have to be shaped right
+# everything here is plain Python so it can run anywhere; none of it needs Blender
+
+class SyntheticBuffer():
+	def __init__(self,endian="little"):
+		self.data = bytearray()
+		self.prefix = "<" if endian == "little" else ">"
+
+	def tell(self):
+		return len(self.data)
+	def pack(self,fmt,*values):
+		self.data += struct.pack(self.prefix+fmt,*values)
+	def packAt(self,offset,fmt,*values):
+		struct.pack_into(self.prefix+fmt,self.data,offset,*values)
+	def raw(self,b):
+		self.data += b
+	def pad(self,n):
+		self.data += b"\x00"*n
+	def align(self,n):
+		while len(self.data) % n != 0:
+			self.data.append(0)
+	def cstr(self,s):
+		offset = len(self.data)
+		self.data += s.encode("utf-8")+b"\x00"
+		return offset
+
+# LBIM footer: [unk5, unk4, width, height, unk3, unk2, type, unk1, version] + magic
+def make_lbim(imgType,width,height,payload):
+	b = SyntheticBuffer()
+	b.raw(payload)
+	b.pack("9L",0,0,width,height,0,0,imgType,0,10001)
+	b.raw(b"LBIM")
+	return bytes(b.data)
+
+modernBlockBytes = {37:4,66:8,67:16,68:16,73:8,75:16,77:16}
+
+def tegra_swizzled_size(imgType,width,height):
+	blockSize = 1 if imgType == 37 else 4
+	bytesPerBlock = modernBlockBytes[imgType]
+	rowBytes = -(-width // blockSize)*bytesPerBlock
+	rows = -(-height // blockSize)
+	gobsX = -(-rowBytes // 64)
+	gobsY = -(-rows // 8)
+	# worst case is a 16-GOB-tall block
+	gobsY = -(-gobsY // 16)*16
+	return gobsX*gobsY*512
+
+def make_texture_payload(rng,imgType,width,height):
+	size = tegra_swizzled_size(imgType,width,height)
+	payload = bytearray(rng.randbytes(size))
+	if imgType == 77: # make sure every BC7 mode (plus the reserved one) turns up
+		for i in range(0,size,16):
+			mode = (i // 16) % 9
+			payload[i] = (1 << mode) if mode < 8 else 0
+	return bytes(payload)
+
+def make_xbc1(name,content,level=6):
+	compressed = zlib.compress(content,level)
+	b = SyntheticBuffer()
+	b.raw(b"xbc1")
+	b.pack("4L",1,len(content),len(compressed),0)
+	nameBytes = name.encode("utf-8")[:27]
+	b.raw(nameBytes+b"\x00"*(28-len(nameBytes)))
+	b.raw(compressed)
+	b.align(16)
+	return bytes(b.data)
+
+def make_sar1(boneCount=64,endpointCount=8,game="XC2",seed=1):
+	rng = random.Random(seed)
+	skel = SyntheticBuffer()
+	skel.raw(b"BC\x00\x00")
+	skel.pack("4L",1,0,0,0x20) # block count, file size (patched), pointer count, data offset
+	skel.pad(0x20-skel.tell())
+	skel.pad(4)
+	skel.raw(b"SKEL")
+	skel.pack("2L",0,0)
+	tocPos = skel.tell()
+	skel.pad(10*16)
+	def section(index,count,writer):
+		skel.align(16)
+		offset = skel.tell()
+		writer()
+		skel.packAt(tocPos+index*16,"4L",offset,0,count,0)
+	def write_parents(count):
+		for i in range(count):
+			skel.pack("h",-1 if i == 0 else rng.randrange(i))
+	def write_transforms(count):
+		for i in range(count):
+			skel.pack("4f",rng.uniform(-1,1),rng.uniform(-1,1),rng.uniform(-1,1),1.0)
+			q = [rng.uniform(-1,1) for j in range(4)]
+			l = sum(x*x for x in q)**0.5
+			skel.pack("4f",*[x/l for x in q])
+			skel.pack("4f",1.0,1.0,1.0,1.0)
+	boneNameRecords = []
+	endpointNameRecords = []
+	section(2,boneCount,lambda: write_parents(boneCount))
+	def write_bone_names():
+		for i in range(boneCount):
+			boneNameRecords.append(skel.tell())
+			skel.pad(16)
+	section(3,boneCount,write_bone_names)
+	section(4,boneCount,lambda: write_transforms(boneCount))
+	section(6,endpointCount,lambda: [skel.pack("h",rng.randrange(boneCount)) for i in range(endpointCount)])
+	def write_endpoint_names():
+		for i in range(endpointCount):
+			endpointNameRecords.append(skel.tell())
+			skel.pad(8)
+	section(7,endpointCount,write_endpoint_names)
+	section(8,endpointCount,lambda: write_transforms(endpointCount))
+	for i,r in enumerate(boneNameRecords):
+		skel.packAt(r,"L",skel.cstr("bone_%04d" % i))
+	for i,r in enumerate(endpointNameRecords):
+		skel.packAt(r,"L",skel.cstr("endpoint_%04d" % i))
+	skel.align(16)
+	skel.packAt(8,"L",skel.tell())
+
+	b = SyntheticBuffer()
+	b.raw(b"1RAS")
+	b.pack("7L",0,0x1001,1,0,0,0,0) # file size, version, file count, toc offset, data offset, unknowns
+	b.cstr("synthetic")
+	b.align(16)
+	tocOffset = b.tell()
+	b.packAt(16,"L",tocOffset)
+	b.pad(0x40)
+	b.align(16)
+	skelOffset = b.tell()
+	b.packAt(20,"L",skelOffset)
+	b.raw(skel.data)
+	skelName = "synthetic_skeleton.skl" if game == "XC3" else "synthetic.skl"
+	b.packAt(tocOffset,"3L",skelOffset,len(skel.data),0)
+	nameBytes = skelName.encode("utf-8")
+	b.data[tocOffset+12:tocOffset+12+len(nameBytes)] = nameBytes
+	b.packAt(4,"L",b.tell())
+	return bytes(b.data)
+
+class WismtModelSpec():
+	def __init__(self,vertexCount=1000,faceCount=1800,tableCount=2,boneCount=16,withShapes=True,withOutlines=True):
+		self.vertexCount = vertexCount
+		self.faceCount = faceCount
+		self.tableCount = tableCount
+		self.boneCount = boneCount
+		self.withShapes = withShapes
+		self.withOutlines = withOutlines
+
+# cached: [name, imgType, width, height]; uncached: [cached texture index, width, height] for the medium level, with a double-size high-res subfile
+def make_wimdo_wismt(spec=None,cachedTextures=None,uncachedTextures=None,seed=1):
+	if spec is None:
+		spec = WismtModelSpec()
+	if cachedTextures is None:
+		cachedTextures = [["tex_bc1",66,64,64],["tex_bc3",68,64,64],["tex_bc5",75,64,64],["temp0000",37,32,32]]
+	if uncachedTextures is None:
+		uncachedTextures = []
+	rng = random.Random(seed)
+	textureNames = [t[0] for t in cachedTextures]
+	meshTableCount = spec.tableCount+(1 if spec.withShapes else 0)
+
+	# first the model chunk, which goes in subfile 0
+	m = SyntheticBuffer()
+	m.pad(0x60) # header, patched at the end
+	weightVertexCount = 32
+	vertexDescriptors = [[0,12],[3,4],[5,8],[6,8],[17,4],[28,4],[99,4]]
+	weightDescriptors = [[41,8],[42,4]]
+	shapeDescriptors = [[3,4],[5,8],[28,4]]
+	vtables = [] # [descriptors, count, flags, outlineIndex]
+	for i in range(spec.tableCount):
+		vtables.append([vertexDescriptors,spec.vertexCount,1 if spec.withOutlines else 0,i])
+	weightTableIndex = len(vtables)
+	vtables.append([weightDescriptors,weightVertexCount,0,0])
+	if spec.withShapes:
+		shapeTableIndex = len(vtables)
+		vtables.append([shapeDescriptors,spec.vertexCount//4,0,0])
+	data = SyntheticBuffer() # the shared data block
+	def vertex_block(descriptors,count):
+		blockSize = sum(d[1] for d in descriptors)
+		offset = data.tell()
+		for v in range(count):
+			for vdType,vdSize in descriptors:
+				if vdType == 0:
+					# quantise positions so a fair few land on top of each other (needed to exercise vertex merging)
+					data.pack("3f",*[rng.randrange(-16,16)/8.0 for j in range(3)])
+				elif vdType == 3:
+					data.pack("L",rng.randrange(weightVertexCount))
+				elif vdType in [5,6,7]:
+					data.pack("2f",rng.random(),rng.random())
+				elif vdType == 17:
+					data.raw(bytes(rng.getrandbits(8) for j in range(4)))
+				elif vdType == 28:
+					data.pack("4b",*[rng.choice([-127,0,127]) for j in range(3)],0)
+				elif vdType == 41:
+					data.pack("4H",*[rng.getrandbits(16) for j in range(4)])
+				elif vdType == 42:
+					data.pack("4B",*[rng.randrange(spec.boneCount) for j in range(4)])
+				else:
+					data.raw(bytes(rng.getrandbits(8) for j in range(vdSize)))
+		data.align(4)
+		return offset,blockSize
+	vtOffsets = []
+	for descriptors,count,flags,outlineIndex in vtables:
+		vtOffsets.append(vertex_block(descriptors,count))
+	ftOffsets = []
+	faceTables = []
+	for i in range(spec.tableCount):
+		faceTables.append([i,spec.vertexCount])
+	if spec.withShapes:
+		faceTables.append([shapeTableIndex,spec.vertexCount//4])
+	for vtIndex,count in faceTables:
+		offset = data.tell()
+		faceCount = spec.faceCount if vtIndex != len(vtables)-1 or not spec.withShapes else spec.faceCount//4
+		for j in range(faceCount*3):
+			data.pack("H",rng.randrange(count))
+		data.align(4)
+		ftOffsets.append([offset,faceCount*3])
+	otOffsets = []
+	if spec.withOutlines:
+		for i in range(spec.tableCount):
+			offset = data.tell()
+			for v in range(spec.vertexCount):
+				blockSize = 8 if i % 2 == 0 else 4
+				if blockSize == 8:
+					data.pack("4b",*[rng.choice([-127,0,127]) for j in range(3)],0)
+				data.raw(bytes(rng.getrandbits(8) for j in range(4)))
+			otOffsets.append([offset,spec.vertexCount,8 if i % 2 == 0 else 4])
+	shapeTargetOffsets = []
+	if spec.withShapes:
+		shapeCount = spec.vertexCount//4
+		offset = data.tell()
+		for v in range(shapeCount): # base target
+			data.pack("3f",*[rng.randrange(-16,16)/8.0 for j in range(3)])
+			data.pack("4B",*[rng.choice([0,128,255]) for j in range(3)],0)
+			data.pad(4)
+		shapeTargetOffsets.append([offset,shapeCount,20])
+		shapeTargetOffsets.append([offset,0,20]) # skipped by the importer
+		offset = data.tell()
+		for v in range(shapeCount//2): # morph target
+			data.pack("3f",*[rng.uniform(-0.1,0.1) for j in range(3)])
+			data.pack("L",0)
+			data.pack("4B",*[rng.choice([0,128,255]) for j in range(3)],0)
+			data.pack("3L",0,0,v*2)
+		shapeTargetOffsets.append([offset,shapeCount//2,32])
+
+	m.align(16)
+	vertexTableOffset = m.tell()
+	descPositions = []
+	for i,(descriptors,count,flags,outlineIndex) in enumerate(vtables):
+		descPositions.append(m.tell())
+		m.pack("8L",vtOffsets[i][0],count,vtOffsets[i][1],0,len(descriptors),0,0,0)
+	for i,(descriptors,count,flags,outlineIndex) in enumerate(vtables):
+		descOffset = m.tell()
+		for d in descriptors:
+			m.pack("2H",*d)
+		m.packAt(descPositions[i]+12,"L",descOffset)
+	m.align(4)
+	extraTableOffset = m.tell()
+	for descriptors,count,flags,outlineIndex in vtables:
+		m.pack("4H",flags,outlineIndex,0,0)
+		m.pad(4)
+	faceTableOffset = m.tell()
+	for offset,count in ftOffsets:
+		m.pack("5L",offset,count,0,0,0)
+	outlineTableOffset = m.tell() if otOffsets else 0
+	for offset,count,blockSize in otOffsets:
+		m.pack("4L",offset,count,blockSize,0)
+	weightDataOffset = m.tell()
+	m.pack("2L2HL",1,0,weightTableIndex,1,0)
+	weightTablePos = m.tell()
+	m.packAt(weightDataOffset+4,"L",weightTablePos)
+	m.pack("3L",0,0,weightVertexCount)
+	m.pad(17)
+	m.pack("B",1)
+	m.pad(10)
+	lodPos = m.tell()
+	m.packAt(weightDataOffset+12,"L",lodPos)
+	m.pack("9H",1,1,1,1,1,0,0,0,0)
+	m.align(4)
+	shapeDataOffset = 0
+	if spec.withShapes:
+		shapeDataOffset = m.tell()
+		m.pack("4L",1,0,len(shapeTargetOffsets),0)
+		m.packAt(shapeDataOffset+4,"L",m.tell())
+		shapeTargetIDPos = m.tell()
+		m.pack("5L",shapeTableIndex,0,1,0,0)
+		m.packAt(shapeDataOffset+12,"L",m.tell())
+		for offset,count,blockSize in shapeTargetOffsets:
+			m.pack("3L2H",offset,count,blockSize,0,0)
+		targetIDOffset = m.tell()
+		m.pack("H",0)
+		m.align(4)
+		m.packAt(shapeTargetIDPos+12,"L",targetIDOffset)
+	m.align(16)
+	dataOffset = m.tell()
+	m.raw(data.data)
+	m.packAt(0,"4L",vertexTableOffset,len(vtables),faceTableOffset,len(ftOffsets))
+	m.packAt(28,"8L",extraTableOffset,outlineTableOffset,len(otOffsets),shapeDataOffset,len(data.data),dataOffset,0,weightDataOffset)
+	m.align(16)
+	modelChunk = bytes(m.data)
+
+	# cached textures chunk
+	t = SyntheticBuffer()
+	textureSpans = []
+	for name,imgType,width,height in cachedTextures:
+		t.align(16)
+		lbim = make_lbim(imgType,width,height,make_texture_payload(rng,imgType,width,height))
+		textureSpans.append([t.tell(),len(lbim)])
+		t.raw(lbim)
+	t.align(16)
+	textureChunk = bytes(t.data)
+
+	shaderChunk = b"\x00"*64
+	root = SyntheticBuffer()
+	contentPointers = []
+	for chunk,chunkType in [[modelChunk,0],[shaderChunk,1],[textureChunk,2]]:
+		root.align(16)
+		contentPointers.append([root.tell(),len(chunk),0,chunkType])
+		root.raw(chunk)
+	subfiles = [make_xbc1("root",bytes(root.data))]
+	textureIDs = []
+	if uncachedTextures:
+		mid = SyntheticBuffer()
+		highRes = []
+		for cachedIndex,width,height in uncachedTextures:
+			imgType = cachedTextures[cachedIndex][1]
+			mid.align(16)
+			lbim = make_lbim(imgType,width,height,make_texture_payload(rng,imgType,width,height))
+			contentPointers.append([mid.tell(),len(lbim),2+len(highRes)+1,3])
+			mid.raw(lbim)
+			highRes.append(make_texture_payload(rng,imgType,width*2,height*2))
+			textureIDs.append(cachedIndex)
+		subfiles.append(make_xbc1("mid",bytes(mid.data)))
+		for i,hr in enumerate(highRes):
+			subfiles.append(make_xbc1("high%d" % i,hr))
+
+	w = SyntheticBuffer()
+	mainOffset = 16
+	w.raw(b"DRSM")
+	w.pack("3L",10001,0x60,mainOffset)
+	w.pad(0x60-w.tell())
+	def rel():
+		return w.tell()-mainOffset
+	contentPointersOffset = rel()
+	for cp in contentPointers:
+		w.pack("2L2H2L",cp[0],cp[1],cp[2],cp[3],0,0)
+	textureIDsOffset = rel()
+	for t in textureIDs:
+		w.pack("H",t)
+	w.align(4)
+	textureCountOffset = rel()
+	w.pack("4L",len(cachedTextures),0,0,0)
+	texHeaderPos = w.tell()
+	w.pad(16*len(cachedTextures))
+	for i,tex in enumerate(cachedTextures):
+		nameOffset = w.cstr(tex[0])-mainOffset-textureCountOffset
+		w.packAt(texHeaderPos+i*16,"4L",0,textureSpans[i][1],textureSpans[i][0],nameOffset)
+	w.align(4)
+	subfileHeadersOffset = rel()
+	w.pad(12*len(subfiles))
+	for i,sf in enumerate(subfiles):
+		w.align(16)
+		w.packAt(mainOffset+subfileHeadersOffset+i*12,"3L",len(sf),0,w.tell())
+		w.raw(sf)
+	w.packAt(24,"4L",len(contentPointers),contentPointersOffset,len(subfiles),subfileHeadersOffset)
+	w.packAt(68,"3L",len(textureIDs),textureIDsOffset if textureIDs else 0,textureCountOffset)
+	wismt = bytes(w.data)
+
+	# now the .wimdo
+	d = SyntheticBuffer()
+	d.raw(b"DMXM")
+	d.pack("9L",10112,0,0,0,0,0,0,0,0)
+	d.align(16)
+	modelsOffset = d.tell()
+	d.pad(0xa0)
+	meshDataOffset = d.tell()-modelsOffset
+	d.pack("3L",0,meshTableCount,0)
+	d.pack("7f",-1,-1,-1,1,1,1,1)
+	meshTableOffset = d.tell()-modelsOffset
+	d.packAt(modelsOffset+meshDataOffset,"L",meshTableOffset)
+	for i in range(meshTableCount):
+		vtIndex = i if i < spec.tableCount else shapeTableIndex
+		d.pack("L4H",i,0,0,vtIndex,i)
+		d.pad(2)
+		d.pack("H",i % 2)
+		d.pad(14)
+		d.pack("B",1)
+		d.pad(17)
+	bonesOffset = d.tell()-modelsOffset
+	d.pack("7L",spec.boneCount,spec.boneCount,0,0,0,0,0)
+	boneHeaderOffset = d.tell()-modelsOffset-bonesOffset
+	boneHeaderPos = d.tell()
+	d.pad(24*spec.boneCount)
+	boneMatrixesOffset = d.tell()-modelsOffset-bonesOffset
+	for i in range(spec.boneCount):
+		d.pack("16f",1,0,0,0, 0,1,0,0, 0,0,1,0, rng.uniform(-1,1),rng.uniform(-1,1),rng.uniform(-1,1),-1)
+	for i in range(spec.boneCount):
+		nameOffset = d.cstr("mbone_%03d" % i)-modelsOffset-bonesOffset
+		d.packAt(boneHeaderPos+i*24,"4L",nameOffset,0,0,i)
+	d.packAt(modelsOffset+bonesOffset+8,"2L",boneHeaderOffset,boneMatrixesOffset)
+	d.align(4)
+	shapeItemsOffset = 0
+	shapeNamesOffset = 0
+	if spec.withShapes:
+		shapeItemsOffset = d.tell()-modelsOffset
+		d.pack("2L",8,1)
+		shapeHeaderPos = d.tell()
+		d.pad(28)
+		nameOffset = d.cstr("morph_smile")-modelsOffset-shapeItemsOffset
+		d.packAt(shapeHeaderPos,"2L",nameOffset,nameOffset)
+		d.align(4)
+		shapeNamesOffset = d.tell()-modelsOffset
+		d.pack("2L",8,1)
+		shapeNamePos = d.tell()
+		d.pad(16)
+		d.packAt(shapeNamePos,"L",d.cstr("morph_smile")-modelsOffset-shapeNamesOffset)
+		d.align(4)
+	d.packAt(modelsOffset+28,"3L",meshDataOffset,1,0)
+	d.packAt(modelsOffset+40,"L",bonesOffset)
+	d.packAt(modelsOffset+128,"2L",shapeItemsOffset,shapeNamesOffset)
+	d.align(16)
+	materialsOffset = d.tell()
+	d.pad(0x80)
+	materialCount = 2
+	samplerTableOffset = d.tell()-materialsOffset
+	d.pack("2L",2,8)
+	d.pack("Lf",0x01|0x02,0.0)
+	d.pack("Lf",0x04|0x10,0.0)
+	materialHeadersOffset = d.tell()-materialsOffset
+	matHeaderPos = d.tell()
+	d.pad(29*4*materialCount)
+	extraData = [0.5,1.0,2.0,0.25,0.125]
+	extraDataOffset = d.tell()-materialsOffset
+	for x in extraData:
+		d.pack("f",x)
+	for i in range(materialCount):
+		texTableOffset = d.tell()-materialsOffset
+		textureCount = len(textureNames) if i == 0 else 1
+		for j in range(textureCount):
+			d.pack("4H",j,j % 2,0,0)
+		passOffset = d.tell()-materialsOffset
+		d.pack("LH",0,0)
+		d.align(4)
+		nameOffset = d.cstr("material_%d" % i)-materialsOffset
+		d.packAt(matHeaderPos+i*29*4,"3L4ff2L",nameOffset,0,0,rng.random(),rng.random(),rng.random(),1.0,0.0,texTableOffset,textureCount)
+		d.packAt(matHeaderPos+i*29*4+16*4,"L",[0,3][i])
+		d.packAt(matHeaderPos+i*29*4+19*4,"L",passOffset-4)
+	d.packAt(materialsOffset,"6L",materialHeadersOffset,materialCount,0,0,extraDataOffset,len(extraData))
+	d.packAt(materialsOffset+92,"L",samplerTableOffset)
+	d.packAt(8,"2L",modelsOffset,materialsOffset)
+	d.align(16)
+	wimdo = bytes(d.data)
+	return wimdo,wismt
+
+# BRRES (big-endian, XC1-style): one MDL0, a bunch of TEX0s (every GX format), and PLT0s for the paletted ones
+class BrresBuilder():
+	def __init__(self):
+		self.b = SyntheticBuffer("big")
+		self.strings = [] # [string, list of [patch position, base position]]
+
+	def string_ref(self,s,patchPos,basePos):
+		self.strings.append([s,patchPos,basePos])
+
+	def write_strings(self):
+		b = self.b
+		b.align(4)
+		pool = {}
+		for s,patchPos,basePos in self.strings:
+			if s not in pool:
+				encoded = s.encode("utf-8")
+				b.pack("L",len(encoded))
+				pool[s] = b.tell()
+				b.raw(encoded+b"\x00")
+				b.align(4)
+			b.packAt(patchPos,"l",pool[s]-basePos)
+
+	# entries: list of [name, absolute data position or None (to be patched later via returned positions)]
+	def write_dict(self,names):
+		b = self.b
+		b.align(4)
+		start = b.tell()
+		b.pack("2L",8+16*(len(names)+1),len(names))
+		b.pack("4H2L",0xffff,0,0,0,0,0)
+		dataPatches = []
+		for i,name in enumerate(names):
+			entryPos = b.tell()
+			b.pack("4H2L",i,0,0,0,0,0)
+			self.string_ref(name,entryPos+8,start)
+			dataPatches.append(entryPos+12)
+		return start,dataPatches
+
+	def patch_dict_data(self,dictStart,patchPos,dataPos):
+		self.b.packAt(patchPos,"l",dataPos-dictStart)
+
+def gx_texture_size(fmt,width,height):
+	blockW,blockH,blockBytes = {0:[8,8,32],1:[8,4,32],2:[8,4,32],3:[4,4,32],4:[4,4,32],5:[4,4,32],6:[4,4,64],8:[8,8,32],9:[8,4,32],10:[4,4,32],14:[8,8,32]}[fmt]
+	return (-(-width // blockW))*(-(-height // blockH))*blockBytes
+
+def make_gx_payload(rng,fmt,width,height,paletteSize=0):
+	size = gx_texture_size(fmt,width,height)
+	if fmt == 10: # C14X2 indexes have to stay inside the palette
+		return b"".join(struct.pack(">H",rng.randrange(paletteSize)) for i in range(size//2))
+	return rng.randbytes(size)
+
+class BrresModelSpec():
+	def __init__(self,boneCount=8,positionCount=600,triangleCount=800,stripLength=120):
+		self.boneCount = boneCount
+		self.positionCount = positionCount
+		self.triangleCount = triangleCount
+		self.stripLength = stripLength
+
+def make_brres(spec=None,textures=None,seed=1):
+	if spec is None:
+		spec = BrresModelSpec()
+	if textures is None: # name, format, width, height, palette format (paletted only)
+		textures = [["t_i4",0,32,32,None],["t_i8",1,32,32,None],["t_ia4",2,32,32,None],["t_ia8",3,32,32,None],
+					["t_rgb565",4,32,32,None],["t_rgb5a3",5,32,32,None],["t_rgba32",6,32,32,None],
+					["t_c4",8,32,32,1],["t_c8",9,32,32,2],["t_c14x2",10,32,32,2],["t_cmpr",14,64,64,None]]
+	rng = random.Random(seed)
+	builder = BrresBuilder()
+	b = builder.b
+	b.raw(b"bres")
+	b.raw(b"\xfe\xff")
+	b.pack("HLHH",0,0,0x10,0)
+	b.pad(0x10-b.tell())
+	b.raw(b"root")
+	rootSizePos = b.tell()
+	b.pack("L",0)
+	folders = ["3DModels(NW4R)"]
+	if any(t[4] is not None for t in textures):
+		folders.append("Palettes(NW4R)")
+	if textures:
+		folders.append("Textures(NW4R)")
+	rootDictStart,rootPatches = builder.write_dict(folders)
+	folderDicts = {}
+	for i,folder in enumerate(folders):
+		if folder == "3DModels(NW4R)":
+			names = ["model"]
+		elif folder == "Palettes(NW4R)":
+			names = [t[0] for t in textures if t[4] is not None]
+		else:
+			names = [t[0] for t in textures]
+		start,patches = builder.write_dict(names)
+		builder.patch_dict_data(rootDictStart,rootPatches[i],start)
+		folderDicts[folder] = [start,patches]
+	b.packAt(rootSizePos,"L",b.tell()-0x10)
+
+	# MDL0
+	b.align(32)
+	mdl = b.tell()
+	folderStart,folderPatches = folderDicts["3DModels(NW4R)"]
+	builder.patch_dict_data(folderStart,folderPatches[0],mdl)
+	b.raw(b"MDL0")
+	b.pack("LLl",0,11,-mdl)
+	sectionPos = b.tell()
+	b.pad(14*4)
+	builder.string_ref("model",b.tell(),mdl)
+	b.pack("L",0)
+	def set_section(index,pos):
+		b.packAt(sectionPos+index*4,"l",pos-mdl)
+	# sections: 0 defs, 1 bones, 2 positions, 3 normals, 4 colours, 5 uvs, 6 fur vectors, 7 fur layers, 8 materials, 9 tevs, 10 meshes, 11 texture links, 12 palette links, 13 user data
+	modelHeader = b.tell()
+	multiWeightCount = 4
+	b.pack("Ll6L4BL",0x40,mdl-modelHeader,0,0,spec.positionCount,spec.triangleCount,0,spec.boneCount,0,0,0,0,0x40)
+	b.pack("6f",-1,-1,-1,1,1,1)
+	weightLinks = list(range(spec.boneCount))+[-1]*multiWeightCount
+	b.pack("L",len(weightLinks))
+	for wl in weightLinks:
+		b.pack("l",wl)
+
+	# defs
+	defsStart,defsPatches = builder.write_dict(["NodeTree","NodeMix","DrawOpa"])
+	set_section(0,defsStart)
+	b.align(4)
+	builder.patch_dict_data(defsStart,defsPatches[0],b.tell())
+	for i in range(spec.boneCount):
+		b.pack("BHH",0x02,i,max(i-1,0))
+	b.pack("B",0x01)
+	builder.patch_dict_data(defsStart,defsPatches[1],b.tell())
+	for w in range(multiWeightCount):
+		b.pack("BHB",0x03,spec.boneCount+w,2)
+		first = rng.randrange(spec.boneCount)
+		second = (first+1) % spec.boneCount
+		value = rng.random()
+		b.pack("Hf",first,value)
+		b.pack("Hf",second,1.0-value)
+	b.pack("B",0x01)
+	builder.patch_dict_data(defsStart,defsPatches[2],b.tell())
+	b.pack("BHHHB",0x04,0,0,0,0)
+	b.pack("BHHHB",0x04,1,1,0,0)
+	b.pack("B",0x01)
+
+	# bones
+	boneNames = ["bone_%02d" % i for i in range(spec.boneCount)]
+	bonesStart,bonesPatches = builder.write_dict(boneNames)
+	set_section(1,bonesStart)
+	bonePositions = []
+	for i in range(spec.boneCount):
+		b.align(4)
+		bonePositions.append(b.tell())
+		builder.patch_dict_data(bonesStart,bonesPatches[i],b.tell())
+		b.pack("Ll",0xd0,mdl-b.tell())
+		builder.string_ref(boneNames[i],b.tell(),bonePositions[i])
+		b.pack("5L",0,i,i,0x31f,0)
+		b.pack("L",0)
+		b.pack("3f",1,1,1)
+		b.pack("3f",rng.uniform(-90,90),rng.uniform(-90,90),rng.uniform(-90,90))
+		b.pack("3f",rng.uniform(-2,2),rng.uniform(-2,2),rng.uniform(-2,2))
+		b.pack("6f",-1,-1,-1,1,1,1)
+		b.pack("5l",(bonePositions[i-1]-bonePositions[i]) if i > 0 else 0,0,0,0,0)
+		b.pack("12f",1,0,0,0, 0,1,0,0, 0,0,1,0)
+		b.pack("12f",1,0,0,0, 0,1,0,0, 0,0,1,0)
+
+	# positions (float), normals (i16 scaled), colours (RGBA8 & RGBA6), uvs (float & i16)
+	posStart,posPatches = builder.write_dict(["pos"])
+	set_section(2,posStart)
+	b.align(32)
+	rec = b.tell()
+	builder.patch_dict_data(posStart,posPatches[0],rec)
+	b.pack("Ll",0,mdl-rec)
+	b.pack("L",0x40)
+	builder.string_ref("pos",b.tell(),rec)
+	b.pack("L",0)
+	b.pack("3L2BH",0,1,4,0,12,spec.positionCount)
+	b.pack("6f",-2,-2,-2,2,2,2)
+	b.pad(rec+0x40-b.tell())
+	for i in range(spec.positionCount):
+		b.pack("3f",*[rng.randrange(-16,16)/8.0 for j in range(3)])
+	b.packAt(rec,"L",b.tell()-rec)
+
+	nrmCount = 64
+	nrmStart,nrmPatches = builder.write_dict(["nrm"])
+	set_section(3,nrmStart)
+	b.align(32)
+	rec = b.tell()
+	builder.patch_dict_data(nrmStart,nrmPatches[0],rec)
+	b.pack("Ll",0,mdl-rec)
+	b.pack("L",0x20)
+	builder.string_ref("nrm",b.tell(),rec)
+	b.pack("L",0)
+	b.pack("3L2BH",0,0,3,14,6,nrmCount)
+	b.pad(rec+0x20-b.tell())
+	for i in range(nrmCount):
+		b.pack("3h",*[rng.choice([-16384,0,16384]) for j in range(3)])
+	b.packAt(rec,"L",b.tell()-rec)
+
+	colourCount = 48
+	colStart,colPatches = builder.write_dict(["col_rgba8","col_rgba6"])
+	set_section(4,colStart)
+	for c,(fmt,stride) in enumerate([[5,4],[4,3]]):
+		b.align(32)
+		rec = b.tell()
+		builder.patch_dict_data(colStart,colPatches[c],rec)
+		b.pack("Ll",0,mdl-rec)
+		b.pack("L",0x20)
+		builder.string_ref(["col_rgba8","col_rgba6"][c],b.tell(),rec)
+		b.pack("L",0)
+		b.pack("3L2BH",c,1,fmt,stride,0,colourCount)
+		for i in range(colourCount):
+			b.raw(bytes(rng.getrandbits(8) for j in range(stride)))
+		b.packAt(rec,"L",b.tell()-rec)
+
+	uvCount = 128
+	uvStart,uvPatches = builder.write_dict(["uv_float","uv_i16"])
+	set_section(5,uvStart)
+	for u,(fmt,divisor,stride) in enumerate([[4,0,8],[3,10,4]]):
+		b.align(32)
+		rec = b.tell()
+		builder.patch_dict_data(uvStart,uvPatches[u],rec)
+		b.pack("Ll",0,mdl-rec)
+		b.pack("L",0x40)
+		builder.string_ref(["uv_float","uv_i16"][u],b.tell(),rec)
+		b.pack("L",0)
+		b.pack("3L2BH",u,1,fmt,divisor,stride,uvCount)
+		b.pad(rec+0x40-b.tell())
+		for i in range(uvCount):
+			if fmt == 4:
+				b.pack("2f",rng.random(),rng.random())
+			else:
+				b.pack("2h",rng.randrange(1024),rng.randrange(1024))
+		b.packAt(rec,"L",b.tell()-rec)
+
+	# materials
+	texNames = [t[0] for t in textures]
+	matNames = ["mat_opa","mat_xlu"]
+	matStart,matPatches = builder.write_dict(matNames)
+	set_section(8,matStart)
+	for m,matName in enumerate(matNames):
+		b.align(32)
+		rec = b.tell()
+		builder.patch_dict_data(matStart,matPatches[m],rec)
+		layerTextures = texNames[m::2] if texNames else []
+		b.pack("Ll",0x500+52*len(layerTextures),mdl-rec)
+		builder.string_ref(matName,b.tell(),rec)
+		b.pack("L",0)
+		b.pack("L",m)
+		b.pack("L",0x80000000 if m == 1 else 0)
+		b.pack("4B",1,1,1,0)
+		b.pack("L",2)
+		b.pack("4B",1,0,0,0)
+		b.pack("2L",0,0)
+		b.pack("lLl",0,len(layerTextures),0x500)
+		b.pad(rec+0x500-b.tell())
+		for t,texName in enumerate(layerTextures):
+			layer = b.tell()
+			builder.string_ref(texName,layer,layer)
+			b.pack("l3l2L",0,0,0,0,t,0)
+			b.pack("4L",t % 3,(t+1) % 3,1,t % 2)
+			b.pack("fLBBH",0.0,0,0,0,0)
+
+	# meshes: one single-bone triangle list, one multi-weight strip mesh
+	meshNames = ["mesh_single","mesh_multi"]
+	meshStart,meshPatches = builder.write_dict(meshNames)
+	set_section(10,meshStart)
+	for m,meshName in enumerate(meshNames):
+		b.align(32)
+		rec = b.tell()
+		builder.patch_dict_data(meshStart,meshPatches[m],rec)
+		b.pack("Ll",0,mdl-rec)
+		b.pack("l",1 if m == 0 else -1)
+		b.pad(rec+0x30-b.tell())
+		multi = m == 1
+		featureFlags = (1 << 9) | (1 << 10) | (1 << 11) | (1 << 13) | (1 << 14) | (1 if multi else 0)
+		b.pack("LL",featureFlags,0)
+		builder.string_ref(meshName,b.tell(),rec)
+		b.pack("L",0)
+		b.pack("3L",m,0,0)
+		b.pack("2h",0,0)
+		b.pack("2h",m,-1)
+		b.pack("8h",0,1,-1,-1,-1,-1,-1,-1)
+		b.pack("2h",-1,-1)
+		weightTablePos = b.tell()
+		b.pack("l",0)
+		b.packAt(weightTablePos,"l",b.tell()-rec)
+		b.pack("L",2)
+		b.pack("2H",0,1)
+		# display list
+		# VCD lo: posMat (1 bit), tex0-7 matrix (1 bit each), pos/nrm/col0/col1 (2 bits each)
+		vcdLo = (3 << 9) | (3 << 11) | (2 << 13)
+		if multi:
+			vcdLo |= 1
+		vcdHi = (3 << 0) | (2 << 2)
+		b.pack("BBL",0x08,0x50,vcdLo)
+		b.pack("BBL",0x08,0x60,vcdHi)
+		b.pack("BBL",0x08,0x70,0x40000000 | (1 << 0) | (4 << 1) | (1 << 9) | (1 << 10) | (5 << 13)) # formats don't matter to the importer
+		b.pack("BHHL",0x10,0,0x1008,(2 << 4) | (1 << 2) | 1)
+		matrixSlots = 4
+		def write_vertex(slot):
+			if multi:
+				b.pack("B",slot*3)
+			b.pack("HHB",rng.randrange(spec.positionCount),rng.randrange(nrmCount),rng.randrange(colourCount))
+			b.pack("HB",rng.randrange(uvCount),rng.randrange(uvCount))
+		if multi:
+			for batch in range(3):
+				for slot in range(matrixSlots):
+					linkIndex = rng.randrange(len(weightLinks))
+					b.pack("BHH",0x20,linkIndex,(11 << 12) | (slot*12))
+					b.pack("BHH",0x28,linkIndex,(8 << 12) | (slot*9))
+				b.pack("BH",0x98,spec.stripLength)
+				for v in range(spec.stripLength):
+					write_vertex(rng.randrange(matrixSlots))
+		else:
+			# a draw command's vertex count is only 16 bits, so big lists get split up
+			remaining = spec.triangleCount*3
+			while remaining > 0:
+				count = min(remaining,65535)
+				b.pack("BH",0x90,count)
+				for v in range(count):
+					write_vertex(0)
+				remaining -= count
+		b.align(32)
+		b.packAt(rec,"L",b.tell()-rec)
+	b.align(4)
+	b.packAt(mdl+4,"L",b.tell()-mdl)
+
+	# palettes & textures
+	if "Palettes(NW4R)" in folderDicts:
+		pltStart,pltPatches = folderDicts["Palettes(NW4R)"]
+		for p,(name,fmt,width,height,pltFormat) in enumerate([t for t in textures if t[4] is not None]):
+			b.align(32)
+			plt = b.tell()
+			builder.patch_dict_data(pltStart,pltPatches[p],plt)
+			colourCount = {8:16,9:256,10:512}[fmt]
+			b.raw(b"PLT0")
+			b.pack("LLl",0,3,-plt)
+			b.pack("L",0x40)
+			builder.string_ref(name,b.tell(),plt)
+			b.pack("L",0)
+			b.pack("LH",pltFormat,colourCount)
+			b.pad(plt+0x40-b.tell())
+			for c in range(colourCount):
+				b.pack("H",rng.getrandbits(16))
+			b.packAt(plt+4,"L",b.tell()-plt)
+	if textures:
+		texStart,texPatches = folderDicts["Textures(NW4R)"]
+		for t,(name,fmt,width,height,pltFormat) in enumerate(textures):
+			b.align(32)
+			tex = b.tell()
+			builder.patch_dict_data(texStart,texPatches[t],tex)
+			paletteSize = {8:16,9:256,10:512}.get(fmt,0)
+			payload = make_gx_payload(rng,fmt,width,height,paletteSize)
+			b.raw(b"TEX0")
+			b.pack("LLl",0x40+len(payload),3,-tex)
+			b.pack("L",0x40)
+			builder.string_ref(name,b.tell(),tex)
+			b.pack("L",0)
+			b.pack("L2HLLffL",0 if pltFormat is None else 1,width,height,fmt,1,0.0,0.0,0)
+			b.pad(tex+0x40-b.tell())
+			b.raw(payload)
+	builder.write_strings()
+	b.align(32)
+	b.packAt(8,"L",b.tell())
+	return bytes(b.data)
+
+# writes a full set (.arc, .wimdo & .wismt, .brres) to the given folder, returning the paths by kind
+def write_synthetic_set(folder,skelBoneCount=64,wismtSpec=None,cachedTextures=None,uncachedTextures=None,brresSpec=None,brresTextures=None,seed=1):
+	os.makedirs(folder,exist_ok=True)
+	paths = {
+			"arc":os.path.join(folder,"synthetic.arc"),
+			"wimdo":os.path.join(folder,"synthetic.wimdo"),
+			"wismt":os.path.join(folder,"synthetic.wismt"),
+			"brres":os.path.join(folder,"synthetic.brres"),
+			}
+	wimdo,wismt = make_wimdo_wismt(wismtSpec,cachedTextures,uncachedTextures,seed=seed)
+	contents = {
+				"arc":make_sar1(boneCount=skelBoneCount,seed=seed),
+				"wimdo":wimdo,
+				"wismt":wismt,
+				"brres":make_brres(brresSpec,brresTextures,seed=seed),
+				}
+	for kind,path in paths.items():
+		with open(path,"wb") as f:
+			f.write(contents[kind])
+	return paths
@@ -0,0 +1,355 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+# checks that every texture format comes out of the importers exactly as it should, and times how fast each one decodes
+# the textures are random (seeded) data, and the expected pixels come from the one-pixel-at-a-time decoders in reference_decoders, so no game files are needed
+# needs the bpy module (the pixels are read back out of the Blender images the importers make), so run it either with the standalone bpy package:
+# 	python -m benchmarks.texture_conformance [options]
+# or inside Blender itself:
+# 	blender --background --python benchmarks/texture_conformance.py -- [options]
+# both the references and the importers are also checked against golden_blocks.json, which is what third-party decoders make of some fixed blocks (see make_golden_blocks)
+# the saving check imports a small synthetic .wismt with textures being saved (as both PNG and DDS, keeping every resolution) and makes sure every file got written
+# if Pillow happens to be installed, the BCn references are also checked against its decoders, as a second opinion on the references themselves
+# exits with 1 if anything didn't match
+
+repoRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if repoRoot not in sys.path:
+	sys.path.insert(0,repoRoot)
+
+import bpy
+import numpy
+
+import monado_forge
+from monado_forge import import_funcs_sar1
+from monado_forge import utils_img
+from monado_forge.utils import print_error,print_warning
+from benchmarks import reference_decoders
+from benchmarks.run_benchmarks import stub_context
+from benchmarks import synthetic
+
+# [name, game, imgType, blueBC5] - the name is what --formats takes
+# BC5 is in twice, since blueBC5 makes it a different decoder in all but name
+textureFormats = [
+					["R8G8B8A8","wismt",37,False],
+					["BC1","wismt",66,False],
+					["BC2","wismt",67,False],
+					["BC3","wismt",68,False],
+					["BC4","wismt",73,False],
+					["BC5","wismt",75,False],
+					["BC5_BLUE","wismt",75,True],
+					["BC7","wismt",77,False],
+					]+[[v[0],"brres",k,False] for k,v in reference_decoders.brresFormats.items()]
+# palette sizes for the paletted formats, chosen so that some indexes are always off the end (which should come out as transparent black)
+paletteSizes = {8:12,9:200,10:12000}
+# DXGI formats for Pillow's DDS reader, and which channels to compare (Pillow has no opinion on BC4's G and B or BC5's B)
+pillowFormats = {66:[71,4],67:[74,4],68:[77,4],73:[80,1],75:[83,2],77:[98,4]}
+
+goldenBlocks = os.path.join(os.path.dirname(os.path.abspath(__file__)),"golden_blocks.json")
+# how the golden blocks are compared: [channels compared, largest difference allowed]
+# Pillow and texture2ddecoder round BC1-5's in-between values their own way, so those can be 1 off (BC4 and BC5's missing channels aren't compared, same as with Pillow)
+# retro-data-structures widens 5-bit, 6-bit and RGB5A3's 3-bit values by shifting them up instead of stretching them to 255, so only the bits it keeps are compared (see shifted_bits)
+# CMPR's in-between colours come from those widened endpoints, so they can be up to 8 off; the layout is what those blocks are really there for (BC1 pins down the colour maths)
+goldenChecks = {
+				"BC1":[4,1],"BC2":[4,1],"BC3":[4,1],"BC4":[1,1],"BC5":[2,1],"BC7":[4,0],
+				"I4":[4,0],"I8":[4,0],"IA4":[4,0],"IA8":[4,0],"RGB565":[4,0],"RGB5A3":[4,0],"RGBA32":[4,0],
+				"C4":[4,0],"C8":[4,0],"CMPR":[4,8],
+				}
+
+def parse_size(spec):
+	try:
+		width,height = [int(x) for x in spec.lower().split("x")]
+	except ValueError:
+		raise argparse.ArgumentTypeError("sizes must be given as WIDTHxHEIGHT, not "+spec)
+	return [width,height]
+
+# random BC7 data where the blocks cycle through the given modes (8 being the reserved one)
+# every BC7 block is one whole 16-byte chunk of a GOB, so every 16th byte of the swizzled data is a block's first byte
+def bc7_payload(rng,size,modes):
+	payload = bytearray(rng.randbytes(size))
+	for i in range(0,size,16):
+		mode = modes[(i // 16) % len(modes)]
+		payload[i] = 0 if mode == 8 else (payload[i] & (0xFF << (mode+1)) & 0xFF) | (1 << mode)
+	return bytes(payload)
+
+def make_texture(rng,game,imgType,width,height,bc7Modes=range(9)):
+	palette = None
+	if game == "wismt":
+		name,blockWidth,blockHeight,bytesPerBlock,decoder = reference_decoders.wismtFormats[imgType]
+		blockCountX,blockCountY = reference_decoders.block_counts(width,height,blockWidth,blockHeight)
+		size = reference_decoders.tegra_surface_size(blockCountX,blockCountY,bytesPerBlock)
+		rawData = bc7_payload(rng,size,list(bc7Modes)) if name == "BC7" else rng.randbytes(size)
+	else:
+		rawData = rng.randbytes(synthetic.gx_texture_size(imgType,width,height))
+		if imgType in paletteSizes:
+			palette = numpy.frombuffer(rng.randbytes(paletteSizes[imgType]*4),dtype=numpy.uint8).reshape(-1,4)
+	return rawData,palette
+
+def import_texture(textureName,game,imgType,width,height,rawData,blueBC5,palette):
+	if game == "wismt":
+		return utils_img.parse_texture_wismt(textureName,10001,imgType,width,height,rawData,blueBC5,False)
+	return utils_img.parse_texture_brres(textureName,imgType,width,height,rawData,palette,False)
+
+def decode_texture(textureName,game,imgType,width,height,rawData,blueBC5,palette):
+	if game == "wismt":
+		return utils_img.decode_texture_wismt(textureName,imgType,width,height,rawData,blueBC5)[0]
+	return utils_img.decode_texture_brres(textureName,imgType,width,height,rawData,palette)
+
+# an image's pixels as top-down (height,width,4) uint8, after which the image is removed
+def take_image_pixels(imageName,width,height):
+	image = bpy.data.images[imageName]
+	floats = numpy.empty(width*height*4,dtype=numpy.float32)
+	image.pixels.foreach_get(floats)
+	bpy.data.images.remove(image)
+	return numpy.rint(floats*255.0).astype(numpy.uint8).reshape(height,width,4)[::-1]
+
+def describe_mismatch(actual,expected):
+	differing = numpy.argwhere(numpy.any(actual != expected,axis=2))
+	y,x = differing[0]
+	return f"{len(differing)}/{expected.shape[0]*expected.shape[1]} pixels differ, first at ({x},{y}): {actual[y,x].tolist()} != {expected[y,x].tolist()}"
+
+# the reference's BCn pixels against Pillow's, as the biggest difference in any compared channel
+def pillow_difference(image,imgType,width,height,rawData,expected):
+	dxgiFormat,channels = pillowFormats[imgType]
+	name,blockWidth,blockHeight,bytesPerBlock,decoder = reference_decoders.wismtFormats[imgType]
+	blockCountX,blockCountY = reference_decoders.block_counts(width,height,blockWidth,blockHeight)
+	blocks = reference_decoders.tegra_unswizzle(rawData,blockCountX,blockCountY,bytesPerBlock)
+	dds = utils_img.dds_header(dxgiFormat,blockCountX*4,blockCountY*4,len(blocks)*bytesPerBlock)+b"".join(blocks)
+	decoded = numpy.asarray(image.open(io.BytesIO(dds)).convert("RGBA"))[0:height,0:width]
+	differences = numpy.abs(decoded[:,:,0:channels].astype(numpy.int64)-expected[:,:,0:channels])
+	if name == "BC7": # Pillow makes the reserved mode 8 opaque black rather than transparent, so those blocks aren't comparable
+		reserved = numpy.array([block[0] == 0 for block in blocks]).reshape(blockCountY,blockCountX)
+		differences[numpy.kron(reserved,numpy.ones([4,4],dtype=bool))[0:height,0:width]] = 0
+	return int(differences.max())
+
+# pixels with each channel cut down to the top bits retro-data-structures keeps
+# RGB5A3's opaque pixels are 5-bit colour and the rest have 3-bit alpha, which is told apart by the golden pixels (the widened alpha never gets to 255, so that's only ever opaque)
+def shifted_bits(name,pixels,expected):
+	bits = numpy.full(pixels.shape,8)
+	if name == "RGB565":
+		bits[...,0:3] = [5,6,5]
+	elif name == "RGB5A3":
+		opaque = expected[...,3] == 255
+		bits[opaque,0:3] = 5
+		bits[~opaque,3] = 3
+	return pixels & (0xFF << (8-bits)) & 0xFF
+
+def golden_difference(name,actual,expected):
+	channels,tolerance = goldenChecks[name]
+	if name in ["RGB565","RGB5A3"]:
+		actual = shifted_bits(name,actual,expected)
+	return int(numpy.abs(actual[...,0:channels].astype(numpy.int64)-expected[...,0:channels]).max())
+
+# every golden block of a format, through the reference decoder and through the importer (as one texture, a row of blocks wide)
+def run_golden(formats):
+	with open(goldenBlocks) as f:
+		golden = json.load(f)
+	results = []
+	for name,game,imgType,blueBC5 in formats:
+		if name not in golden:
+			continue
+		formatInfo = reference_decoders.wismtFormats[imgType] if game == "wismt" else reference_decoders.brresFormats[imgType]
+		blockWidth,blockHeight,bytesPerBlock,decoder = formatInfo[1:]
+		blocks = [bytes.fromhex(block) for block in golden[name]["blocks"]]
+		expected = numpy.concatenate([numpy.frombuffer(bytes.fromhex(p),dtype=numpy.uint8).reshape(blockHeight,blockWidth,4) for p in golden[name]["pixels"]],axis=1)
+		width,height = blockWidth*len(blocks),blockHeight
+		palette = None
+		if "palette" in golden[name]:
+			palette = numpy.frombuffer(bytes.fromhex(golden[name]["palette"]),dtype=numpy.uint8).reshape(-1,4)
+			paletteTuples = [tuple(int(v) for v in colour) for colour in palette]
+			references = [decoder(block,paletteTuples) for block in blocks]
+		else:
+			references = [decoder(block) for block in blocks]
+		reference = reference_decoders.assemble_blocks(references,len(blocks),blockWidth,blockHeight,width,height)
+		if game == "wismt":
+			rawData = reference_decoders.tegra_swizzle(blocks,len(blocks),1,bytesPerBlock)
+		else:
+			rawData = b"".join(blocks)
+		with contextlib.redirect_stdout(io.StringIO()):
+			imageName = import_texture("golden",game,imgType,width,height,rawData,blueBC5,palette)
+		actual = take_image_pixels(imageName,width,height)
+		tolerance = goldenChecks[name][1]
+		result = {"case":f"{name} golden blocks","passed":True,"detail":"","source":golden[name]["source"]}
+		for what,pixels in [["reference",reference],["importer",actual]]:
+			result[what+"Difference"] = golden_difference(name,pixels,expected)
+			if result[what+"Difference"] > tolerance:
+				result["passed"] = False
+				result["detail"] += f" {what} differs from {golden[name]['source']} by up to {result[what+'Difference']}"
+		print(f"{result['case']:<24} {'ok' if result['passed'] else 'FAILED'}  ({result['source']}, within {max(result['referenceDifference'],result['importerDifference'])})"+(" "+result["detail"] if result["detail"] else ""))
+		results.append(result)
+	return results
+
+def run_conformance(formats,sizes,rng,pillowImage=None):
+	results = []
+	knownFailures = reference_decoders.check_known_blocks()
+	for failure in knownFailures:
+		print_error("reference decoder is wrong: "+failure)
+	results.append({"case":"reference decoders","passed":not knownFailures,"detail":"; ".join(knownFailures)})
+	results += run_golden(formats)
+	cases = []
+	for name,game,imgType,blueBC5 in formats:
+		for width,height in sizes:
+			cases.append([f"{name} {width}x{height}",game,imgType,blueBC5,width,height,range(9)])
+		if name == "BC7": # every mode on its own too, so that one bad mode can't hide among the others
+			width,height = sizes[0]
+			for mode in range(9):
+				cases.append([f"{name} mode {mode} {width}x{height}",game,imgType,blueBC5,width,height,[mode]])
+	for caseName,game,imgType,blueBC5,width,height,bc7Modes in cases:
+		rawData,palette = make_texture(rng,game,imgType,width,height,bc7Modes)
+		if game == "wismt":
+			expected = reference_decoders.wismt_texture(imgType,width,height,rawData,blueBC5)
+		else:
+			expected = reference_decoders.brres_texture(imgType,width,height,rawData,palette)
+		with contextlib.redirect_stdout(io.StringIO()): # e.g. the warning that comes with BC7 mode 8, which is expected here
+			imageName = import_texture("conformance",game,imgType,width,height,rawData,blueBC5,palette)
+		actual = take_image_pixels(imageName,width,height)
+		result = {"case":caseName,"passed":bool(numpy.array_equal(actual,expected)),"detail":""}
+		if not result["passed"]:
+			result["detail"] = describe_mismatch(actual,expected)
+		if pillowImage and game == "wismt" and imgType in pillowFormats and not blueBC5:
+			# Pillow rounds BC1-5's in-between values its own way, so those can be 1 off; BC7 is all integer maths and has to match exactly
+			result["pillowDifference"] = pillow_difference(pillowImage,imgType,width,height,rawData,expected)
+			if result["pillowDifference"] > (0 if imgType == 77 else 1):
+				result["passed"] = False
+				result["detail"] += f" reference differs from Pillow by up to {result['pillowDifference']}"
+		print(f"{caseName:<24} {'ok' if result['passed'] else 'FAILED'}"+(f"  (Pillow within {result['pillowDifference']})" if "pillowDifference" in result else "")+("  "+result["detail"] if result["detail"] else ""))
+		results.append(result)
+	return results
+
+# keepAllResolutions puts each resolution in its own res0/res1/res2 folder, which nothing else makes, so that's what gets used here
+def run_saving(saveFormats):
+	results = []
+	cachedTextures = [["tex00_bc1",66,64,64],["tex01_bc7",77,64,64]]
+	uncachedTextures = [[0,64,64]] # so the BC1 also comes in medium and high resolution
+	wismtSpec = synthetic.WismtModelSpec(vertexCount=100,faceCount=100,tableCount=1,boneCount=8)
+	for saveFormat in saveFormats:
+		workdir = tempfile.mkdtemp(prefix="monado_forge_saving_")
+		paths = synthetic.write_synthetic_set(workdir,8,wismtSpec,cachedTextures,uncachedTextures)
+		texturePath = os.path.join(workdir,"textures")
+		context = stub_context({"game":"XC2"},{"autoSaveTextures":True,"texturePath":texturePath,"textureSaveFormat":saveFormat,"keepAllResolutions":True})
+		existingImages = set(image.name for image in bpy.data.images)
+		result = {"case":f"saving {saveFormat} (all resolutions)","passed":True,"detail":""}
+		try:
+			with contextlib.redirect_stdout(io.StringIO()):
+				with open(paths["wimdo"],"rb") as f:
+					wimdoResults = import_funcs_sar1.import_wimdo(f,context)
+				with open(paths["wismt"],"rb") as f:
+					import_funcs_sar1.import_wismt(f,wimdoResults,context)
+			expected = [os.path.join(folder,"synthetic_"+name+"."+saveFormat.lower()) for folder,name in [["res0","tex00_bc1"],["res0","tex01_bc7"],["res1","tex00_bc1"],["res2","tex00_bc1"]]]
+			missing = [name for name in expected if not os.path.isfile(os.path.join(texturePath,name))]
+			if missing:
+				result["passed"] = False
+				result["detail"] = "not written: "+", ".join(missing)
+		except Exception as e:
+			result["passed"] = False
+			result["detail"] = f"import failed: {type(e).__name__}: {e}"
+		for image in list(bpy.data.images):
+			if image.name not in existingImages:
+				bpy.data.images.remove(image)
+		print(f"{result['case']:<24} {'ok' if result['passed'] else 'FAILED'}"+("  "+result["detail"] if result["detail"] else ""))
+		results.append(result)
+	return results
+
+def run_throughput(formats,sizes,rng,repeat):
+	results = []
+	for name,game,imgType,blueBC5 in formats:
+		for width,height in sizes:
+			if game == "wismt":
+				rawData = synthetic.make_texture_payload(rng,imgType,width,height)
+				palette = None
+			else:
+				paletteSize = {8:16,9:256,10:512}.get(imgType,0)
+				rawData = synthetic.make_gx_payload(rng,imgType,width,height,paletteSize)
+				palette = numpy.frombuffer(rng.randbytes(paletteSize*4),dtype=numpy.uint8).reshape(-1,4)
+			decodeTimes = []
+			importTimes = []
+			with contextlib.redirect_stdout(io.StringIO()):
+				for i in range(repeat):
+					start = time.perf_counter()
+					decode_texture("throughput",game,imgType,width,height,rawData,blueBC5,palette)
+					decodeTimes.append(time.perf_counter()-start)
+					start = time.perf_counter()
+					imageName = import_texture("throughput",game,imgType,width,height,rawData,blueBC5,palette)
+					importTimes.append(time.perf_counter()-start)
+					bpy.data.images.remove(bpy.data.images[imageName])
+			megapixels = width*height/1000000
+			result = {
+						"format":name,
+						"width":width,
+						"height":height,
+						"decodeSeconds":decodeTimes,
+						"importSeconds":importTimes,
+						"decodeMP/s":megapixels/min(decodeTimes),
+						"importMP/s":megapixels/min(importTimes),
+						}
+			print(f"{name:<10} {width:>5}x{height:<5}  decode {result['decodeMP/s']:9.2f} MP/s  import {result['importMP/s']:9.2f} MP/s")
+			results.append(result)
+	return results
+
+def main(argv):
+	formatNames = [f[0] for f in textureFormats]
+	parser = argparse.ArgumentParser(description="Check Monado Forge's texture decoders against reference decoders, and time them.")
+	parser.add_argument("--formats",nargs="*",default=formatNames,choices=formatNames)
+	parser.add_argument("--checks",nargs="*",default=["conformance","saving","throughput"],choices=["conformance","saving","throughput"])
+	parser.add_argument("--conformance-sizes",nargs="*",type=parse_size,default=[[64,64],[37,21],[24,136]],help="image sizes to check, as WIDTHxHEIGHT (odd ones check the padding and cropping)")
+	parser.add_argument("--sizes",nargs="*",type=parse_size,default=[[256,256],[1024,1024]],help="image sizes to time, as WIDTHxHEIGHT")
+	parser.add_argument("--no-pillow",action="store_true",help="don't cross-check the references against Pillow, even if it's installed")
+	parser.add_argument("--repeat",type=int,default=3)
+	parser.add_argument("--seed",type=int,default=1)
+	parser.add_argument("--output",default=None,help="JSON file to write the results to")
+	args = parser.parse_args(argv)
+
+	formats = [f for f in textureFormats if f[0] in args.formats]
+	pillowImage = None
+	if not args.no_pillow:
+		try:
+			from PIL import Image as pillowImage
+		except ImportError:
+			print_warning("Pillow isn't installed, so the references won't be cross-checked")
+
+	report = {
+				"timestamp":time.strftime("%Y-%m-%dT%H:%M:%S"),
+				"environment":{
+								"addonVersion":list(monado_forge.bl_info["version"]),
+								"blender":bpy.app.version_string,
+								"python":platform.python_version(),
+								"numpy":numpy.__version__,
+								"pillow":getattr(sys.modules.get("PIL"),"__version__",None) if pillowImage else None,
+								"platform":platform.platform(),
+								"cpus":os.cpu_count(),
+								},
+				"parameters":vars(args),
+				"passed":True,
+				}
+	if "conformance" in args.checks:
+		print("Conformance:")
+		report["conformance"] = run_conformance(formats,args.conformance_sizes,random.Random(args.seed),pillowImage)
+		failures = [r for r in report["conformance"] if not r["passed"]]
+		report["passed"] = not failures
+		print(f"{len(report['conformance'])-len(failures)}/{len(report['conformance'])} passed")
+	if "saving" in args.checks:
+		print("Saving:")
+		report["saving"] = run_saving(["PNG","DDS"])
+		report["passed"] = report["passed"] and all(r["passed"] for r in report["saving"])
+	if "throughput" in args.checks:
+		print("Throughput (best of "+str(args.repeat)+"; import includes making the Blender image):")
+		report["throughput"] = run_throughput(formats,args.sizes,random.Random(args.seed),args.repeat)
+	if args.output:
+		with open(args.output,"w") as f:
+			json.dump(report,f,indent="\t")
+		print("Results written to "+args.output)
+	return report
+
+if __name__ == "__main__":
+	argv = sys.argv[1:]
+	if "--" in argv: # running inside Blender, which keeps its own arguments before the --
+		argv = argv[argv.index("--")+1:]
+	report = main(argv)
+	sys.exit(0 if report["passed"] else 1)
@@ -14,6 +14,8 @@ bl_info = {
 packageList = (
 				"classes",
 				"utils",
+				"utils_cache",
+				"utils_swizzle",
 				"utils_img",
 				"main_ui",
 				"import_funcs",
@@ -1,3 +1,5 @@
+import numpy
+
 # because just packing/unpacking arrays gets old and error-prone
 
 def ensure_type(var,intended):
@@ -354,196 +356,121 @@ class MonadoForgeMaterial:
 		ensure_type(value,int)
 		self._uvLayerCount = value
 
-class MonadoForgeVertex:
-	def __init__(self,i):
-		self._indexes = [i]
-		self._position = [0,0,0] # having position ever be None seems to cause Problems
-		self._loops = {} # keyed by face index
-		self._weightSetIndex = -1 # pre-bake
-		self._weights = {} # post-bake (must also be by index rather than name since we don't necessarily know names)
-		self._normals = {}
-		self._colours = {} # in 255 format
-		self._uvs = {}
-		self._outlines = {} # same as colours, but split for usefulness
+# a whole table of vertices, kept as one array per attribute (row i of each being vertex i) rather than one object per vertex
+# the vertex count is fixed at creation, and everything set afterwards has to match it
+class MonadoForgeVertexTable:
+	def __init__(self,count=0):
+		ensure_type(count,int)
+		self._positions = numpy.zeros([count,3],dtype=numpy.float32) # having position ever be None seems to cause Problems
+		self._weightSetIndexes = numpy.full(count,-1,dtype=numpy.int32) # pre-bake, -1 for none
+		self._normals = None
+		self._colours = {} # by layer, in 255 format
+		self._uvs = {} # by layer
+		self._outlines = None # same as colours, but split for usefulness
+		self._mergedIndexes = numpy.arange(count) # for each vertex, the index of the vertex it's a double of (itself if none)
 	
-	@property
-	def index(self):
-		return self._indexes[0] # returns only the "primary" index
-	# no setter
-	
-	@property
-	def position(self):
-		return self._position
-	@position.setter
-	def position(self,value):
-		ensure_length(value,3)
-		self._position = value[:]
-	def clearPosition(self):
-		self._position = [0,0,0]
+	def __len__(self):
+		return len(self._positions)
 	
 	@property
-	def weightSetIndex(self):
-		return self._weightSetIndex
-	@weightSetIndex.setter
-	def weightSetIndex(self,value):
-		ensure_type(value,int)
-		self._weightSetIndex = value
-	def clearWeightSetIndex(self):
-		self._weightSetIndex = -1
-	@property
-	def hasWeightIndex(self):
-		return self._weightSetIndex != -1
-	# no setter
+	def positions(self):
+		return self._positions
+	@positions.setter
+	def positions(self,value):
+		self._positions = self._ensureColumn(value,numpy.float32,3)
 	
 	@property
-	def weights(self):
-		return self._weights
-	# no @setter (requires group index)
-	def setWeight(self,groupIndex,weight):
-		ensure_type(weight,float)
-		self._weights[groupIndex] = weight
-	def clearWeights(self):
-		self._weights = {}
+	def weightSetIndexes(self):
+		return self._weightSetIndexes
+	@weightSetIndexes.setter
+	def weightSetIndexes(self,value):
+		self._weightSetIndexes = self._ensureColumn(value,numpy.int32)
+	def clearWeightSetIndexes(self):
+		self._weightSetIndexes = numpy.full(len(self),-1,dtype=numpy.int32)
 	@property
-	def hasWeights(self):
-		return self._weights != {}
+	def hasWeightIndexes(self):
+		return bool((self._weightSetIndexes != -1).any())
 	# no setter
 	
 	@property
 	def normals(self):
 		return self._normals
-	# no @setter (requires index)
-	def setNormal(self,index,normal):
-		ensure_length(normal,3)
-		self._normals[index] = normal[:]
+	@normals.setter
+	def normals(self,value):
+		self._normals = self._ensureColumn(value,numpy.float32,3)
 	def clearNormals(self):
-		self._normals = {}
+		self._normals = None
 	@property
 	def hasNormals(self):
-		return self._normals != {}
+		return self._normals is not None
 	# no setter
 	
 	@property
 	def colours(self):
 		return self._colours
-	# no @setter (requires index and layer)
-	def setColour(self,index,layer,colour):
-		ensure_length(colour,4) # Blender really pushes alpha for everything
-		if index not in self._colours.keys():
-			self._colours[index] = {}
-		self._colours[index][layer] = colour[:]
+	# no @setter (requires layer)
+	def setColours(self,layer,colours):
+		self._colours[layer] = self._ensureColumn(colours,numpy.uint8,4) # Blender really pushes alpha for everything
 	def clearColours(self):
 		self._colours = {}
 	@property
 	def hasColours(self):
 		return self._colours != {}
 	# no setter
-	def getColourLayerIndexes(self,index):
-		return list(self._colours[index].keys())
 	
 	@property
 	def uvs(self):
 		return self._uvs
-	# no @setter (requires index and layer)
-	def setUV(self,index,layer,uv):
-		ensure_length(uv,2)
-		if index not in self._uvs.keys():
-			self._uvs[index] = {}
-		self._uvs[index][layer] = uv[:]
+	# no @setter (requires layer)
+	def setUVs(self,layer,uvs):
+		self._uvs[layer] = self._ensureColumn(uvs,numpy.float32,2)
 	def clearUVs(self):
 		self._uvs = {}
 	@property
 	def hasUVs(self):
 		return self._uvs != {}
 	# no setter
-	def getUVLayerIndexes(self,index):
-		return list(self._uvs[index].keys())
 	
 	@property
 	def outlines(self):
 		return self._outlines
-	# no @setter (requires index)
-	def setOutline(self,index,colour):
-		ensure_length(colour,4) # Blender really pushes alpha for everything
-		self._outlines[index] = colour[:]
+	@outlines.setter
+	def outlines(self,value):
+		self._outlines = self._ensureColumn(value,numpy.uint8,4) # Blender really pushes alpha for everything
 	def clearOutlines(self):
-		self._outlines = {}
+		self._outlines = None
 	@property
 	def hasOutlines(self):
-		return self._outlines != {}
+		return self._outlines is not None
 	# no setter
 	
-	def isDouble(self,other,compareNormals=True):
-		if self == other:
-			return True
-		if self._position != other._position:
-			return False
-		if self._weightSetIndex != other._weightSetIndex:
-			return False
-		if self._weights != other._weights:
-			return False
-		# we only compare one of the normals (the primary index's) because
-		# if a vertex has been merged previously, we already know its normals are all the same
-		if compareNormals and (self.hasNormals and other.hasNormals) and self._normals[self.index] != other._normals[other.index]:
-			return False
-		# unlike normals, there is no logical use case for "I don't want to merge vertices if their colours or UVs are different"
-		# (or at least I can't think of one)
-		# so don't offer an option, and don't compare them at all
-		return True
-	
-	# checks if a merge is valid, and if so, self takes on other's indexes and values
-	def tryMerge(self,other,mergeSharp=False):
-		if self == other:
-			return False
-		if self.index == other.index: # something is very wrong, do not continue
-			raise ValueError("we have somehow tried to merge two different vertices that share the index "+str(self.index))
-		if not self.isDouble(other, compareNormals = not mergeSharp):
-			return False
-		self._indexes += other._indexes
-		self._normals |= other._normals # since indexes cannot be the same, these are "safe" (no collisions)
-		self._colours |= other._colours
-		self._uvs |= other._uvs
-		self._outlines |= other._outlines
-		return True
-
-class MonadoForgeVertexList:
-	def __init__(self):
-		self._vertices = {} # by index
-		self._hashedByPos = {} # by position tuple (not really "hashed", but rather "hashable")
-	
-	def __getitem__(self,index):
-		return self._vertices[index]
-	def __len__(self):
-		return len(self._vertices)
-	def __iter__(self):
-		return iter(self._vertices.items())
-	
 	@property
-	def vertices(self):
-		return self._vertices
-	# no setter
-	def addVertex(self,index,vertex,automerge=False,mergeSharp=False):
-		ensure_type(index,int)
-		if index in self._vertices.keys(): # a sign of a problem
-			raise ValueError("this MonadoForgeVertexList already contains a vertex of index "+str(index))
-		ensure_type(vertex,MonadoForgeVertex)
-		tupPos = tuple(vertex.position)
-		if tupPos not in self._hashedByPos.keys():
-			self._hashedByPos[tupPos] = []
-		if automerge:
-			succeeded = False
-			for otherIndex in self._hashedByPos[tupPos]:
-				other = self[otherIndex]
-				succeeded = other.tryMerge(vertex,mergeSharp=mergeSharp)
-				if succeeded:
-					self._vertices[index] = other # this index now belongs to the existing vertex, not the provided one
-					break
-			if not succeeded:
-				self._vertices[index] = vertex
-		else: # no automerge
-			self._vertices[index] = vertex
-		self._hashedByPos[tupPos].append(index) # has to be this late or it'll try to compare with itself up there
+	def mergedIndexes(self):
+		return self._mergedIndexes
+	# no setter (see mergeDoubles)
+	
+	# anything array-like, as an array of one row per vertex (and the given row width, if any)
+	def _ensureColumn(self,value,dtype,width=None):
+		value = numpy.asarray(value,dtype=dtype)
+		shape = (len(self),) if width is None else (len(self),width)
+		if value.shape != shape:
+			raise ValueError("expected an array of shape "+str(shape)+", not "+str(value.shape))
+		return value
+	
+	# points every vertex at the first vertex that's a double of it: same position, weight set, and normal (unless merging sharp edges)
+	# unlike normals, there is no logical use case for "I don't want to merge vertices if their colours or UVs are different"
+	# (or at least I can't think of one)
+	# so don't offer an option, and don't compare them at all
+	def mergeDoubles(self,mergeSharp=False):
+		# compared as raw bits, so the +0.0 is needed to make -0.0 and 0.0 count as the same
+		keyColumns = [(self._positions+numpy.float32(0.0)).view(numpy.uint32),self._weightSetIndexes.view(numpy.uint32)[:,None]]
+		if not mergeSharp and self.hasNormals:
+			keyColumns.append((self._normals+numpy.float32(0.0)).view(numpy.uint32))
+		# return_index gives the first occurrence of each key, since it's done with a stable sort
+		unique,firsts,inverse = numpy.unique(numpy.concatenate(keyColumns,axis=1),axis=0,return_index=True,return_inverse=True)
+		self._mergedIndexes = firsts[inverse.reshape(-1)]
 
+# faces are normally kept in bulk as an (N,3) array of vertex indexes (see MonadoForgeMesh), this is for one-offs
 class MonadoForgeFace:
 	def __init__(self,i):
 		self._index = i
@@ -572,7 +499,9 @@ class MonadoForgeFace:
 class MonadoForgeMeshShape:
 	def __init__(self):
 		self._vertexTableIndex = 0
-		self._vertices = {} # indexes are not necessarily in order or sequential, so must be a dict (by index) rather than a plain list
+		self._indexes = numpy.zeros(0,dtype=numpy.int64) # not necessarily in order or sequential
+		self._positions = numpy.zeros([0,3],dtype=numpy.float32) # offsets from the base, one row per index
+		self._normals = None
 		self._name = ""
 	
 	@property
@@ -584,14 +513,29 @@ class MonadoForgeMeshShape:
 		self._vertexTableIndex = value
 	
 	@property
-	def vertices(self):
-		return self._vertices
-	# no @setter (requires table index)
-	def setVertex(self,i,v):
-		ensure_type(v,MonadoForgeVertex)
-		self._vertices[i] = v
+	def indexes(self):
+		return self._indexes
+	@property
+	def positions(self):
+		return self._positions
+	@property
+	def normals(self):
+		return self._normals
+	# no setters (all have to be set together)
+	def setVertices(self,indexes,positions,normals=None):
+		indexes = numpy.asarray(indexes,dtype=numpy.int64)
+		positions = numpy.asarray(positions,dtype=numpy.float32)
+		if positions.shape != (len(indexes),3):
+			raise ValueError("expected positions of shape "+str((len(indexes),3))+", not "+str(positions.shape))
+		if normals is not None:
+			normals = numpy.asarray(normals,dtype=numpy.float32)
+			if normals.shape != positions.shape:
+				raise ValueError("expected normals of shape "+str(positions.shape)+", not "+str(normals.shape))
+		self._indexes = indexes
+		self._positions = positions
+		self._normals = normals
 	def clearVertices(self):
-		self._vertices = {}
+		self.setVertices(numpy.zeros(0,dtype=numpy.int64),numpy.zeros([0,3],dtype=numpy.float32))
 	
 	@property
 	def name(self):
@@ -604,8 +548,8 @@ class MonadoForgeMeshShape:
 class MonadoForgeMesh:
 	def __init__(self):
 		self._name = ""
-		self._vertices = MonadoForgeVertexList()
-		self._faces = []
+		self._vertices = MonadoForgeVertexTable() # can be shared between meshes
+		self._faces = numpy.zeros([0,3],dtype=numpy.uint32) # triangles only, as rows of vertex indexes
 		self._weightSets = [] # because it can be convenient to hold these here and have vertexes just refer with index
 		self._shapes = [] # list of MonadoForgeMeshShapes
 		self._materialIndex = -1
@@ -623,17 +567,10 @@ class MonadoForgeMesh:
 		return self._vertices
 	@vertices.setter
 	def vertices(self,value):
-		self.clearVertices()
-		if isinstance(value,MonadoForgeVertexList):
-			self._vertices = value
-		else:
-			for v in value:
-				self.addVertex(v)
+		ensure_type(value,MonadoForgeVertexTable)
+		self._vertices = value
 	def clearVertices(self):
-		self._vertices = MonadoForgeVertexList()
-	def addVertex(self,v):
-		ensure_type(v,MonadoForgeVertex)
-		self._vertices.append(v)
+		self._vertices = MonadoForgeVertexTable()
 	
 	@property
 	def faces(self):
@@ -641,13 +578,19 @@ class MonadoForgeMesh:
 	@faces.setter
 	def faces(self,value):
 		self.clearFaces()
-		for f in value:
-			self.addFace(f)
+		if isinstance(value,numpy.ndarray): # the normal way: already an array, so keep it as-is (no copy)
+			if value.ndim != 2 or value.shape[1] != 3:
+				raise ValueError("faces array must be of shape (N,3), not "+str(value.shape))
+			self._faces = value
+		else:
+			for f in value:
+				self.addFace(f)
 	def clearFaces(self):
-		self._faces = []
+		self._faces = numpy.zeros([0,3],dtype=numpy.uint32)
 	def addFace(self,f):
 		ensure_type(f,MonadoForgeFace)
-		self._faces.append(f)
+		ensure_length(f.vertexIndexes,3)
+		self._faces = numpy.append(self._faces,[f.vertexIndexes],axis=0)
 	
 	@property
 	def weightSets(self):
@@ -685,96 +628,51 @@ class MonadoForgeMesh:
 		ensure_type(value,int)
 		self._materialIndex = value
 	
-	# assumption: if a single vertex has any of these, all the other vertices must also
-	# too potentially expensive to be reasonable @properties
 	def hasWeightIndexes(self):
-		for i,v in self._vertices:
-			if v.hasWeightIndex: return True
-		return False
-	def hasWeights(self):
-		for i,v in self._vertices:
-			if v.hasWeights: return True
-		return False
+		return self._vertices.hasWeightIndexes
 	def hasNormals(self):
-		for i,v in self._vertices:
-			if v.hasNormals: return True
-		return False
+		return self._vertices.hasNormals
 	def hasColours(self):
-		for i,v in self._vertices:
-			if v.hasColours: return True
-		return False
+		return self._vertices.hasColours
 	def hasUVs(self):
-		for i,v in self._vertices:
-			if v.hasUVs: return True
-		return False
+		return self._vertices.hasUVs
 	def hasOutlines(self):
-		for i,v in self._vertices:
-			if v.hasOutlines: return True
-		return False
+		return self._vertices.hasOutlines
 	def hasShapes(self):
 		return len(self._shapes) > 0
 	
+	# all of these return arrays with one row per vertex (including any that were merged away, so the indexes still line up)
 	def getVertexPositionsList(self):
-		return [v.position for i,v in self._vertices]
+		return self._vertices.positions
 	def getVertexWeightIndexesList(self):
-		return [v.weightSetIndex for i,v in self._vertices]
-	def getVertexWeightsList(self):
-		return [v.weights for i,v in self._vertices]
-	def getVertexesInWeightGroup(self,groupID):
-		return [v for i,v in self._vertices if groupID in v.weights.keys()]
+		return self._vertices.weightSetIndexes
+	# only the vertices that doubles were merged into, since those are the only ones faces end up using
 	def getVertexesWithWeightIndex(self,index):
-		return [v for i,v in self._vertices if v.weightSetIndex == index]
+		return numpy.flatnonzero((self._vertices.weightSetIndexes == index) & (self._vertices.mergedIndexes == numpy.arange(len(self._vertices))))
 	def getVertexNormalsList(self):
-		return [v.normal for i,v in self._vertices]
+		return self._vertices.normals
 	def getColourLayerList(self):
-		layers = []
-		for i,v in self._vertices:
-			layers += [k for k in v.colours.keys()]
-		return list(set(layers))
+		return list(self._vertices.colours.keys())
 	def getVertexColoursLayer(self,layer):
-		return [v.colours[layer] for i,v in self._vertices]
+		return self._vertices.colours[layer]
 	def getUVLayerList(self):
-		layers = []
-		for i,v in self._vertices:
-			layers += [k for k in v.uvs.keys()]
-		return list(set(layers))
+		return list(self._vertices.uvs.keys())
 	def getVertexUVsLayer(self,layer):
-		return [v.uvs[layer] for i,v in self._vertices]
+		return self._vertices.uvs[layer]
 	
 	def getFaceVertexIndexesList(self):
 		# this is where each face can finally ask its vertices "should I use a different index to avoid doubling"
-		return [[self._vertices[i].index for i in f.vertexIndexes] for f in self._faces]
+		return self._vertices.mergedIndexes[self._faces]
 	
+	# the loops are just the faces' vertex indexes in order (before merging, so each loop keeps its own vertex's values)
 	def getLoopNormalsList(self):
-		normalsList = []
-		for f in self._faces:
-			for i in f.vertexIndexes:
-				normalsList.append(self._vertices[i].normals[i])
-		return normalsList
+		return self._vertices.normals[self._faces.ravel()]
 	def getLoopColoursList(self):
-		coloursList = {}
-		for f in self._faces:
-			for i in f.vertexIndexes:
-				for layer in self._vertices[i].getColourLayerIndexes(i):
-					if layer not in coloursList:
-						coloursList[layer] = []
-					coloursList[layer].append(self._vertices[i].colours[i][layer])
-		return coloursList
+		return {layer:colours[self._faces.ravel()] for layer,colours in self._vertices.colours.items()}
 	def getLoopUVsList(self):
-		uvsList = {}
-		for f in self._faces:
-			for i in f.vertexIndexes:
-				for layer in self._vertices[i].getUVLayerIndexes(i):
-					if layer not in uvsList:
-						uvsList[layer] = []
-					uvsList[layer].append(self._vertices[i].uvs[i][layer])
-		return uvsList
+		return {layer:uvs[self._faces.ravel()] for layer,uvs in self._vertices.uvs.items()}
 	def getLoopOutlinesList(self):
-		outlinesList = []
-		for f in self._faces:
-			for i in f.vertexIndexes:
-				outlinesList.append(self._vertices[i].outlines[i])
-		return outlinesList
+		return self._vertices.outlines[self._faces.ravel()]
 
 class MonadoForgeMeshHeader:
 	# intended to be immutable, so no setters
@@ -2,6 +2,7 @@ import bpy
 import io
 import math
 import mathutils
+import numpy
 import os
 
 from . classes import *
@@ -923,9 +924,9 @@ def realise_results(forgeResults, mainName, self, context):
 		newMatsByIndex[mat.index] = newMat
 	
 	meshes = forgeResults.meshes
+	meshProgress = ProgressReporter(context,"Mesh creation",len(meshes),printProgress)
 	for m,mesh in enumerate(meshes):
-		if printProgress:
-			print_progress_bar(m,len(meshes),"Mesh creation")
+		meshProgress.update(m)
 		bpy.ops.object.add(type="MESH", enter_editmode=False, align="WORLD", location=(0,0,0), rotation=(0,0,0), scale=(1,1,1))
 		newMeshObject = bpy.context.view_layer.objects.active
 		if mesh.name:
@@ -935,17 +936,24 @@ def realise_results(forgeResults, mainName, self, context):
 		meshData = newMeshObject.data
 		meshData.name = "Mesh"
 		vertCount = len(mesh.vertices)
-		meshData.from_pydata(mesh.getVertexPositionsList(),[],mesh.getFaceVertexIndexesList())
-		for f in meshData.polygons:
-			f.use_smooth = True
+		positions = mesh.getVertexPositionsList()
+		faceVertexIndexes = mesh.getFaceVertexIndexesList()
+		# the same steps as Mesh.from_pydata(), but straight from the arrays rather than going through Python lists
+		meshData.vertices.add(len(positions))
+		meshData.loops.add(faceVertexIndexes.size)
+		meshData.polygons.add(len(faceVertexIndexes))
+		meshData.vertices.foreach_set("co",positions.ravel())
+		meshData.polygons.foreach_set("loop_start",numpy.arange(0,faceVertexIndexes.size,3,dtype=numpy.int32))
+		meshData.polygons.foreach_set("vertices",faceVertexIndexes.astype(numpy.int32).ravel())
+		if len(faceVertexIndexes) > 0:
+			meshData.update(calc_edges=True)
+		meshData.polygons.foreach_set("use_smooth",numpy.ones(len(faceVertexIndexes),dtype=bool))
 		if bpy.app.version < (4,1,0): # 4.1 removed this and made it the default (kind of)
 			meshData.use_auto_smooth = True
 		if mesh.hasWeightIndexes() and baseArmature: # try the indexes method first (faster) (and also needs a baseArmature or it makes no sense)
-			weightIndexes = set(mesh.getVertexWeightIndexesList())
-			vertexesInEachGroup = {}
+			weightIndexes = numpy.unique(mesh.getVertexWeightIndexesList()).tolist()
 			for i in range(len(baseArmature.data.bones)):
 				newMeshObject.vertex_groups.new(name=baseArmature.data.bones[i].name)
-				vertexesInEachGroup[i] = mesh.getVertexesInWeightGroup(i)
 			vertexesInEachSet = {}
 			for i in weightIndexes:
 				vertexesInEachSet[i] = mesh.getVertexesWithWeightIndex(i)
@@ -957,11 +965,8 @@ def realise_results(forgeResults, mainName, self, context):
 					groupValue = weightSetData[1][j]
 					if groupValue == 0: continue
 					vertexGroup = newMeshObject.vertex_groups[groupIndex]
-					vertexesToAdd = vertexesInEachSet[weightIndex]
-					vertexIDsToAdd = [v.index for v in vertexesToAdd]
+					vertexIDsToAdd = vertexesInEachSet[weightIndex].tolist()
 					newMeshObject.vertex_groups[groupIndex].add(vertexIDsToAdd,groupValue,"ADD")
-		elif mesh.hasWeights(): # no indexes, but do have directly-applied weights
-			pass # not needed at the present time
 		if mesh.hasNormals():
 			normalsList = mesh.getLoopNormalsList()
 			meshData.normals_split_custom_set(normalsList)
@@ -971,26 +976,30 @@ def realise_results(forgeResults, mainName, self, context):
 			meshColours = mesh.getLoopColoursList()
 			for layer,colours in meshColours.items():
 				newColoursLayer = meshData.color_attributes.new("VertexColours"+str(layer+1),"FLOAT_COLOR","CORNER") # BYTE_COLOR *should* be correct, but in practice it isn't
-				for loop in meshData.loops:
-					newColoursLayer.data[loop.index].color = [toBlenderColour_255(c) for c in colours[loop.index]]
+				newColoursLayer.data.foreach_set("color",blenderColours_255[colours].ravel())
 		if mesh.hasUVs():
 			meshUVs = mesh.getLoopUVsList()
 			for layer,uvs in meshUVs.items():
 				newUVsLayer = meshData.uv_layers.new(name="UV"+str(layer+1))
-				for loop in meshData.loops:
-					newUVsLayer.data[loop.index].uv = uvs[loop.index]
+				newUVsLayer.data.foreach_set("uv",uvs.ravel())
 		if mesh.hasOutlines():
 			meshOutlines = mesh.getLoopOutlinesList()
 			# since vertex alpha is not a logical place for Blender to look for outline thickness,
 			# we move it to a new vertex group instead
 			newColoursLayer = meshData.color_attributes.new("OutlineColours","FLOAT_COLOR","CORNER") # BYTE_COLOR *should* be correct, but in practice it isn't
 			thicknessGroup = newMeshObject.vertex_groups.new(name="OutlineThickness")
-			for loop in meshData.loops:
-				thickness = meshOutlines[loop.index][3]/255.0
-				thisColour = [toBlenderColour_255(c) for c in meshOutlines[loop.index]]
-				thisColour[3] = 1.0 # cancel using alpha for thickness
-				newColoursLayer.data[loop.index].color = thisColour
-				thicknessGroup.add([loop.vertex_index],thickness,"REPLACE") # hopefully we don't end up with a vertex that requires multiple different thicknesses...
+			outlineColours = blenderColours_255[meshOutlines]
+			outlineColours[:,3] = 1.0 # cancel using alpha for thickness
+			newColoursLayer.data.foreach_set("color",outlineColours.ravel())
+			# hopefully we don't end up with a vertex that requires multiple different thicknesses...
+			# but if we do, the last loop using it wins
+			loopVertexIndexes = faceVertexIndexes.ravel()
+			lastLoops = numpy.full(len(positions),-1,dtype=numpy.int64)
+			numpy.maximum.at(lastLoops,loopVertexIndexes,numpy.arange(len(loopVertexIndexes)))
+			usedVertexIndexes = numpy.flatnonzero(lastLoops != -1)
+			thicknesses = meshOutlines[lastLoops[usedVertexIndexes],3]
+			for thickness in numpy.unique(thicknesses).tolist():
+				thicknessGroup.add(usedVertexIndexes[thicknesses == thickness].tolist(),thickness/255.0,"REPLACE")
 			outlineMod = newMeshObject.modifiers.new(name="Outline",type="SOLIDIFY")
 			outlineMod.use_rim = False
 			outlineMod.use_flip_normals = True
@@ -1006,8 +1015,11 @@ def realise_results(forgeResults, mainName, self, context):
 			meshData.shape_keys.use_relative = True
 			for s in shapes:
 				newShape = newMeshObject.shape_key_add(name=s.name,from_mix=False)
-				for vertexIndex,vertex in s.vertices.items():
-					newShape.data[vertexIndex].co += mathutils.Vector(vertex.position)
+				shapePositions = numpy.empty(len(newShape.data)*3,dtype=numpy.float32)
+				newShape.data.foreach_get("co",shapePositions)
+				shapePositions = shapePositions.reshape(-1,3)
+				numpy.add.at(shapePositions,s.indexes,s.positions)
+				newShape.data.foreach_set("co",shapePositions.ravel())
 		if materials and not context.scene.monado_forge_import.skipMaterialImport and mesh.materialIndex != -1:
 			meshData.materials.append(newMatsByIndex[mesh.materialIndex])
 		
@@ -1026,8 +1038,7 @@ def realise_results(forgeResults, mainName, self, context):
 		armatureMod.object = baseArmature
 		newMeshObject.parent = baseArmature
 		# end of per-mesh loop
-	if printProgress:
-		print_progress_bar(len(meshes),len(meshes),"Mesh creation")
+	meshProgress.finish()
 	# and finally, if there is an external armature, merge the base one into it
 	if externalArmature:
 		bpy.ops.object.select_all(action="DESELECT")
@@ -2,10 +2,12 @@ import bpy
 import io
 import math
 import mathutils
+import numpy
 import os
 
 from . classes import *
 from . utils import *
+from . utils_cache import *
 from . utils_img import *
 from . import_funcs import *
 from . modify_funcs import *
@@ -15,101 +17,86 @@ from . modify_funcs import *
 # https://avsys.xyz/wiki/BRRES_(File_Format)
 # the raw C++-masquerading-as-C# code of BrawlBox v0.66 (why else would it all be pointers >:( )
 
-def read_brres_str(f,pointer,offset,debug=False):
-	crumb = f.tell()
-	f.seek(offset+pointer - 4) # have to "back up" 4 to get the length (could just do a till-null read, but this is safer)
-	if debug: print(f.tell())
-	length = readAndParseIntBig(f,4)
+# fixed-size record layouts (see RecordSchema)
+mdl0BoneSchema = RecordSchema([
+								["size","u4"],["parentSubfileOffset","i4"],["nameOffset","u4"],["index","u4"],["linkID","u4"],
+								["flags","u4"],["billboardFormat","u4"],["billboardReference","u4"],
+								["scale","f4",3],["rotation","f4",3],["position","f4",3],["boundingBoxMin","f4",3],["boundingBoxMax","f4",3],
+								["parentOffset","i4"],["firstChildOffset","i4"],["nextSiblingOffset","i4"],["prevSiblingOffset","i4"],["userDataOffset","i4"],
+								["matrix","f4",12], # there's an inverse matrix after this, but it's definitely not needed
+								])
+rgba6Layout = BitLayout([6,6,6,6])
+xf1008Layout = BitLayout([24,4,2,2]) # unused, texCrdNum, nrmNum, colNum
+
+def read_brres_str(r,pointer,offset):
+	# have to "back up" 4 to get the length (could just do a till-null read, but this is safer)
+	length = r.u32(offset+pointer-4)
 	if length > 0xffff: # sanity check
 		print_error("tried to read a string from a bad place: file position "+str(offset+pointer))
-		f.seek(crumb)
 		return "(bad string "+str(offset+pointer)+")"
-	s = readFixedLenStr(f,length)
-	f.seek(crumb)
-	return s
+	return r.stringPool().sized(offset+pointer,length)
 
 # output: a dict of name : offset (absolute)
-def parse_brres_dict(f,prefix=""):
-	headerCrumb = f.tell()
-	dictSize = readAndParseIntBig(f,4) # includes this header
-	dictCount = readAndParseIntBig(f,4)
+def parse_brres_dict(r,offset,prefix=""):
+	dictSize,dictCount = r.unpack("2L",offset)
 	d = {}
-	for i in range(dictCount+1): # the +1 is because there's always an extra reference entry to begin with
-		id = readAndParseIntBig(f,2)
-		unk1 = readAndParseIntBig(f,2)
-		leftIndex = readAndParseIntBig(f,2)
-		rightIndex = readAndParseIntBig(f,2)
-		namePointer = readAndParseIntBig(f,4)
-		dataPointer = readAndParseIntBig(f,4)
-		
-		# current belief is that the ID and L/R indexes aren't needed for our purposes
-		
+	# the +1 is because there's always an extra reference entry to begin with
+	# current belief is that the ID and L/R indexes aren't needed for our purposes
+	for id,unk1,leftIndex,rightIndex,namePointer,dataPointer in r.unpackArray("4H2L",offset+8,dictCount+1):
 		name = None
 		dataPos = None
 		if namePointer > 0:
-			name = read_brres_str(f,namePointer,headerCrumb)
+			name = read_brres_str(r,namePointer,offset)
 		if dataPointer > 0:
-			dataPos = dataPointer + headerCrumb
+			dataPos = dataPointer + offset
 		if name and dataPos:
 			d[prefix+name] = dataPos
-	actualSize = f.tell() - headerCrumb
+	actualSize = 8+(dictCount+1)*16
 	if actualSize != dictSize:
-		print_warning("dict at "+str(headerCrumb)+" has malformed size: expected "+str(dictSize)+", got "+str(actualSize))
+		print_warning("dict at "+str(offset)+" has malformed size: expected "+str(dictSize)+", got "+str(actualSize))
 	return d
 
-def parse_mdl0(f, context, subfileOffset):
+# moves each vector (a row of the table) by its bone's matrix
+# done with mathutils once per distinct bone/row pair, rather than with NumPy, so the results are exactly what they'd be done one at a time
+def transform_by_bones(table,tableIndexes,boneIndexes,matrixes):
+	pairs,inverse = numpy.unique(numpy.stack([boneIndexes,tableIndexes],axis=1).reshape(-1,2),axis=0,return_inverse=True)
+	transformed = [(matrixes[b] @ mathutils.Vector(table[i].tolist()))[:] for b,i in pairs.tolist()]
+	return numpy.array(transformed,dtype=numpy.float32).reshape(-1,3)[inverse.reshape(-1)]
+
+def parse_mdl0(r, context, subfileOffset):
 	printProgress = context.scene.monado_forge_main.printProgress
 	mergeSharpEdges = context.scene.monado_forge_import.mergeSharpEdges
 	
-	subfileLength = readAndParseIntBig(f,4)
-	subfileVersion = readAndParseIntBig(f,4)
-	subfileParentOffset = readAndParseIntBig(f,4,signed=True)
-	definitionsOffset = readAndParseIntBig(f,4)
-	bonesOffset = readAndParseIntBig(f,4)
-	positionsOffset = readAndParseIntBig(f,4)
-	normalsOffset = readAndParseIntBig(f,4)
-	coloursOffset = readAndParseIntBig(f,4)
-	uvsOffset = readAndParseIntBig(f,4)
+	subfileLength,subfileVersion,subfileParentOffset = r.unpack("2Ll",subfileOffset+4)
+	pos = subfileOffset+16
+	definitionsOffset,bonesOffset,positionsOffset,normalsOffset,coloursOffset,uvsOffset = r.unpack("6L",pos)
+	pos += 6*4
 	if subfileVersion >= 10:
-		furVectorsOffset = readAndParseIntBig(f,4)
-		furLayersOffset = readAndParseIntBig(f,4)
-	materialsOffset = readAndParseIntBig(f,4)
-	tevsOffset = readAndParseIntBig(f,4)
-	meshesOffset = readAndParseIntBig(f,4)
-	textureLinksOffset = readAndParseIntBig(f,4)
-	paletteLinksOffset = readAndParseIntBig(f,4)
+		furVectorsOffset,furLayersOffset = r.unpack("2L",pos)
+		pos += 2*4
+	materialsOffset,tevsOffset,meshesOffset,textureLinksOffset,paletteLinksOffset = r.unpack("5L",pos)
+	pos += 5*4
 	if subfileVersion >= 11:
-		userDataOffset = readAndParseIntBig(f,4)
-	nameOffset = readAndParseIntBig(f,4)
-	name = read_brres_str(f,nameOffset,subfileOffset)
+		userDataOffset = r.u32(pos)
+		pos += 4
+	nameOffset = r.u32(pos)
+	pos += 4
+	name = read_brres_str(r,nameOffset,subfileOffset)
 	
-	modelHeaderCrumb = f.tell()
-	modelHeaderSize = readAndParseIntBig(f,4)
+	modelHeaderCrumb = pos
+	modelHeaderSize,modelHeaderOffset,scalingMode,textureMatrixMode,vertexCount,faceCount,pathOffset,boneCount = r.unpack("Ll6L",modelHeaderCrumb)
 	if modelHeaderSize != 0x40:
 		print_warning(name+" doesn't have a modelHeaderSize of 0x40 (undefined behaviour)")
-	modelHeaderOffset = readAndParseIntBig(f,4,signed=True)
-	scalingMode = readAndParseIntBig(f,4)
-	textureMatrixMode = readAndParseIntBig(f,4)
-	vertexCount = readAndParseIntBig(f,4)
-	faceCount = readAndParseIntBig(f,4)
-	pathOffset = readAndParseIntBig(f,4)
-	boneCount = readAndParseIntBig(f,4)
-	useNormalMatrixArray = readAndParseIntBig(f,1)
-	useTextureMatrixArray = readAndParseIntBig(f,1)
-	useExtents = readAndParseIntBig(f,1)
-	envelopeMatrixMode = readAndParseIntBig(f,1)
-	weightLinkTableOffset = readAndParseIntBig(f,4)
-	boundingBoxMin = [readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)]
-	boundingBoxMax = [readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)]
+	useNormalMatrixArray,useTextureMatrixArray,useExtents,envelopeMatrixMode,weightLinkTableOffset = r.unpack("4BL",modelHeaderCrumb+32)
+	boundingBoxMin = r.unpack("3f",modelHeaderCrumb+40)
+	boundingBoxMax = r.unpack("3f",modelHeaderCrumb+52)
 	
 	# many things use this instead of "raw" bone IDs
 	# the general order is: single-bone weights, multi-bone weights (always -1), non-geometry bone IDs
 	weightLinkTable = []
 	if weightLinkTableOffset > 0:
-		f.seek(weightLinkTableOffset+modelHeaderCrumb)
-		weightLinkCount = readAndParseIntBig(f,4)
-		for bl in range(weightLinkCount):
-			weightLinkTable.append(readAndParseIntBig(f,4,signed=True))
+		weightLinkCount = r.u32(weightLinkTableOffset+modelHeaderCrumb)
+		weightLinkTable = list(r.unpack(str(weightLinkCount)+"l",weightLinkTableOffset+modelHeaderCrumb+4))
 	
 	# the following will be two lists in one: single-bone weights, and multi-bone weights
 	# it will be flattened into a single weight index list later
@@ -127,29 +114,29 @@ def parse_mdl0(f, context, subfileOffset):
 	defsMultiWeightGroups = {}
 	defsMeshDraw = {}
 	if definitionsOffset > 0:
-		f.seek(definitionsOffset+subfileOffset)
-		defsDict = parse_brres_dict(f)
+		defsDict = parse_brres_dict(r,definitionsOffset+subfileOffset)
 		for d,(defName,defDataOffset) in enumerate(defsDict.items()):
-			f.seek(defDataOffset)
+			pos = defDataOffset
 			# fun with bytecode
 			data = []
 			while True:
-				cmd = readAndParseIntBig(f,1)
+				cmd = r.u8(pos)
+				pos += 1
 				if cmd == 0x00: # no-op
 					pass
 				elif cmd == 0x01: # end signal
 					break
 				elif cmd == 0x02: # "node mapping" (implied to be bone-related but doesn't seem to be necessary)
-					boneIndex = readAndParseIntBig(f,2)
-					parentMatrixIndex = readAndParseIntBig(f,2)
+					boneIndex,parentMatrixIndex = r.unpack("2H",pos)
+					pos += 4
 					data.append([2,[boneIndex,parentMatrixIndex]])
 				elif cmd == 0x03: # weighting
-					weightID = readAndParseIntBig(f,2)
-					weightCount = readAndParseIntBig(f,1)
+					weightID,weightCount = r.unpack("HB",pos)
+					pos += 3
 					weights = []
 					for w in range(weightCount):
-						weightTableID = readAndParseIntBig(f,2)
-						weightValue = readAndParseFloatBig(f)
+						weightTableID,weightValue = r.unpack("Hf",pos)
+						pos += 6
 						weights.append([weightLinkTable[weightTableID],weightValue])
 					# currently the data is in [[i,v],[i,v]] format
 					# this needs to be transposed into [[i,i],[v,v]] format
@@ -157,18 +144,16 @@ def parse_mdl0(f, context, subfileOffset):
 					data.append([3,[weightID,weightCount,weights]])
 					defsMultiWeightGroups[weightID] = weights
 				elif cmd == 0x04: # mesh
-					materialIndex = readAndParseIntBig(f,2)
-					meshIndex = readAndParseIntBig(f,2)
-					boneIndex = readAndParseIntBig(f,2)
-					priority = readAndParseIntBig(f,1)
+					materialIndex,meshIndex,boneIndex,priority = r.unpack("3HB",pos)
+					pos += 7
 					defsMeshDraw[meshIndex] = [materialIndex,boneIndex,priority]
 				elif cmd == 0x05: # "indexing"
-					matrixID = readAndParseIntBig(f,2)
-					weightIndex = readAndParseIntBig(f,2)
+					matrixID,weightIndex = r.unpack("2H",pos)
+					pos += 4
 					data.append([5,[matrixID,weightIndex]])
 				elif cmd == 0x06: # "duplicate matrix"
-					toMatrix = readAndParseIntBig(f,2)
-					fromMatrix = readAndParseIntBig(f,2)
+					toMatrix,fromMatrix = r.unpack("2H",pos)
+					pos += 4
 					data.append([6,[toMatrix,fromMatrix]])
 			#print("defData",data)
 	# we can build the second part of the weights list now
@@ -184,63 +169,34 @@ def parse_mdl0(f, context, subfileOffset):
 	# dunno how to actually use them yet, though
 	textureLinks = {}
 	if textureLinksOffset > 0:
-		f.seek(textureLinksOffset+subfileOffset)
-		texLinkDict = parse_brres_dict(f)
+		texLinkDict = parse_brres_dict(r,textureLinksOffset+subfileOffset)
 		for b,(texLinkName,texLinkDataOffset) in enumerate(texLinkDict.items()):
-			f.seek(texLinkDataOffset)
-			texLinkCount = readAndParseIntBig(f,4)
+			texLinkCount = r.u32(texLinkDataOffset)
 			for tl in range(texLinkCount):
-				textureLinks[texLinkName] = [readAndParseIntBig(f,4),readAndParseIntBig(f,4)]
+				textureLinks[texLinkName] = list(r.unpack("2L",texLinkDataOffset+4+tl*8))
 	
 	paletteLinks = {}
 	if paletteLinksOffset > 0:
-		f.seek(paletteLinksOffset+subfileOffset)
-		palLinkDict = parse_brres_dict(f)
+		palLinkDict = parse_brres_dict(r,paletteLinksOffset+subfileOffset)
 		for b,(palLinkName,palLinkDataOffset) in enumerate(palLinkDict.items()):
-			f.seek(palLinkDataOffset)
-			palLinkCount = readAndParseIntBig(f,4)
+			palLinkCount = r.u32(palLinkDataOffset)
 			for pl in range(palLinkCount):
-				paletteLinks[palLinkName] = [readAndParseIntBig(f,4),readAndParseIntBig(f,4)]
+				paletteLinks[palLinkName] = list(r.unpack("2L",palLinkDataOffset+4+pl*8))
 	
 	boneList = []
 	boneLinkTable = {} # for turning bone indexes into link IDs
 	if bonesOffset > 0:
-		f.seek(bonesOffset+subfileOffset)
-		boneDict = parse_brres_dict(f)
-		for b,(boneName,boneDataOffset) in enumerate(boneDict.items()):
-			f.seek(boneDataOffset)
-			boneSize = readAndParseIntBig(f,4)
-			parentSubfileOffset = readAndParseIntBig(f,4,signed=True)
-			boneNameOffset = readAndParseIntBig(f,4) # shouldn't need, already have name
-			boneIndex = readAndParseIntBig(f,4)
-			boneLinkID = readAndParseIntBig(f,4)
+		boneDict = parse_brres_dict(r,bonesOffset+subfileOffset)
+		boneRecords = r.gather(mdl0BoneSchema,list(boneDict.values()))
+		# the name offset shouldn't be needed, already have the name
+		# the bounding box, sibling/child/user data offsets, and matrix aren't needed, but could come in handy maybe
+		boneColumns = zip(boneDict.items(),*tableColumns(boneRecords,"index","linkID","scale","rotation","position","parentOffset"))
+		for (boneName,boneDataOffset),boneIndex,boneLinkID,boneScale,boneRot,bonePos,boneParentOffset in boneColumns:
 			boneLinkTable[boneIndex] = boneLinkID
-			boneFlags = readAndParseIntBig(f,4)
-			boneBillboardFormat = readAndParseIntBig(f,4)
-			boneBillboardReference = readAndParseIntBig(f,4)
-			boneScale = [readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)]
-			boneRot = [readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)]
-			bonePos = [readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)]
-			boneMin = [readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)]
-			boneMax = [readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)]
-			boneParentOffset = readAndParseIntBig(f,4,signed=True)
-			boneFirstChildOffset = readAndParseIntBig(f,4,signed=True)
-			boneNextSiblingOffset = readAndParseIntBig(f,4,signed=True)
-			bonePrevSiblingOffset = readAndParseIntBig(f,4,signed=True)
-			boneUserDataOffset = readAndParseIntBig(f,4,signed=True)
-			# don't need this, but could come in handy maybe
-			boneMatrix = mathutils.Matrix([
-							[readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)],
-							[readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)],
-							[readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)],
-							[0,0,0,1],
-							])
-			# definitely don't need the inverse matrix
 			if boneParentOffset == 0:
 				parentIndex = -1
 			else: # have to travel to the parent bone and get its index
-				f.seek(boneDataOffset+boneParentOffset+4*3)
-				parentIndex = readAndParseIntBig(f,4)
+				parentIndex = r.u32(boneDataOffset+boneParentOffset+4*3)
 			newBone = MonadoForgeBone(boneIndex)
 			newBone.name = boneName
 			newBone.parent = parentIndex
@@ -253,178 +209,177 @@ def parse_mdl0(f, context, subfileOffset):
 	
 	# now that we have all the bones, we can calculate their global matrixes (they start with just local)
 	globalBoneMatrixes = calculateGlobalBoneMatrixes(boneList)
+	globalNormalMatrixes = {b:m.to_quaternion().to_matrix() for b,m in globalBoneMatrixes.items()} # rotation part only
 	
 	# now that we have the bone info, we can create the whole rest of the weights list
 	multiWeightShiftIndex = len(weightsList[0])
 	fullWeightIndexesList = weightsList[0]+weightsList[1] # no need to call flattened_list, it's simple enough
 	
+	# the int formats shared by positions/normals/uvs: 0 = u8, 1 = i8, 2 = u16, 3 = i16 (4 = float)
+	intFormatCodes = ["B","b","H","h"]
+	
 	# could call these "vertex tables" or just "vertices", doesn't matter too much
 	positions = {}
 	if positionsOffset > 0:
-		f.seek(positionsOffset+subfileOffset)
-		positionsDict = parse_brres_dict(f)
+		positionsDict = parse_brres_dict(r,positionsOffset+subfileOffset)
 		for p,(positionName,positionDataOffset) in enumerate(positionsDict.items()):
-			f.seek(positionDataOffset)
-			positionSize = readAndParseIntBig(f,4)
-			parentSubfileOffset = readAndParseIntBig(f,4,signed=True)
-			dataOffset = readAndParseIntBig(f,4)
-			positionNameOffset = readAndParseIntBig(f,4) # probably not needed, already have a name
-			positionIndex = readAndParseIntBig(f,4)
-			positionDimensionality = readAndParseIntBig(f,4) # 0 = 2D, 1 = 3D
-			positionDataFormat = readAndParseIntBig(f,4) # 0 = u8, 1 = i8, 2 = u16, 3 = i16, 4 = float
-			positionNonFloatDivisor = readAndParseIntBig(f,1) # if not float, divide all positions by (1 << this)
-			positionStrideSize = readAndParseIntBig(f,1) # only needed to keep place given unknowns
-			positionVertexCount = readAndParseIntBig(f,2)
-			positionBoundingBoxMin = [readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)]
-			positionBoundingBoxMax = [readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)]
-			f.seek(dataOffset+positionDataOffset)
+			# positionNameOffset probably not needed, already have a name
+			positionSize,parentSubfileOffset,dataOffset,positionNameOffset,positionIndex,positionDimensionality,positionDataFormat = r.unpack("Ll5L",positionDataOffset)
+			# dimensionality: 0 = 2D, 1 = 3D
+			# format: 0 = u8, 1 = i8, 2 = u16, 3 = i16, 4 = float
+			# non-float divisor: if not float, divide all positions by (1 << this)
+			# stride: only needed to keep place given unknowns
+			positionNonFloatDivisor,positionStrideSize,positionVertexCount = r.unpack("2BH",positionDataOffset+28)
+			positionBoundingBoxMin = r.unpack("3f",positionDataOffset+32)
+			positionBoundingBoxMax = r.unpack("3f",positionDataOffset+44)
+			pos = dataOffset+positionDataOffset
 			positions[positionIndex] = []
+			is3D = positionDimensionality == 1 # will be assigning Z = 0 for 2D positions
+			divisor = 1 << positionNonFloatDivisor
 			for i in range(positionVertexCount):
-				is3D = positionDimensionality == 1 # will be assigning Z = 0 for 2D positions
-				divisor = 1 << positionNonFloatDivisor
 				if positionDataFormat == 4:
-					positions[positionIndex].append([readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f) if is3D else 0.0])
+					if is3D:
+						positions[positionIndex].append(list(r.unpack("3f",pos)))
+						pos += 12
+					else:
+						positions[positionIndex].append(list(r.unpack("2f",pos))+[0.0])
+						pos += 8
 				elif positionDataFormat >= 0 and positionDataFormat <= 3:
 					formatSize = [1,1,2,2][positionDataFormat]
-					formatSigned = [False,True,False,True][positionDataFormat]
-					positions[positionIndex].append([
-														readAndParseIntBig(f,formatSize,signed=formatSigned)/divisor,
-														readAndParseIntBig(f,formatSize,signed=formatSigned)/divisor,
-														readAndParseIntBig(f,formatSize,signed=formatSigned)/divisor if is3D else 0.0,
-													])
+					if is3D:
+						positions[positionIndex].append([x/divisor for x in r.unpack(intFormatCodes[positionDataFormat]*3,pos)])
+						pos += formatSize*3
+					else:
+						positions[positionIndex].append([x/divisor for x in r.unpack(intFormatCodes[positionDataFormat]*2,pos)]+[0.0])
+						pos += formatSize*2
 				else:
 					print_warning("unknown position data format: "+str(positionDataFormat))
 					positions[positionIndex].append([0,0,0]) # need something so indices still line up
-					f.seek(f.tell()+positionStrideSize)
+					pos += positionStrideSize
+			positions[positionIndex] = numpy.array(positions[positionIndex],dtype=numpy.float32).reshape(-1,3)
 	
 	normals = {}
 	if normalsOffset > 0:
-		f.seek(normalsOffset+subfileOffset)
-		normalsDict = parse_brres_dict(f)
+		normalsDict = parse_brres_dict(r,normalsOffset+subfileOffset)
 		for p,(normalName,normalDataOffset) in enumerate(normalsDict.items()):
-			f.seek(normalDataOffset)
-			normalSize = readAndParseIntBig(f,4)
-			parentSubfileOffset = readAndParseIntBig(f,4,signed=True)
-			dataOffset = readAndParseIntBig(f,4)
-			normalNameOffset = readAndParseIntBig(f,4) # probably not needed, already have a name
-			normalIndex = readAndParseIntBig(f,4)
-			normalType = readAndParseIntBig(f,4) # 0 = normal, 1 = normal+binormal+tangent, 2 = normal or binormal or tangent
+			# normalNameOffset probably not needed, already have a name
+			normalSize,parentSubfileOffset,dataOffset,normalNameOffset,normalIndex,normalType,normalDataFormat = r.unpack("Ll5L",normalDataOffset)
+			# type: 0 = normal, 1 = normal+binormal+tangent, 2 = normal or binormal or tangent
 			if normalType != 0:
 				print_warning("normalType is "+str(normalType)+"; this is not currently understood so results may be weird")
-			normalDataFormat = readAndParseIntBig(f,4) # 0 = u8, 1 = i8, 2 = u16, 3 = i16, 4 = float
-			normalNonFloatDivisor = readAndParseIntBig(f,1) # if not float, divide all normals by (1 << this)
-			normalStrideSize = readAndParseIntBig(f,1) # only needed to keep place given unknowns
-			normalCount = readAndParseIntBig(f,2)
-			f.seek(dataOffset+normalDataOffset)
+			# format: 0 = u8, 1 = i8, 2 = u16, 3 = i16, 4 = float
+			# non-float divisor: if not float, divide all normals by (1 << this)
+			# stride: only needed to keep place given unknowns
+			normalNonFloatDivisor,normalStrideSize,normalCount = r.unpack("2BH",normalDataOffset+28)
+			pos = dataOffset+normalDataOffset
 			normals[normalIndex] = []
+			divisor = 1 << normalNonFloatDivisor
 			for i in range(normalCount):
-				divisor = 1 << normalNonFloatDivisor
 				if normalDataFormat == 4:
-					normals[normalIndex].append([readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)])
+					normals[normalIndex].append(list(r.unpack("3f",pos)))
+					pos += 12
 				elif normalDataFormat >= 0 and normalDataFormat <= 3:
 					formatSize = [1,1,2,2][normalDataFormat]
-					formatSigned = [False,True,False,True][normalDataFormat]
-					normals[normalIndex].append([
-													readAndParseIntBig(f,formatSize,signed=formatSigned)/divisor,
-													readAndParseIntBig(f,formatSize,signed=formatSigned)/divisor,
-													readAndParseIntBig(f,formatSize,signed=formatSigned)/divisor,
-												])
+					normals[normalIndex].append([x/divisor for x in r.unpack(intFormatCodes[normalDataFormat]*3,pos)])
+					pos += formatSize*3
 				else:
 					print_warning("unknown normal data format: "+str(normalDataFormat))
 					normals[normalIndex].append([0,0,1]) # need something so indices still line up
-					f.seek(f.tell()+normalStrideSize)
+					pos += normalStrideSize
+			normals[normalIndex] = numpy.array(normals[normalIndex],dtype=numpy.float32).reshape(-1,3)
 	
 	# all colours will be represented with alpha just to make things easier (Blender also prefers it)
+	# the smaller formats are expanded to whole bytes the same way texture colours are
 	colours = {}
 	if coloursOffset > 0:
-		f.seek(coloursOffset+subfileOffset)
-		coloursDict = parse_brres_dict(f)
+		coloursDict = parse_brres_dict(r,coloursOffset+subfileOffset)
 		for c,(colourName,colourDataOffset) in enumerate(coloursDict.items()):
-			f.seek(colourDataOffset)
-			colourSize = readAndParseIntBig(f,4)
-			parentSubfileOffset = readAndParseIntBig(f,4,signed=True)
-			dataOffset = readAndParseIntBig(f,4)
-			colourNameOffset = readAndParseIntBig(f,4) # probably not needed, already have a name
-			colourIndex = readAndParseIntBig(f,4)
-			colourHasAlpha = readAndParseIntBig(f,4) # 0 = RGB, 1 = RGBA
-			colourDataFormat = readAndParseIntBig(f,4) # 0 = RGB565, 1 = RGB8, 2 = RGBX8, 3 = RGBA4, 4 = RGBA6, 5 = RGBA8
-			colourStrideSize = readAndParseIntBig(f,1) # only needed to keep place given unknowns
-			colourPadding = readAndParseIntBig(f,1)
-			colourCount = readAndParseIntBig(f,2)
+			# colourNameOffset probably not needed, already have a name
+			colourSize,parentSubfileOffset,dataOffset,colourNameOffset,colourIndex,colourHasAlpha,colourDataFormat = r.unpack("Ll5L",colourDataOffset)
+			# has alpha: 0 = RGB, 1 = RGBA
+			# format: 0 = RGB565, 1 = RGB8, 2 = RGBX8, 3 = RGBA4, 4 = RGBA6, 5 = RGBA8
+			# stride: only needed to keep place given unknowns
+			colourStrideSize,colourPadding,colourCount = r.unpack("2BH",colourDataOffset+28)
+			pos = colourDataOffset+32
 			colours[colourIndex] = []
 			for i in range(colourCount):
 				if colourDataFormat == 0: # RGB565
-					data = readAndParseIntBig(f,2)
+					data = r.u16(pos)
+					pos += 2
 					colours[colourIndex].append([
-						((data & 0b1111100000000000) >> 11)/31*255,
-						((data & 0b0000011111100000) >> 5)/63*255,
-						(data & 0b0000000000011111)/31*255,
+						fiveBitBytes[(data & 0b1111100000000000) >> 11],
+						sixBitBytes[(data & 0b0000011111100000) >> 5],
+						fiveBitBytes[data & 0b0000000000011111],
 						255])
 				elif colourDataFormat == 1: # RGB8
-					colours[colourIndex].append([readAndParseIntBig(f,1),readAndParseIntBig(f,1),readAndParseIntBig(f,1),255])
+					colours[colourIndex].append(list(r.unpack("3B",pos))+[255])
+					pos += 3
 				elif colourDataFormat == 2: # RGBX8
-					colours[colourIndex].append([readAndParseIntBig(f,1),readAndParseIntBig(f,1),readAndParseIntBig(f,1),255])
-					unused = readAndParseIntBig(f,1) # sheesh what a dumb format that's 25% of your space completely wasted
+					colours[colourIndex].append(list(r.unpack("3B",pos))+[255])
+					pos += 4 # sheesh what a dumb format that's 25% of your space completely wasted
 				elif colourDataFormat == 3: # RGBA4
-					data = readAndParseIntBig(f,2)
+					data = r.u16(pos)
+					pos += 2
 					colours[colourIndex].append([
-						((data & 0xf000) >> 12)/15*255,
-						((data & 0x0f00) >> 8)/15*255,
-						((data & 0x00f0) >> 4)/15*255,
-						( data & 0x000f)/15*255,
+						fourBitBytes[(data & 0xf000) >> 12],
+						fourBitBytes[(data & 0x0f00) >> 8],
+						fourBitBytes[(data & 0x00f0) >> 4],
+						fourBitBytes[ data & 0x000f],
 						])
 				elif colourDataFormat == 4: # RGBA6
-					params = f.read(3)
-					bits = BitReader(params)
-					colours[colourIndex].append([
-						(bits.readbits(6))/63*255,
-						(bits.readbits(6))/63*255,
-						(bits.readbits(6))/63*255,
-						(bits.readbits(6))/63*255,
-						])
+					params = r.raw(pos,3)
+					pos += 3
+					colours[colourIndex].append([sixBitBytes[x] for x in rgba6Layout.unpack(params)])
 				elif colourDataFormat == 5: # RGBA8
-					colours[colourIndex].append([readAndParseIntBig(f,1),readAndParseIntBig(f,1),readAndParseIntBig(f,1),readAndParseIntBig(f,1)])
+					colours[colourIndex].append(list(r.unpack("4B",pos)))
+					pos += 4
 				else:
 					print_warning("unknown colour data format: "+str(colourDataFormat))
-					colours[colourIndex].append([1.0,1.0,1.0,1.0]) # need something so indices still line up
-					f.seek(f.tell()+colourStrideSize)
+					colours[colourIndex].append([1,1,1,1]) # need something so indices still line up
+					pos += colourStrideSize
+			colours[colourIndex] = numpy.array(colours[colourIndex],dtype=numpy.uint8).reshape(-1,4)
 	
 	uvs = {}
 	if uvsOffset > 0:
-		f.seek(uvsOffset+subfileOffset)
-		uvsDict = parse_brres_dict(f)
+		uvsDict = parse_brres_dict(r,uvsOffset+subfileOffset)
 		for uv,(uvName,uvDataOffset) in enumerate(uvsDict.items()):
-			f.seek(uvDataOffset)
-			uvSize = readAndParseIntBig(f,4)
-			parentSubfileOffset = readAndParseIntBig(f,4,signed=True)
-			dataOffset = readAndParseIntBig(f,4)
-			uvNameOffset = readAndParseIntBig(f,4) # probably not needed, already have a name
-			uvIndex = readAndParseIntBig(f,4)
-			uvDimensionality = readAndParseIntBig(f,4) # 0 = 1D, 1 = 2D
-			uvDataFormat = readAndParseIntBig(f,4) # 0 = u8, 1 = i8, 2 = u16, 3 = i16, 4 = float
-			uvNonFloatDivisor = readAndParseIntBig(f,1) # if not float, divide all positions by (1 << this)
-			uvStrideSize = readAndParseIntBig(f,1) # only needed to keep place given unknowns
-			uvCount = readAndParseIntBig(f,2)
-			uvBoundingBoxMin = [readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)]
-			uvBoundingBoxMax = [readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)]
-			f.seek(dataOffset+uvDataOffset)
+			# uvNameOffset probably not needed, already have a name
+			uvSize,parentSubfileOffset,dataOffset,uvNameOffset,uvIndex,uvDimensionality,uvDataFormat = r.unpack("Ll5L",uvDataOffset)
+			# dimensionality: 0 = 1D, 1 = 2D
+			# format: 0 = u8, 1 = i8, 2 = u16, 3 = i16, 4 = float
+			# non-float divisor: if not float, divide all positions by (1 << this)
+			# stride: only needed to keep place given unknowns
+			uvNonFloatDivisor,uvStrideSize,uvCount = r.unpack("2BH",uvDataOffset+28)
+			uvBoundingBoxMin = r.unpack("3f",uvDataOffset+32)
+			uvBoundingBoxMax = r.unpack("3f",uvDataOffset+44)
+			pos = dataOffset+uvDataOffset
 			uvs[uvIndex] = []
+			is2D = uvDimensionality == 1 # will be assigning V = 0 for 1D positions
+			divisor = 1 << uvNonFloatDivisor
 			for i in range(uvCount): # reminder: the vertical must be inverted for all of these
-				is2D = uvDimensionality == 1 # will be assigning V = 0 for 1D positions
-				divisor = 1 << uvNonFloatDivisor
 				if uvDataFormat == 4:
-					uvs[uvIndex].append([readAndParseFloatBig(f),1.0-(readAndParseFloatBig(f) if is2D else 0.0)])
+					if is2D:
+						u,v = r.unpack("2f",pos)
+						pos += 8
+					else:
+						u,v = r.f32(pos),0.0
+						pos += 4
+					uvs[uvIndex].append([u,1.0-v])
 				elif uvDataFormat >= 0 and uvDataFormat <= 3:
 					formatSize = [1,1,2,2][uvDataFormat]
-					formatSigned = [False,True,False,True][uvDataFormat]
-					uvs[uvIndex].append([
-											readAndParseIntBig(f,formatSize,signed=formatSigned)/divisor,
-											1.0-(readAndParseIntBig(f,formatSize,signed=formatSigned)/divisor if is2D else 0.0),
-										])
+					if is2D:
+						u,v = r.unpack(intFormatCodes[uvDataFormat]*2,pos)
+						pos += formatSize*2
+						uvs[uvIndex].append([u/divisor,1.0-v/divisor])
+					else:
+						u = r.unpack(intFormatCodes[uvDataFormat],pos)[0]
+						pos += formatSize
+						uvs[uvIndex].append([u/divisor,1.0])
 				else:
 					print_warning("unknown uv data format: "+str(uvDataFormat))
 					uvs[uvIndex].append([0,0]) # need something so indices still line up
-					f.seek(f.tell()+uvStrideSize)
+					pos += uvStrideSize
+			uvs[uvIndex] = numpy.array(uvs[uvIndex],dtype=numpy.float32).reshape(-1,2)
 	
 	# materials come next in the order, but we do them later so we can pass the colour/uv layer count
 	# we can get away with this because the defs contain the mesh/material linking purely by index
@@ -434,15 +389,11 @@ def parse_mdl0(f, context, subfileOffset):
 	maxColourLayers = 0
 	maxUVLayers = 0
 	if meshesOffset > 0: # a safe bet, but
-		f.seek(meshesOffset+subfileOffset)
-		meshDict = parse_brres_dict(f)
+		meshDict = parse_brres_dict(r,meshesOffset+subfileOffset)
 		for m,(meshName,meshDataOffset) in enumerate(meshDict.items()):
-			f.seek(meshDataOffset)
-			meshSize = readAndParseIntBig(f,4)
-			parentSubfileOffset = readAndParseIntBig(f,4,signed=True)
-			singleBoneWeightIndex = readAndParseIntBig(f,4,signed=True) # -1 means multiple bones
-			f.seek(meshDataOffset+0x30) # skip some unknowns/stuff this importer shouldn't need to know (hopefully!)
-			featureFlags = readAndParseIntBig(f,4) # no idea which we need, so might as well set them all up
+			meshSize,parentSubfileOffset,singleBoneWeightIndex = r.unpack("Lll",meshDataOffset) # singleBoneWeightIndex -1 means multiple bones
+			# skip some unknowns/stuff this importer shouldn't need to know (hopefully!)
+			featureFlags = r.u32(meshDataOffset+0x30) # no idea which we need, so might as well set them all up
 			flagPosMatrix = featureFlags & (1 << 0)
 			flagTexMatrixes = [0,0,0,0,0,0,0,0]
 			for i in range(8):
@@ -455,38 +406,26 @@ def parse_mdl0(f, context, subfileOffset):
 			flagUVs = [0,0,0,0,0,0,0,0]
 			for i in range(8):
 				flagUVs[i] = featureFlags & (1 << (i+13))
-			meshFlags = readAndParseIntBig(f,4)
+			meshFlags = r.u32(meshDataOffset+0x34)
 			flagInvisible = meshFlags & (1 << 0)
 			flagChangeCurrentMatrix = meshFlags & (1 << 1)
-			meshNameOffset = readAndParseIntBig(f,4) # probably not needed, already have a name
-			meshIndex = readAndParseIntBig(f,4)
-			meshVertexCount = readAndParseIntBig(f,4)
-			meshFaceCount = readAndParseIntBig(f,4)
-			meshVerticesIndex = readAndParseIntBig(f,2,signed=True)
-			meshNormalsIndex = readAndParseIntBig(f,2,signed=True)
-			meshColourIndexes = [-1,-1]
-			currentColourLayers = 0
-			for i in range(2):
-				meshColourIndexes[i] = readAndParseIntBig(f,2,signed=True)
-				if meshColourIndexes[i] != -1:
-					currentColourLayers += 1
+			# meshNameOffset probably not needed, already have a name
+			meshNameOffset,meshIndex,meshVertexCount,meshFaceCount = r.unpack("4L",meshDataOffset+0x38)
+			meshVerticesIndex,meshNormalsIndex = r.unpack("2h",meshDataOffset+0x48)
+			meshColourIndexes = list(r.unpack("2h",meshDataOffset+0x4c))
+			currentColourLayers = 2-meshColourIndexes.count(-1)
 			maxColourLayers = max(currentColourLayers,maxColourLayers)
-			meshUVIndexes = [-1,-1,-1,-1,-1,-1,-1,-1]
-			currentUVLayers = 0
-			for i in range(8):
-				meshUVIndexes[i] = readAndParseIntBig(f,2,signed=True)
-				if meshUVIndexes[i] != -1:
-					currentUVLayers += 1
+			meshUVIndexes = list(r.unpack("8h",meshDataOffset+0x50))
+			currentUVLayers = 8-meshUVIndexes.count(-1)
 			maxUVLayers = max(currentUVLayers,maxUVLayers)
+			cursor = meshDataOffset+0x60
 			if subfileVersion >= 10:
-				meshFurVectorsIndex = readAndParseIntBig(f,2,signed=True)
-				meshFurLayersIndex = readAndParseIntBig(f,2,signed=True)
-			weightIndexTableOffset = readAndParseIntBig(f,4,signed=True)
-			f.seek(weightIndexTableOffset+meshDataOffset)
-			weightIndexTableCount = readAndParseIntBig(f,4)
-			weightIndexTableData = []
-			for weightItem in range(weightIndexTableCount):
-				weightIndexTableData.append(readAndParseIntBig(f,2))
+				meshFurVectorsIndex,meshFurLayersIndex = r.unpack("2h",cursor)
+				cursor += 4
+			weightIndexTableOffset = r.i32(cursor)
+			cursor = weightIndexTableOffset+meshDataOffset
+			weightIndexTableCount = r.u32(cursor)
+			cursor += 4+weightIndexTableCount*2
 			# this is now raw Wii graphics code (ugliness guaranteed)
 			# the deal is: some commands define the format, and then other commands read the data in said format
 			# the basic pattern is defining the bit-size of indexes with 0850 and 0860 cmds
@@ -504,15 +443,23 @@ def parse_mdl0(f, context, subfileOffset):
 							# there's more, but they're for materials rather than geometry, going to presume we don't need them for now
 							}
 			indexWidths = flagPatterns["0850"][0:-1]+flagPatterns["0860"][0:-1]
+			# the flag patterns are reversed (and then unreversed via [::-1] after being read so the unused are skipped)
+			# because they're in little-first order but the layouts read in big-first order
+			cpLayouts = {
+						0x50:BitLayout(reversed(flagPatterns["0850"])),
+						0x60:BitLayout(reversed(flagPatterns["0860"])),
+						0x70:BitLayout(reversed(flagPatterns["0870"])),
+						0x80:BitLayout(reversed(flagPatterns["0880"])),
+						0x90:BitLayout(reversed(flagPatterns["0890"])),
+						}
 			# the following use magic numbers because they leave out the unused items
 			combinedCPIndexedFlags = [0]*(13+8)
 			combinedCPEmbeddedFlags = [0]*(14+11+10)
 			unknownCmds = []
-			# there will be a lot of duplicate vertices, that's fine for now
-			forgeVerts = MonadoForgeVertexList()
-			forgeFaces = []
-			hashedVertsByPosition = {} # this is for faster duplicate culling later
-			curVIndex = 0
+			# every face corner gets its own vertex (so there will be a lot of duplicates, they get merged at the end)
+			# kept as one row of indexes per corner, plus the bone it's weighted to (which has to be found at draw time)
+			drawCorners = []
+			drawBoneTargets = []
 			# the following are volatile arrays: they will be overwritten with new stuff constantly
 			# this is why we can't just bulk all the vertices at once, they need the most recently-loaded index set
 			# they're not actually arrays because we can just use the memory address target as a dict key (nice and simple)
@@ -521,194 +468,176 @@ def parse_mdl0(f, context, subfileOffset):
 			indexedMatrixesTex = {}
 			indexedMatrixesLgt = {}
 			try: # this try is primarily so we can still print unknownCmds if something goes wrong
-				while f.tell() < meshSize+meshDataOffset:
-					faces = []
-					cmd = readAndParseIntBig(f,1)
+				while cursor < meshSize+meshDataOffset:
+					cmd = r.u8(cursor)
+					cursor += 1
 					if cmd == 0x00: # no-op
 						pass
 					elif cmd == 0x08: # load CP
-						subcmd = readAndParseIntBig(f,1)
-						params = f.read(4)
-						bits = BitReader(params)
-						readFields = []
-						# the flag patterns are reversed (and then unreversed via [::-1] after being read so the unused are skipped)
-						# because they're in little-first order but we kinda have to read in big-first order
+						subcmd = r.u8(cursor)
+						params = r.raw(cursor+1,4)
+						cursor += 5
+						if subcmd in cpLayouts:
+							readFields = cpLayouts[subcmd].unpack(params)
 						if subcmd == 0x50:
-							for p in reversed(flagPatterns["0850"]):
-								readFields.append(bits.readbits(p))
 							combinedCPIndexedFlags[0:13] = readFields[13:0:-1]
 						elif subcmd == 0x60:
-							for p in reversed(flagPatterns["0860"]):
-								readFields.append(bits.readbits(p))
 							combinedCPIndexedFlags[13:21] = readFields[8:0:-1]
 						elif subcmd == 0x70:
-							for p in reversed(flagPatterns["0870"]):
-								readFields.append(bits.readbits(p))
 							combinedCPEmbeddedFlags[0:14] = readFields[14:0:-1]
 						elif subcmd == 0x80:
-							for p in reversed(flagPatterns["0880"]):
-								readFields.append(bits.readbits(p))
 							combinedCPEmbeddedFlags[14:25] = readFields[11:0:-1]
 						elif subcmd == 0x90:
-							for p in reversed(flagPatterns["0890"]):
-								readFields.append(bits.readbits(p))
 							combinedCPEmbeddedFlags[25:35] = readFields[10:0:-1]
 					elif cmd == 0x10: # load XF
 						# don't know how much we need this yet, so only kinda roughing it in
-						transferSize = readAndParseIntBig(f,2) + 1
-						address = readAndParseIntBig(f,2)
-						params = f.read(4)
-						bits = BitReader(params)
-						# reminder: have to read things in backwards
+						transferSize,address = r.unpack("2H",cursor)
+						transferSize += 1
+						params = r.raw(cursor+4,4)
+						cursor += 8
 						if address == 0x1008:
-							unused = bits.readbits(24)
-							texCoordCount = bits.readbits(4)
-							normalCount = bits.readbits(2)
-							colourCount = bits.readbits(2)
+							unused,texCoordCount,normalCount,colourCount = xf1008Layout.unpack(params)
 						#elif address == 0x1040 # uhhh not yet sure how to deal with the 4th digit also being a value (hopefully don't need it)
 					# okay according to the BrawlBox code some of this stuff is:
 					# 16 bits of index
 					# 4 bits of "length-1" (says you have to add 1 to get the true value)
 					# 8 bits of memory address (needed to know what's being replaced from the current array)
 					elif cmd == 0x20: # indexed 4x3 position matrix (...what does that mean exactly?)
-						mtxIndex = readAndParseIntBig(f,2)
-						otherStuff = readAndParseIntBig(f,2)
+						mtxIndex,otherStuff = r.unpack("2H",cursor)
+						cursor += 4
 						chunkLength = (otherStuff >> 12)+1
 						memAddr = otherStuff & 0xff
 						indexedMatrixesPos[memAddr//chunkLength] = mtxIndex
 					elif cmd == 0x28: # indexed 3x3 normal matrix (same as above)
-						mtxIndex = readAndParseIntBig(f,2)
-						otherStuff = readAndParseIntBig(f,2)
+						mtxIndex,otherStuff = r.unpack("2H",cursor)
+						cursor += 4
 						chunkLength = (otherStuff >> 12)+1
 						memAddr = otherStuff & 0xff
 						indexedMatrixesNrm[memAddr//chunkLength] = mtxIndex
 					elif cmd == 0x30: # indexed 4x4 texture matrix (same as above)
-						mtxIndex = readAndParseIntBig(f,2)
-						otherStuff = readAndParseIntBig(f,2)
+						mtxIndex,otherStuff = r.unpack("2H",cursor)
+						cursor += 4
 						chunkLength = (otherStuff >> 12)+1
 						memAddr = otherStuff & 0xff
 						indexedMatrixesTex[memAddr//chunkLength] = mtxIndex
 					elif cmd == 0x38: # light-based something or other???
-						mtxIndex = readAndParseIntBig(f,2)
-						otherStuff = readAndParseIntBig(f,2)
+						mtxIndex,otherStuff = r.unpack("2H",cursor)
+						cursor += 4
 						chunkLength = (otherStuff >> 12)+1
 						memAddr = otherStuff & 0xff
 						indexedMatrixesLgt[memAddr//chunkLength] = mtxIndex
 					# draw commands not put in yet: 0x80 quads, 0xa0 tri-fan, 0xa8 lines, 0xb0 line-strip, 0xb8 points
 					elif cmd == 0x90 or cmd == 0x98: # draw commands
-						vertCount = readAndParseIntBig(f,2)
-						vertData = []
-						for i in range(vertCount):
-							vert = []
-							for j,v in enumerate(indexWidths):
-								vert.append(-1) # add a null, then replace it with what's read
-								if v == 1:
-									if combinedCPIndexedFlags[j] == 0:
-										pass # not present
-									elif combinedCPIndexedFlags[j] == 1:
-										vert[-1] = readAndParseIntBig(f,1)
-									else:
-										print_warning("unsupported situation found @ "+str(f.tell()))
-								elif v == 2:
-									if combinedCPIndexedFlags[j] == 0:
-										pass # not present
-									elif combinedCPIndexedFlags[j] == 1:
-										print_warning("direct embedded draw cmds not currently supported @ "+str(f.tell()))
-									elif combinedCPIndexedFlags[j] == 2:
-										vert[-1] = readAndParseIntBig(f,1)
-									elif combinedCPIndexedFlags[j] == 3:
-										vert[-1] = readAndParseIntBig(f,2)
-									else:
-										print_warning("unsupported situation found @ "+str(f.tell()))
-							vertData.append(vert)
+						vertCount = r.u16(cursor)
+						cursor += 2
+						# the vertex layout is fixed for the whole draw, so work it out once and read all the vertices as one table
+						vertFields = [] # which of the indexWidths slots each column goes into
+						for j,v in enumerate(indexWidths):
+							if v == 1:
+								if combinedCPIndexedFlags[j] == 0:
+									pass # not present
+								elif combinedCPIndexedFlags[j] == 1:
+									vertFields.append([j,"u1"])
+								else:
+									print_warning("unsupported situation found @ "+str(cursor))
+							elif v == 2:
+								if combinedCPIndexedFlags[j] == 0:
+									pass # not present
+								elif combinedCPIndexedFlags[j] == 1:
+									print_warning("direct embedded draw cmds not currently supported @ "+str(cursor))
+								elif combinedCPIndexedFlags[j] == 2:
+									vertFields.append([j,"u1"])
+								elif combinedCPIndexedFlags[j] == 3:
+									vertFields.append([j,"u2"])
+								else:
+									print_warning("unsupported situation found @ "+str(cursor))
+						vertSchema = RecordSchema([["i"+str(j),fmt] for j,fmt in vertFields])
+						vertTable = r.table(vertSchema,cursor,vertCount)
+						vertData = numpy.full([vertCount,len(indexWidths)],-1,dtype=numpy.int64) # the nulls stay for anything not present
+						for j,fmt in vertFields:
+							vertData[:,j] = vertTable["i"+str(j)]
+						cursor += vertSchema.size*vertCount
 						if cmd == 0x90: # triangles
-							for v in range(0,len(vertData),3):
-								# the vert order is backwards (2,1,0) for normals purposes
-								faces.append([vertData[v+2],vertData[v+1],vertData[v]])
+							# the vert order is backwards (2,1,0) for normals purposes
+							order = numpy.arange(vertCount//3*3).reshape(-1,3)[:,::-1]
 						if cmd == 0x98: # triangle strip
-							for v in range(len(vertData)-2):
-								# if we just add the verts in order, the strip will keep alternating between clockwise and CCW
-								# so we have to invert the direction of every other face
-								if v % 2 == 0:
-									faces.append([vertData[v+2],vertData[v+1],vertData[v]])
-								else:
-									faces.append([vertData[v],vertData[v+1],vertData[v+2]])
+							# if we just add the verts in order, the strip will keep alternating between clockwise and CCW
+							# so we have to invert the direction of every other face
+							order = numpy.arange(max(vertCount-2,0))[:,None]+numpy.array([2,1,0])
+							order[1::2] = order[1::2,::-1]
+						corners = vertData[order.ravel()]
+						boneTargets = numpy.full(len(corners),-1,dtype=numpy.int64)
+						hasPosition = corners[:,9] != -1 # should never not have one, but
+						if singleBoneWeightIndex != -1: # entire mesh uses the same bone
+							boneTargets[hasPosition] = singleBoneWeightIndex
+						else: # per-vertex weights (has to be looked up now, since the matrix "array" keeps changing)
+							# but what if vert[0] is -1? apparently that's a thing
+							posMatrixes,inverse = numpy.unique(corners[hasPosition,0]//3,return_inverse=True)
+							boneTargets[hasPosition] = numpy.array([indexedMatrixesPos[x] for x in posMatrixes.tolist()],dtype=numpy.int64)[inverse]
+						drawCorners.append(corners)
+						drawBoneTargets.append(boneTargets)
 					else: # all options exhausted, not a known/supported code
 						if cmd not in unknownCmds: unknownCmds.append(cmd)
-					for face in faces:
-						faceVerts = []
-						newFaceIndex = len(forgeFaces)
-						for vert in face:
-							newVertex = MonadoForgeVertex(curVIndex)
-							if vert[9] != -1: # should never happen (a vertex without position), but
-								pos = positions[meshVerticesIndex][vert[9]]
-								if vert[10] != -1: # normal
-									nrm = normals[meshNormalsIndex][vert[10]]
-								singleBone = None
-								boneListIndex = -1
-								if singleBoneWeightIndex != -1: # entire mesh uses the same bone
-									boneListIndexTarget = singleBoneWeightIndex
-								else: # per-vertex weights
-									# but what if vert[0] is -1? apparently that's a thing
-									boneListIndexTarget = indexedMatrixesPos[vert[0]//3]
-								boneListIndex = weightLinkTable[boneListIndexTarget]
-								newVertex.weightSetIndex = boneListIndex
-								if boneListIndex == -1: # not a single bone vertex
-									newVertex.weightSetIndex = boneListIndexTarget+multiWeightShiftIndex
-								else: # is a single bone vertex
-									# these vertices are origin-clustered and modified into position based on their bone
-									singleBone = boneList[boneListIndex]
-									boneMatrix = globalBoneMatrixes[boneListIndex]
-									pos = boneMatrix @ mathutils.Vector(pos)
-									if vert[10] != -1:
-										# rotation part only
-										nrmMatrix = boneMatrix.to_quaternion().to_matrix()
-										nrm = nrmMatrix @ mathutils.Vector(nrm)
-								newVertex.position = pos
-								if vert[10] != -1: # normal
-									newVertex.setNormal(curVIndex,nrm)
-							else:
-								print_warning("vertex without position: "+str(vert))
-							if vert[11] != -1: # colour 1
-								newVertex.setColour(curVIndex,0,colours[meshColourIndexes[0]][vert[11]])
-							if vert[12] != -1: # colour 2
-								newVertex.setColour(curVIndex,1,colours[meshColourIndexes[1]][vert[12]])
-							for uvLayer,uvIndex in enumerate(vert[13:21]):
-								uvMatrixIndex = vert[uvLayer+1] # vert[1] - vert[8]
-								if uvMatrixIndex != -1: # don't know what to do here yet
-									print_warning("uvMatrixIndex == "+str(uvMatrixIndex))
-								if uvIndex != -1:
-									newVertex.setUV(curVIndex,uvLayer,uvs[meshUVIndexes[uvLayer]][uvIndex])
-							forgeVerts.addVertex(curVIndex,newVertex,automerge=True,mergeSharp=mergeSharpEdges)
-							faceVerts.append(curVIndex)
-							curVIndex += 1
-						newFace = MonadoForgeFace(newFaceIndex)
-						newFace.vertexIndexes = faceVerts
-						forgeFaces.append(newFace)
 			finally:
 				if unknownCmds:
 					print_warning("found unknown graphic commands: "+", ".join(hex(x) for x in unknownCmds))
+			corners = numpy.concatenate(drawCorners) if drawCorners else numpy.zeros([0,len(indexWidths)],dtype=numpy.int64)
+			boneTargets = numpy.concatenate(drawBoneTargets) if drawBoneTargets else numpy.zeros(0,dtype=numpy.int64)
+			for vert in corners[corners[:,9] == -1].tolist():
+				print_warning("vertex without position: "+str(vert))
+			for vert in corners[(corners[:,1:9] != -1).any(axis=1)].tolist():
+				for uvMatrixIndex in vert[1:9]: # don't know what to do here yet
+					if uvMatrixIndex != -1:
+						print_warning("uvMatrixIndex == "+str(uvMatrixIndex))
+			forgeVerts = MonadoForgeVertexTable(len(corners))
+			hasPosition = corners[:,9] != -1
+			hasNormal = hasPosition & (corners[:,10] != -1)
+			if hasPosition.any():
+				boneListIndexes = numpy.full(len(corners),-1,dtype=numpy.int64)
+				boneListIndexes[hasPosition] = numpy.array(weightLinkTable,dtype=numpy.int64)[boneTargets[hasPosition]]
+				isSingleBone = boneListIndexes != -1
+				weightSetIndexes = numpy.full(len(corners),-1,dtype=numpy.int64)
+				weightSetIndexes[hasPosition] = numpy.where(isSingleBone,boneListIndexes,boneTargets+multiWeightShiftIndex)[hasPosition]
+				forgeVerts.weightSetIndexes = weightSetIndexes
+				# single bone vertices are origin-clustered and modified into position based on their bone
+				vertPositions = numpy.zeros([len(corners),3],dtype=numpy.float32)
+				vertPositions[hasPosition] = positions[meshVerticesIndex][corners[hasPosition,9]]
+				vertPositions[isSingleBone] = transform_by_bones(positions[meshVerticesIndex],corners[isSingleBone,9],boneListIndexes[isSingleBone],globalBoneMatrixes)
+				forgeVerts.positions = vertPositions
+				if hasNormal.any():
+					vertNormals = numpy.zeros([len(corners),3],dtype=numpy.float32)
+					vertNormals[hasNormal] = normals[meshNormalsIndex][corners[hasNormal,10]]
+					isSingleBone &= hasNormal
+					vertNormals[isSingleBone] = transform_by_bones(normals[meshNormalsIndex],corners[isSingleBone,10],boneListIndexes[isSingleBone],globalNormalMatrixes)
+					forgeVerts.normals = vertNormals
+			for colourLayer in range(2):
+				colourIndexes = corners[:,11+colourLayer]
+				if (colourIndexes != -1).any():
+					vertColours = numpy.zeros([len(corners),4],dtype=numpy.uint8)
+					vertColours[colourIndexes != -1] = colours[meshColourIndexes[colourLayer]][colourIndexes[colourIndexes != -1]]
+					forgeVerts.setColours(colourLayer,vertColours)
+			for uvLayer in range(8):
+				uvIndexes = corners[:,13+uvLayer]
+				if (uvIndexes != -1).any():
+					vertUVs = numpy.zeros([len(corners),2],dtype=numpy.float32)
+					vertUVs[uvIndexes != -1] = uvs[meshUVIndexes[uvLayer]][uvIndexes[uvIndexes != -1]]
+					forgeVerts.setUVs(uvLayer,vertUVs)
+			forgeVerts.mergeDoubles(mergeSharp=mergeSharpEdges)
 			newMesh = MonadoForgeMesh()
 			newMesh.name = name+"_"+meshName
 			newMesh.vertices = forgeVerts
-			newMesh.faces = forgeFaces
+			newMesh.faces = numpy.arange(len(corners),dtype=numpy.uint32).reshape(-1,3)
 			newMesh.materialIndex = defsMeshDraw[meshIndex][0]
 			newMesh.weightSets = fullWeightIndexesList
 			meshes[m] = newMesh
 	
 	materials = {}
 	if materialsOffset > 0:
-		f.seek(materialsOffset+subfileOffset)
-		materialsDict = parse_brres_dict(f)
+		materialsDict = parse_brres_dict(r,materialsOffset+subfileOffset)
 		for material,(materialName,materialDataOffset) in enumerate(materialsDict.items()):
-			f.seek(materialDataOffset)
-			materialSize = readAndParseIntBig(f,4)
-			parentSubfileOffset = readAndParseIntBig(f,4,signed=True)
-			#dataOffset = readAndParseIntBig(f,4)
-			materialNameOffset = readAndParseIntBig(f,4) # probably not needed, already have a name
-			materialIndex = readAndParseIntBig(f,4)
+			# materialNameOffset probably not needed, already have a name
+			materialSize,parentSubfileOffset,materialNameOffset,materialIndex,materialFlags = r.unpack("Ll3L",materialDataOffset)
 			# probably don't need most of these, but might as well set them up just in case
-			materialFlags = readAndParseIntBig(f,4)
 			flagIsXLU = (materialFlags & 0x80000000) != 0 # specifically, has alpha aside from 1.0 or 0.0
 			flagNoTexMatrix = (materialFlags & 0x00000080) != 0
 			flagNoTexCoords = (materialFlags & 0x00000040) != 0
@@ -718,74 +647,42 @@ def parse_mdl0(f, context, subfileOffset):
 			flagNoTexCoordScale = (materialFlags & 0x00000004) != 0
 			flagNoTEVColour = (materialFlags & 0x00000002) != 0
 			flagNoPixelDisplay = (materialFlags & 0x00000001) != 0
-			materialTexgenCount = readAndParseIntBig(f,1)
-			materialLightChannelCount = readAndParseIntBig(f,1)
-			materialShaderStageCount = readAndParseIntBig(f,1)
-			materialIndirectTexCount = readAndParseIntBig(f,1)
-			materialCulling = readAndParseIntBig(f,4) # bitflags: 1 = cull front, 2 = cull back
-			materialDepthTesting = readAndParseIntBig(f,1)
-			materialLightsetIndex = readAndParseIntBig(f,1)
-			materialFogIndex = readAndParseIntBig(f,1)
-			materialPadding = readAndParseIntBig(f,1)
-			materialIndirectMethod = readAndParseIntBig(f,4)
-			materialLightNrmMapRef = readAndParseIntBig(f,4)
-			materialShaderOffset = readAndParseIntBig(f,4,signed=True)
-			materialTexCount = readAndParseIntBig(f,4)
-			materialLayerOffset = readAndParseIntBig(f,4,signed=True)
-			materialOtherOffset1 = readAndParseIntBig(f,4,signed=True) # these change based on version and don't seem needed for XC1, so not trying too hard
-			materialOtherOffset2 = readAndParseIntBig(f,4,signed=True)
-			materialOtherOffset3 = readAndParseIntBig(f,4,signed=True)
-			materialTexMapUsage = readAndParseIntBig(f,4) # flags for which texture maps are used
-			f.seek(f.tell()+0x100) # "Precompiled code space containing texture information."
-			materialPaletteUsage = readAndParseIntBig(f,4) # flags for which palettes are used
-			f.seek(f.tell()+0x60) # "Precompiled code space containing palette information."
-			materialFixFlags = readAndParseIntBig(f,4) # bitflags: 1 = enable layer, 2 = fixed scale, 4 = fixed rotation, 8 = fixed translation
-			materialTexMatrixMode = readAndParseIntBig(f,4) # 0 = "Maya", 1 = "XSI", 2 = "3DS Max" (what do any of these actually mean)
+			materialTexgenCount,materialLightChannelCount,materialShaderStageCount,materialIndirectTexCount = r.unpack("4B",materialDataOffset+20)
+			materialCulling = r.u32(materialDataOffset+24) # bitflags: 1 = cull front, 2 = cull back
+			materialDepthTesting,materialLightsetIndex,materialFogIndex,materialPadding = r.unpack("4B",materialDataOffset+28)
+			# the other offsets change based on version and don't seem needed for XC1, so not trying too hard
+			materialIndirectMethod,materialLightNrmMapRef,materialShaderOffset,materialTexCount,materialLayerOffset,materialOtherOffset1,materialOtherOffset2,materialOtherOffset3 = r.unpack("2LlLl3l",materialDataOffset+32)
+			materialTexMapUsage = r.u32(materialDataOffset+64) # flags for which texture maps are used
+			# +0x100: "Precompiled code space containing texture information."
+			materialPaletteUsage = r.u32(materialDataOffset+68+0x100) # flags for which palettes are used
+			# +0x60: "Precompiled code space containing palette information."
+			materialFixFlags,materialTexMatrixMode = r.unpack("2L",materialDataOffset+72+0x100+0x60)
+			# fix flags: 1 = enable layer, 2 = fixed scale, 4 = fixed rotation, 8 = fixed translation
+			# tex matrix mode: 0 = "Maya", 1 = "XSI", 2 = "3DS Max" (what do any of these actually mean)
 			materialCoordinates = []
-			for i in range(8):
-				scaleCoords = [readAndParseFloatBig(f),readAndParseFloatBig(f)]
-				rotCoords = readAndParseFloatBig(f)
-				transCoords = [readAndParseFloatBig(f),readAndParseFloatBig(f)]
-				materialCoordinates.append([scaleCoords,rotCoords,transCoords])
+			for sx,sy,rot,tx,ty in r.unpackArray("5f",materialDataOffset+80+0x100+0x60,8):
+				materialCoordinates.append([[sx,sy],rot,[tx,ty]])
 			materialTexMatrixes = []
-			for i in range(8):
-				camRef = readAndParseIntBig(f,1,signed=True)
-				lightRef = readAndParseIntBig(f,1,signed=True)
-				mapMode = readAndParseIntBig(f,1) # 0 = UVs, 1 = camera, 2 = projection, 3 = list, 4 = specular
-				identityEffect = readAndParseIntBig(f,1)
-				texMatrix = [
-								[readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)],
-								[readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)],
-								[readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f),readAndParseFloatBig(f)],
-							]
+			for camRef,lightRef,mapMode,identityEffect,*m in r.unpackArray("2b2B12f",materialDataOffset+80+0x100+0x60+8*20,8):
+				# mapMode: 0 = UVs, 1 = camera, 2 = projection, 3 = list, 4 = specular
+				texMatrix = [list(m[0:4]),list(m[4:8]),list(m[8:12])]
 				materialTexMatrixes = [camRef,lightRef,mapMode,identityEffect,texMatrix]
 			materialLightChannels = []
-			for i in range(8):
-				lightFlags = readAndParseIntBig(f,4) # bitflags: 1 = material colour, 2 = material alpha, 4 = ambient colour, 8 = ambient alpha, 16 = raster colour, 32 = raster alpha
-				baseMaterialColour = [readAndParseIntBig(f,1),readAndParseIntBig(f,1),readAndParseIntBig(f,1),readAndParseIntBig(f,1)] # RGBA
-				baseAmbientColour = [readAndParseIntBig(f,1),readAndParseIntBig(f,1),readAndParseIntBig(f,1),readAndParseIntBig(f,1)] # RGBA
-				colourChannelControl = readAndParseIntBig(f,4) # probably some other sort of flags
-				alphaChannelControl = readAndParseIntBig(f,4) # same
+			for lightFlags,*lightData in r.unpackArray("L8B2L",materialDataOffset+80+0x100+0x60+8*20+8*52,8):
+				# light flags: 1 = material colour, 2 = material alpha, 4 = ambient colour, 8 = ambient alpha, 16 = raster colour, 32 = raster alpha
+				baseMaterialColour = lightData[0:4] # RGBA
+				baseAmbientColour = lightData[4:8] # RGBA
+				colourChannelControl,alphaChannelControl = lightData[8:10] # probably some other sort of flags
 				materialLightChannels.append([lightFlags,baseMaterialColour,baseAmbientColour,colourChannelControl,alphaChannelControl])
-			f.seek(materialDataOffset+materialLayerOffset)
 			textureData = []
-			for t in range(materialTexCount):
-				texNameOffset = readAndParseIntBig(f,4,signed=True)
-				paletteNameOffset = readAndParseIntBig(f,4,signed=True)
-				texDataOffset = readAndParseIntBig(f,4,signed=True) # unused/dummy?
-				paletteDataOffset = readAndParseIntBig(f,4,signed=True) # unused/dummy?
-				texDataID = readAndParseIntBig(f,4)
-				paletteDataID = readAndParseIntBig(f,4)
-				texWrapU = readAndParseIntBig(f,4) # 0 = clamp, 1 = repeat, 2 = mirror
-				texWrapV = readAndParseIntBig(f,4)
-				texFilterModeSmaller = readAndParseIntBig(f,4) # 0 = nearest, 1 = linear, 2 = nearest mipmap nearest, 3 = linear mipmap nearest, 4 = nearest mipmap linear, 5 = linear mipmap linear
-				texFilterModeLarger = readAndParseIntBig(f,4) # 0 = nearest, 1 = linear
-				texLODBias = readAndParseFloatBig(f)
-				texMaxAnisotropy = readAndParseIntBig(f,4) # 0 = 1, 1 = 2, 2 = 4
-				texClampBias = readAndParseIntBig(f,1)
-				texTexelInterpolate = readAndParseIntBig(f,1)
-				texPadding = readAndParseIntBig(f,2)
-				textureName = read_brres_str(f,texNameOffset,materialDataOffset+materialLayerOffset+52*t) # the extra 52 is because of the reads in this for-loop
+			# texData/paletteData offsets are unused/dummy?
+			# wrap: 0 = clamp, 1 = repeat, 2 = mirror
+			# filter (smaller): 0 = nearest, 1 = linear, 2 = nearest mipmap nearest, 3 = linear mipmap nearest, 4 = nearest mipmap linear, 5 = linear mipmap linear
+			# filter (larger): 0 = nearest, 1 = linear
+			# max anisotropy: 0 = 1, 1 = 2, 2 = 4
+			for t,layer in enumerate(r.unpackArray("4l6LfL2BH",materialDataOffset+materialLayerOffset,materialTexCount)):
+				texNameOffset,paletteNameOffset,texDataOffset,paletteDataOffset,texDataID,paletteDataID,texWrapU,texWrapV,texFilterModeSmaller,texFilterModeLarger,texLODBias,texMaxAnisotropy,texClampBias,texTexelInterpolate,texPadding = layer
+				textureName = read_brres_str(r,texNameOffset,materialDataOffset+materialLayerOffset+52*t) # each layer entry is 52 bytes
 				textureData.append([textureName,texWrapU,texWrapV,texFilterModeLarger])
 			# all the stuff is in now, process it
 			newMat = MonadoForgeMaterial(materialIndex)
@@ -818,136 +715,102 @@ def parse_mdl0(f, context, subfileOffset):
 		print("Finished parsing MDL0 from .brres file.")
 	return results
 
-def parse_plt0(f, context, subfileOffset):
+def parse_plt0(r, context, subfileOffset):
 	printProgress = context.scene.monado_forge_main.printProgress
-	startBreadcrumb = f.tell()
-	subfileLength = readAndParseIntBig(f,4)
-	subfileVersion = readAndParseIntBig(f,4)
-	subfileParentOffset = readAndParseIntBig(f,4,signed=True)
+	subfileLength,subfileVersion,subfileParentOffset = r.unpack("2Ll",subfileOffset+4)
 	
-	pltHeaderCrumb = f.tell()
-	pltHeaderSize = readAndParseIntBig(f,4)
+	pltHeaderSize,nameOffset,paletteFormat,colourCount = r.unpack("3LH",subfileOffset+16)
 	if pltHeaderSize != 0x40:
 		print_warning("palette at "+str(subfileOffset)+" doesn't have a pltHeaderSize of 0x40 (undefined behaviour)")
-	nameOffset = readAndParseIntBig(f,4)
-	name = read_brres_str(f,nameOffset,subfileOffset)
-	paletteFormat = readAndParseIntBig(f,4)
-	colourCount = readAndParseIntBig(f,2)
+	name = read_brres_str(r,nameOffset,subfileOffset)
 	
-	f.seek(pltHeaderSize+subfileOffset)
-	colours = []
-	# all these results are in 255 format
-	if paletteFormat == 1: # RGB565
-		for c in range(colourCount):
-			data = readAndParseIntBig(f,2)
-			r = ((data & 0b1111100000000000) >> 11)/31*255
-			g = ((data & 0b0000011111100000) >> 5)/63*255
-			b = (data & 0b0000000000011111)/31*255
-			colours.append([r,g,b,255])
-	elif paletteFormat == 2: # RGB5A3
-		for c in range(colourCount):
-			data = readAndParseIntBig(f,2)
-			mode = (data & 0b1000000000000000) >> 15
-			if mode:
-				r = ((data & 0b0111110000000000) >> 10)/31*255
-				g = ((data & 0b0000001111100000) >> 5)/31*255
-				b = (data & 0b0000000000011111)/31*255
-				colours.append([r,g,b,255])
-			else:
-				a = ((data & 0b0111000000000000) >> 12)/7*255
-				r = ((data & 0b0000111100000000) >> 8)/15*255
-				g = ((data & 0b0000000011110000) >> 4)/15*255
-				b = (data & 0b0000000000001111)/15*255
-				colours.append([r,g,b,a])
+	# the colours are in the same formats as the matching texture formats, so they're decoded the same way (as one long "block")
+	# the result is an (N,4) uint8 array
+	paletteDecoders = {0:decode_ia8_blocks,1:decode_rgb565_blocks,2:decode_rgb5a3_blocks}
+	if paletteFormat in paletteDecoders:
+		colours = paletteDecoders[paletteFormat](r.array("u1",pltHeaderSize+subfileOffset,colourCount*2).reshape(1,-1))[0]
 	else:
 		print_error("PLT0 block "+name+"is of unknown/unsupported format "+str(paletteFormat))
+		colours = numpy.zeros([0,4],dtype=numpy.uint8)
 	return name,colours
 
-def parse_tex0(f, context, subfileOffset, palettesDict):
+def parse_tex0(r, context, subfileOffset, palettesDict):
 	printProgress = context.scene.monado_forge_main.printProgress
 	texPath = None
 	if context.scene.monado_forge_import.autoSaveTextures:
 		texPath = bpy.path.abspath(context.scene.monado_forge_import.texturePath)
-	startBreadcrumb = f.tell()
-	subfileLength = readAndParseIntBig(f,4)
-	subfileVersion = readAndParseIntBig(f,4)
-	subfileParentOffset = readAndParseIntBig(f,4,signed=True)
+	subfileLength,subfileVersion,subfileParentOffset = r.unpack("2Ll",subfileOffset+4)
 	
-	texHeaderCrumb = f.tell()
-	texHeaderSize = readAndParseIntBig(f,4)
+	texHeaderSize,nameOffset,ciFlag,imgWidth,imgHeight,imgFormat,mipmapCount,minMipmap,maxMipmap,unused = r.unpack("3L2H2L2fL",subfileOffset+16)
 	if texHeaderSize != 0x40:
 		print_warning("texture at "+str(subfileOffset)+" doesn't have a texHeaderSize of 0x40 (undefined behaviour)")
-	nameOffset = readAndParseIntBig(f,4)
-	name = read_brres_str(f,nameOffset,subfileOffset)
-	ciFlag = readAndParseIntBig(f,4)
-	imgWidth = readAndParseIntBig(f,2)
-	imgHeight = readAndParseIntBig(f,2)
-	imgFormat = readAndParseIntBig(f,4)
-	mipmapCount = readAndParseIntBig(f,4)
-	minMipmap = readAndParseFloatBig(f)
-	maxMipmap = readAndParseFloatBig(f)
-	unused = readAndParseIntBig(f,4)
+	name = read_brres_str(r,nameOffset,subfileOffset)
 	
 	# assumption: texture name always matches palette name
-	palette = palettesDict.get(name,[])
+	palette = palettesDict.get(name,numpy.zeros([0,4],dtype=numpy.uint8))
 	
-	f.seek(texHeaderSize+subfileOffset)
 	# here is the raw image data
-	imgName = parse_texture_brres(name,imgFormat,imgWidth,imgHeight,f.read(subfileLength-texHeaderSize),palette,printProgress,
-		overwrite=context.scene.monado_forge_import.duplicateImageMethod,saveTo=texPath)
+	imgName = parse_texture_brres(name,imgFormat,imgWidth,imgHeight,r.raw(texHeaderSize+subfileOffset,subfileLength-texHeaderSize),palette,printProgress,
+		overwrite=context.scene.monado_forge_import.duplicateImageMethod,saveTo=texPath,cache=get_texture_cache(context))
+	return imgName
 
 def import_brres_root(f, context):
 	printProgress = context.scene.monado_forge_main.printProgress
+	r = BinaryReader(f,"big")
 	
-	magic = f.read(4)
+	magic = r.raw(0,4)
 	if magic != b"bres":
 		print_error(f.name+" is not a valid BRRES file (unexpected header)")
 		return None
-	bom = f.read(2)
+	bom = r.raw(4,2)
 	if bom != b"\xfe\xff":
 		print_error(f.name+" doesn't have the big-endian BOM (not normal for XC1 files)")
 		return None
-	rootVersion = readAndParseIntBig(f,2)
-	filesize = readAndParseIntBig(f,4) # seems to not include end padding (though the padding might be an artifact of the nameless XC1 file splitter)
-	rootOffset = readAndParseIntBig(f,2)
-	sectionCount = readAndParseIntBig(f,2)
+	# filesize seems to not include end padding (though the padding might be an artifact of the nameless XC1 file splitter)
+	rootVersion,filesize,rootOffset,sectionCount = r.unpack("HL2H",6)
 	
-	f.seek(rootOffset)
-	rootMagic = f.read(4)
+	rootMagic = r.raw(rootOffset,4)
 	if rootMagic != b"root":
 		print_error(f.name+" is not a valid BRRES file (root is not named root)")
 		return None
-	rootSize = readAndParseIntBig(f,4)
-	rootDict = parse_brres_dict(f)
+	rootSize = r.u32(rootOffset+4)
+	rootDict = parse_brres_dict(r,rootOffset+8)
 	globalDict = {}
 	# assumption: if two subfiles are in the same folder, they cannot share a name
 	# they can share names if they're in different folders (e.g. 66077.brres oj010010)
 	for rootFolder in rootDict.items():
 		folderName,folderOffset = rootFolder
-		f.seek(folderOffset)
-		folderDict = parse_brres_dict(f,folderName+"/")
+		folderDict = parse_brres_dict(r,folderOffset,folderName+"/")
 		globalDict.update(folderDict)
-	results = {}
+	results = {"PLT0":{}}
+	# palettes go first, so every texture can find its palette no matter what order the subfiles are in
+	# assumption: palette names are never shared in a single .brres file
+	textureOffsets = []
+	for subfileName,subfileOffset in globalDict.items():
+		submagic = r.raw(subfileOffset,4)
+		if submagic == b"PLT0":
+			pltName,pltColours = parse_plt0(r,context,subfileOffset)
+			results["PLT0"][pltName] = pltColours
+		elif submagic == b"TEX0":
+			textureOffsets.append(subfileOffset)
 	for subfile in globalDict.items():
 		subfileName,subfileOffset = subfile
-		f.seek(subfileOffset)
-		submagic = f.read(4)
+		submagic = r.raw(subfileOffset,4)
 		# there's a common format to the subfile headers, but it's more convenient to pretend otherwise
 		# was going to set this up with some cleverness about a function map, but decided it was overcomplicating things
 		if submagic == b"MDL0":
 			if "MDL0" not in results.keys(): results["MDL0"] = []
-			results["MDL0"].append(parse_mdl0(f,context,subfileOffset))
-		elif submagic == b"PLT0":
-			# assumption: palette names are never shared in a single .brres file
-			if "PLT0" not in results.keys(): results["PLT0"] = {}
-			pltName,pltColours = parse_plt0(f,context,subfileOffset)
-			results["PLT0"][pltName] = pltColours
-		elif submagic == b"TEX0":
-			# textures are just imported straight to Blender, no passing of results needed
-			# assumption: any necessary PLT0 file will always be imported first
-			parse_tex0(f,context,subfileOffset,results.get("PLT0",{}))
+			results["MDL0"].append(parse_mdl0(r,context,subfileOffset))
+		elif submagic == b"PLT0" or submagic == b"TEX0":
+			pass # done separately
 		else:
 			print_warning(str(submagic)+" files not yet supported, skipping")
+	# textures are just imported straight to Blender, no passing of results needed
+	with ProgressReporter(context,"Textures",len(textureOffsets),printProgress) as textureProgress:
+		for t,subfileOffset in enumerate(textureOffsets):
+			textureName = parse_tex0(r,context,subfileOffset,results["PLT0"])
+			textureProgress.update(t+1,detail=str(textureName))
+	r.close()
 	
 	if len(results["MDL0"]) > 1:
 		print_warning("found multiple MDL0s in this file, only processing the first for now")
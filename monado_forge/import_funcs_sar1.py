@@ -1,41 +1,92 @@
 import bpy
-import io
+import collections
+import concurrent.futures
 import math
 import mathutils
+import numpy
 import os
 import zlib
 
 from . classes import *
 from . utils import *
+from . utils_cache import *
 from . utils_img import *
 from . import_funcs import *
 from . modify_funcs import *
 
+# fixed-size record layouts (see RecordSchema), so whole tables can be read in one go
+
+# .wimdo
+wimdoMeshGroupSchema = RecordSchema([
+								["tableOffset","u4"],["tableCount","u4"],["unknown1","u4"],
+								["boundingBoxStart","f4",3],["boundingBoxEnd","f4",3],["boundingRadius","f4"],
+								])
+wimdoMeshSchema = RecordSchema([
+								["id","u4"],["flags1","u2"],["flags2","u2"],["vertTableIndex","u2"],["faceTableIndex","u2"],[None,2],
+								["materialIndex","u2"],[None,14],["lod","u1"],[None,17],
+								])
+# .wismt model chunk
+wismtVertexTableSchema = RecordSchema([["dataOffset","u4"],["dataCount","u4"],["blockSize","u4"],["descOffset","u4"],["descCount","u4"],[None,12]])
+wismtVertexDescSchema = RecordSchema([["type","u2"],["size","u2"]])
+wismtVertexExtraSchema = RecordSchema([["flags","u2"],["outlineIndex","u2"],["morphIndex","u2"],["morphCount","u2"],[None,4]])
+wismtFaceTableSchema = RecordSchema([["dataOffset","u4"],["vertCount","u4"],[None,12]])
+wismtOutlineTableSchema = RecordSchema([["dataOffset","u4"],["dataCount","u4"],["blockSize","u4"],[None,4]])
+wismtWeightTableSchema = RecordSchema([["startIndex","u4"],["dataOffset","u4"],["dataCount","u4"],[None,17],["lod","u1"],[None,10]])
+wismtWeightLodSchema = RecordSchema([["tableIndexes","u2",9]]) # apparently this is fixed at 9 (https://github.com/atnavon/xc2f/wiki/Geometry)
+wismtShapeHeaderSchema = RecordSchema([["dataChunkID","u4"],["targetIndex","u4"],["targetCounts","u4"],["targetIDOffset","u4"],[None,4]])
+wismtShapeTargetSchema = RecordSchema([["dataChunkOffset","u4"],["vertexCount","u4"],["blockSize","u4"],["unknown","u2"],["type","u2"]])
+wismtShapeBaseFields = [["position","f4",3],["normal","u1",3]] # the rest of the block isn't needed (block size varies, so no schema)
+wismtShapeVertexSchema = RecordSchema([["position","f4",3],[None,4],["normal","u1",3],[None,9],["index","u4"]])
+# the vertex blocks themselves are described by the vertex descriptors, so their schemas are made per table (see wismt_vertex_schema)
+wismtVertexDescFormats = {
+							0:["f4",3], # position
+							3:["u4"], # weights index
+							5:["f4",2], # UV 1
+							6:["f4",2], # UV 2
+							7:["f4",2], # UV 3
+							17:["u1",4], # colour 1 (ARGB)
+							28:["i1",4], # normal (plus a dummy)
+							41:["u2",4], # weight values (weightTable verts only)
+							42:["u1",4], # weight IDs (weightTable verts only)
+							}
+
+# returns the schema, the field name for each known vdType, and the unknown vdTypes (which just become raw byte fields)
+def wismt_vertex_schema(vertexDescriptors,blockSize):
+	fields = []
+	fieldsByType = {}
+	unknownTypes = {}
+	for vdType,vdSize in vertexDescriptors:
+		fieldName = "vd"+str(len(fields))
+		if vdType in wismtVertexDescFormats.keys():
+			fields.append([fieldName]+wismtVertexDescFormats[vdType])
+			fieldsByType[vdType] = fieldName # if a type is somehow in there twice, the later one wins (same as reading in order would)
+		else:
+			unknownTypes[vdType] = vdSize
+			if vdSize > 0:
+				fields.append([fieldName,"u1",vdSize])
+	schema = RecordSchema(fields)
+	if blockSize > schema.size: # there can be padding at the end
+		schema = RecordSchema(fields,size=blockSize)
+	return schema,fieldsByType,unknownTypes
+
 def import_sar1_skel_subfile(f, context):
 	game = context.scene.monado_forge_main.game
 	printProgress = context.scene.monado_forge_main.printProgress
 	importEndpoints = context.scene.monado_forge_import.importEndpoints
 	
-	magic = f.read(4)
+	r = BinaryReader(f)
+	magic = r.raw(0,4)
 	if magic != b"1RAS":
-		print_error(f.name+" is not a valid SAR1 file (unexpected header)")
+		print_error(r.name+" is not a valid SAR1 file (unexpected header)")
 		return None
-	fileSize = readAndParseInt(f,4)
-	version = readAndParseInt(f,4)
-	numFiles = readAndParseInt(f,4)
-	tocOffset = readAndParseInt(f,4)
-	dataOffset = readAndParseInt(f,4)
-	unknown1 = readAndParseInt(f,4)
-	unknown2 = readAndParseInt(f,4)
-	path = readStr(f)
+	fileSize,version,numFiles,tocOffset,dataOffset,unknown1,unknown2 = r.unpack("7L",4)
+	names = r.stringPool()
+	path = names.get(32)
 	
 	importedSkeletons = []
 	for i in range(numFiles):
-		f.seek(tocOffset+i*0x40)
-		offset = readAndParseInt(f,4)
-		size = readAndParseInt(f,4)
-		unknown = readAndParseInt(f,4)
-		filename = readStr(f)
+		offset,size,unknown = r.unpack("3L",tocOffset+i*0x40)
+		filename = names.get(tocOffset+i*0x40+12)
 		# todo: try to do this based on file type instead of name
 		if game == "XC3":
 			skelFilename = "skeleton"
@@ -44,33 +95,21 @@ def import_sar1_skel_subfile(f, context):
 		if skelFilename not in filename: # yes, we're just dropping everything that's not a skeleton, we ain't lookin for them
 			continue
 		
-		f.seek(offset)
-		bcMagic = f.read(4)
+		bcMagic = r.raw(offset,4)
 		if bcMagic == b"LCHC": # some sort of special case I guess? (seen in XBC2ModelDecomp)
 			continue
 		if bcMagic != b"BC\x00\x00": # BC check
 			print_error("BC check failed for "+filename+" (dunno what this means tbh, file probably bad in some way e.g. wrong endianness)")
 			continue
-		blockCount = readAndParseInt(f,4)
-		fileSize = readAndParseInt(f,4)
-		pointerCount = readAndParseInt(f,4)
-		dataOffset = readAndParseInt(f,4)
+		blockCount,fileSize,pointerCount,dataOffset = r.unpack("4L",offset+4)
 		
-		f.seek(offset+dataOffset+4)
-		skelMagic = f.read(4)
+		skelMagic = r.raw(offset+dataOffset+4,4)
 		if skelMagic != b"SKEL":
 			print_error(".skl file "+filename+" has bad header")
 			return None
 		
-		skelHeaderUnknown1 = readAndParseInt(f,4)
-		skelHeaderUnknown2 = readAndParseInt(f,4)
-		skelTocItems = []
-		for j in range(10): # yeah it's a magic number, deal with it
-			itemOffset = readAndParseInt(f,4)
-			itemUnknown1 = readAndParseInt(f,4)
-			itemCount = readAndParseInt(f,4)
-			itemUnknown2 = readAndParseInt(f,4)
-			skelTocItems.append([itemOffset,itemUnknown1,itemCount,itemUnknown2])
+		skelHeaderUnknown1,skelHeaderUnknown2 = r.unpack("2L",offset+dataOffset+8)
+		skelTocItems = r.unpackArray("4L",offset+dataOffset+16,10) # yeah it's a magic number, deal with it; each is [offset, unknown, count, unknown]
 		
 		# finally we have the datums
 		# TOC layout:
@@ -98,28 +137,10 @@ def import_sar1_skel_subfile(f, context):
 				print_warning(".skl file "+filename+" has inconsistent endpoint counts (see console); endpoint import skipped")
 		forgeBones = []
 		for b in range(skelTocItems[2][2]):
-			# parent
-			f.seek(offset+skelTocItems[2][0]+b*2)
-			parent = readAndParseInt(f,2,signed=True)
-			# name
-			f.seek(offset+skelTocItems[3][0]+b*16)
-			nameOffset = readAndParseInt(f,4)
-			f.seek(offset+nameOffset)
-			name = readStr(f)
-			# data
-			f.seek(offset+skelTocItems[4][0]+b*(4*12))
-			px = readAndParseFloat(f)
-			py = readAndParseFloat(f)
-			pz = readAndParseFloat(f)
-			pw = readAndParseFloat(f)
-			rx = readAndParseFloat(f)
-			ry = readAndParseFloat(f)
-			rz = readAndParseFloat(f)
-			rw = readAndParseFloat(f)
-			sx = readAndParseFloat(f)
-			sy = readAndParseFloat(f)
-			sz = readAndParseFloat(f)
-			sw = readAndParseFloat(f)
+			parent = r.i16(offset+skelTocItems[2][0]+b*2)
+			nameOffset = r.u32(offset+skelTocItems[3][0]+b*16)
+			name = names.get(offset+nameOffset)
+			px,py,pz,pw,rx,ry,rz,rw,sx,sy,sz,sw = r.unpack("12f",offset+skelTocItems[4][0]+b*(4*12))
 			# reminder that the pos and scale are x,y,z,w but the rotation is w,x,y,z
 			fb = MonadoForgeBone(len(forgeBones))
 			fb.name = name
@@ -131,28 +152,10 @@ def import_sar1_skel_subfile(f, context):
 			forgeBones.append(fb)
 		if importEndpoints:
 			for ep in range(skelTocItems[6][2]):
-				# parent
-				f.seek(offset+skelTocItems[6][0]+ep*2)
-				parent = readAndParseInt(f,2,signed=True)
-				# name
-				f.seek(offset+skelTocItems[7][0]+ep*8) # yeah endpoint names are packed tighter than "normal" bone names
-				nameOffset = readAndParseInt(f,4)
-				f.seek(offset+nameOffset)
-				name = readStr(f)
-				# data
-				f.seek(offset+skelTocItems[8][0]+ep*(4*12))
-				px = readAndParseFloat(f)
-				py = readAndParseFloat(f)
-				pz = readAndParseFloat(f)
-				pw = readAndParseFloat(f)
-				rx = readAndParseFloat(f)
-				ry = readAndParseFloat(f)
-				rz = readAndParseFloat(f)
-				rw = readAndParseFloat(f)
-				sx = readAndParseFloat(f)
-				sy = readAndParseFloat(f)
-				sz = readAndParseFloat(f)
-				sw = readAndParseFloat(f)
+				parent = r.i16(offset+skelTocItems[6][0]+ep*2)
+				nameOffset = r.u32(offset+skelTocItems[7][0]+ep*8) # yeah endpoint names are packed tighter than "normal" bone names
+				name = names.get(offset+nameOffset)
+				px,py,pz,pw,rx,ry,rz,rw,sx,sy,sz,sw = r.unpack("12f",offset+skelTocItems[8][0]+ep*(4*12))
 				# for some reason, endpoints tend to have pw = 0, which positions it relative to root instead of parent (and we don't want that)
 				if pw == 0.0: pw = 1.0
 				# reminder that the pos and scale are x,y,z,w but the rotation is w,x,y,z
@@ -167,6 +170,7 @@ def import_sar1_skel_subfile(f, context):
 		if printProgress:
 			print("Read "+str(len(forgeBones))+" bones.")
 		importedSkeletons.append(forgeBones)
+	r.close()
 	if not importedSkeletons:
 		print_warning("No valid .skl items found in file")
 		return None
@@ -181,18 +185,12 @@ def import_sar1_skel_subfile(f, context):
 def import_wimdo(f, context, externalSkeleton=None):
 	printProgress = context.scene.monado_forge_main.printProgress
 	# little endian assumed
-	magic = f.read(4)
+	r = BinaryReader(f)
+	magic = r.raw(0,4)
 	if magic != b"DMXM":
 		raise ValueError("Not a valid .wimdo file (unexpected header)")
-	version = readAndParseInt(f,4)
-	modelsOffset = readAndParseInt(f,4)
-	materialsOffset = readAndParseInt(f,4)
-	unknown1 = readAndParseInt(f,4)
-	vertexBufferOffset = readAndParseInt(f,4)
-	shadersOffset = readAndParseInt(f,4)
-	cachedTexturesTableOffset = readAndParseInt(f,4)
-	unknown2 = readAndParseInt(f,4)
-	uncachedTexturesTableOffset = readAndParseInt(f,4)
+	version,modelsOffset,materialsOffset,unknown1,vertexBufferOffset,shadersOffset,cachedTexturesTableOffset,unknown2,uncachedTexturesTableOffset = r.unpack("9L",4)
+	names = r.stringPool()
 	
 	# assumption: there can be only one skeleton per .wimdo
 	forgeBones = []
@@ -202,68 +200,35 @@ def import_wimdo(f, context, externalSkeleton=None):
 	materials = []
 	
 	if modelsOffset > 0:
-		f.seek(modelsOffset)
-		meshesUnknown1 = readAndParseInt(f,4)
-		boundingBoxStart = [readAndParseFloat(f),readAndParseFloat(f),readAndParseFloat(f)]
-		boundingBoxEnd = [readAndParseFloat(f),readAndParseFloat(f),readAndParseFloat(f)]
-		meshDataOffset = readAndParseInt(f,4)
-		meshCount = readAndParseInt(f,4)
-		meshesUnknown2 = readAndParseInt(f,4)
-		bonesOffset = readAndParseInt(f,4)
-		f.seek(f.tell()+21*4) # skip these unknowns
-		shapeItemsOffset = readAndParseInt(f,4)
-		shapeNamesOffset = readAndParseInt(f,4)
-		f.seek(modelsOffset+21*4) # skip s'more
-		lodsOffset = readAndParseInt(f,4)
+		meshesUnknown1 = r.u32(modelsOffset)
+		boundingBoxStart = r.unpack("3f",modelsOffset+4)
+		boundingBoxEnd = r.unpack("3f",modelsOffset+16)
+		meshDataOffset,meshCount,meshesUnknown2,bonesOffset = r.unpack("4L",modelsOffset+28)
+		# skip a bunch of unknowns
+		shapeItemsOffset,shapeNamesOffset = r.unpack("2L",modelsOffset+128)
+		lodsOffset = r.u32(modelsOffset+84)
 		
 		if meshCount > 0:
-			f.seek(modelsOffset+meshDataOffset)
-			for i in range(meshCount):
-				meshTableOffset = readAndParseInt(f,4)
-				meshTableCount = readAndParseInt(f,4)
-				meshUnknown1 = readAndParseInt(f,4)
-				meshBoundingBoxStart = [readAndParseFloat(f),readAndParseFloat(f),readAndParseFloat(f)]
-				meshBoundingBoxEnd = [readAndParseFloat(f),readAndParseFloat(f),readAndParseFloat(f)]
-				meshBoundingRadius = readAndParseFloat(f)
-				f.seek(modelsOffset+meshTableOffset)
-				for j in range(meshTableCount):
-					meshID = readAndParseInt(f,4)
-					meshFlags1 = readAndParseInt(f,2)
-					meshFlags2 = readAndParseInt(f,2)
-					meshVertTableIndex = readAndParseInt(f,2)
-					meshFaceTableIndex = readAndParseInt(f,2)
-					f.seek(f.tell()+2) # skip unknown
-					meshMaterialIndex = readAndParseInt(f,2)
-					f.seek(f.tell()+14) # skip unknown
-					meshLODValue = readAndParseInt(f,1)
-					f.seek(f.tell()+17) # skip unknown
-					meshHeaders.append(MonadoForgeMeshHeader(meshID,meshFlags1,meshFlags2,meshVertTableIndex,meshFaceTableIndex,meshMaterialIndex,meshLODValue))
+			meshGroups = r.table(wimdoMeshGroupSchema,modelsOffset+meshDataOffset,meshCount)
+			for meshTableOffset,meshTableCount in zip(*tableColumns(meshGroups,"tableOffset","tableCount")):
+				meshTable = r.table(wimdoMeshSchema,modelsOffset+meshTableOffset,meshTableCount)
+				for meshHeaderValues in zip(*tableColumns(meshTable,"id","flags1","flags2","vertTableIndex","faceTableIndex","materialIndex","lod")):
+					meshHeaders.append(MonadoForgeMeshHeader(*meshHeaderValues))
 			if printProgress:
 				print("Found "+str(len(meshHeaders))+" mesh headers.")
 		
 		if bonesOffset > 0:
-			f.seek(modelsOffset+bonesOffset)
-			boneCount = readAndParseInt(f,4)
-			boneCount2 = readAndParseInt(f,4)
-			boneHeaderOffset = readAndParseInt(f,4)
-			boneMatrixesOffset = readAndParseInt(f,4)
-			bonesUnknown1 = readAndParseInt(f,4)
-			bonesUnknown2 = readAndParseInt(f,4) # claimed by XBC2MD to be "positions offset", but that's part of the matrixes
-			bonePairsOffset = readAndParseInt(f,4)
+			boneCount,boneCount2,boneHeaderOffset,boneMatrixesOffset,bonesUnknown1,bonesUnknown2,bonePairsOffset = r.unpack("7L",modelsOffset+bonesOffset)
+			# bonesUnknown2 is claimed by XBC2MD to be "positions offset", but that's part of the matrixes
 			
 			for b in range(boneCount):
-				f.seek(modelsOffset+bonesOffset+boneHeaderOffset+b*6*4)
-				nameOffset = readAndParseInt(f,4)
-				boneUnknown1 = readAndParseInt(f,4)
-				boneType = readAndParseInt(f,4)
-				boneIndex = readAndParseInt(f,4)
-				f.seek(modelsOffset+bonesOffset+nameOffset)
-				boneName = readStr(f)
-				f.seek(modelsOffset+bonesOffset+boneMatrixesOffset+b*16*4)
-				boneXAxis = [readAndParseFloat(f),readAndParseFloat(f),readAndParseFloat(f),readAndParseFloat(f)]
-				boneYAxis = [readAndParseFloat(f),readAndParseFloat(f),readAndParseFloat(f),readAndParseFloat(f)]
-				boneZAxis = [readAndParseFloat(f),readAndParseFloat(f),readAndParseFloat(f),readAndParseFloat(f)]
-				bonePosition = [-readAndParseFloat(f),-readAndParseFloat(f),-readAndParseFloat(f),-readAndParseFloat(f)] # yes, the negatives are needed
+				nameOffset,boneUnknown1,boneType,boneIndex = r.unpack("4L",modelsOffset+bonesOffset+boneHeaderOffset+b*6*4)
+				boneName = names.get(modelsOffset+bonesOffset+nameOffset)
+				matrixValues = r.unpack("16f",modelsOffset+bonesOffset+boneMatrixesOffset+b*16*4)
+				boneXAxis = list(matrixValues[0:4])
+				boneYAxis = list(matrixValues[4:8])
+				boneZAxis = list(matrixValues[8:12])
+				bonePosition = [-x for x in matrixValues[12:16]] # yes, the negatives are needed
 				# the position needs to be modified by the matrix in order to place it as expected
 				posMatrix = mathutils.Matrix.Translation(bonePosition)
 				rotMatrix = mathutils.Matrix([boneXAxis,boneYAxis,boneZAxis,bonePosition])
@@ -277,91 +242,45 @@ def import_wimdo(f, context, externalSkeleton=None):
 				print("Found "+str(len(forgeBones))+" bones.")
 		
 		if shapeItemsOffset > 0:
-			f.seek(modelsOffset+shapeItemsOffset)
-			shapeHeaderOffset = readAndParseInt(f,4)
-			shapeHeaderCount = readAndParseInt(f,4)
+			shapeHeaderOffset,shapeHeaderCount = r.unpack("2L",modelsOffset+shapeItemsOffset)
 			for i in range(shapeHeaderCount):
-				f.seek(modelsOffset+shapeItemsOffset+shapeHeaderOffset+i*7*4)
-				shapeNameOffset1 = readAndParseInt(f,4)
-				shapeNameOffset2 = readAndParseInt(f,4)
+				shapeNameOffset1,shapeNameOffset2 = r.unpack("2L",modelsOffset+shapeItemsOffset+shapeHeaderOffset+i*7*4)
 				# it's unclear what the difference in these is supposed to be (the resulting strings seem to always be the same)
 				# there's a bunch of other stuff here but it doesn't seem like we need it?
-				f.seek(modelsOffset+shapeItemsOffset+shapeNameOffset1)
-				shapeName1 = readStr(f)
-				f.seek(modelsOffset+shapeItemsOffset+shapeNameOffset2)
-				shapeName2 = readStr(f)
+				shapeName1 = names.get(modelsOffset+shapeItemsOffset+shapeNameOffset1)
+				shapeName2 = names.get(modelsOffset+shapeItemsOffset+shapeNameOffset2)
 				shapeHeaders.append([shapeName1])
 			if printProgress:
 				print("Found "+str(len(shapeHeaders))+" shape headers.")
 		# apparently you can have shapes with controllers without names? odd
 		if shapeNamesOffset > 0:
-			f.seek(modelsOffset+shapeNamesOffset)
-			shapeNameTableOffset = readAndParseInt(f,4)
-			shapeNameTableCount = readAndParseInt(f,4)
+			shapeNameTableOffset,shapeNameTableCount = r.unpack("2L",modelsOffset+shapeNamesOffset)
 			for i in range(shapeNameTableCount):
-				f.seek(modelsOffset+shapeNamesOffset+shapeNameTableOffset+i*4*4)
-				shapeNameOffset = readAndParseInt(f,4)
-				f.seek(modelsOffset+shapeNamesOffset+shapeNameOffset)
-				shapeNames.append(readStr(f))
+				shapeNameOffset = r.u32(modelsOffset+shapeNamesOffset+shapeNameTableOffset+i*4*4)
+				shapeNames.append(names.get(modelsOffset+shapeNamesOffset+shapeNameOffset))
 	
 	# we have to do this even if skipMaterialImport, because the material render pass is needed to get the correct weight table
 	if materialsOffset > 0:
-		f.seek(materialsOffset)
-		materialHeadersOffset = readAndParseInt(f,4)
-		materialCount = readAndParseInt(f,4)
-		materialUnknown1 = readAndParseInt(f,4)
-		materialUnknown2 = readAndParseInt(f,4)
-		materialExtraDataOffset = readAndParseInt(f,4)
-		materialExtraDataCount = readAndParseInt(f,4)
+		materialHeadersOffset,materialCount,materialUnknown1,materialUnknown2,materialExtraDataOffset,materialExtraDataCount = r.unpack("6L",materialsOffset)
 		# a bunch of unknowns follow (looks likely to be offset+count pairs), skipping entirely for the moment
-		f.seek(materialsOffset+92) # a magic number unfortunately
-		samplerTableOffset = readAndParseInt(f,4)
+		samplerTableOffset = r.u32(materialsOffset+92) # a magic number unfortunately
 		# get the samplers now so we can put them in the materials
-		f.seek(materialsOffset+samplerTableOffset)
-		samplerCount = readAndParseInt(f,4)
-		samplerOffset = readAndParseInt(f,4)
-		f.seek(materialsOffset+samplerTableOffset+samplerOffset)
-		samplers = []
-		for s in range(samplerCount):
-			samplers.append([readAndParseInt(f,4),readAndParseFloat(f)]) # flags, LOD bias (don't need to parse/understand here)
-		f.seek(materialsOffset+materialHeadersOffset)
+		samplerCount,samplerOffset = r.unpack("2L",materialsOffset+samplerTableOffset)
+		samplers = [list(s) for s in r.unpackArray("Lf",materialsOffset+samplerTableOffset+samplerOffset,samplerCount)] # flags, LOD bias (don't need to parse/understand here)
 		for m in range(materialCount):
-			matNameOffset = readAndParseInt(f,4)
-			matFlags1 = readAndParseInt(f,4)
-			matFlags2 = readAndParseInt(f,4)
-			matBaseColour = [toBlenderColour_Float(readAndParseFloat(f)),toBlenderColour_Float(readAndParseFloat(f)),toBlenderColour_Float(readAndParseFloat(f)),readAndParseFloat(f)]
-			matU0 = readAndParseFloat(f)
-			matTextureTableOffset = readAndParseInt(f,4)
-			matTextureCount = readAndParseInt(f,4)
-			matU1 = readAndParseInt(f,4) # some sort of flags, probably
-			matU2 = readAndParseInt(f,4)
-			matU3 = readAndParseInt(f,4)
-			matU4 = readAndParseInt(f,4)
-			matU5 = readAndParseInt(f,4)
-			matU6 = readAndParseInt(f,4)
-			matExtraDataIndex = readAndParseInt(f,4)
-			matU7 = readAndParseInt(f,4)
-			matU8 = readAndParseInt(f,4)
-			matU9 = readAndParseInt(f,4) # this is an offset that we need later
-			matU10 = readAndParseInt(f,4)
-			matU11 = readAndParseInt(f,4)
-			matU12 = readAndParseInt(f,4)
-			matU13 = readAndParseInt(f,4)
-			matU14 = readAndParseInt(f,4)
-			matU15 = readAndParseInt(f,4)
-			matU16 = readAndParseInt(f,4)
-			matU17 = readAndParseInt(f,4)
-			matU18 = readAndParseInt(f,4)
-			ftemp = f.tell()
-			f.seek(materialsOffset+matNameOffset)
-			matName = readStr(f)
-			f.seek(materialsOffset+matTextureTableOffset)
-			matTextureTable = []
-			for t in range(matTextureCount):
-				matTextureTable.append([readAndParseInt(f,2),readAndParseInt(f,2),readAndParseInt(f,2),readAndParseInt(f,2)])
-			f.seek(materialsOffset+matU9+4)
-			renderPassType = readAndParseInt(f,2)
-			f.seek(ftemp)
+			matHeader = r.unpack("3L5f21L",materialsOffset+materialHeadersOffset+m*29*4)
+			matNameOffset,matFlags1,matFlags2 = matHeader[0:3]
+			matBaseColour = [toBlenderColour_Float(matHeader[3]),toBlenderColour_Float(matHeader[4]),toBlenderColour_Float(matHeader[5]),matHeader[6]]
+			matU0 = matHeader[7]
+			matTextureTableOffset,matTextureCount = matHeader[8:10]
+			matU1,matU2,matU3,matU4,matU5,matU6 = matHeader[10:16] # matU1 is some sort of flags, probably
+			matExtraDataIndex = matHeader[16]
+			matU7,matU8 = matHeader[17:19]
+			matU9 = matHeader[19] # this is an offset that we need later
+			matU10,matU11,matU12,matU13,matU14,matU15,matU16,matU17,matU18 = matHeader[20:29]
+			matName = names.get(materialsOffset+matNameOffset)
+			matTextureTable = [list(t) for t in r.unpackArray("4H",materialsOffset+matTextureTableOffset,matTextureCount)]
+			renderPassType = r.u16(materialsOffset+matU9+4)
 			#materials.append([matName,matBaseColour,matTextureTable,matExtraDataIndex])
 			mat = MonadoForgeWimdoMaterial(m)
 			mat.name = matName
@@ -371,10 +290,7 @@ def import_wimdo(f, context, externalSkeleton=None):
 			mat.extraDataIndex = matExtraDataIndex
 			mat.renderPassType = renderPassType
 			materials.append(mat)
-		f.seek(materialsOffset+materialExtraDataOffset)
-		materialExtraData = []
-		for mx in range(materialExtraDataCount):
-			materialExtraData.append(readAndParseFloat(f))
+		materialExtraData = list(r.unpack(str(materialExtraDataCount)+"f",materialsOffset+materialExtraDataOffset))
 		splitExtraData = []
 		matCounter = -1
 		nextStart = materials[0].extraDataIndex
@@ -390,14 +306,9 @@ def import_wimdo(f, context, externalSkeleton=None):
 			materials[i].extraData = sxd
 		if printProgress:
 			print("Found "+str(len(materials))+" materials.")
-	if vertexBufferOffset > 0:
-		f.seek(vertexBufferOffset)
-	if shadersOffset > 0:
-		f.seek(shadersOffset)
-	if cachedTexturesTableOffset > 0:
-		f.seek(cachedTexturesTableOffset)
-	if uncachedTexturesTableOffset > 0: # don't need this for the texture files themselves - it's for metadata (alpha, repeat, etc)
-		f.seek(uncachedTexturesTableOffset)
+	# not yet used: vertexBufferOffset, shadersOffset, cachedTexturesTableOffset, uncachedTexturesTableOffset
+	# (the last isn't needed for the texture files themselves - it's for metadata (alpha, repeat, etc))
+	r.close()
 	
 	skeleton = MonadoForgeSkeleton()
 	skeleton.bones = forgeBones
@@ -406,31 +317,118 @@ def import_wimdo(f, context, externalSkeleton=None):
 		print("Finished parsing .wimdo file.")
 	return results
 
-def extract_wismt_subfile(f, headerOffset, context, headless=False):
-	f.seek(headerOffset)
-	compressedSize = readAndParseInt(f,4)
-	uncompressedSize = readAndParseInt(f,4)
-	dataOffset = readAndParseInt(f,4)
-	f.seek(dataOffset)
+# how much compressed data to feed the decompressor at a time
+xbc1ChunkSize = 1 << 20
+# how many high-res texture subfiles can be decompressed ahead of the one currently being decoded (each is held in memory until used)
+xbc1MaxInFlight = 4
+
+# decompress straight into one preallocated buffer, a chunk at a time, rather than holding the whole output twice over
+# this also lets us stop as soon as we have everything we need (if partial)
+# this doesn't touch anything Blender-related, so it's safe to run on another thread (zlib lets go of the GIL while it works)
+def inflate_xbc1(compressed,targetSize,isPartial,subfileName):
+	content = bytearray(targetSize)
+	contentView = memoryview(content)
+	decompressor = zlib.decompressobj()
+	produced = 0
+	pending = b""
+	inPos = 0
+	while not decompressor.eof:
+		room = targetSize-produced
+		if isPartial and room == 0:
+			break
+		if not pending and inPos < len(compressed):
+			pending = compressed[inPos:inPos+xbc1ChunkSize]
+			inPos += len(pending)
+		out = decompressor.decompress(pending,room if isPartial else room+1) # the +1 is so that too much data gets noticed
+		pending = decompressor.unconsumed_tail
+		if len(out) > room:
+			raise ValueError("subfile "+subfileName+" decompressed to more than its claimed size of "+str(targetSize))
+		contentView[produced:produced+len(out)] = out
+		produced += len(out)
+		if not out and not pending and inPos >= len(compressed): # ran out of input
+			break
+	contentView.release()
+	if produced != targetSize or (not isPartial and not decompressor.eof):
+		raise ValueError("subfile "+subfileName+" did not decompress to its claimed size: "+str(produced)+" != "+str(targetSize))
+	return content
+
+# the main-thread half of extracting a subfile: reads the header and checks the cache
+# returns [subfileName,content] if it's cached, or [subfileName,None,inflateArgs,finishArgs] if it still needs decompressing
+# neededSize: only decompress this much of the start of the subfile (None = all of it)
+# if the extract cache is on, the whole thing is always decompressed (so it can be cached), and a cache hit returns an mmap
+def open_wismt_subfile(r, headerOffset, context, headless=False, neededSize=None):
+	compressedSize,uncompressedSize,dataOffset = r.unpack("3L",headerOffset)
 	if headless:
-		f.seek(headerOffset)
-	submagic = f.read(4)
+		dataOffset = headerOffset
+	submagic = r.raw(dataOffset,4)
 	if submagic != b"xbc1":
 		raise ValueError("subfile at "+str(headerOffset)+" has an invalid header (not \"xbc1\")")
-	subfileVersion = readAndParseInt(f,4)
-	subfileSize = readAndParseInt(f,4)
-	subfileCompressedSize = readAndParseInt(f,4)
-	subfileUnknown1 = readAndParseInt(f,4)
-	subfileName = readFixedLenStr(f,28)
-	content = zlib.decompress(f.read(subfileCompressedSize))
-	if len(content) != subfileSize:
-		raise ValueError("subfile "+subfileName+" did not decompress to its claimed size: "+str(len(content))+" != "+str(subfileSize))
+	subfileVersion,subfileSize,subfileCompressedSize,subfileUnknown1 = r.unpack("4L",dataOffset+4)
+	subfileName = r.fixedLenStr(dataOffset+20,28)
+	cache = get_extract_cache(context)
+	cacheKey = None
+	if cache and r.name and os.path.isfile(r.name):
+		cacheKey = file_cache_key(r.name,headerOffset,headless)
+		cached = cache.get(cacheKey)
+		if cached is not None and len(cached) == subfileSize:
+			return [subfileName,cached]
+		neededSize = None
+	if context.scene.monado_forge_main.dumpExtracts: # a dump is no use unless it's the whole thing
+		neededSize = None
+	isPartial = neededSize is not None and neededSize < subfileSize
+	targetSize = neededSize if isPartial else subfileSize
+	dumpPath = None
 	if context.scene.monado_forge_main.dumpExtracts:
-		contentStream = io.BytesIO(content)
-		with open(os.path.realpath(f.name)+".dump_"+("hl_" if headless else "")+str(headerOffset),"wb") as d:
-			d.write(contentStream.getbuffer())
+		dumpPath = os.path.realpath(r.name)+".dump_"+("hl_" if headless else "")+str(headerOffset)
+	inflateArgs = [r.view(dataOffset+48,subfileCompressedSize),targetSize,isPartial,subfileName]
+	finishArgs = [cache,cacheKey,dumpPath]
+	return [subfileName,None,inflateArgs,finishArgs]
+
+# the main-thread half of finishing up after decompression
+def finish_wismt_subfile(content,cache,cacheKey,dumpPath):
+	if cacheKey:
+		cache.put(cacheKey,content)
+	if dumpPath:
+		with open(dumpPath,"wb") as d:
+			d.write(content)
+
+def extract_wismt_subfile(r, headerOffset, context, headless=False, neededSize=None):
+	opened = open_wismt_subfile(r,headerOffset,context,headless,neededSize)
+	if opened[1] is not None:
+		return opened[0],opened[1]
+	subfileName,cached,inflateArgs,finishArgs = opened
+	content = inflate_xbc1(*inflateArgs)
+	inflateArgs[0].release()
+	finish_wismt_subfile(content,*finishArgs)
 	return subfileName,content
 
+# same as extract_wismt_subfile, but for a whole list of subfiles (one reader per subfile, or the same reader repeated)
+# they're decompressed on a thread pool, and yielded in order as they're needed
+# no more than maxInFlight are ever done (or in progress) but not yet taken, to keep memory in check
+def extract_wismt_subfiles(readersAndOffsets, context, headless=False, maxInFlight=xbc1MaxInFlight):
+	readersAndOffsets = iter(readersAndOffsets)
+	queued = collections.deque()
+	with concurrent.futures.ThreadPoolExecutor(max_workers=maxInFlight) as pool:
+		def queueNext():
+			for r,headerOffset in readersAndOffsets:
+				opened = open_wismt_subfile(r,headerOffset,context,headless)
+				if opened[1] is None:
+					opened.append(pool.submit(inflate_xbc1,*opened[2]))
+				queued.append(opened)
+				return
+		for i in range(maxInFlight):
+			queueNext()
+		while queued:
+			opened = queued.popleft()
+			if opened[1] is not None:
+				content = opened[1]
+			else:
+				content = opened[4].result()
+				opened[2][0].release()
+				finish_wismt_subfile(content,*opened[3])
+			queueNext()
+			yield opened[0],content
+
 def import_wismt(f, wimdoResults, context):
 	filename = os.path.splitext(os.path.basename(f.name))[0]
 	game = context.scene.monado_forge_main.game
@@ -449,22 +447,14 @@ def import_wismt(f, wimdoResults, context):
 	# renamed some stuff from older programs to make more sense:
 	# data items -> content pointers
 	# TOC -> subfile headers
-	magic = f.read(4)
+	r = BinaryReader(f)
+	magic = r.raw(0,4)
 	if magic != b"DRSM":
 		raise ValueError("Not a valid .wismt file (unexpected header)")
-	version = readAndParseInt(f,4)
-	headerSize = readAndParseInt(f,4)
-	mainOffset = readAndParseInt(f,4)
-	tag = readAndParseInt(f,4)
-	revision = readAndParseInt(f,4)
-	contentPointersCount = readAndParseInt(f,4)
-	contentPointersOffset = readAndParseInt(f,4)
-	subfileCount = readAndParseInt(f,4)
-	subfileHeadersOffset = readAndParseInt(f,4)
-	f.seek(f.tell()+7*4)
-	textureIDsCount = readAndParseInt(f,4)
-	textureIDsOffset = readAndParseInt(f,4)
-	textureCountOffset = readAndParseInt(f,4)
+	version,headerSize,mainOffset,tag,revision,contentPointersCount,contentPointersOffset,subfileCount,subfileHeadersOffset = r.unpack("9L",4)
+	names = r.stringPool()
+	# 7 unknowns
+	textureIDsCount,textureIDsOffset,textureCountOffset = r.unpack("3L",68)
 	
 	# here is the deal:
 	# content pointers can be models, shaders, cached textures, or uncached textures
@@ -477,43 +467,78 @@ def import_wismt(f, wimdoResults, context):
 	hasContentType = [False,False,False,False] # model, shader, cached texture, uncached texture
 	if contentPointersCount > 0:
 		for i in range(contentPointersCount):
-			f.seek(mainOffset+contentPointersOffset+i*5*4)
-			internalOffset = readAndParseInt(f,4)
-			contentSize = readAndParseInt(f,4)
-			highResSubfileIndex = readAndParseInt(f,2) - 1 # the -1 is needed to align properly
-			contentType = readAndParseInt(f,2)
+			internalOffset,contentSize,highResSubfileIndex,contentType = r.unpack("2L2H",mainOffset+contentPointersOffset+i*5*4)
+			highResSubfileIndex -= 1 # the -1 is needed to align properly
 			hasContentType[contentType] = True
 			contentPointers.append([internalOffset,contentSize,highResSubfileIndex,contentType])
 	textureIDList = []
 	if textureIDsOffset > 0 and not context.scene.monado_forge_import.skipMaterialImport:
-		f.seek(mainOffset+textureIDsOffset)
-		for i in range(textureIDsCount):
-			textureIDList.append(readAndParseInt(f,2))
+		textureIDList = list(r.unpack(str(textureIDsCount)+"H",mainOffset+textureIDsOffset))
 	textureHeaders = []
 	if textureCountOffset > 0 and not context.scene.monado_forge_import.skipMaterialImport:
-		f.seek(mainOffset+textureCountOffset)
-		textureCount = readAndParseInt(f,4)
-		textureChunkSize = readAndParseInt(f,4)
-		textureUnknown = readAndParseInt(f,4)
-		textureStringsOffset = readAndParseInt(f,4)
+		textureCount,textureChunkSize,textureUnknown,textureStringsOffset = r.unpack("4L",mainOffset+textureCountOffset)
 		for i in range(textureCount):
-			textureUnknown1 = readAndParseInt(f,4)
-			textureFilesize = readAndParseInt(f,4)
-			textureOffset = readAndParseInt(f,4)
-			textureNameOffset = readAndParseInt(f,4)
-			tempOffset = f.tell()
-			f.seek(mainOffset+textureCountOffset+textureNameOffset)
-			textureName = readStr(f)
-			f.seek(tempOffset)
+			textureUnknown1,textureFilesize,textureOffset,textureNameOffset = r.unpack("4L",mainOffset+textureCountOffset+16+i*16)
+			textureName = names.get(mainOffset+textureCountOffset+textureNameOffset)
 			textureHeaders.append([textureFilesize,textureOffset,textureNameOffset,textureName])
 		# not really sure why this is here, but it's in XBC2MD, so there must be a reason for it
 		# special case: if these offsets are the same, the IDs are in a different spot than usual (i.e. here right after the headers)
 		if textureIDsOffset == textureCountOffset:
-			textureIDList = []
-			for i in range(textureCount):
-				textureIDList.append(readAndParseInt(f,2))
+			textureIDList = list(r.unpack(str(textureCount)+"H",mainOffset+textureCountOffset+16+textureCount*16))
+	
+	keepAllResolutions = context.scene.monado_forge_import.keepAllResolutions
+	maxTextureSize = context.scene.monado_forge_import.maxTextureSize
+	importUncached = context.scene.monado_forge_import.importUncachedTextures and not context.scene.monado_forge_import.skipMaterialImport
+	texMPath = bpy.path.abspath(context.scene.monado_forge_import.textureRepoMPath)
+	texHPath = bpy.path.abspath(context.scene.monado_forge_import.textureRepoHPath)
+	useTextureRepos = game == "XC3" and importUncached and texMPath and texHPath
+	# textures with a bigger version elsewhere (in the uncached subfile, or in the XC3 repos)
+	texturesWithUncached = set()
+	if hasContentType[3] and importUncached:
+		texturesWithUncached = set(textureHeaders[textureIDList[cpi-3]][3] for cpi,cp in enumerate(contentPointers) if cp[3] == 3)
+	# cached textures that might yet be beaten by a bigger version that fits the max size
+	# if it turns out none does, the cached one is imported after all at the end (its queue_texture args are kept here for that, or None if it's already been done)
+	upgradableTextures = {}
 	
 	textureAlignment = {} # dict of {internal texture name : final name of image as it is in the Blender file}
+	# textures get decoded in the background, and their images made as they come back (still in this order, so later resolutions win as usual)
+	textureQueue = TextureDecodeQueue(texture_decode_worker_count(context),cache=get_texture_cache(context))
+	textureProgress = None # only started once the first texture's done, since they turn up in amongst reading everything else
+	def texture_done(nameToUse,imgWidth,imgHeight):
+		nonlocal textureProgress
+		if not textureProgress:
+			textureProgress = ProgressReporter(context,"Textures",len(textureHeaders),printProgress)
+		textureProgress.update(len(textureAlignment),detail=nameToUse+f" ({imgWidth}x{imgHeight})")
+	def queue_texture(textureName,nameToUse,imgType,imgWidth,imgHeight,rawData,dechannelise):
+		overwrite = context.scene.monado_forge_import.duplicateImageMethod
+		blueBC5 = context.scene.monado_forge_import.blueBC5
+		if texPath and context.scene.monado_forge_import.textureSaveFormat == "DDS" and can_save_texture_dds(imgType,blueBC5,dechannelise):
+			# nothing to decode, but it still goes through the queue so it happens in the same order as everything else
+			def create_dds(pixels):
+				textureAlignment[textureName] = create_texture_wismt_dds(nameToUse,imgType,imgWidth,imgHeight,rawData,
+					overwrite=overwrite,saveTo=texPath,existingImageNames=existingImageNames)
+				texture_done(nameToUse,imgWidth,imgHeight)
+			textureQueue.submit(nameToUse,imgType,imgWidth,imgHeight,None,blueBC5,create_dds)
+			return
+		def create(pixels):
+			textureAlignment[textureName] = create_texture_wismt(nameToUse,imgWidth,imgHeight,pixels,printProgress,
+				overwrite=overwrite,saveTo=texPath,dechannelise=dechannelise,existingImageNames=existingImageNames)
+			texture_done(nameToUse,imgWidth,imgHeight)
+		if reused_image_name(nameToUse,overwrite,existingImageNames):
+			rawData = None # no point decoding it
+		textureQueue.submit(nameToUse,imgType,imgWidth,imgHeight,rawData,blueBC5,create)
+	# which of the medium and high (double the medium) resolutions of an uncached texture to import
+	# normally that's the biggest that fits the max texture size (or every one that does, if keeping them all)
+	# if none fit, it's the cached one if there is one (see upgradableTextures), otherwise the medium one, since that's the smallest
+	def pick_uncached_resolutions(textureName,imgWidth,imgHeight,hasHigh):
+		hasCached = textureName in listOfCachedTextureNames
+		doHigh = hasHigh and fits_texture_budget(imgWidth*2,imgHeight*2,maxTextureSize)
+		doMedium = fits_texture_budget(imgWidth,imgHeight,maxTextureSize) or not hasCached
+		if not keepAllResolutions:
+			doMedium = doMedium and not doHigh
+		if doMedium or doHigh:
+			upgradableTextures.pop(textureName,None) # the cached one isn't needed any more
+		return doMedium,doHigh
 	
 	meshes = []
 	vertexWeights = []
@@ -524,498 +549,373 @@ def import_wismt(f, wimdoResults, context):
 	hasUncachedTexSubfile = hasContentType[3]
 	if hasRootSubfile:
 		subfileHeaderOffset = mainOffset+subfileHeadersOffset+nextSubfileIndex*3*4
-		subfileName,subfileData = extract_wismt_subfile(f,subfileHeaderOffset,context)
+		# only decompress as far as the last thing we're actually going to read (the cached textures tend to be at the end)
+		neededContentTypes = [0] if context.scene.monado_forge_import.skipMaterialImport else [0,2]
+		neededSize = max([cp[0]+cp[1] for cp in contentPointers if cp[3] in neededContentTypes],default=0)
+		subfileName,subfileData = extract_wismt_subfile(r,subfileHeaderOffset,context,neededSize=neededSize)
+		subfileReader = BinaryReader(subfileData)
 		for cp in contentPointers:
 			internalOffset,contentSize,highResSubfileIndex,contentType = cp
 			if contentType == 0: # model
-				data = subfileData[internalOffset:internalOffset+contentSize]
 				if printProgress:
 					print("Opening model subfile.")
-				sf = io.BytesIO(data)
-				try: # no except, just finally (to close sf)
-					vertexTableOffset = readAndParseInt(sf,4)
-					vertexTableCount = readAndParseInt(sf,4)
-					faceTableOffset = readAndParseInt(sf,4)
-					faceTableCount = readAndParseInt(sf,4)
-					sf.seek(sf.tell()+3*4)
-					extraTableOffset = readAndParseInt(sf,4)
-					outlineTableOffset = readAndParseInt(sf,4)
-					outlineTableCount = readAndParseInt(sf,4)
-					shapeDataOffset = readAndParseInt(sf,4)
-					dataSize = readAndParseInt(sf,4)
-					dataOffset = readAndParseInt(sf,4)
-					weightDataSize = readAndParseInt(sf,4)
-					weightDataOffset = readAndParseInt(sf,4)
-					# another 0x14 mystery reads
-					vertexTables = []
-					faceTables = []
-					outlineTables = []
-					weightTables = []
-					weightTableIndexConversion = []
-					shapeHeaders = []
-					shapeTargets = []
-					shapes = []
-					if vertexTableOffset > 0: # not sure how we can have a mesh without vertexes, but just in case
-						for i in range(vertexTableCount):
-							sf.seek(vertexTableOffset+i*8*4)
-							vtDataOffset = readAndParseInt(sf,4)
-							vtDataCount = readAndParseInt(sf,4)
-							vtBlockSize = readAndParseInt(sf,4)
-							vtDescOffset = readAndParseInt(sf,4)
-							vtDescCount = readAndParseInt(sf,4)
-							# 3 unknowns
-							sf.seek(vtDescOffset)
-							vertexDescriptors = []
-							for j in range(vtDescCount):
-								vdType = readAndParseInt(sf,2)
-								vdSize = readAndParseInt(sf,2)
-								vertexDescriptors.append([vdType,vdSize])
-							if extraTableOffset > 0:
-								sf.seek(extraTableOffset+i*3*4)
-								vtFlags = readAndParseInt(sf,2)
-								vtOutlineIndex = readAndParseInt(sf,2)
-								vtMorphIndex = readAndParseInt(sf,2)
-								vtMorphCount = readAndParseInt(sf,2)
-							vertexTables.append([vtDataOffset,vtDataCount,vtBlockSize,vtDescOffset,vtDescCount,vertexDescriptors,vtFlags,vtOutlineIndex,vtMorphIndex,vtMorphCount])
-						if printProgress:
-							print("Found "+str(len(vertexTables))+" vertex tables.")
-					if faceTableOffset > 0:
-						for i in range(faceTableCount):
-							sf.seek(faceTableOffset+i*5*4)
-							ftDataOffset = readAndParseInt(sf,4)
-							ftVertCount = readAndParseInt(sf,4)
-							# 3 unknowns
-							sf.seek(dataOffset+ftDataOffset)
-							ftVertexes = []
-							for j in range(ftVertCount):
-								ftVertexes.append(readAndParseInt(sf,2))
-							faceTables.append([ftDataOffset,ftVertCount,ftVertexes])
-						if printProgress:
-							print("Found "+str(len(faceTables))+" face tables.")
-					if outlineTableOffset > 0 and doOutlines:
-						for i in range(outlineTableCount):
-							sf.seek(outlineTableOffset+i*4*4)
-							otDataOffset = readAndParseInt(sf,4)
-							otDataCount = readAndParseInt(sf,4)
-							otBlockSize = readAndParseInt(sf,4)
-							# 1 unknown/null
-							sf.seek(otDataOffset+dataOffset)
-							otNormals = []
-							otColours = []
-							# how this works:
-							# if otBlockSize is 8, it includes a normal and a colour
-							# otherwise (it's 4), it's just a colour
-							for piece in range(otDataCount):
-								if otBlockSize == 8:
-									newNormal = [readAndParseInt(sf,1,signed=True)/128.0,readAndParseInt(sf,1,signed=True)/128.0,readAndParseInt(sf,1,signed=True)/128.0]
-									readAndParseInt(sf,1,signed=True) # dummy
-									otNormals.append(mathutils.Vector(newNormal).normalized()[:])
-								else:
-									otNormals.append([])
-								r,g,b,a = readAndParseInt(sf,1),readAndParseInt(sf,1),readAndParseInt(sf,1),readAndParseInt(sf,1)
-								otColours.append([r,g,b,a])
-							outlineTables.append([otDataOffset,otDataCount,otBlockSize,otNormals,otColours])
-						if printProgress:
-							print("Found "+str(len(outlineTables))+" outline tables.")
-					if weightDataOffset > 0:
-						sf.seek(weightDataOffset)
-						weightTableCount = readAndParseInt(sf,4)
-						weightTableOffset = readAndParseInt(sf,4)
-						weightVertTableIndex = readAndParseInt(sf,2)
-						weightTableLodCount = readAndParseInt(sf,2)
-						weightTableLodOffset = readAndParseInt(sf,4)
-						sf.seek(weightTableOffset)
-						for i in range(weightTableCount):
-							# buncha unknowns in here, might not use it necessarily
-							wtStartIndex = readAndParseInt(sf,4)
-							wtDataOffset = readAndParseInt(sf,4)
-							wtDataCount = readAndParseInt(sf,4)
-							sf.seek(sf.tell()+17)
-							wtLOD = readAndParseInt(sf,1)
-							sf.seek(sf.tell()+10)
-							weightTables.append([wtStartIndex,wtDataOffset,wtDataCount,wtLOD])
-						sf.seek(weightTableLodOffset)
-						for i in range(weightTableLodCount):
-							weightTableIndexConversion.append([])
-							for j in range(9): # apparently this is fixed (https://github.com/atnavon/xc2f/wiki/Geometry)
-								weightTableIndexConversion[-1].append(readAndParseInt(sf,2)-1) # doing a -1 here for easier debugging later
-						if printProgress:
-							print("Found "+str(len(weightTables))+" weight tables.")
-					if shapeDataOffset > 0:
-						sf.seek(shapeDataOffset)
-						shapeHeaderCount = readAndParseInt(sf,4)
-						shapeHeaderOffset = readAndParseInt(sf,4)
-						shapeTargetCount = readAndParseInt(sf,4)
-						shapeTargetOffset = readAndParseInt(sf,4)
-						sf.seek(shapeHeaderOffset)
-						for i in range(shapeHeaderCount):
-							shapeDataChunkID = readAndParseInt(sf,4)
-							shapeTargetIndex = readAndParseInt(sf,4)
-							shapeTargetCounts = readAndParseInt(sf,4)
-							shapeTargetIDOffset = readAndParseInt(sf,4)
-							dummy = readAndParseInt(sf,4)
-							shapeHeaders.append([shapeDataChunkID,shapeTargetIndex,shapeTargetCounts,shapeTargetIDOffset])
-						sf.seek(shapeTargetOffset)
-						for i in range(shapeTargetCount):
-							targetDataChunkOffset = readAndParseInt(sf,4)
-							targetVertexCount = readAndParseInt(sf,4)
-							targetBlockSize = readAndParseInt(sf,4)
-							targetUnknown = readAndParseInt(sf,2)
-							targetType = readAndParseInt(sf,2)
-							shapeTargets.append([targetDataChunkOffset,targetVertexCount,targetBlockSize,targetUnknown,targetType])
-						if printProgress:
-							print("Found "+str(len(shapeTargets))+" shapekeys.")
-					
-					# tables ready, now read the actual data
-					unknownVDTypes = {}
-					vertexData = {}
-					faceData = {}
-					vertexWeightData = {} # assumption: a single vertex cannot both contain actual data and be one of the "weight container only" vertices
-					# we need to read shapes (if any) first
-					# this is because a mesh with a shape does not define positions or normals for its vertices,
-					# instead relying on the base shape to do that for it,
-					# which means we need that data for correct double detection later
-					baseShapeData = {}
-					for i in range(len(shapeHeaders)):
-						shapeDataChunkID,shapeTargetIndex,shapeTargetCounts,shapeTargetIDOffset = shapeHeaders[i]
-						targetDataChunkOffset,targetVertexCount,targetBlockSize,targetUnknown,targetType = shapeTargets[shapeTargetIndex]
-						sf.seek(shapeTargetIDOffset)
-						targetIDs = []
-						for j in range(shapeTargetCounts):
-							targetIDs.append(readAndParseInt(sf,2))
-						sf.seek(dataOffset+targetDataChunkOffset)
-						# first, get the base shape
-						# having shapes means that normals are unsigned (unlike elsewhere) so compensate for that
-						baseShapeData[shapeDataChunkID] = {"v":[],"n":[]}
-						for j in range(targetVertexCount):
-							baseShapeData[shapeDataChunkID]["v"].append([readAndParseFloat(sf),readAndParseFloat(sf),readAndParseFloat(sf)])
-							newNormal = [(readAndParseInt(sf,1)/255.0)*2-1,(readAndParseInt(sf,1)/255.0)*2-1,(readAndParseInt(sf,1)/255.0)*2-1]
-							# doesn't necessarily read as normalized
-							baseShapeData[shapeDataChunkID]["n"].append(mathutils.Vector(newNormal).normalized()[:])
-							sf.seek(sf.tell()+targetBlockSize-15) # the magic -15 is the length of the position+normal (4*3 + 3)
-						shapeNameList = ["basis"] + [h[0] for h in wimdoResults.shapeHeaders] # "basis" needs to be added because the first target is also the base shape for some reason
-						for j in range(shapeTargetCounts+1):
-							if j == 0: continue # as above, the first is the basis so we don't need it
-							# it's okay to overwrite these variables, we don't need the above ones anymore
-							targetDataChunkOffset,targetVertexCount,targetBlockSize,targetUnknown,targetType = shapeTargets[shapeTargetIndex+j+1]
-							sf.seek(dataOffset+targetDataChunkOffset)
-							newShape = MonadoForgeMeshShape()
-							for k in range(targetVertexCount):
-								newPosition = [readAndParseFloat(sf),readAndParseFloat(sf),readAndParseFloat(sf)]
-								readAndParseInt(sf,4) # dummy
-								newNormal = [(readAndParseInt(sf,1)/255.0)*2-1,(readAndParseInt(sf,1)/255.0)*2-1,(readAndParseInt(sf,1)/255.0)*2-1]
-								readAndParseInt(sf,1) # more dummies
-								readAndParseInt(sf,4)
-								readAndParseInt(sf,4)
-								index = readAndParseInt(sf,4)
-								newVertex = MonadoForgeVertex(index)
-								newVertex.position = newPosition
-								# doesn't necessarily read as normalized
-								newVertex.setNormal(index,mathutils.Vector(newNormal).normalized()[:])
-								newShape.setVertex(index,newVertex)
-							newShape.vertexTableIndex = shapeDataChunkID
-							newShape.name = shapeNameList[j] # probably wrong but need to find a counterexample
-							shapes.append(newShape)
-					shapesByVertexTableIndex = {}
-					for s in shapes:
-						thisShapesIndex = s.vertexTableIndex
-						if thisShapesIndex in shapesByVertexTableIndex.keys():
-							shapesByVertexTableIndex[thisShapesIndex].append(s)
-						else:
-							shapesByVertexTableIndex[thisShapesIndex] = [s]
-					if printProgress and shapes != []:
-						print("Finished reading shape data.")
-					for i in range(len(vertexTables)):
-						vertexData[i] = MonadoForgeVertexList()
-						vertexWeightData[i] = []
-						vtDataOffset,vtDataCount,vtBlockSize,vtDescOffset,vtDescCount,vertexDescriptors,vtFlags,vtOutlineIndex,vtMorphIndex,vtMorphCount = vertexTables[i]
-						sf.seek(dataOffset+vtDataOffset)
-						hasShapes = i in baseShapeData.keys()
-						hasOutline = vtFlags % 2 == 1
+				sf = subfileReader.sub(internalOffset,contentSize)
+				vertexTableOffset,vertexTableCount,faceTableOffset,faceTableCount = sf.unpack("4L",0)
+				# 3 unknowns
+				extraTableOffset,outlineTableOffset,outlineTableCount,shapeDataOffset,dataSize,dataOffset,weightDataSize,weightDataOffset = sf.unpack("8L",28)
+				# another 0x14 mystery reads
+				vertexTables = []
+				faceTables = []
+				outlineTables = []
+				weightTables = []
+				weightTableIndexConversion = []
+				shapeHeaders = []
+				shapeTargets = []
+				shapes = []
+				if vertexTableOffset > 0: # not sure how we can have a mesh without vertexes, but just in case
+					vtTable = sf.table(wismtVertexTableSchema,vertexTableOffset,vertexTableCount)
+					if extraTableOffset > 0:
+						vtExtras = zip(*tableColumns(sf.table(wismtVertexExtraSchema,extraTableOffset,vertexTableCount),"flags","outlineIndex","morphIndex","morphCount"))
+					else: # no outlines or morphs anywhere
+						vtExtras = [[0,0,0,0]]*vertexTableCount
+					for vt,vtExtra in zip(zip(*tableColumns(vtTable,"dataOffset","dataCount","blockSize","descOffset","descCount")),vtExtras):
+						vtDataOffset,vtDataCount,vtBlockSize,vtDescOffset,vtDescCount = vt
+						vtFlags,vtOutlineIndex,vtMorphIndex,vtMorphCount = vtExtra
+						vertexDescriptors = [list(vd) for vd in zip(*tableColumns(sf.table(wismtVertexDescSchema,vtDescOffset,vtDescCount),"type","size"))]
+						vertexTables.append([vtDataOffset,vtDataCount,vtBlockSize,vtDescOffset,vtDescCount,vertexDescriptors,vtFlags,vtOutlineIndex,vtMorphIndex,vtMorphCount])
+					if printProgress:
+						print("Found "+str(len(vertexTables))+" vertex tables.")
+				if faceTableOffset > 0:
+					ftTable = sf.table(wismtFaceTableSchema,faceTableOffset,faceTableCount)
+					for ftDataOffset,ftVertCount in zip(*tableColumns(ftTable,"dataOffset","vertCount")):
+						ftVertexes = sf.array("u2",dataOffset+ftDataOffset,ftVertCount) # no copy, just a view of the subfile
+						faceTables.append([ftDataOffset,ftVertCount,ftVertexes])
+					if printProgress:
+						print("Found "+str(len(faceTables))+" face tables.")
+				if outlineTableOffset > 0 and doOutlines:
+					otTable = sf.table(wismtOutlineTableSchema,outlineTableOffset,outlineTableCount)
+					for otDataOffset,otDataCount,otBlockSize in zip(*tableColumns(otTable,"dataOffset","dataCount","blockSize")):
+						# how this works:
+						# if otBlockSize is 8, it includes a normal and a colour
+						# otherwise (it's 4), it's just a colour
+						otStride = 8 if otBlockSize == 8 else 4
+						otData = sf.array("u1",dataOffset+otDataOffset,otDataCount*otStride).reshape(-1,otStride)
+						otNormals = normalized_vectors(otData[:,0:3].view(numpy.int8)/128.0) if otStride == 8 else None
+						otColours = otData[:,otStride-4:]
+						outlineTables.append([otDataOffset,otDataCount,otBlockSize,otNormals,otColours])
+					if printProgress:
+						print("Found "+str(len(outlineTables))+" outline tables.")
+				if weightDataOffset > 0:
+					weightTableCount,weightTableOffset,weightVertTableIndex,weightTableLodCount,weightTableLodOffset = sf.unpack("2L2HL",weightDataOffset)
+					# buncha unknowns in here, might not use it necessarily
+					wtTable = sf.table(wismtWeightTableSchema,weightTableOffset,weightTableCount)
+					weightTables = [list(wt) for wt in zip(*tableColumns(wtTable,"startIndex","dataOffset","dataCount","lod"))]
+					wtLodTable = sf.table(wismtWeightLodSchema,weightTableLodOffset,weightTableLodCount)
+					weightTableIndexConversion = (wtLodTable["tableIndexes"].astype(int)-1).tolist() # doing a -1 here for easier debugging later
+					if printProgress:
+						print("Found "+str(len(weightTables))+" weight tables.")
+				if shapeDataOffset > 0:
+					shapeHeaderCount,shapeHeaderOffset,shapeTargetCount,shapeTargetOffset = sf.unpack("4L",shapeDataOffset)
+					shTable = sf.table(wismtShapeHeaderSchema,shapeHeaderOffset,shapeHeaderCount)
+					shapeHeaders = [list(sh) for sh in zip(*tableColumns(shTable,"dataChunkID","targetIndex","targetCounts","targetIDOffset"))]
+					stTable = sf.table(wismtShapeTargetSchema,shapeTargetOffset,shapeTargetCount)
+					shapeTargets = [list(st) for st in zip(*tableColumns(stTable,"dataChunkOffset","vertexCount","blockSize","unknown","type"))]
+					if printProgress:
+						print("Found "+str(len(shapeTargets))+" shapekeys.")
+				
+				# tables ready, now read the actual data
+				unknownVDTypes = {}
+				vertexData = {}
+				faceData = {}
+				vertexWeightData = {} # assumption: a single vertex cannot both contain actual data and be one of the "weight container only" vertices
+				# we need to read shapes (if any) first
+				# this is because a mesh with a shape does not define positions or normals for its vertices,
+				# instead relying on the base shape to do that for it,
+				# which means we need that data for correct double detection later
+				baseShapeData = {}
+				for i in range(len(shapeHeaders)):
+					shapeDataChunkID,shapeTargetIndex,shapeTargetCounts,shapeTargetIDOffset = shapeHeaders[i]
+					targetDataChunkOffset,targetVertexCount,targetBlockSize,targetUnknown,targetType = shapeTargets[shapeTargetIndex]
+					# first, get the base shape
+					# having shapes means that normals are unsigned (unlike elsewhere) so compensate for that
+					baseShape = sf.table(RecordSchema(wismtShapeBaseFields,size=targetBlockSize),dataOffset+targetDataChunkOffset,targetVertexCount)
+					# doesn't necessarily read as normalized
+					baseShapeData[shapeDataChunkID] = {"v":baseShape["position"],"n":normalized_vectors((baseShape["normal"]/255.0)*2-1)}
+					shapeNameList = ["basis"] + [h[0] for h in wimdoResults.shapeHeaders] # "basis" needs to be added because the first target is also the base shape for some reason
+					for j in range(shapeTargetCounts+1):
+						if j == 0: continue # as above, the first is the basis so we don't need it
+						# it's okay to overwrite these variables, we don't need the above ones anymore
+						targetDataChunkOffset,targetVertexCount,targetBlockSize,targetUnknown,targetType = shapeTargets[shapeTargetIndex+j+1]
+						newShape = MonadoForgeMeshShape()
+						targetVertices = sf.table(wismtShapeVertexSchema,dataOffset+targetDataChunkOffset,targetVertexCount)
+						# doesn't necessarily read as normalized
+						newShape.setVertices(targetVertices["index"],targetVertices["position"],normalized_vectors((targetVertices["normal"]/255.0)*2-1))
+						newShape.vertexTableIndex = shapeDataChunkID
+						newShape.name = shapeNameList[j] # probably wrong but need to find a counterexample
+						shapes.append(newShape)
+				shapesByVertexTableIndex = {}
+				for s in shapes:
+					thisShapesIndex = s.vertexTableIndex
+					if thisShapesIndex in shapesByVertexTableIndex.keys():
+						shapesByVertexTableIndex[thisShapesIndex].append(s)
+					else:
+						shapesByVertexTableIndex[thisShapesIndex] = [s]
+				if printProgress and shapes != []:
+					print("Finished reading shape data.")
+				for i in range(len(vertexTables)):
+					vertexWeightData[i] = []
+					vtDataOffset,vtDataCount,vtBlockSize,vtDescOffset,vtDescCount,vertexDescriptors,vtFlags,vtOutlineIndex,vtMorphIndex,vtMorphCount = vertexTables[i]
+					hasShapes = i in baseShapeData.keys()
+					hasOutline = vtFlags % 2 == 1
+					# the whole table is decoded in one go, then the columns are handed out to the vertices
+					vtSchema,vdFields,vdUnknownTypes = wismt_vertex_schema(vertexDescriptors,vtBlockSize)
+					unknownVDTypes.update(vdUnknownTypes)
+					vtData = sf.table(vtSchema,dataOffset+vtDataOffset,vtDataCount)
+					vtUVs = {}
+					for vdType,fieldName in vdFields.items():
+						if vdType == 5 or vdType == 6 or vdType == 7: # UV (inverted Y reminder)
+							uvs = vtData[fieldName].astype(numpy.float64)
+							uvs[:,1] = 1.0-uvs[:,1]
+							vtUVs[vdType-5] = uvs # 5 -> 0, 6 -> 1, 7 -> 2
+					vtWeightValues = (vtData[vdFields[41]]/65535.0).tolist() if 41 in vdFields.keys() else None
+					vtWeightIDs = vtData[vdFields[42]].tolist() if 42 in vdFields.keys() else None
+					isWeightTable = vtWeightValues is not None or vtWeightIDs is not None
+					if isWeightTable: # the "weight container only" vertices, which don't go in a mesh
+						vertexData[i] = MonadoForgeVertexTable()
 						for vIndex in range(vtDataCount):
-							newVertex = MonadoForgeVertex(vIndex)
-							weightVertex = [[],[]]
-							hasColourLayers = [False] # only one colour layer is known at this time
-							hasUVLayers = [False,False,False]
-							for vd in vertexDescriptors:
-								vdType,vdSize = vd
-								if vdType == 0: # position
-									newVertex.position = [readAndParseFloat(sf),readAndParseFloat(sf),readAndParseFloat(sf)]
-								elif vdType == 3: # weights index
-									newVertex.weightSetIndex = readAndParseInt(sf,4)
-								elif vdType == 5 or vdType == 6 or vdType == 7: # UV (inverted Y reminder)
-									uvLayer = vdType-5 # 5 -> 0, 6 -> 1, 7 -> 2
-									newVertex.setUV(vIndex,uvLayer,[readAndParseFloat(sf),1.0-readAndParseFloat(sf)])
-									hasUVLayers[uvLayer] = True
-								elif vdType == 17: # colour 1
-									a,r,g,b = readAndParseInt(sf,1),readAndParseInt(sf,1),readAndParseInt(sf,1),readAndParseInt(sf,1)
-									newVertex.setColour(vIndex,0,[r,g,b,a])
-									hasColourLayers[0] = True
-								elif vdType == 28: # normals
-									newNormal = [readAndParseInt(sf,1,signed=True)/128.0,readAndParseInt(sf,1,signed=True)/128.0,readAndParseInt(sf,1,signed=True)/128.0]
-									readAndParseInt(sf,1,signed=True) # dummy
-									# doesn't necessarily read as normalized
-									newVertex.setNormal(vIndex,mathutils.Vector(newNormal).normalized()[:])
-								elif vdType == 41: # weight values (weightTable verts only)
-									weightVertex[1] = [readAndParseInt(sf,2)/65535.0,readAndParseInt(sf,2)/65535.0,readAndParseInt(sf,2)/65535.0,readAndParseInt(sf,2)/65535.0]
-								elif vdType == 42: # weight IDs (weightTable verts only)
-									weightVertex[0] = [readAndParseInt(sf,1),readAndParseInt(sf,1),readAndParseInt(sf,1),readAndParseInt(sf,1)]
-								else:
-									unknownVDTypes[vdType] = vdSize
-									sf.seek(sf.tell()+vdSize)
-							if hasShapes:
-								newVertex.position = baseShapeData[i]["v"][vIndex]
-								newVertex.setNormal(vIndex,baseShapeData[i]["n"][vIndex])
-							if hasOutline:
-								newVertex.setOutline(vIndex,outlineTables[vtOutlineIndex][4][vIndex])
-							if weightVertex == [[],[]]: # a "normal" vertex
-								vertexData[i].addVertex(vIndex,newVertex,automerge=True,mergeSharp=mergeSharpEdges)
-							else: # a weight table vertex
-								vertexWeightData[i].append(weightVertex)
-							maxColourLayers = max(maxColourLayers,sum(hasColourLayers))
-							maxUVLayers = max(maxUVLayers,sum(hasUVLayers))
-					if printProgress and vertexData != {}:
-						print("Finished reading vertex data.")
-					if unknownVDTypes:
-						print_warning("unknownVDTypes: "+str(unknownVDTypes))
-					for i in range(len(faceTables)):
-						faceData[i] = []
-						ftDataOffset,ftVertCount,ftVertexes = faceTables[i]
-						for j in range(0,len(ftVertexes),3):
-							newFaceIndex = len(faceData[i])
-							newFace = MonadoForgeFace(newFaceIndex)
-							newFace.vertexIndexes = [ftVertexes[j],ftVertexes[j+1],ftVertexes[j+2]]
-							faceData[i].append(newFace)
-					if printProgress and faceData != {}:
-						print("Finished reading face data.")
-					
-					unusedVertexTables = [k for k in vertexData.keys()]
-					unusedFaceTables = [k for k in faceData.keys()]
-					bestLOD = wimdoResults.getBestLOD()
-					# do the special weight table vertices first
-					if weightDataOffset > 0: # has weights
-						unusedVertexTables.remove(weightVertTableIndex)
-						for v in range(len(vertexWeightData[weightVertTableIndex])):
-							vertexWeights.append([vertexWeightData[weightVertTableIndex][v][0],vertexWeightData[weightVertTableIndex][v][1]])
-					# split up the weight list by weight table
-					splitVertexWeights = {}
-					for splitTableIndex in range(len(weightTables)):
-						startIndex = weightTables[splitTableIndex][1]-weightTables[splitTableIndex][0]
-						endIndex = weightTables[splitTableIndex][1]+weightTables[splitTableIndex][2]
-						splitVertexWeights[splitTableIndex] = vertexWeights[startIndex:endIndex]
-					# now for the meshes themselves
-					for md in wimdoResults.meshHeaders:
-						vtIndex = md.meshVertTableIndex
-						ftIndex = md.meshFaceTableIndex
-						mtIndex = md.meshMaterialIndex
-						
-						# here is where we can determine the necessary weight table for this mesh
-						# this is entirely based on what xc3_lib does (no further trying to understand it has been done)
-						flags1 = md.meshFlags1
-						meshLod = md.meshLODValue
-						tableID = 0
-						if flags1 == 64:
-							tableID = 4
+							vertexWeightData[i].append([vtWeightIDs[vIndex] if vtWeightIDs is not None else [],vtWeightValues[vIndex] if vtWeightValues is not None else []])
+					else: # "normal" vertices, which go straight into the table's arrays
+						vertices = MonadoForgeVertexTable(vtDataCount)
+						if hasShapes:
+							vertices.positions = baseShapeData[i]["v"][0:vtDataCount]
+							vertices.normals = baseShapeData[i]["n"][0:vtDataCount]
 						else:
-							passLookup = {0:0,1:1,7:3}
-							passType = wimdoResults.materials[mtIndex].renderPassType
-							try:
-								tableID = passLookup[passType]
-							except KeyError:
-								print_warning("unknown passType:",passType)
-								tableID = 0
-						if weightTableIndexConversion == []:
-							pass # this is fine, there just aren't any weight tables
-						else:
-							finalTableID = weightTableIndexConversion[meshLod-1][tableID]
-							if finalTableID == -1:
-								print_warning("bad finalTableID: meshLod "+str(meshLod)+", tableID "+str(tableID)+", weightTableIndexConversion "+str(weightTableIndexConversion))
-								finalTableID = 0
-						
-						if vtIndex in unusedVertexTables:
-							unusedVertexTables.remove(vtIndex)
-						if ftIndex in unusedFaceTables:
-							unusedFaceTables.remove(ftIndex)
-						# this order of operations means that tables are still marked as "used" even if they're of dropped LODs
-						if not context.scene.monado_forge_import.alsoImportLODs:
-							if md.meshLODValue > bestLOD:
-								continue
-						
-						newMesh = MonadoForgeMesh()
-						newMesh.vertices = vertexData[vtIndex]
-						newMesh.faces = faceData[ftIndex]
-						if splitVertexWeights != {}:
-							newMesh.weightSets = splitVertexWeights[finalTableID]
-						newMesh.materialIndex = mtIndex
-						if vtIndex in shapesByVertexTableIndex.keys():
-							newMesh.shapes = shapesByVertexTableIndex[vtIndex]
-						meshes.append(newMesh)
-					if unusedVertexTables:
-						print("Unused vertex tables: "+str(unusedVertexTables))
-					if unusedFaceTables:
-						print("Unused face tables: "+str(unusedFaceTables))
-					if printProgress:
-						print("Finished processing mesh data.")
-				finally:
-					sf.close()
+							if 0 in vdFields.keys():
+								vertices.positions = vtData[vdFields[0]]
+							if 28 in vdFields.keys():
+								# doesn't necessarily read as normalized
+								vertices.normals = normalized_vectors(vtData[vdFields[28]][:,0:3]/128.0)
+						if 3 in vdFields.keys():
+							vertices.weightSetIndexes = vtData[vdFields[3]]
+						for uvLayer,uvs in vtUVs.items():
+							vertices.setUVs(uvLayer,uvs)
+						if 17 in vdFields.keys():
+							vertices.setColours(0,vtData[vdFields[17]][:,[1,2,3,0]]) # ARGB -> RGBA
+						if hasOutline:
+							vertices.outlines = outlineTables[vtOutlineIndex][4][0:vtDataCount]
+						vertices.mergeDoubles(mergeSharp=mergeSharpEdges)
+						vertexData[i] = vertices
+					if vtDataCount > 0:
+						maxColourLayers = max(maxColourLayers,1 if 17 in vdFields.keys() else 0) # only one colour layer is known at this time
+						maxUVLayers = max(maxUVLayers,len(vtUVs))
+				if printProgress and vertexData != {}:
+					print("Finished reading vertex data.")
+				if unknownVDTypes:
+					print_warning("unknownVDTypes: "+str(unknownVDTypes))
+				for i in range(len(faceTables)):
+					ftDataOffset,ftVertCount,ftVertexes = faceTables[i]
+					faceData[i] = ftVertexes[0:len(ftVertexes)//3*3].reshape(-1,3) # still no copy
+				if printProgress and faceData != {}:
+					print("Finished reading face data.")
+				
+				unusedVertexTables = [k for k in vertexData.keys()]
+				unusedFaceTables = [k for k in faceData.keys()]
+				bestLOD = wimdoResults.getBestLOD()
+				# do the special weight table vertices first
+				if weightDataOffset > 0: # has weights
+					unusedVertexTables.remove(weightVertTableIndex)
+					for v in range(len(vertexWeightData[weightVertTableIndex])):
+						vertexWeights.append([vertexWeightData[weightVertTableIndex][v][0],vertexWeightData[weightVertTableIndex][v][1]])
+				# split up the weight list by weight table
+				splitVertexWeights = {}
+				for splitTableIndex in range(len(weightTables)):
+					startIndex = weightTables[splitTableIndex][1]-weightTables[splitTableIndex][0]
+					endIndex = weightTables[splitTableIndex][1]+weightTables[splitTableIndex][2]
+					splitVertexWeights[splitTableIndex] = vertexWeights[startIndex:endIndex]
+				# now for the meshes themselves
+				for md in wimdoResults.meshHeaders:
+					vtIndex = md.meshVertTableIndex
+					ftIndex = md.meshFaceTableIndex
+					mtIndex = md.meshMaterialIndex
+					
+					# here is where we can determine the necessary weight table for this mesh
+					# this is entirely based on what xc3_lib does (no further trying to understand it has been done)
+					flags1 = md.meshFlags1
+					meshLod = md.meshLODValue
+					tableID = 0
+					if flags1 == 64:
+						tableID = 4
+					else:
+						passLookup = {0:0,1:1,7:3}
+						passType = wimdoResults.materials[mtIndex].renderPassType
+						try:
+							tableID = passLookup[passType]
+						except KeyError:
+							print_warning("unknown passType:",passType)
+							tableID = 0
+					if weightTableIndexConversion == []:
+						pass # this is fine, there just aren't any weight tables
+					else:
+						finalTableID = weightTableIndexConversion[meshLod-1][tableID]
+						if finalTableID == -1:
+							print_warning("bad finalTableID: meshLod "+str(meshLod)+", tableID "+str(tableID)+", weightTableIndexConversion "+str(weightTableIndexConversion))
+							finalTableID = 0
+					
+					if vtIndex in unusedVertexTables:
+						unusedVertexTables.remove(vtIndex)
+					if ftIndex in unusedFaceTables:
+						unusedFaceTables.remove(ftIndex)
+					# this order of operations means that tables are still marked as "used" even if they're of dropped LODs
+					if not context.scene.monado_forge_import.alsoImportLODs:
+						if md.meshLODValue > bestLOD:
+							continue
+					
+					newMesh = MonadoForgeMesh()
+					newMesh.vertices = vertexData[vtIndex]
+					newMesh.faces = faceData[ftIndex]
+					if splitVertexWeights != {}:
+						newMesh.weightSets = splitVertexWeights[finalTableID]
+					newMesh.materialIndex = mtIndex
+					if vtIndex in shapesByVertexTableIndex.keys():
+						newMesh.shapes = shapesByVertexTableIndex[vtIndex]
+					meshes.append(newMesh)
+				if unusedVertexTables:
+					print("Unused vertex tables: "+str(unusedVertexTables))
+				if unusedFaceTables:
+					print("Unused face tables: "+str(unusedFaceTables))
+				if printProgress:
+					print("Finished processing mesh data.")
 			if contentType == 1: # shader
-				data = subfileData[internalOffset:internalOffset+contentSize]
 				if printProgress:
 					print("Found shader chunk of size "+str(contentSize)+" (not supported, skipping)")
 				pass
 			if contentType == 2 and not context.scene.monado_forge_import.skipMaterialImport: # cached texture
-				data = subfileData[internalOffset:internalOffset+contentSize]
-				sf = io.BytesIO(data)
-				try: # no except, just finally (to close sf)
-					for i in range(len(textureHeaders)):
-						textureFilesize,textureOffset,textureNameOffset,textureName = textureHeaders[i]
-						# for some reason, this stuff is in reverse order: first data, then properties (in reverse order), and magic at end
-						sf.seek(textureOffset+textureFilesize-0x4)
-						submagic = sf.read(4)
-						if submagic != b"LBIM":
-							print_error("Bad cached texture (invalid subfilemagic); skipping "+str(textureName))
-						else:
-							sf.seek(textureOffset+textureFilesize-0x28)
-							subfileUnknown5 = readAndParseInt(sf,4)
-							subfileUnknown4 = readAndParseInt(sf,4)
-							imgWidth = readAndParseInt(sf,4)
-							imgHeight = readAndParseInt(sf,4)
-							subfileUnknown3 = readAndParseInt(sf,4)
-							subfileUnknown2 = readAndParseInt(sf,4)
-							imgType = readAndParseInt(sf,4)
-							subfileUnknown1 = readAndParseInt(sf,4)
-							imgVersion = readAndParseInt(sf,4)
-							sf.seek(textureOffset)
-							listOfCachedTextureNames.append(textureName)
-							dc = splitTemps and textureName.startswith("temp")
-							nameToUse = textureName
-							if differentiate or (differentiateTemp and textureName.startswith("temp")):
-								nameToUse = filename+"_"+nameToUse
-							if context.scene.monado_forge_import.keepAllResolutions:
-								nameToUse = os.path.join("res0",nameToUse)
-							finalName = parse_texture_wismt(nameToUse,imgVersion,imgType,imgWidth,imgHeight,sf.read(textureFilesize),
-								context.scene.monado_forge_import.blueBC5,printProgress,
-								overwrite=context.scene.monado_forge_import.duplicateImageMethod,saveTo=texPath,dechannelise=dc,existingImageNames=existingImageNames)
-							textureAlignment[textureName] = finalName
-				finally:
-					sf.close()
-		del subfileData # just to ensure it's cleaned up as soon as possible
-		nextSubfileIndex += 1
-	# reminder: XC3 doesn't go in here at all (at least for most models)
-	if hasUncachedTexSubfile and context.scene.monado_forge_import.importUncachedTextures and not context.scene.monado_forge_import.skipMaterialImport:
-		subfileHeaderOffset = mainOffset+subfileHeadersOffset+nextSubfileIndex*3*4
-		subfileName,subfileData = extract_wismt_subfile(f,subfileHeaderOffset,context)
-		for cpi,cp in enumerate(contentPointers):
-			internalOffset,contentSize,highResSubfileIndex,contentType = cp
-			if contentType == 3: # med-res texture
-				data = subfileData[internalOffset:internalOffset+contentSize]
-				sf = io.BytesIO(data)
-				try: # no except, just finally (to close sf)
-					textureName = textureHeaders[textureIDList[cpi-3]][3]
+				sf = subfileReader.sub(internalOffset,contentSize)
+				for i in range(len(textureHeaders)):
+					textureFilesize,textureOffset,textureNameOffset,textureName = textureHeaders[i]
 					# for some reason, this stuff is in reverse order: first data, then properties (in reverse order), and magic at end
-					sf.seek(contentSize-0x4)
-					submagic = sf.read(4)
+					submagic = sf.raw(textureOffset+textureFilesize-0x4,4)
 					if submagic != b"LBIM":
-						print_error("Bad uncached texture (invalid subfilemagic); skipping "+str(textureName))
+						print_error("Bad cached texture (invalid subfilemagic); skipping "+str(textureName))
 					else:
-						sf.seek(contentSize-0x28)
-						subfileUnknown5 = readAndParseInt(sf,4)
-						subfileUnknown4 = readAndParseInt(sf,4)
-						imgWidth = readAndParseInt(sf,4)
-						imgHeight = readAndParseInt(sf,4)
-						subfileUnknown3 = readAndParseInt(sf,4)
-						subfileUnknown2 = readAndParseInt(sf,4)
-						imgType = readAndParseInt(sf,4)
-						subfileUnknown1 = readAndParseInt(sf,4)
-						imgVersion = readAndParseInt(sf,4)
+						subfileUnknown5,subfileUnknown4,imgWidth,imgHeight,subfileUnknown3,subfileUnknown2,imgType,subfileUnknown1,imgVersion = sf.unpack("9L",textureOffset+textureFilesize-0x28)
+						listOfCachedTextureNames.append(textureName)
 						dc = splitTemps and textureName.startswith("temp")
-						if context.scene.monado_forge_import.keepAllResolutions or highResSubfileIndex <= 0: # if there's no highResSubfileIndex, this is the best resolution
-							sf.seek(0)
-							nameToUse = textureName
-							if differentiate or (differentiateTemp and textureName.startswith("temp")):
-								nameToUse = filename+"_"+nameToUse
-							if context.scene.monado_forge_import.keepAllResolutions:
-								nameToUse = os.path.join("res1",nameToUse)
-							finalName = parse_texture_wismt(nameToUse,imgVersion,imgType,imgWidth,imgHeight,sf.read(),
-								context.scene.monado_forge_import.blueBC5,printProgress,
-								overwrite=context.scene.monado_forge_import.duplicateImageMethod,saveTo=texPath,dechannelise=dc,existingImageNames=existingImageNames)
-							textureAlignment[textureName] = finalName
-						# it is at this point where we need the data from the highest-resolution image
-						if highResSubfileIndex > 0:
-							hdfileHeaderOffset = mainOffset+subfileHeadersOffset+highResSubfileIndex*3*4
-							hdfileName,hdfileData = extract_wismt_subfile(f,hdfileHeaderOffset,context)
-							nameToUse = textureName
-							if differentiate or (differentiateTemp and textureName.startswith("temp")):
-								nameToUse = filename+"_"+nameToUse
-							if context.scene.monado_forge_import.keepAllResolutions:
-								nameToUse = os.path.join("res2",nameToUse)
-							finalName = parse_texture_wismt(nameToUse,imgVersion,imgType,imgWidth*2,imgHeight*2,hdfileData,
-								context.scene.monado_forge_import.blueBC5,printProgress,
-								overwrite=context.scene.monado_forge_import.duplicateImageMethod,saveTo=texPath,dechannelise=dc,existingImageNames=existingImageNames)
-							textureAlignment[textureName] = finalName
-				finally:
-					sf.close()
-		del subfileData
+						nameToUse = textureName
+						if differentiate or (differentiateTemp and textureName.startswith("temp")):
+							nameToUse = filename+"_"+nameToUse
+						if keepAllResolutions:
+							nameToUse = os.path.join("res0",nameToUse)
+						hasUncached = textureName in texturesWithUncached or (useTextureRepos and os.path.exists(os.path.join(texMPath,textureName+".wismt")))
+						# anything bigger than this is going to be at least twice the size, so only if this is already under the limit can something bigger fit
+						if hasUncached and (maxTextureSize <= 0 or max(imgWidth,imgHeight) < maxTextureSize):
+							upgradableTextures[textureName] = None if keepAllResolutions else [nameToUse,imgType,imgWidth,imgHeight,sf.raw(textureOffset,textureFilesize),dc]
+						if keepAllResolutions or textureName not in upgradableTextures:
+							queue_texture(textureName,nameToUse,imgType,imgWidth,imgHeight,sf.raw(textureOffset,textureFilesize),dc)
+		subfileReader.close()
+		del subfileReader,subfileData # just to ensure it's cleaned up as soon as possible
+		nextSubfileIndex += 1
+	# reminder: XC3 doesn't go in here at all (at least for most models)
+	# only bother with the uncached subfile if there's something in it that might get used (i.e. it's the only version, or might fit the max size)
+	wantedUncached = []
+	if hasUncachedTexSubfile and importUncached:
+		wantedUncached = [cpi for cpi,cp in enumerate(contentPointers) if cp[3] == 3 and (textureHeaders[textureIDList[cpi-3]][3] in upgradableTextures or textureHeaders[textureIDList[cpi-3]][3] not in listOfCachedTextureNames)]
+	if wantedUncached:
+		subfileHeaderOffset = mainOffset+subfileHeadersOffset+nextSubfileIndex*3*4
+		subfileName,subfileData = extract_wismt_subfile(r,subfileHeaderOffset,context)
+		subfileReader = BinaryReader(subfileData)
+		# work out which resolutions are wanted first, so that the high-res versions can all get decompressing in the background now
+		# (they're big and there tend to be a lot of them; they come out of hdExtracts in this same order as they're needed below)
+		uncachedPlans = []
+		hdSubfiles = []
+		for cpi in wantedUncached:
+			internalOffset,contentSize,highResSubfileIndex,contentType = contentPointers[cpi]
+			sf = subfileReader.sub(internalOffset,contentSize)
+			textureName = textureHeaders[textureIDList[cpi-3]][3]
+			# for some reason, this stuff is in reverse order: first data, then properties (in reverse order), and magic at end
+			submagic = sf.raw(contentSize-0x4,4)
+			if submagic != b"LBIM":
+				print_error("Bad uncached texture (invalid subfilemagic); skipping "+str(textureName))
+				continue
+			subfileUnknown5,subfileUnknown4,imgWidth,imgHeight,subfileUnknown3,subfileUnknown2,imgType,subfileUnknown1,imgVersion = sf.unpack("9L",contentSize-0x28)
+			doMedium,doHigh = pick_uncached_resolutions(textureName,imgWidth,imgHeight,highResSubfileIndex > 0)
+			if doHigh:
+				hdSubfiles.append([r,mainOffset+subfileHeadersOffset+highResSubfileIndex*3*4])
+			uncachedPlans.append([textureName,sf,imgType,imgWidth,imgHeight,doMedium,doHigh])
+		hdExtracts = extract_wismt_subfiles(hdSubfiles,context)
+		for textureName,sf,imgType,imgWidth,imgHeight,doMedium,doHigh in uncachedPlans:
+			dc = splitTemps and textureName.startswith("temp")
+			if doMedium:
+				nameToUse = textureName
+				if differentiate or (differentiateTemp and textureName.startswith("temp")):
+					nameToUse = filename+"_"+nameToUse
+				if keepAllResolutions:
+					nameToUse = os.path.join("res1",nameToUse)
+				queue_texture(textureName,nameToUse,imgType,imgWidth,imgHeight,sf.raw(0),dc)
+			# it is at this point where we need the data from the highest-resolution image
+			if doHigh:
+				hdfileName,hdfileData = next(hdExtracts)
+				nameToUse = textureName
+				if differentiate or (differentiateTemp and textureName.startswith("temp")):
+					nameToUse = filename+"_"+nameToUse
+				if keepAllResolutions:
+					nameToUse = os.path.join("res2",nameToUse)
+				queue_texture(textureName,nameToUse,imgType,imgWidth*2,imgHeight*2,hdfileData,dc)
+				del hdfileData
+		hdExtracts.close()
+		del uncachedPlans
+		subfileReader.close()
+		del subfileReader,subfileData
 		nextSubfileIndex += 1
+	r.close()
 	# at this point, any remaining subfiles ought to be unheadered data, so ignore them
 	# now, go fetch the external textures
 	# assumption: the external .wismt files here are literally copy-pastes of the previous-game stuff
 	# as in, the Ms have the typical headers, while the Hs are headerless and double the size
 	# there's probably a way to reduce the copy-pasted code here, but the necessary differences are subtle
-	texMPath = bpy.path.abspath(context.scene.monado_forge_import.textureRepoMPath)
-	texHPath = bpy.path.abspath(context.scene.monado_forge_import.textureRepoHPath)
-	if game == "XC3" and context.scene.monado_forge_import.importUncachedTextures and not context.scene.monado_forge_import.skipMaterialImport and texMPath and texHPath:
+	if useTextureRepos:
 		for textureName in set(listOfCachedTextureNames):
 			mFilename = os.path.join(texMPath,textureName+".wismt")
 			hFilename = os.path.join(texHPath,textureName+".wismt")
-			if not os.path.exists(mFilename): continue
-			hasH = os.path.exists(hFilename)
+			if textureName not in upgradableTextures: continue # no M file, or it'd be too big anyway
 			with open(mFilename,"rb") as fM:
-				subfileName,subfileData = extract_wismt_subfile(fM,0,context,headless=True)
-				sf = io.BytesIO(subfileData)
-				try: # no except, just finally (to close sf)
-					sf.seek(len(subfileData)-0x4)
-					submagic = sf.read(4)
-					if submagic != b"LBIM":
-						print_error("Bad uncached texture (invalid subfilemagic); skipping "+str(textureName))
-						continue
-					sf.seek(len(subfileData)-0x28)
-					subfileUnknown5 = readAndParseInt(sf,4)
-					subfileUnknown4 = readAndParseInt(sf,4)
-					imgWidth = readAndParseInt(sf,4)
-					imgHeight = readAndParseInt(sf,4)
-					subfileUnknown3 = readAndParseInt(sf,4)
-					subfileUnknown2 = readAndParseInt(sf,4)
-					imgType = readAndParseInt(sf,4)
-					subfileUnknown1 = readAndParseInt(sf,4)
-					imgVersion = readAndParseInt(sf,4)
-					dc = splitTemps and textureName.startswith("temp")
-					if context.scene.monado_forge_import.keepAllResolutions or not hasH: # if there's no hasH, this is the best resolution
-						sf.seek(0)
-						nameToUse = textureName
-						if differentiate or (differentiateTemp and textureName.startswith("temp")):
-							nameToUse = filename+"_"+nameToUse
-						if context.scene.monado_forge_import.keepAllResolutions:
-							nameToUse = os.path.join("res1",nameToUse)
-						finalName = parse_texture_wismt(nameToUse,imgVersion,imgType,imgWidth,imgHeight,sf.read(),
-							context.scene.monado_forge_import.blueBC5,printProgress,
-							overwrite=context.scene.monado_forge_import.duplicateImageMethod,saveTo=texPath,dechannelise=dc,existingImageNames=existingImageNames)
-						textureAlignment[textureName] = finalName
-					# it is at this point where we need the data from the highest-resolution image
-					if hasH:
-						with open(hFilename,"rb") as fH:
-							hdfileName,hdfileData = extract_wismt_subfile(fH,0,context,headless=True)
-							nameToUse = textureName
-							if differentiate or (differentiateTemp and textureName.startswith("temp")):
-								nameToUse = filename+"_"+nameToUse
-							if context.scene.monado_forge_import.keepAllResolutions:
-								nameToUse = os.path.join("res2",nameToUse)
-							finalName = parse_texture_wismt(nameToUse,imgVersion,imgType,imgWidth*2,imgHeight*2,hdfileData,
-								context.scene.monado_forge_import.blueBC5,printProgress,
-								overwrite=context.scene.monado_forge_import.duplicateImageMethod,saveTo=texPath,dechannelise=dc,existingImageNames=existingImageNames)
-							textureAlignment[textureName] = finalName
-				finally:
-					sf.close()
+				with BinaryReader(fM) as rM:
+					subfileName,subfileData = extract_wismt_subfile(rM,0,context,headless=True)
+			sf = BinaryReader(subfileData)
+			submagic = sf.raw(len(subfileData)-0x4,4)
+			if submagic != b"LBIM":
+				print_error("Bad uncached texture (invalid subfilemagic); skipping "+str(textureName))
+				continue
+			subfileUnknown5,subfileUnknown4,imgWidth,imgHeight,subfileUnknown3,subfileUnknown2,imgType,subfileUnknown1,imgVersion = sf.unpack("9L",len(subfileData)-0x28)
+			dc = splitTemps and textureName.startswith("temp")
+			doMedium,doHigh = pick_uncached_resolutions(textureName,imgWidth,imgHeight,os.path.exists(hFilename))
+			if doMedium:
+				nameToUse = textureName
+				if differentiate or (differentiateTemp and textureName.startswith("temp")):
+					nameToUse = filename+"_"+nameToUse
+				if keepAllResolutions:
+					nameToUse = os.path.join("res1",nameToUse)
+				queue_texture(textureName,nameToUse,imgType,imgWidth,imgHeight,subfileData,dc)
+			# it is at this point where we need the data from the highest-resolution image
+			if doHigh:
+				with open(hFilename,"rb") as fH:
+					with BinaryReader(fH) as rH:
+						hdfileName,hdfileData = extract_wismt_subfile(rH,0,context,headless=True)
+				nameToUse = textureName
+				if differentiate or (differentiateTemp and textureName.startswith("temp")):
+					nameToUse = filename+"_"+nameToUse
+				if keepAllResolutions:
+					nameToUse = os.path.join("res2",nameToUse)
+				queue_texture(textureName,nameToUse,imgType,imgWidth*2,imgHeight*2,hdfileData,dc)
+	# any cached textures that didn't get beaten after all
+	for textureName,fallback in upgradableTextures.items():
+		if fallback:
+			queue_texture(textureName,*fallback)
+	
+	textureQueue.finish() # everything's been read, so now just wait for the rest of the textures
+	clear_deswizzle_maps()
+	if textureProgress:
+		textureProgress.finish()
 	
 	# time to ready materials
 	wimdoMaterials = wimdoResults.materials
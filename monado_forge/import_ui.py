@@ -322,6 +322,17 @@ class MonadoForgeViewImportProperties(PropertyGroup):
 		maxlen=1024,
 		subtype="FILE_PATH",
 	)
+	def textureSaveFormatCallback(self, context):
+		return (
+			("PNG","PNG","Decode textures and save them as .png"),
+			("DDS","DDS","Save compressed textures as .dds without decoding them, which is much faster (textures that can't be done this way are still decoded and saved as .png)"),
+		)
+	textureSaveFormat : EnumProperty(
+		name="Texture Save Format",
+		items=textureSaveFormatCallback,
+		description="What format to auto-save .wismt textures in",
+		default=0,
+	)
 	def duplicateImageMethodCallback(self, context):
 		return (
 			("ADD","Add","Import a new copy of the image (may result in more than expected due to multiple resolutions)"),
@@ -432,6 +443,14 @@ class MonadoForgeViewImportProperties(PropertyGroup):
 		description="Include all textures, even if there's a larger resolution of the same",
 		default=False,
 	)
+	maxTextureSize : IntProperty(
+		name="Max Texture Size",
+		description="Use the largest resolution of each texture that's no bigger than this on either side, and don't even decompress anything bigger (if none are small enough, the smallest is used; 0 = no limit)",
+		default=0,
+		min=0,
+		soft_max=8192,
+		subtype="PIXEL",
+	)
 	compressEDVs : BoolProperty(
 		name="Compress EDV nodes",
 		description="Make extra data values take up less space in the material node setup",
@@ -486,6 +505,10 @@ class OBJECT_PT_MonadoForgeViewImportPanel(Panel):
 		texturePathRow = col.row()
 		texturePathRow.prop(scn.monado_forge_import, "texturePath", text="...to")
 		texturePathRow.enabled = scn.monado_forge_import.autoSaveTextures
+		if scn.monado_forge_main.game != "XC1":
+			textureFormatRow = col.row()
+			textureFormatRow.prop(scn.monado_forge_import, "textureSaveFormat", text="...as")
+			textureFormatRow.enabled = scn.monado_forge_import.autoSaveTextures
 		col.prop(scn.monado_forge_import, "duplicateImageMethod", text="Duping")
 		col.separator()
 		if scn.monado_forge_main.game == "XC1":
@@ -547,6 +570,7 @@ class OBJECT_PT_MonadoForgeViewImportTextureOptionsPanel(Panel):
 			col.prop(scn.monado_forge_import, "blueBC5")
 			col.prop(scn.monado_forge_import, "splitTemps")
 			col.prop(scn.monado_forge_import, "keepAllResolutions")
+			col.prop(scn.monado_forge_import, "maxTextureSize")
 
 class OBJECT_PT_MonadoForgeViewImportMaterialOptionsPanel(Panel):
 	bl_idname = "OBJECT_PT_MonadoForgeViewImportMaterialOptionsPanel"
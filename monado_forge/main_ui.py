@@ -4,7 +4,9 @@ from bpy.props import (
 						BoolProperty,
 						EnumProperty,
 						FloatProperty,
+						IntProperty,
 						PointerProperty,
+						StringProperty,
 						)
 from bpy.types import (
 						Operator,
@@ -58,6 +60,36 @@ class MonadoForgeProperties(PropertyGroup):
 		step=1,
 		unit="ROTATION",
 	)
+	cacheExtracts : BoolProperty(
+		name="Cache Extracts",
+		description="Keep decompressed subfiles on disk, so re-importing the same file doesn't have to decompress it all again",
+		default=False,
+	)
+	cacheTextures : BoolProperty(
+		name="Cache Decoded Textures",
+		description="Keep decoded textures on disk, so any texture that's been imported before (from any file) doesn't have to be decoded again",
+		default=False,
+	)
+	cachePath : StringProperty(
+		name="Cache Folder",
+		description="Folder to keep the cache in (leave blank to use the system temp folder)",
+		default="",
+		subtype="DIR_PATH",
+	)
+	cacheMaxSize : IntProperty(
+		name="Cache Size (MB)",
+		description="Once the caches together get bigger than this, the least recently used files (from either) are deleted",
+		default=4096,
+		min=1,
+		soft_max=65536,
+	)
+	textureDecodeWorkers : IntProperty(
+		name="Texture Decode Threads",
+		description="How many textures to decode at once in the background (0 = one per CPU core, 1 = decode them one at a time, without any background threads)",
+		default=0,
+		min=0,
+		soft_max=64,
+	)
 	dumpExtracts : BoolProperty(
 		name="DEBUG: Dump Extracts",
 		description="Dump data opened via zlib and zstd to source folder for debugging purposes",
@@ -92,6 +124,13 @@ class OBJECT_PT_MonadoForgeSettingsPanel(Panel):
 		col.prop(scn.monado_forge_main, "printProgress")
 		col.prop(scn.monado_forge_main, "positionEpsilon")
 		col.prop(scn.monado_forge_main, "angleEpsilon")
+		col.prop(scn.monado_forge_main, "cacheExtracts")
+		col.prop(scn.monado_forge_main, "cacheTextures")
+		cacheGroup = col.column(align=True)
+		cacheGroup.prop(scn.monado_forge_main, "cachePath", text="...in")
+		cacheGroup.prop(scn.monado_forge_main, "cacheMaxSize")
+		cacheGroup.enabled = scn.monado_forge_main.cacheExtracts or scn.monado_forge_main.cacheTextures
+		col.prop(scn.monado_forge_main, "textureDecodeWorkers")
 		col.prop(scn.monado_forge_main, "dumpExtracts")
 
 classes = (
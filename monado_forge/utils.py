@@ -2,9 +2,11 @@ import bpy
 import io
 import math
 import mathutils
+import mmap
 import numpy
 import os
 import struct
+import time
 from contextlib import redirect_stdout
 
 from . classes import *
@@ -26,13 +28,6 @@ def clamp(value,low,high):
 # https://stackoverflow.com/questions/14822184/
 def ceildiv(a,b):
 	return -(a // -b)
-# https://stackoverflow.com/questions/12681945/
-def reverse_int(n,l):
-	result = 0
-	for i in range(l):
-		result = (result << 1) + (n & 1)
-		n >>= 1
-	return result
 # https://stackabuse.com/python-how-to-flatten-list-of-lists/
 def flattened_list(given_list):
 	return [item for sublist in given_list for item in sublist]
@@ -42,7 +37,16 @@ def flattened_list_recursive(given_list):
 	if isinstance(given_list[0], list):
 		return flattened_list_recursive(given_list[0]) + flattened_list_recursive(given_list[1:])
 	return given_list[:1] + flattened_list_recursive(given_list[1:])
+# row-wise equivalent of mathutils.Vector(v).normalized()[:] (same float precision), for whole arrays of vectors at once
+def normalized_vectors(a):
+	a = numpy.asarray(a,dtype=numpy.float32)
+	lengths = numpy.sqrt(numpy.einsum("ij,ij->i",a,a,dtype=numpy.float64)).astype(numpy.float32)
+	safe = lengths > 1.0e-35 # mathutils turns too-short vectors into zero vectors
+	result = numpy.zeros_like(a)
+	result[safe] = a[safe]*(numpy.float32(1.0)/lengths[safe])[:,None]
+	return result
 def print_colour(s,c):
+	ProgressReporter.lineIsLast = False
 	print(c+str(s)+"\033[0m")
 def print_error(s):
 	print_colour(s,"\033[91m")
@@ -55,118 +59,328 @@ def print_bar(p): # 0.0-1.0
 	barsFilled = int(barLength*p)
 	barsUnfilled = barLength-barsFilled
 	print("["+"#"*barsFilled+"-"*barsUnfilled+"]",end="")
-def print_progress_bar(n,d,t): # numerator, denominator, text
-	if n == 0:
-		print(t+": ",end="")
-		print_bar(0)
-		print(" 0 / "+str(d)+" ")
-	elif n == d:
-		print("\033[F\r"+t+": ",end="")
-		print_bar(1)
-		print(" "+str(n)+" / "+str(d))
-	else:
-		print("\033[F\r"+t+": ",end="")
-		print_bar(n/d)
-		print(" "+str(n)+" / "+str(d))
-
-swizzleMapCache = {}
+def format_duration(seconds):
+	seconds = int(seconds+0.5)
+	if seconds < 60:
+		return str(seconds)+"s"
+	return str(seconds // 60)+"m"+f"{seconds % 60:02d}s"
+
+# progress through a stage of an import, shown in Blender's own progress indicator and (if printing) as a console bar with an ETA
+# update() can be called as often as is convenient: anything more often than once every interval seconds is ignored, so it costs next to nothing
+# the console bar rewrites itself in place, unless something else (an error, warning, etc.) got printed since, in which case it starts a new line
+class ProgressReporter():
+	lineIsLast = False # whether the last thing printed was a progress bar (i.e. it's safe to overwrite)
+
+	def __init__(self,context,stageName,total,printProgress=False,interval=0.1):
+		self.stageName = stageName
+		self.total = total
+		self.printProgress = printProgress
+		self.interval = interval
+		self.windowManager = getattr(context,"window_manager",None)
+		self.startTime = time.perf_counter()
+		self.lastUpdateTime = None
+		self.done = 0
+		if self.windowManager:
+			self.windowManager.progress_begin(0,max(total,1))
+		self.update(0,force=True)
+
+	def __enter__(self):
+		return self
+	def __exit__(self,excType,excValue,traceback):
+		self.finish()
+
+	# detail is anything extra worth showing about what's happening right now (e.g. the name of the current item)
+	def update(self,done,detail="",force=False):
+		self.done = done
+		now = time.perf_counter()
+		if not force and self.lastUpdateTime is not None and now-self.lastUpdateTime < self.interval:
+			return
+		self.lastUpdateTime = now
+		if self.windowManager:
+			self.windowManager.progress_update(done)
+		if self.printProgress:
+			self._print(now,detail)
+
+	def _print(self,now,detail):
+		line = self.stageName+": "
+		if ProgressReporter.lineIsLast:
+			line = "\033[F\r"+line
+		print(line,end="")
+		print_bar(self.done/self.total if self.total > 0 else 1)
+		line = " "+str(self.done)+" / "+str(self.total)
+		if self.done >= self.total:
+			line += " ("+format_duration(now-self.startTime)+")"
+		elif self.done > 0:
+			line += " (ETA "+format_duration((now-self.startTime)/self.done*(self.total-self.done))+")"
+		if detail:
+			line += " "+detail
+		print(line+"\033[K") # clear whatever's left of a previous longer line
+		ProgressReporter.lineIsLast = True
+
+	def finish(self):
+		if self.lastUpdateTime is None: # already finished
+			return
+		self.update(self.total,force=True)
+		if self.windowManager:
+			self.windowManager.progress_end()
+		self.lastUpdateTime = None
+		ProgressReporter.lineIsLast = False # the finished bar stays as it is
 
 # file reading
 
-u8CodeB = ">B"
-i8CodeB = ">b"
-u16CodeB = ">H"
-i16CodeB = ">h"
-u32CodeB = ">L"
-i32CodeB = ">l"
-fpCodeB = ">f"
-u8CodeL = "<B"
-i8CodeL = "<b"
-u16CodeL = "<H"
-i16CodeL = "<h"
-u32CodeL = "<L"
-i32CodeL = "<l"
-fpCodeL = "<f"
-
-# old games are big and new ones are little, so assume little as default
-def readAndParseInt(inFile,bytes,signed=False,endian="little"):
-	if endian == "big":
-		return readAndParseIntBig(inFile,bytes,signed)
-	if bytes == 1:
-		parseString = i8CodeL if signed else u8CodeL
-	elif bytes == 2:
-		parseString = i16CodeL if signed else u16CodeL
-	elif bytes == 4:
-		parseString = i32CodeL if signed else u32CodeL
-	else:
-		raise ValueError("invalid int bytesize: "+str(bytes))
-	return struct.unpack(parseString,inFile.read(struct.calcsize(parseString)))[0]
-def readAndParseIntBig(inFile,bytes,signed=False):
-	if bytes == 1:
-		parseString = i8CodeB if signed else u8CodeB
-	elif bytes == 2:
-		parseString = i16CodeB if signed else u16CodeB
-	elif bytes == 4:
-		parseString = i32CodeB if signed else u32CodeB
-	else:
-		raise ValueError("invalid int bytesize: "+str(bytes))
-	return struct.unpack(parseString,inFile.read(struct.calcsize(parseString)))[0]
-
-def readAndParseFloat(inFile,endian="little"):
-	if endian == "big":
-		return readAndParseFloatBig(inFile)
-	return struct.unpack(fpCodeL,inFile.read(struct.calcsize(fpCodeL)))[0]
-def readAndParseFloatBig(inFile):
-	return struct.unpack(fpCodeB,inFile.read(struct.calcsize(fpCodeB)))[0]
-
-def readStr(inFile):
-	strBytes = b""
-	c = inFile.read(1)
-	while c != b"\x00" and c != b"":
-		strBytes += c
-		c = inFile.read(1)
-	return strBytes.decode("utf-8")
-def readFixedLenStr(inFile,length):
-	strBytes = b""
-	for i in range(length):
-		c = inFile.read(1)
-		strBytes += c
-	return strBytes.decode("utf-8")
-
-# https://stackoverflow.com/questions/10689748/how-to-read-bits-from-a-file
-# tweaked to operate directly on a bytearray so an extra file-like object isn't needed
-# as normal, 0x30 is read as 0, 0, 1, 1, 0, 0, 0, 0 in 1-bit chunks, and as 0011, 0000 in 4-bit chunks
-# as reversed, 0x30 is read as 0, 0, 0, 0, 1, 1, 0, 0 in 1-bit chunks, but as 0011, 0000 in 4-bit chunks
-# the "why" is simply "because that's how it needs to work" (mostly for BC7 purposes)
-class BitReader():
-	def __init__(self,a,reverse=False):
-		self.input = a
-		self.accumulator = 0
-		self.bcount = 0
-		self.pointer = 0
+# everything is read straight out of one buffer with struct.unpack_from, addressed by offset (rather than seeking a file object around)
+# files are mmapped (no reading the whole thing up front, no per-field syscalls), bytes-likes are wrapped in a memoryview (no copying)
+# endianness is fixed per reader, since no file mixes the two
+class BinaryReader():
+	def __init__(self,source,endian="little",name=None,base=0,size=None):
+		self.prefix = ">" if endian == "big" else "<"
+		self.endian = endian
+		self.name = name if name is not None else getattr(source,"name",None)
+		self._mmap = None
+		if isinstance(source,(bytes,bytearray,mmap.mmap)):
+			self._data = source
+		elif isinstance(source,memoryview):
+			self._data = source.obj if isinstance(source.obj,(bytes,bytearray,mmap.mmap)) and source.nbytes == len(source.obj) else source.tobytes()
+		else: # a file
+			try:
+				self._mmap = mmap.mmap(source.fileno(),0,access=mmap.ACCESS_READ)
+				self._data = self._mmap
+			except (AttributeError,OSError,ValueError,io.UnsupportedOperation): # not a real file, or an empty one (can't mmap those)
+				source.seek(0)
+				self._data = source.read()
+		self.base = base
+		self.size = (len(self._data)-base) if size is None else size
+		self.buffer = memoryview(self._data)[base:base+self.size]
+		self._structs = {}
+		self._stringPool = None
+
+	def __len__(self):
+		return self.size
+	def __enter__(self):
+		return self
+	def __exit__(self,*args):
+		self.close()
+	def close(self):
+		self.buffer.release()
+		if self._mmap is not None:
+			try:
+				self._mmap.close()
+			except BufferError: # something (e.g. a NumPy array) still looks into the map, so leave it to be cleaned up with that
+				pass
+			self._mmap = None
+
+	# caching the compiled structs is noticeably faster than re-parsing the format every call
+	def _struct(self,fmt):
+		s = self._structs.get(fmt)
+		if s is None:
+			s = struct.Struct(self.prefix+fmt)
+			self._structs[fmt] = s
+		return s
+	def unpack(self,fmt,offset):
+		return self._struct(fmt).unpack_from(self.buffer,offset)
+	# for tables of identical records
+	def unpackArray(self,fmt,offset,count,stride=None):
+		s = self._struct(fmt)
+		if stride is None or stride == s.size:
+			return list(s.iter_unpack(self.buffer[offset:offset+count*s.size]))
+		return [s.unpack_from(self.buffer,offset+i*stride) for i in range(count)]
+
+	def u8(self,offset):
+		return self.buffer[offset]
+	def i8(self,offset):
+		return self._struct("b").unpack_from(self.buffer,offset)[0]
+	def u16(self,offset):
+		return self._struct("H").unpack_from(self.buffer,offset)[0]
+	def i16(self,offset):
+		return self._struct("h").unpack_from(self.buffer,offset)[0]
+	def u32(self,offset):
+		return self._struct("L").unpack_from(self.buffer,offset)[0]
+	def i32(self,offset):
+		return self._struct("l").unpack_from(self.buffer,offset)[0]
+	def f32(self,offset):
+		return self._struct("f").unpack_from(self.buffer,offset)[0]
+	def integer(self,offset,bytes,signed=False): # for when the size is only known at runtime
+		return int.from_bytes(self.buffer[offset:offset+bytes],self.endian,signed=signed)
+
+	def raw(self,offset,length=None):
+		if length is None:
+			length = self.size-offset
+		return self._data[self.base+offset:self.base+offset+length]
+	def view(self,offset,length=None): # no copy, but only valid as long as the reader is
+		if length is None:
+			return self.buffer[offset:]
+		return self.buffer[offset:offset+length]
+	def string(self,offset):
+		end = self._data.find(b"\x00",self.base+offset,self.base+self.size)
+		if end == -1:
+			end = self.base+self.size
+		return str(self._data[self.base+offset:end],"utf-8")
+	def fixedLenStr(self,offset,length):
+		return str(self.buffer[offset:offset+length],"utf-8")
+	# shared by everything that asks, so a name looked up by one part of a parser is already known to the rest
+	def stringPool(self):
+		if self._stringPool is None:
+			self._stringPool = StringPool(self)
+		return self._stringPool
+
+	# a reader over part of this one, with offsets starting from 0 again (shares the buffer, no copying)
+	def sub(self,offset,length=None):
+		if length is None:
+			length = self.size-offset
+		return BinaryReader(self._data,self.endian,name=self.name,base=self.base+offset,size=length)
+
+	# a plain array of a single NumPy type (e.g. "u2"), straight out of the buffer like table() below
+	def array(self,fmt,offset,count):
+		if count == 0:
+			return numpy.zeros(0,dtype=self.prefix+fmt)
+		return numpy.frombuffer(self._data,dtype=self.prefix+fmt,count=count,offset=self.base+offset)
+	# whole tables of fixed-size records in one go, as a NumPy structured array (see RecordSchema)
+	# the result looks straight into the buffer, so treat it as read-only
+	def table(self,schema,offset,count):
+		if count == 0: # frombuffer can complain about the offset even when nothing is being read
+			return numpy.zeros(0,dtype=schema.dtype(self.endian))
+		return numpy.frombuffer(self._data,dtype=schema.dtype(self.endian),count=count,offset=self.base+offset)
+	# same, but for records that aren't packed together (e.g. ones found through a dict); this one copies
+	def gather(self,schema,offsets):
+		offsets = numpy.asarray(offsets,dtype=numpy.int64).reshape(-1)
+		if len(offsets) == 0:
+			return numpy.zeros(0,dtype=schema.dtype(self.endian))
+		allBytes = numpy.frombuffer(self._data,dtype=numpy.uint8,count=self.size,offset=self.base)
+		recordBytes = allBytes[offsets[:,None]+numpy.arange(schema.size)]
+		return recordBytes.view(schema.dtype(self.endian)).reshape(-1)
+
+# names tend to be packed together in one table and looked up over and over (e.g. the same texture name from many materials)
+# so this finds them with one search each straight out of the reader's data (no copying, no byte-at-a-time reading) and remembers them
+# offsets are the same as the reader's
+class StringPool():
+	def __init__(self,reader):
+		self.data = reader._data
+		self.shift = reader.base
+		self.end = reader.base+reader.size
+		self._strings = {}
+	def __getitem__(self,offset):
+		return self.get(offset)
+	# null-terminated
+	def get(self,offset):
+		s = self._strings.get(offset)
+		if s is None:
+			pos = offset+self.shift
+			end = self.data.find(b"\x00",pos,self.end)
+			if end == -1:
+				end = self.end
+			s = str(self.data[pos:end],"utf-8")
+			self._strings[offset] = s
+		return s
+	# length already known (only remembered by offset, so don't ask for the same offset with different lengths)
+	def sized(self,offset,length):
+		s = self._strings.get(offset)
+		if s is None:
+			pos = offset+self.shift
+			s = str(self.data[pos:pos+length],"utf-8")
+			self._strings[offset] = s
+		return s
+
+# a fixed-size record layout, described once and decoded a whole table at a time
+# fields are [name,format] or [name,format,count] in file order, with NumPy-style formats ("u4", "i2", "f4", etc.)
+# a name of None is skipped space (unknowns or padding), and its "format" is the byte count instead
+class RecordSchema():
+	def __init__(self,fields,size=None):
+		self.names = []
+		self.formats = []
+		self.offsets = []
+		pos = 0
+		for field in fields:
+			if field[0] is None:
+				pos += field[1]
+				continue
+			fmt = field[1] if len(field) < 3 else (field[1],field[2])
+			self.names.append(field[0])
+			self.formats.append(fmt)
+			self.offsets.append(pos)
+			pos += numpy.dtype(fmt).itemsize
+		if size is not None and size < pos:
+			raise ValueError("record size "+str(size)+" is smaller than its fields ("+str(pos)+")")
+		self.size = pos if size is None else size
+		self._dtypes = {}
+	def dtype(self,endian="little"):
+		d = self._dtypes.get(endian)
+		if d is None:
+			prefix = ">" if endian == "big" else "<"
+			formats = [prefix+f if isinstance(f,str) else (prefix+f[0],f[1]) for f in self.formats]
+			d = numpy.dtype({"names":self.names,"formats":formats,"offsets":self.offsets,"itemsize":self.size})
+			self._dtypes[endian] = d
+		return d
+
+# turns the named columns of a record table into plain Python lists (so zip() can walk them like rows)
+def tableColumns(table,*names):
+	return [table[n].tolist() for n in names]
+
+# for when the same layout of fields gets read over and over (BC7 blocks, GX registers, etc.)
+# the whole block is treated as one integer, and every field is a precomputed shift and mask away
+# as normal, fields are taken from the highest bit downwards (with the bytes big-endian)
+# as reversed, fields are taken from the lowest bit upwards (with the bytes little-endian), which is what BC7 needs
+# e.g. 0x30 read as 4-bit fields is 3, 0 as normal, but 0, 3 as reversed
+# offset skips that many bits before the first field (e.g. a header that has already been read to decide which layout to use)
+# a 0-width field reads as 0
+class BitLayout():
+	def __init__(self,widths,reverse=False,offset=0,totalBits=None):
+		self.widths = list(widths)
 		self.reverse = reverse
-	def _readbit(self):
-		if not self.bcount:
-			next = self.input[self.pointer]
-			self.pointer += 1
-			self.accumulator = next
-			self.bcount = 8
-		if self.reverse:
-			rv = (self.accumulator & (1 << 7-(self.bcount-1))) >> 7-(self.bcount-1)
-		else:
-			rv = (self.accumulator & (1 << self.bcount-1)) >> self.bcount-1
-		self.bcount -= 1
-		return rv
-	def readbits(self,n):
-		if n == 0: return None # having to deal with None is better than confusing "read a 0" with "read nothing so here's 0"
-		v = 0
-		d = n
-		while d > 0:
-			v = (v << 1) | self._readbit()
-			d -= 1
-		if self.reverse:
-			return reverse_int(v,n)
-		return v
+		self.totalBits = totalBits if totalBits is not None else offset+sum(self.widths)
+		self.shifts = []
+		self.masks = []
+		for w in self.widths:
+			self.shifts.append(offset if reverse else self.totalBits-offset-w)
+			self.masks.append((1 << w)-1)
+			offset += w
+		self._fields = list(zip(self.shifts,self.masks))
+	def to_int(self,data):
+		return int.from_bytes(data,"little" if self.reverse else "big")
+	# all fields of a single block, in read order (the block can be given as bytes or as an already-converted int)
+	def unpack(self,block):
+		if not isinstance(block,int):
+			block = self.to_int(block)
+		return [(block >> s) & m for s,m in self._fields]
+	# a single field, but from every block of an array made by bit_blocks() at once
+	def field(self,blocks,i):
+		shift = self.shifts[i]
+		width = self.widths[i]
+		lo = blocks[:,0]
+		hi = blocks[:,1]
+		if shift >= 64:
+			values = hi >> numpy.uint64(shift-64)
+		elif shift+width <= 64:
+			values = lo >> numpy.uint64(shift)
+		else: # straddles the two halves
+			values = (lo >> numpy.uint64(shift)) | (hi << numpy.uint64(64-shift))
+		return values & numpy.uint64(self.masks[i])
+	def fields(self,blocks):
+		return [self.field(blocks,i) for i in range(len(self.widths))]
+
+# splits raw data into blocks of up to 16 bytes, each as a [low,high] pair of uint64s of the integer BitLayout would see it as
+def bit_blocks(data,blockBytes,reverse=False):
+	if blockBytes > 16:
+		raise ValueError("bit_blocks can't handle blocks larger than 16 bytes (got "+str(blockBytes)+")")
+	raw = numpy.frombuffer(data,dtype=numpy.uint8)
+	raw = raw[0:len(raw)//blockBytes*blockBytes].reshape(-1,blockBytes)
+	if not reverse: # big-endian, so flip each block to put the lowest byte first
+		raw = raw[:,::-1]
+	padded = numpy.zeros([len(raw),16],dtype=numpy.uint8)
+	padded[:,0:blockBytes] = raw
+	return padded.view("<u8")
+
+# like BitLayout.field, but for when the layout varies from block to block (e.g. depending on some earlier field)
+# shifts and widths are (N,fieldCount) arrays (or anything that broadcasts to that), with shifts meaning the same as BitLayout.shifts
+# widths must be under 64
+def bit_fields_at(blocks,shifts,widths):
+	shifts = numpy.asarray(shifts,dtype=numpy.uint64)
+	lo = blocks[:,0:1]
+	hi = blocks[:,1:2]
+	s = shifts & numpy.uint64(63)
+	# numpy can't shift by 64, so the part that comes from the high half has to be dropped separately when s is 0
+	fromBoth = (lo >> s) | numpy.where(s > 0,hi << ((numpy.uint64(64)-s) & numpy.uint64(63)),numpy.uint64(0))
+	values = numpy.where(shifts < 64,fromBoth,hi >> s)
+	return values & ((numpy.uint64(1) << numpy.asarray(widths,dtype=numpy.uint64)) - numpy.uint64(1))
 
 # class helper functions
 
@@ -194,6 +408,8 @@ def calculateGlobalBoneMatrixes(boneList):
 def toBlenderColour_255(c):
 	c = min(max(0, c), 255) / 255
 	return c / 12.92 if c < 0.04045 else math.pow((c + 0.055) / 1.055, 2.4)
+# the same for every possible byte, so whole arrays of colours can be converted with a single take
+blenderColours_255 = numpy.array([toBlenderColour_255(c) for c in range(256)],dtype=numpy.float32)
 def toBlenderColour_Float(c):
 	return c / 12.92 if c < 0.04045 else math.pow((c + 0.055) / 1.055, 2.4)
 def fromBlenderColour_255(c):
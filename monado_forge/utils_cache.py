@@ -0,0 +1,121 @@
+import bpy
+import hashlib
+import mmap
+import os
+import tempfile
+
+from . utils import *
+
+# persistent on-disk caches, so that re-importing the same thing doesn't redo the expensive parts
+# each cache is just a folder of files named after a hash of their key, and "least recently used" is tracked via the files' mtimes
+# (a hit touches the file), which means there's no index file that could get out of sync with what's actually there
+
+defaultCacheFolder = os.path.join(tempfile.gettempdir(),"monado_forge_cache")
+cachePrefixes = ["xbc1_","tex_"] # every cache that lives in the shared folder (see get_extract_cache and get_texture_cache)
+
+class DiskCache():
+	def __init__(self,folder,maxBytes,prefix="",budgetPrefixes=None):
+		self.folder = folder
+		self.maxBytes = maxBytes
+		self.prefix = prefix # lets multiple caches share a folder without treating each other's files as their own
+		# whose files count towards maxBytes (and so can get evicted to make room): by default just this cache's own
+		self.budgetPrefixes = tuple(budgetPrefixes) if budgetPrefixes is not None else (prefix,)
+		os.makedirs(self.folder,exist_ok=True)
+
+	def _path(self,key):
+		return os.path.join(self.folder,self.prefix+hashlib.sha1(repr(key).encode("utf-8")).hexdigest())
+
+	# returns a read-only mmap of the cached data (or None if not cached)
+	def get(self,key):
+		path = self._path(key)
+		try:
+			with open(path,"rb") as f:
+				if os.fstat(f.fileno()).st_size == 0: # can't mmap an empty file
+					return b""
+				data = mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ)
+			os.utime(path) # mark as recently used
+			return data
+		except OSError:
+			return None
+
+	def put(self,key,data):
+		if len(data) > self.maxBytes: # would just get evicted immediately
+			return
+		path = self._path(key)
+		# write to a temporary name first so nothing can ever see a half-written file
+		tempPath = path+".part"+str(os.getpid())
+		try:
+			with open(tempPath,"wb") as f:
+				f.write(data)
+			os.replace(tempPath,path)
+		except OSError as e:
+			print_warning("couldn't write to cache: "+str(e))
+			try:
+				os.remove(tempPath)
+			except OSError:
+				pass
+			return
+		self.evict()
+
+	# delete the least recently used files (of every cache sharing the budget) until everything fits
+	def evict(self):
+		entries = []
+		totalSize = 0
+		with os.scandir(self.folder) as it:
+			for entry in it:
+				if not entry.is_file() or not entry.name.startswith(self.budgetPrefixes) or ".part" in entry.name:
+					continue
+				stat = entry.stat()
+				entries.append([stat.st_mtime,stat.st_size,entry.path])
+				totalSize += stat.st_size
+		entries.sort()
+		for mtime,size,path in entries:
+			if totalSize <= self.maxBytes:
+				break
+			try:
+				os.remove(path)
+				totalSize -= size
+			except OSError: # probably still open somewhere (e.g. mmapped on Windows), so just leave it for next time
+				pass
+
+	def clear(self):
+		with os.scandir(self.folder) as it:
+			for entry in it:
+				if entry.is_file() and entry.name.startswith(self.prefix):
+					try:
+						os.remove(entry.path)
+					except OSError:
+						pass
+
+def cache_folder(context):
+	mainSettings = context.scene.monado_forge_main
+	return bpy.path.abspath(mainSettings.cachePath) if mainSettings.cachePath else defaultCacheFolder
+
+# the caches as set up in the global settings (or None if turned off)
+# they share a folder and a single size limit, so whichever has the least recently used files gives them up first
+def get_extract_cache(context):
+	mainSettings = context.scene.monado_forge_main
+	if not mainSettings.cacheExtracts:
+		return None
+	return DiskCache(cache_folder(context),mainSettings.cacheMaxSize*1024*1024,prefix="xbc1_",budgetPrefixes=cachePrefixes)
+
+def get_texture_cache(context):
+	mainSettings = context.scene.monado_forge_main
+	if not mainSettings.cacheTextures:
+		return None
+	return DiskCache(cache_folder(context),mainSettings.cacheMaxSize*1024*1024,prefix="tex_",budgetPrefixes=cachePrefixes)
+
+# identifies a subfile without having to read any of it: if the source file changes, so does its size or mtime
+def file_cache_key(path,*extra):
+	stat = os.stat(path)
+	return (os.path.realpath(path),stat.st_size,stat.st_mtime_ns)+extra
+
+# identifies something by what's actually in it, so the same data gets the same key no matter where it came from
+def content_cache_key(data,*extra):
+	return (hashlib.sha1(data).hexdigest(),)+extra
+
+def register():
+	pass
+
+def unregister():
+	pass
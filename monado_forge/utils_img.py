@@ -1,6 +1,6 @@
 import bpy
-import io
-import math
+import collections
+import concurrent.futures
 import mathutils
 import numpy
 import os
@@ -9,6 +9,8 @@ from contextlib import redirect_stdout
 
 from . classes import *
 from . utils import *
+from . utils_cache import *
+from . utils_swizzle import *
 
 # https://wiki.tockdom.com/wiki/Image_Formats
 # [formatName, bitsPerPixel, blockWidth, blockHeight, blockBytesize]
@@ -26,12 +28,273 @@ brresImageFormats = {
 						14:["CMPR",4,8,8,32], # this is BC1_UNORM with 2x2 sub-blocks, aka DXT1
 					}
 
+# array-based block decoding: rather than going through images one block at a time, every block is decoded at once
+# the decoders take an (N,blockBytes) uint8 array and give back (N,pixelsPerBlock,4) uint8 colours,
+# with each block's pixels in top-down row-major order (i.e. the order they'd be written in, not Blender's bottom-up order)
+# pixels stay as uint8 all the way until they're handed to Blender (see set_image_pixels), since that's all it keeps for these images anyway
+# any maths that needs fractions is done per block (e.g. on the palettes) wherever possible, so there's only ever one uint8 array per pixel
+
+# 0.0-1.0 floats to 0-255, rounded the same way Blender does it (so nothing changes compared to giving it the floats)
+def unit_to_byte(values):
+	return numpy.floor(numpy.clip(numpy.asarray(values,dtype=numpy.float32),0.0,1.0)*numpy.float32(255.0)+numpy.float32(0.5)).astype(numpy.uint8)
+
+# BC1-style colour: two RGB565 endpoints, then four rows of 2-bit indexes (one byte per row)
+# fourColourOnly is for BC2/BC3, which don't have BC1's "3 colours + transparent" mode
+# gx is for CMPR, which has big-endian endpoints and the pixels of each row in the opposite order
+def decode_bc1_colour_blocks(blocks,fourColourOnly=False,gx=False):
+	blocks = blocks.astype(numpy.uint32)
+	if gx:
+		endpoint0 = (blocks[:,0] << 8) | blocks[:,1]
+		endpoint1 = (blocks[:,2] << 8) | blocks[:,3]
+	else:
+		endpoint0 = blocks[:,0] | (blocks[:,1] << 8)
+		endpoint1 = blocks[:,2] | (blocks[:,3] << 8)
+	# the maths is done in float64 then stored as float32, the same as the pixels themselves
+	maxes = numpy.array([0b11111,0b111111,0b11111])
+	endpointColours = ((numpy.stack([endpoint0,endpoint1],axis=1)[:,:,None] >> numpy.array([11,5,0],dtype=numpy.uint32)) & maxes)/maxes
+	c0 = endpointColours[:,0]
+	c1 = endpointColours[:,1]
+	fourColour = (endpoint0 > endpoint1)[:,None]
+	if fourColourOnly:
+		fourColour[:] = True
+	palettes = numpy.ones([len(blocks),4,4],dtype=numpy.float32) # block, palette entry, channel
+	palettes[:,0:2,0:3] = endpointColours
+	palettes[:,2,0:3] = numpy.where(fourColour,2/3*c0+1/3*c1,1/2*c0+1/2*c1)
+	palettes[:,3,0:3] = numpy.where(fourColour,1/3*c0+2/3*c1,0.0)
+	palettes[:,3,3] = numpy.where(fourColour[:,0],1.0,0.0) # binary alpha
+	palettes = unit_to_byte(palettes)
+	shifts = numpy.array([6,4,2,0] if gx else [0,2,4,6],dtype=numpy.uint32)
+	indexes = ((blocks[:,4:8,None] >> shifts) & 0b11).reshape(-1,16)
+	# index into all the palettes at once as one long list
+	return numpy.take(palettes.reshape(-1,4),indexes+numpy.arange(0,len(blocks)*4,4)[:,None],axis=0)
+
+# BC3-style (and BC4/BC5) channel: two 8-bit endpoints, then 16 3-bit indexes into an 8-value ramp
+# the values come back as uint8 normally, or as the exact 0-255 floats if asBytes is off (for when there's more maths to be done on them)
+def decode_bc4_channel_blocks(blocks,asBytes=True):
+	a0 = blocks[:,0].astype(numpy.int64)
+	a1 = blocks[:,1].astype(numpy.int64)
+	# a0 > a1: six values interpolated between them; otherwise: four interpolated values, then 0 and 255
+	k = numpy.arange(1,7)
+	eightRamp = ((7-k)*a0[:,None]+k*a1[:,None])/7.0
+	k = numpy.arange(1,5)
+	sixRamp = numpy.zeros([len(blocks),6],dtype=numpy.float64)
+	sixRamp[:,0:4] = ((5-k)*a0[:,None]+k*a1[:,None])/5.0
+	sixRamp[:,5] = 255.0
+	ramp = numpy.empty([len(blocks),8],dtype=numpy.float64)
+	ramp[:,0] = a0
+	ramp[:,1] = a1
+	ramp[:,2:8] = numpy.where((a0 > a1)[:,None],eightRamp,sixRamp)
+	if asBytes:
+		ramp = unit_to_byte(ramp/255.0)
+	# the 48 bits of indexes as one little-endian number (padded out to 64 bits)
+	indexBits = numpy.zeros([len(blocks),8],dtype=numpy.uint8)
+	indexBits[:,0:6] = blocks[:,2:8]
+	indexBits = indexBits.view("<u8")
+	indexes = ((indexBits >> (numpy.arange(16,dtype=numpy.uint64)*numpy.uint64(3))) & numpy.uint64(0b111)).astype(numpy.intp)
+	return numpy.take(ramp.reshape(-1),indexes+numpy.arange(0,len(blocks)*8,8)[:,None])
+
+def decode_bc1_blocks(blocks):
+	return decode_bc1_colour_blocks(blocks)
+
+# explicit 4-bit alpha for every pixel, then BC1-style colour
+bc2AlphaBytes = unit_to_byte(numpy.arange(16)/15.0)
+def decode_bc2_blocks(blocks):
+	pixels = decode_bc1_colour_blocks(blocks[:,8:16],fourColourOnly=True)
+	alphas = numpy.stack([blocks[:,0:8] & 0b1111,blocks[:,0:8] >> 4],axis=2).reshape(-1,16)
+	pixels[:,:,3] = bc2AlphaBytes[alphas]
+	return pixels
+
+def decode_bc3_blocks(blocks):
+	pixels = decode_bc1_colour_blocks(blocks[:,8:16],fourColourOnly=True)
+	pixels[:,:,3] = decode_bc4_channel_blocks(blocks[:,0:8])
+	return pixels
+
+def decode_bc4_blocks(blocks):
+	pixels = numpy.full([len(blocks),16,4],255,dtype=numpy.uint8)
+	pixels[:,:,0:3] = decode_bc4_channel_blocks(blocks)[:,:,None]
+	return pixels
+
+# BC5 is just two BC4s stapled together (red then green)
+# blueBC5 calculates a blue channel for normal mapping (such that the length of [r,g,b] is 1.0), otherwise it's left at 0
+def decode_bc5_blocks(blocks,blueBC5=False):
+	pixels = numpy.zeros([len(blocks),16,4],dtype=numpy.uint8)
+	if blueBC5: # the blue is worked out from the exact red and green, not the rounded ones
+		reds = decode_bc4_channel_blocks(blocks[:,0:8],asBytes=False)
+		greens = decode_bc4_channel_blocks(blocks[:,8:16],asBytes=False)
+		pixels[:,:,0] = unit_to_byte(reds/255.0)
+		pixels[:,:,1] = unit_to_byte(greens/255.0)
+		r = (reds-128)/128.0
+		g = (greens-128)/128.0
+		# r**2+g**2 > 1 can't be a unit vector, so those just get flat 0.5 (which is what clipping to sqrt(0) gives)
+		pixels[:,:,2] = unit_to_byte(numpy.sqrt(numpy.clip(1-r**2-g**2,0.0,None))/2+0.5)
+	else:
+		pixels[:,:,0] = decode_bc4_channel_blocks(blocks[:,0:8])
+		pixels[:,:,1] = decode_bc4_channel_blocks(blocks[:,8:16])
+	pixels[:,:,3] = 255
+	return pixels
+
+# CMPR blocks are 8x8, made of four BC1-ish 4x4 sub-blocks in [[0,1],[2,3]] order
+def decode_cmpr_blocks(blocks):
+	subPixels = decode_bc1_colour_blocks(blocks.reshape(-1,8),gx=True)
+	# block, sub-block row, sub-block column, pixel row, pixel column -> block, sub-block row, pixel row, sub-block column, pixel column
+	return subPixels.reshape(-1,2,2,4,4,4).transpose(0,1,3,2,4,5).reshape(-1,64,4)
+
+# plain 8-bit channels, one pixel per "block"
+def decode_rgba8_blocks(blocks):
+	return blocks.reshape(-1,1,4)
+
+# the rest of the GX formats (see brresImageFormats)
+# everything is big-endian, and 4-bit values have the first pixel in the top nibble
+def gx_nibbles(blocks):
+	return numpy.stack([blocks >> 4,blocks & 0b1111],axis=2).reshape(len(blocks),-1)
+
+def gx_u16s(blocks):
+	return (blocks[:,0::2].astype(numpy.uint16) << 8) | blocks[:,1::2]
+
+# n-bit channel values to 0-255 (the ones that aren't just bit copies, e.g. 4-bit alpha in RGB5A3 is 3 bits)
+threeBitBytes = unit_to_byte(numpy.arange(8)/7.0)
+fourBitBytes = unit_to_byte(numpy.arange(16)/15.0)
+fiveBitBytes = unit_to_byte(numpy.arange(32)/31.0)
+sixBitBytes = unit_to_byte(numpy.arange(64)/63.0)
+
+def grey_pixels(values,alphas=255):
+	pixels = numpy.empty([len(values),values.shape[1],4],dtype=numpy.uint8)
+	pixels[:,:,0:3] = values[:,:,None]
+	pixels[:,:,3] = alphas
+	return pixels
+
+def decode_i4_blocks(blocks):
+	return grey_pixels(gx_nibbles(blocks)*0x11)
+
+def decode_i8_blocks(blocks):
+	return grey_pixels(blocks)
+
+# alpha in the top half, intensity in the bottom
+def decode_ia4_blocks(blocks):
+	return grey_pixels((blocks & 0b1111)*0x11,(blocks >> 4)*0x11)
+
+def decode_ia8_blocks(blocks):
+	return grey_pixels(blocks[:,1::2],blocks[:,0::2])
+
+def decode_rgb565_blocks(blocks):
+	colours = gx_u16s(blocks)
+	pixels = numpy.full([len(blocks),colours.shape[1],4],255,dtype=numpy.uint8)
+	pixels[:,:,0] = fiveBitBytes[colours >> 11]
+	pixels[:,:,1] = sixBitBytes[(colours >> 5) & 0b111111]
+	pixels[:,:,2] = fiveBitBytes[colours & 0b11111]
+	return pixels
+
+# the top bit picks between opaque RGB555 and ARGB3444
+def decode_rgb5a3_blocks(blocks):
+	colours = gx_u16s(blocks)
+	opaque = (colours & 0x8000) != 0
+	pixels = numpy.empty([len(blocks),colours.shape[1],4],dtype=numpy.uint8)
+	pixels[:,:,0] = numpy.where(opaque,fiveBitBytes[(colours >> 10) & 0b11111],fourBitBytes[(colours >> 8) & 0b1111])
+	pixels[:,:,1] = numpy.where(opaque,fiveBitBytes[(colours >> 5) & 0b11111],fourBitBytes[(colours >> 4) & 0b1111])
+	pixels[:,:,2] = numpy.where(opaque,fiveBitBytes[colours & 0b11111],fourBitBytes[colours & 0b1111])
+	pixels[:,:,3] = numpy.where(opaque,255,threeBitBytes[(colours >> 12) & 0b111])
+	return pixels
+
+# the first half of each block is AR pairs for its 16 pixels, the second half GB pairs
+def decode_rgba32_blocks(blocks):
+	ar = blocks[:,0:32].reshape(-1,16,2)
+	gb = blocks[:,32:64].reshape(-1,16,2)
+	return numpy.stack([ar[:,:,1],gb[:,:,0],gb[:,:,1],ar[:,:,0]],axis=2)
+
+# the palette formats just give indexes, which get looked up in the palette afterwards (see decode_texture_brres)
+def decode_c4_indexes(blocks):
+	return gx_nibbles(blocks)
+
+def decode_c8_indexes(blocks):
+	return blocks
+
+def decode_c14x2_indexes(blocks):
+	return gx_u16s(blocks) & 0x3FFF
+
+# [decoder, bits per index]
+gxIndexDecoders = {
+					"C4":[decode_c4_indexes,4],
+					"C8":[decode_c8_indexes,8],
+					"C14X2":[decode_c14x2_indexes,14],
+				}
+
+# the palette (an (N,4) uint8 array, see parse_plt0) as a lookup table covering every possible index
+# (anything off the end of the actual palette is transparent black)
+def palette_lookup_table(palette,indexBits):
+	table = numpy.zeros([1 << indexBits,4],dtype=numpy.uint8)
+	colours = palette[0:len(table)]
+	table[0:len(colours)] = colours
+	return table
+
+# turns (blockCountY*blockCountX,blockHeight*blockWidth,4) decoded blocks into Blender-ordered (bottom row first) pixels
+def blocks_to_pixels(blockPixels,blockCountX,blockCountY,blockWidth,blockHeight):
+	image = blockPixels.reshape(blockCountY,blockCountX,blockHeight,blockWidth,4).transpose(0,2,1,3,4)
+	return image.reshape(blockCountY*blockHeight,blockCountX*blockWidth,4)[::-1].reshape(-1,4)
+
+# decoded textures are cached (see get_texture_cache) by their raw data plus whatever else affects the decoding
+# bump this whenever a decoder changes what it gives back, so that older results don't get reused
+textureCacheVersion = 2
+
+# stored exactly as the decoders give them (RGBA, uint8, bottom row first)
+def get_cached_texture(cache,key,imgWidth,imgHeight):
+	data = cache.get(key)
+	if data is None:
+		return None
+	pixels = None
+	if len(data) == imgWidth*imgHeight*4:
+		cached = numpy.frombuffer(data,dtype=numpy.uint8).reshape(-1,4)
+		pixels = cached.copy()
+		del cached
+	if not isinstance(data,bytes):
+		data.close()
+	return pixels
+
+def put_cached_texture(cache,key,pixels):
+	cache.put(key,numpy.ascontiguousarray(pixels).reshape(-1))
+
+# what each single-channel value looks like as an opaque grey RGBA pixel
+greyPixelFloats = numpy.ones([256,4],dtype=numpy.float32)
+greyPixelFloats[:,0:3] = (numpy.arange(256)/numpy.float32(255.0))[:,None]
+
+# the one place pixels turn into floats, since that's the only thing Blender takes
+# pixels are (N,4) RGBA, or (N,) for a single channel to be shown as opaque greyscale (which can be a view of one channel of something else)
+# Blender images are always RGBA as far as Python's concerned, so there's no way to hand over just the one channel
+# fast pixel updates using foreach_set:
+# https://projects.blender.org/blender/blender/commit/9075ec8269e7cb029f4fab6c1289eb2f1ae2858a
+def set_image_pixels(image,pixels):
+	if pixels.ndim == 1:
+		floats = greyPixelFloats[pixels] # a single lookup straight into the final buffer
+	else:
+		floats = numpy.divide(pixels,numpy.float32(255.0),dtype=numpy.float32)
+	image.pixels.foreach_set(floats.reshape(-1))
+
+# the pixel-making half of parse_texture_brres (as with parse_texture_wismt, the pixels come back bottom row first and cropped to size)
+def decode_texture_brres(textureName,imgType,imgWidth,imgHeight,rawData,palette):
+	imgFormat,bitsPerPixel,blockWidth,blockHeight,blockBytesize = brresImageFormats[imgType]
+	# images must be divisible by the block size - extend them as necessary
+	virtImgWidth = imgWidth if imgWidth % blockWidth == 0 else imgWidth + (blockWidth - (imgWidth % blockWidth))
+	virtImgHeight = imgHeight if imgHeight % blockHeight == 0 else imgHeight + (blockHeight - (imgHeight % blockHeight))
+	blockCountX = virtImgWidth // blockWidth
+	blockCountY = virtImgHeight // blockHeight
+	blockCount = blockCountX*blockCountY
+	
+	blocks = numpy.zeros([blockCount,blockBytesize],dtype=numpy.uint8)
+	raw = numpy.frombuffer(rawData,dtype=numpy.uint8)[0:blockCount*blockBytesize]
+	blocks.reshape(-1)[0:len(raw)] = raw
+	if imgFormat in gxIndexDecoders:
+		indexDecoder,indexBits = gxIndexDecoders[imgFormat]
+		blockPixels = palette_lookup_table(palette,indexBits).take(indexDecoder(blocks),axis=0)
+	else:
+		blockPixels = arrayBlockDecoders[imgFormat](blocks)
+	pixels = blocks_to_pixels(blockPixels,blockCountX,blockCountY,blockWidth,blockHeight)
+	return pixels.reshape([virtImgHeight,virtImgWidth,4])[virtImgHeight-imgHeight:,0:imgWidth].reshape(-1,4) # bottom row first, so the padding is at the start
+
 # much of this was copied from parse_texture_wismt (it seems hard to try and merge the two)
-def parse_texture_brres(textureName,imgType,imgWidth,imgHeight,rawData,palette,printProgress,overwrite="ADD",saveTo=None,dechannelise=False):
+def parse_texture_brres(textureName,imgType,imgWidth,imgHeight,rawData,palette,printProgress,overwrite="ADD",saveTo=None,dechannelise=False,cache=None):
 	if imgType > 0xe:
 		print_error(textureName+" is of an unknown/unsupported image type (id "+str(imgType)+")")
 		return
-	if imgType in [8,9,10] and not palette:
+	if imgType in [8,9,10] and len(palette) == 0:
 		print_error(textureName+" uses a palette format but no palette was provided")
 		return
 	imgFormat,bitsPerPixel,blockWidth,blockHeight,blockBytesize = brresImageFormats[imgType]
@@ -61,136 +324,20 @@ def parse_texture_brres(textureName,imgType,imgWidth,imgHeight,rawData,palette,p
 		newImage.filepath = os.path.join(saveTo,newImage.name+".png")
 	newImage.name = textureName # if the image was a .001 because of ADD, this will re-route it (needed because the current brres process won't catch onto it otherwise)
 	
-	# images must be divisible by the block size - extend them as necessary
-	virtImgWidth = imgWidth if imgWidth % blockWidth == 0 else imgWidth + (blockWidth - (imgWidth % blockWidth))
-	virtImgHeight = imgHeight if imgHeight % blockHeight == 0 else imgHeight + (blockHeight - (imgHeight % blockHeight))
-	# gotta create the image in full emptiness to start with, so we can random-access-fill the blocks as they come
-	# Blender always needs alpha, so colours must be length 4
-	pixels = numpy.zeros([virtImgHeight*virtImgWidth,4],dtype=numpy.float32)
-	
-	blockCountX = virtImgWidth // blockWidth
-	blockCountY = virtImgHeight // blockHeight
-	blockCount = blockCountX*blockCountY
-	
-	d = io.BytesIO(rawData)
-	
-	for targetBlock in range(blockCount):
-		if printProgress and targetBlock % 64 == 0: # printing for every single block racks up the import time a lot (e.g. 12s to 20s)
-			print_progress_bar(targetBlock,blockCount,textureName)
-		targetBlockX = targetBlock % blockCountX
-		targetBlockY = targetBlock // blockCountX
-		subBlocks = 4 if imgFormat == "CMPR" else 1
-		for sb in range(subBlocks): # sub-blocks, if necessary
-			# convert block to pixel (Y is inverted, X is not)
-			blockRootPixelX = targetBlockX*blockWidth + (4 if (subBlocks>1 and sb%2==1) else 0)
-			blockRootPixelY = virtImgHeight - targetBlockY*blockHeight - blockHeight + (4 if (subBlocks>1 and sb <=1) else 0)
-			if imgFormat == "CMPR": # mostly copy-pasted form the BC1 section in parse_texture_wismt
-				endpoint0 = readAndParseIntBig(d,2)
-				endpoint1 = readAndParseIntBig(d,2)
-				row0 = readAndParseIntBig(d,1)
-				row1 = readAndParseIntBig(d,1)
-				row2 = readAndParseIntBig(d,1)
-				row3 = readAndParseIntBig(d,1)
-				r0,g0,b0 = ((endpoint0 & 0b1111100000000000) >> 11),((endpoint0 & 0b0000011111100000) >> 5),(endpoint0 & 0b0000000000011111)
-				r1,g1,b1 = ((endpoint1 & 0b1111100000000000) >> 11),((endpoint1 & 0b0000011111100000) >> 5),(endpoint1 & 0b0000000000011111)
-				# potential future feature: autodetect images that are supposed to be greyscale and only use the higher-resolution green channel
-				#if monochrome and not(r0 == b0 and r1 == b1 and abs(r0*2 - g0) <= 1 and abs(r1*2 - g1) <= 1):
-				#	monochrome = False
-				colours = [[],[],[],[]]
-				colours[0] = [r0/0b11111,g0/0b111111,b0/0b11111,1.0]
-				colours[1] = [r1/0b11111,g1/0b111111,b1/0b11111,1.0]
-				if endpoint0 > endpoint1:
-					colours[2] = [2/3*colours[0][0]+1/3*colours[1][0],2/3*colours[0][1]+1/3*colours[1][1],2/3*colours[0][2]+1/3*colours[1][2],1.0]
-					colours[3] = [1/3*colours[0][0]+2/3*colours[1][0],1/3*colours[0][1]+2/3*colours[1][1],1/3*colours[0][2]+2/3*colours[1][2],1.0]
-				else:
-					colours[2] = [1/2*colours[0][0]+1/2*colours[1][0],1/2*colours[0][1]+1/2*colours[1][1],1/2*colours[0][2]+1/2*colours[1][2],1.0]
-					colours[3] = [0.0,0.0,0.0,0.0] # binary alpha
-				# the X-position of pixels in blocks is inverted compared to wismt
-				pixelIndexes = [
-								(row3 & 0b11000000) >> 6, (row3 & 0b00110000) >> 4, (row3 & 0b00001100) >> 2, (row3 & 0b00000011),
-								(row2 & 0b11000000) >> 6, (row2 & 0b00110000) >> 4, (row2 & 0b00001100) >> 2, (row2 & 0b00000011),
-								(row1 & 0b11000000) >> 6, (row1 & 0b00110000) >> 4, (row1 & 0b00001100) >> 2, (row1 & 0b00000011),
-								(row0 & 0b11000000) >> 6, (row0 & 0b00110000) >> 4, (row0 & 0b00001100) >> 2, (row0 & 0b00000011),
-								]
-				for p,pi in enumerate(pixelIndexes):
-					pixels[(blockRootPixelX + p % 4) + ((blockRootPixelY + p // 4) * virtImgWidth)] = colours[pi]
-			elif imgFormat == "RGBA32":
-				chunkAR = [readAndParseIntBig(d,1) for x in range(blockBytesize//2)]
-				chunkGB = [readAndParseIntBig(d,1) for x in range(blockBytesize//2)]
-				chunkA = chunkAR[::2]
-				chunkR = chunkAR[1::2]
-				chunkG = chunkGB[::2]
-				chunkB = chunkGB[1::2]
-				colours = []
-				for c in range(len(chunkA)):
-					colours.append([chunkR[c],chunkG[c],chunkB[c],chunkA[c]])
-				blockedColours = [
-									colours[12],colours[13],colours[14],colours[15],
-									colours[ 8],colours[ 9],colours[10],colours[11],
-									colours[ 4],colours[ 5],colours[ 6],colours[ 7],
-									colours[ 0],colours[ 1],colours[ 2],colours[ 3],
-									]
-				for p,pv in enumerate(blockedColours):
-					pixels[(blockRootPixelX + p % blockWidth) + ((blockRootPixelY + p // blockWidth) * virtImgWidth)] = [x/255 for x in pv]
-			else: # every other format can be done fairly similarly
-				data = d.read(blockBytesize)
-				br = BitReader(data)
-				rowData = [] # using numpy for this seems to be slower? guessing there's too much churn in these small loops
-				for row in range(blockHeight):
-					rowData.append([])
-					for col in range(blockWidth):
-						if imgFormat == "I4":
-							rowData[-1].append([br.readbits(4) * 0x11]*3+[255]) # reminder: [read(x)]*3 results in [v,v,v], not [read(x),read(x),read(x)]
-						elif imgFormat == "I8":
-							rowData[-1].append([br.readbits(8)]*3+[255])
-						elif imgFormat == "IA4":
-							alpha = br.readbits(4)
-							value = br.readbits(4)
-							rowData[-1].append([value * 0x11]*3+[alpha])
-						elif imgFormat == "IA8":
-							alpha = br.readbits(8)
-							value = br.readbits(8)
-							rowData[-1].append([value]*3+[alpha])
-						elif imgFormat == "RGB565":
-							r = br.readbits(5)/31*255
-							g = br.readbits(6)/63*255
-							b = br.readbits(5)/31*255
-							rowData[-1].append([r,g,b,255])
-						elif imgFormat == "RGB5A3":
-							mode = br.readbits(1)
-							if mode:
-								a = 255
-								r = br.readbits(5)/31*255
-								g = br.readbits(5)/31*255
-								b = br.readbits(5)/31*255
-							else:
-								a = br.readbits(3)/7*255
-								r = br.readbits(4)/15*255
-								g = br.readbits(4)/15*255
-								b = br.readbits(4)/15*255
-							rowData[-1].append([r,g,b,a])
-						elif imgFormat == "C4":
-							rowData[-1].append(palette[br.readbits(4)])
-						elif imgFormat == "C8":
-							rowData[-1].append(palette[br.readbits(8)])
-						elif imgFormat == "C14X2":
-							waste = br.readbits(2)
-							rowData[-1].append(palette[br.readbits(14)])
-					pixelValues = list(reversed(rowData))
-					for p,pv in enumerate(flattened_list(pixelValues)):
-						pixels[(blockRootPixelX + p % blockWidth) + ((blockRootPixelY + p // blockWidth) * virtImgWidth)] = [x/255 for x in pv]
-	if printProgress:
-		print_progress_bar(blockCount,blockCount,textureName)
-	d.close()
+	pixels = None
+	if cache:
+		# the palette's part of the content too
+		cacheKey = content_cache_key(bytes(rawData)+numpy.ascontiguousarray(palette).tobytes(),"brres",textureCacheVersion,imgType,imgWidth,imgHeight,len(palette))
+		pixels = get_cached_texture(cache,cacheKey,imgWidth,imgHeight)
+	if pixels is None:
+		pixels = decode_texture_brres(textureName,imgType,imgWidth,imgHeight,rawData,palette)
+		if cache:
+			put_cached_texture(cache,cacheKey,pixels)
 	
 	finalImages = [[newImage,pixels]]
 	
-	# final pixel data must be flattened to 1D (and, if necessary, cropped)
 	for fi,px in finalImages:
-		# fast pixel updates using foreach_set:
-		# https://projects.blender.org/blender/blender/commit/9075ec8269e7cb029f4fab6c1289eb2f1ae2858a
-		pixel_buffer = px.reshape([virtImgHeight,virtImgWidth,4])[0:imgHeight,0:imgWidth].reshape(-1)
-		fi.pixels.foreach_set(pixel_buffer)
+		set_image_pixels(fi,px)
 		fi.update()
 		
 		if saveTo:
@@ -293,27 +440,219 @@ bc7AnchorIndexes = {
 							],
 					}
 
+# all of the above as lookup arrays, for decoding whole sets of blocks at once
+# partition maps: [subsetCount][partitionPattern,pixel] = subset (pixels in top-down row-major order)
+bc7PartitionTables = {
+						1:numpy.zeros([64,16],dtype=numpy.intp),
+						2:(numpy.array(bc7PartitionMaps[2])[:,None] >> numpy.arange(16)) & 0b1,
+						3:(numpy.array(bc7PartitionMaps[3])[:,None] >> (numpy.arange(16)*2)) & 0b11,
+						}
+# anchor flags: [subsetCount][partitionPattern,pixel] = whether that pixel is its subset's anchor (and so has one fewer index bit)
+bc7AnchorTables = {}
+for subsetCount,partitionTable in bc7PartitionTables.items():
+	anchors = numpy.array([bc7AnchorIndexes[str(subset+1)+"/"+str(subsetCount)] for subset in range(subsetCount)]).T # [partitionPattern,subset]
+	bc7AnchorTables[subsetCount] = numpy.take_along_axis(anchors,partitionTable,axis=1) == numpy.arange(16)
+# weights: [indexBits,index] (only rows 2-4 are real)
+bc7WeightTable = numpy.zeros([5,16],dtype=numpy.int64)
+for indexBits,weights in bc7Weights.items():
+	bc7WeightTable[indexBits,0:len(weights)] = weights
+# the mode is the number of 0 bits before the first 1 (so it's entirely decided by the first byte, and all 0s is the reserved mode 8)
+bc7ModeOfFirstByte = numpy.array([(b & -b).bit_length()-1 if b else 8 for b in range(256)])
+# the mode, partition, rotation, and index selection fields, which decide what the rest of the block looks like
+bc7HeaderLayouts = {m:BitLayout([m+1]+bc7ModeData[m][1:4],reverse=True) for m in bc7ModeData.keys()}
+# rotation swaps alpha with one of the other channels
+bc7RotationOrders = numpy.array([[0,1,2,3],[3,1,2,0],[0,3,2,1],[0,1,3,2]])
+
+bc7FieldTableCache = {}
+# where every field after the header is, as [partitionPattern,field] arrays of shifts and widths (see bit_fields_at)
+# the fields are, in order: endpoints (R, G, B, A, per subset per endpoint), per-endpoint P-bits, shared P-bits, indexes, second indexes
+# the index widths (and so where every index after an anchor starts) depend on the partition pattern, which is why this isn't a BitLayout
+def bc7_field_tables(mode):
+	try:
+		return bc7FieldTableCache[mode]
+	except KeyError:
+		pass
+	subsetCount,partitionBits,rotationBits,indexSelectionBits,colourBits,alphaBits,endpointPBits,sharedPBits,indexBits,index2Bits = bc7ModeData[mode]
+	anchorTable = bc7AnchorTables[subsetCount][0:1 << partitionBits]
+	fixedWidths = [colourBits]*(subsetCount*2*3) + [alphaBits]*(subsetCount*2) + [endpointPBits]*(subsetCount*2) + [sharedPBits]*subsetCount
+	widths = [numpy.broadcast_to(fixedWidths,[len(anchorTable),len(fixedWidths)]),indexBits-anchorTable]
+	if index2Bits > 0:
+		widths.append(index2Bits-anchorTable)
+	widths = numpy.concatenate(widths,axis=1)
+	headerBits = mode+1+partitionBits+rotationBits+indexSelectionBits
+	shifts = headerBits+numpy.cumsum(widths,axis=1)-widths
+	bc7FieldTableCache[mode] = [shifts,widths]
+	return bc7FieldTableCache[mode]
+
+# all the blocks given must be of the same mode
+def decode_bc7_mode_blocks(blocks,mode):
+	subsetCount,partitionBits,rotationBits,indexSelectionBits,colourBits,alphaBits,endpointPBits,sharedPBits,indexBits,index2Bits = bc7ModeData[mode]
+	blockCount = len(blocks)
+	bits = bit_blocks(blocks,16,reverse=True)
+	header = bc7HeaderLayouts[mode]
+	partitions = header.field(bits,1).astype(numpy.intp)
+	rotations = header.field(bits,2).astype(numpy.intp)
+	indexSelections = header.field(bits,3).astype(bool)
+	shifts,widths = bc7_field_tables(mode)
+	fields = bit_fields_at(bits,shifts[partitions],widths[partitions]).astype(numpy.int64)
+	
+	# endpoints: [block,channel,subset,endpoint]
+	endpointCount = subsetCount*2
+	endpoints = fields[:,0:endpointCount*4].reshape(blockCount,4,subsetCount,2)
+	pos = endpointCount*4
+	endpointPs = fields[:,pos:pos+endpointCount].reshape(blockCount,1,subsetCount,2)
+	pos += endpointCount
+	sharedPs = fields[:,pos:pos+subsetCount].reshape(blockCount,1,subsetCount,1)
+	pos += subsetCount
+	firstIndexes = fields[:,pos:pos+16]
+	pos += 16
+	# P-bits go on the bottom of every channel (alpha too, if there is alpha)
+	channels = 4 if alphaBits > 0 else 3
+	if endpointPBits > 0:
+		endpoints[:,0:channels] = (endpoints[:,0:channels] << 1) | endpointPs
+	if sharedPBits > 0:
+		endpoints[:,0:channels] = (endpoints[:,0:channels] << 1) | sharedPs
+	# then everything is expanded to 8 bits by copying the top bits into the bottom
+	cb = colourBits+endpointPBits+sharedPBits
+	endpoints[:,0:3] = (endpoints[:,0:3] << (8 - cb)) | ((endpoints[:,0:3] << (8 - cb)) >> cb)
+	if alphaBits > 0:
+		ab = alphaBits+endpointPBits+sharedPBits
+		endpoints[:,3] = (endpoints[:,3] << (8 - ab)) | ((endpoints[:,3] << (8 - ab)) >> ab)
+	else:
+		endpoints[:,3] = 255
+	
+	# with only one set of indexes, colour and alpha share it
+	colourIndexes = firstIndexes
+	alphaIndexes = firstIndexes
+	colourIndexBits = numpy.full([blockCount,1],indexBits)
+	alphaIndexBits = numpy.full([blockCount,1],indexBits)
+	if index2Bits > 0: # index selection decides which set is for colour and which for alpha
+		secondIndexes = fields[:,pos:pos+16]
+		selections = indexSelections[:,None]
+		colourIndexes = numpy.where(selections,secondIndexes,firstIndexes)
+		alphaIndexes = numpy.where(selections,firstIndexes,secondIndexes)
+		colourIndexBits = numpy.where(selections,index2Bits,indexBits)
+		alphaIndexBits = numpy.where(selections,indexBits,index2Bits)
+	weights = numpy.empty([blockCount,16,4],dtype=numpy.int64) # block, pixel, channel
+	weights[:,:,0:3] = bc7WeightTable[colourIndexBits,colourIndexes][:,:,None]
+	weights[:,:,3] = bc7WeightTable[alphaIndexBits,alphaIndexes]
+	
+	# each pixel's subset's endpoints, as [block,pixel,channel]
+	subsets = bc7PartitionTables[subsetCount][partitions]
+	blockIndexes = numpy.arange(blockCount)[:,None]
+	endpoint0 = endpoints[blockIndexes,:,subsets,0]
+	endpoint1 = endpoints[blockIndexes,:,subsets,1]
+	values = ((64-weights)*endpoint0 + weights*endpoint1 + 32) >> 6
+	values = numpy.take_along_axis(values,bc7RotationOrders[rotations][:,None,:],axis=2)
+	return values.astype(numpy.uint8)
+
+# blocks are decoded in groups by mode, since everything about the layout depends on it
+def decode_bc7_blocks(blocks):
+	pixels = numpy.zeros([len(blocks),16,4],dtype=numpy.uint8) # the reserved mode 8 is left as transparent black
+	modes = bc7ModeOfFirstByte[blocks[:,0]]
+	for mode in range(8):
+		selection = numpy.nonzero(modes == mode)[0]
+		if len(selection) > 0:
+			pixels[selection] = decode_bc7_mode_blocks(blocks[selection],mode)
+	return pixels
+
+arrayBlockDecoders = {
+						"BC1_UNORM":decode_bc1_blocks,
+						"BC2_UNORM":decode_bc2_blocks,
+						"BC3_UNORM":decode_bc3_blocks,
+						"BC4_UNORM":decode_bc4_blocks,
+						"BC5_UNORM":decode_bc5_blocks,
+						"BC7_UNORM":decode_bc7_blocks,
+						"CMPR":decode_cmpr_blocks,
+						"R8G8B8A8_UNORM":decode_rgba8_blocks,
+						"I4":decode_i4_blocks,
+						"I8":decode_i8_blocks,
+						"IA4":decode_ia4_blocks,
+						"IA8":decode_ia8_blocks,
+						"RGB565":decode_rgb565_blocks,
+						"RGB5A3":decode_rgb5a3_blocks,
+						"RGBA32":decode_rgba32_blocks,
+					}
+
 # much of this is just grabbed from XBC2MD, but only after understanding it (rather than blindly copy-pasting anything)
 # REMINDER: don't manipulate image.pixels directly/individually or things will be dummy slow https://blender.stackexchange.com/questions/3673/
 # references:
 # 	https://www.vg-resource.com/thread-31389.html
 # 	https://www.vg-resource.com/thread-33929.html
-# 	https://en.wikipedia.org/wiki/Z-order_curve
 # 	https://github.com/ScanMountGoat/tegra_swizzle
 # 	https://learn.microsoft.com/en-us/windows/win32/direct3d10/d3d10-graphics-programming-guide-resources-block-compression
 # 	https://learn.microsoft.com/en-us/windows/win32/direct3d11/bc7-format
 # 	https://github.com/python-pillow/Pillow/blob/main/src/libImaging/BcnDecode.c
 # 	https://registry.khronos.org/DataFormat/specs/1.3/dataformat.1.3.html#bptc_bc7
-def parse_texture_wismt(textureName,imgVersion,imgType,imgWidth,imgHeight,rawData,blueBC5,printProgress,overwrite="ADD",saveTo=None,dechannelise=False,existingImageNames=[]):
+# in blocks
+textureDecodeBatchSize = 16384
+
+# this is the pure-data half of parse_texture_wismt: no Blender involved, so it can happen anywhere (see TextureDecodeQueue)
+# returns the uint8 pixels (bottom row first, already cropped to size) and a list of [isError,message] problems
+# (problems are passed back rather than printed, since the printing has to happen in order on the main thread)
+def decode_texture_wismt(textureName,imgType,imgWidth,imgHeight,rawData,blueBC5):
+	messages = []
 	try:
 		imgFormat,bitsPerPixel = modernImageFormats[imgType]
 	except KeyError:
-		print_error(textureName+" is of an unknown/unsupported image type (id "+str(imgType)+")")
-		return
+		messages.append([True,textureName+" is of an unknown/unsupported image type (id "+str(imgType)+")"])
+		return None,messages
 	
-	# first, check to see if an image of the intended name exists already
-	# if the image is in existingImageNames, then do add/use/overwrite based on the config
-	# otherwise, that means it's a smaller version of the same image done earlier in this same import, and it can be killed for free
+	textureNamePlusSize = textureName+f" ({imgWidth}x{imgHeight})"
+	blockSize = 4 # in pixels
+	bytesPerBlock = bitsPerPixel*2
+	if imgFormat == "R8G8B8A8_UNORM": # blocks are single pixels rather than 4x4
+		blockSize = 1
+		bytesPerBlock = bitsPerPixel // 8
+	# since the minimum block size is 4, images must be divisible by 4 - extend them as necessary
+	virtImgWidth = imgWidth if imgWidth % blockSize == 0 else imgWidth + (blockSize - (imgWidth % blockSize))
+	virtImgHeight = imgHeight if imgHeight % blockSize == 0 else imgHeight + (blockSize - (imgHeight % blockSize))
+	blockCountX = virtImgWidth // blockSize
+	blockCountY = virtImgHeight // blockSize
+	blockCount = blockCountX*blockCountY
+	
+	blocks,valid = deswizzle_blocks(rawData,blockCountX,blockCountY,bytesPerBlock)
+	missingCount = blockCount - int(numpy.count_nonzero(valid))
+	# decoded a batch at a time, so that the decoders' in-between arrays (which can be much bigger than the uint8 results) don't have to cover the whole image at once
+	blockPixels = numpy.empty([blockCount,blockSize*blockSize,4],dtype=numpy.uint8)
+	for start in range(0,blockCount,textureDecodeBatchSize):
+		batch = blocks[start:start+textureDecodeBatchSize]
+		if imgFormat == "BC5_UNORM":
+			blockPixels[start:start+textureDecodeBatchSize] = decode_bc5_blocks(batch,blueBC5)
+		else:
+			blockPixels[start:start+textureDecodeBatchSize] = arrayBlockDecoders[imgFormat](batch)
+	blockPixels[~valid] = 0
+	if missingCount > 0:
+		messages.append([True,"Texture "+textureNamePlusSize+" didn't complete deswizzling correctly: "+str(missingCount)+" / "+str(blockCount)+" blocks missing from the data"])
+	if imgFormat == "BC7_UNORM" and numpy.any(blocks[valid,0] == 0):
+		messages.append([False,"Texture "+textureNamePlusSize+" contained illegal BC7 blocks (rendered as transparent black)"])
+	# Blender always needs alpha, so colours must be length 4
+	# bottom row first, so any padding rows are at the start
+	pixels = blocks_to_pixels(blockPixels,blockCountX,blockCountY,blockSize,blockSize)
+	pixels = pixels.reshape([virtImgHeight,virtImgWidth,4])[virtImgHeight-imgHeight:,0:imgWidth].reshape(-1,4)
+	return pixels,messages
+
+def print_texture_messages(messages):
+	for isError,message in messages:
+		if isError:
+			print_error(message)
+		else:
+			print_warning(message)
+
+# whether an image is small enough for the max texture size setting (0 = no limit)
+def fits_texture_budget(imgWidth,imgHeight,maxSize):
+	return maxSize <= 0 or max(imgWidth,imgHeight) <= maxSize
+
+# if the duplicate image method says to use the existing copy of this image, the name of that copy (so there's no need to decode anything)
+def reused_image_name(textureName,overwrite,existingImageNames):
+	if overwrite == "USE" and textureName in existingImageNames and textureName in bpy.data.images:
+		return bpy.data.images[textureName].name
+	return None
+
+# makes a new blank image, first dealing with any existing image of the intended name
+# if the image is in existingImageNames, then do add/overwrite based on the config (use has to be dealt with before getting here)
+# otherwise, that means it's a smaller version of the same image done earlier in this same import, and it can be killed for free
+def new_texture_image(textureName,imgWidth,imgHeight,overwrite,existingImageNames,alpha=False):
 	doReplace = False
 	existingImage = None
 	try:
@@ -321,438 +660,58 @@ def parse_texture_wismt(textureName,imgVersion,imgType,imgWidth,imgHeight,rawDat
 		if textureName in existingImageNames:
 			if overwrite == "ADD":
 				pass # make a new copy, it all just works
-			elif overwrite == "USE":
-				print_info(textureName+" already exists, using the existing copy")
-				return existingImage.name # pretend you imported it and point to the existing copy
+			elif overwrite == "USE": # shouldn't happen, we wouldn't have got this far
+				print_error("got to unreachable code via "+textureName)
 			elif overwrite == "REPLACE":
 				doReplace = True
 		else: # there's an image by this name, but it wasn't there before this import started - replace
 			bpy.data.images.remove(existingImage)
 	except KeyError as e: # no existing image of the same name
 		pass # fine, move on
-	newImage = bpy.data.images.new(textureName,imgWidth,imgHeight,alpha=True)
+	newImage = bpy.data.images.new(textureName,imgWidth,imgHeight,alpha=alpha)
 	if doReplace and existingImage:
 		existingImage.user_remap(newImage)
 		bpy.data.images.remove(existingImage)
 		newImage.name = textureName
+	return newImage
+
+# the Blender half of parse_texture_wismt: turns already-decoded pixels (None if decoding failed) into the image(s)
+def create_texture_wismt(textureName,imgWidth,imgHeight,pixels,printProgress,overwrite="ADD",saveTo=None,dechannelise=False,existingImageNames=[]):
+	reusedName = reused_image_name(textureName,overwrite,existingImageNames)
+	if reusedName:
+		print_info(textureName+" already exists, using the existing copy")
+		return reusedName # pretend you imported it and point to the existing copy
+	if pixels is None:
+		return
+	
+	newImage = new_texture_image(textureName,imgWidth,imgHeight,overwrite,existingImageNames,alpha=True)
 	# don't really want to do any of this until the end, but apparently setting the filepath after setting the pixels clears the image for no good reason
 	newImage.file_format = "PNG"
 	if saveTo:
 		newImage.filepath = os.path.join(saveTo,newImage.name+".png")
-	
-	textureNamePlusSize = textureName+f" ({imgWidth}x{imgHeight})"
-	blockSize = 4 # in pixels
-	unswizzleBufferSize = bitsPerPixel*2 # needs a better name at some point
-	if imgFormat == "R8G8B8A8_UNORM": # blocks are single pixels rather than 4x4
-		blockSize = 1
-		unswizzleBufferSize = bitsPerPixel // 8
-	# since the minimum block size is 4, images must be divisible by 4 - extend them as necessary
-	virtImgWidth = imgWidth if imgWidth % blockSize == 0 else imgWidth + (blockSize - (imgWidth % blockSize))
-	virtImgHeight = imgHeight if imgHeight % blockSize == 0 else imgHeight + (blockSize - (imgHeight % blockSize))
-	# gotta create the image in full emptiness to start with, so we can random-access-fill the blocks as they come
-	# Blender always needs alpha, so colours must be length 4
-	pixels = numpy.zeros([virtImgHeight*virtImgWidth,4],dtype=numpy.float32)
-	
-	blockCountX = virtImgWidth // blockSize
-	blockCountY = virtImgHeight // blockSize
-	blockCount = blockCountX*blockCountY
-	tileWidth = clamp(16 // unswizzleBufferSize, 1, 16)
-	tileCountX = ceildiv(blockCountX,tileWidth)
-	tileCountY = blockCountY # since tile height is always 1
-	tileCount = tileCountX*tileCountY
-	# essentially, how many unswizzled "rows" must we read to get a full "column" (in tiles)
-	# this controls how wide the column chunk must be
-	# not currently used (dunno if it later needs to be)
-	columnStackSize = clamp(blockCountY // 8, 1, 16)
-	
-	d = io.BytesIO(rawData)
-	#print(imgFormat)
-	
-	try:
-		swizzlist = swizzleMapCache[f"{tileCountY},{tileCountX}"]
-	except KeyError:
-		swizzleTileMap = numpy.full([tileCountY,tileCountX],-1,dtype=int)
-		# swizzle pattern: (may need to change as larger images are discovered, but should be correct for smaller ones)
-		# x = 10001111111000010010
-		# y = 01110000000111101101
-		# [x9, y9, y8, y7, x8, x7, x6, x5, x4, x3, x2, y6, y5, y4, y3, x1, y2, y1, x0, y0]
-		# the distinction between z and currentTile is so we can draw the z-curve out of bounds while keeping all valid values in-bounds
-		currentTile = 0
-		z = -1 # will be incremented to 0 shortly
-		while currentTile < tileCountY*tileCountX:
-			if z > 10000000:
-				print_error("Bad z-loop detected in image "+textureName+": z = "+str(z)+"; currentTile = "+str(currentTile))
-				break
-			z += 1
-			y = ((z&0x70000)>>9) | ((z&0x1E0)>>2) | ((z&0xC)>>1) | (z&0x1)
-			if y >= len(swizzleTileMap): continue
-			x = ((z&0x80000)>>10) | ((z&0xFE00)>>7) | ((z&0x10)>>3) | ((z&0x2)>>1)
-			if x >= len(swizzleTileMap[y]): continue
-			swizzleTileMap[y,x] = currentTile
-			currentTile += 1
-		swizzlist = swizzleTileMap.flatten().tolist()
-		swizzleMapCache[f"{tileCountY},{tileCountX}"] = swizzlist
-		#print(swizzlist)
-	#swizzlist = range(blockCountX*blockCountY) # no-op option for debugging
-	monochrome = True
-	unassignedCount = False
-	bc7Mode8Flag = False
-	for t in range(tileCount):
-		if swizzlist[t] == -1:
-			unassignedCount += 1
-			continue
-		if printProgress and t % 64 == 0: # printing for every single t racks up the import time a lot (e.g. 12s to 20s)
-			print_progress_bar(t,tileCount,textureNamePlusSize)
-		d.seek(swizzlist[t]*(unswizzleBufferSize*tileWidth))
-		for t2 in range(tileWidth):
-			targetTile = t
-			targetBlock = t*tileWidth + t2
-			if targetBlock >= blockCount: continue # can happen for tiny textures, not a problem
-			targetBlockX = targetBlock % blockCountX
-			targetBlockY = targetBlock // blockCountX
-			# convert block to pixel (Y is inverted, X is not)
-			blockRootPixelX = targetBlockX*blockSize
-			blockRootPixelY = virtImgHeight - targetBlockY*blockSize - blockSize
-			if imgFormat == "R8G8B8A8_UNORM":
-				r = readAndParseInt(d,1)
-				g = readAndParseInt(d,1)
-				b = readAndParseInt(d,1)
-				a = readAndParseInt(d,1)
-				pixels[blockRootPixelX+blockRootPixelY*virtImgWidth] = [r/255.0,g/255.0,b/255.0,a/255.0]
-			elif imgFormat == "BC1_UNORM" or imgFormat == "BC2_UNORM" or imgFormat == "BC3_UNORM": # easy enough to treat these the same
-				if imgFormat == "BC2_UNORM":
-					alphas = []
-					for a in range(8): # hopefully this is correct, haven't actually found a test case image yet
-						aBlock = readAndParseInt(d,1)
-						alphas.append((aBlock >> 2) & 0b1111)
-						alphas.append(aBlock & 0b1111)
-				elif imgFormat == "BC3_UNORM":
-					a0 = readAndParseInt(d,1)
-					a1 = readAndParseInt(d,1)
-					alphas = [a0,a1]
-					if a0 > a1:
-						for a in range(6):
-							alphas.append(((6-a)*a0+(a+1)*a1)/7.0)
-					else:
-						for a in range(4):
-							alphas.append(((4-a)*a0+(a+1)*a1)/5.0)
-						alphas.append(0.0)
-						alphas.append(255.0)
-					alphaIndexes0 = int.from_bytes(d.read(3),"little") # can't use readAndParseInt for these since 3 is a weird size
-					alphaIndexes1 = int.from_bytes(d.read(3),"little")
-					alphaIndexesTemp = []
-					for a in range(8):
-						alphaIndexesTemp.append((alphaIndexes0 & (0b111 << a*3)) >> a*3)
-					for a in range(8):
-						alphaIndexesTemp.append((alphaIndexes1 & (0b111 << a*3)) >> a*3)
-					alphaIndexes = [alphaIndexesTemp[i] for i in [12,13,14,15,8,9,10,11,4,5,6,7,0,1,2,3]]
-				# BC1_UNORM doesn't have "separate" alpha at all - no "else" needed
-				endpoint0 = readAndParseInt(d,2)
-				endpoint1 = readAndParseInt(d,2)
-				row0 = readAndParseInt(d,1)
-				row1 = readAndParseInt(d,1)
-				row2 = readAndParseInt(d,1)
-				row3 = readAndParseInt(d,1)
-				r0,g0,b0 = ((endpoint0 & 0b1111100000000000) >> 11),((endpoint0 & 0b0000011111100000) >> 5),(endpoint0 & 0b0000000000011111)
-				r1,g1,b1 = ((endpoint1 & 0b1111100000000000) >> 11),((endpoint1 & 0b0000011111100000) >> 5),(endpoint1 & 0b0000000000011111)
-				# potential future feature: autodetect images that are supposed to be greyscale and only use the higher-resolution green channel
-				#if monochrome and not(r0 == b0 and r1 == b1 and abs(r0*2 - g0) <= 1 and abs(r1*2 - g1) <= 1):
-				#	monochrome = False
-				colours = [[],[],[],[]]
-				colours[0] = [r0/0b11111,g0/0b111111,b0/0b11111,1.0]
-				colours[1] = [r1/0b11111,g1/0b111111,b1/0b11111,1.0]
-				if imgFormat != "BC1_UNORM" or endpoint0 > endpoint1:
-					colours[2] = [2/3*colours[0][0]+1/3*colours[1][0],2/3*colours[0][1]+1/3*colours[1][1],2/3*colours[0][2]+1/3*colours[1][2],1.0]
-					colours[3] = [1/3*colours[0][0]+2/3*colours[1][0],1/3*colours[0][1]+2/3*colours[1][1],1/3*colours[0][2]+2/3*colours[1][2],1.0]
-				else: # BC1_UNORM and endpoint0 < endpoint1
-					colours[2] = [1/2*colours[0][0]+1/2*colours[1][0],1/2*colours[0][1]+1/2*colours[1][1],1/2*colours[0][2]+1/2*colours[1][2],1.0]
-					colours[3] = [0.0,0.0,0.0,0.0] # binary alpha
-				pixelIndexes = [
-								(row3 & 0b00000011), (row3 & 0b00001100) >> 2, (row3 & 0b00110000) >> 4, (row3 & 0b11000000) >> 6,
-								(row2 & 0b00000011), (row2 & 0b00001100) >> 2, (row2 & 0b00110000) >> 4, (row2 & 0b11000000) >> 6,
-								(row1 & 0b00000011), (row1 & 0b00001100) >> 2, (row1 & 0b00110000) >> 4, (row1 & 0b11000000) >> 6,
-								(row0 & 0b00000011), (row0 & 0b00001100) >> 2, (row0 & 0b00110000) >> 4, (row0 & 0b11000000) >> 6,
-								]
-				if imgFormat == "BC2_UNORM":
-					for p,pi in enumerate(pixelIndexes):
-						pixels[(blockRootPixelX + p % 4) + ((blockRootPixelY + p // 4) * virtImgWidth)] = colours[pi][0:3]+[alphas[pi]/15.0]
-				if imgFormat == "BC3_UNORM":
-					for p,pi in enumerate(pixelIndexes):
-						pixels[(blockRootPixelX + p % 4) + ((blockRootPixelY + p // 4) * virtImgWidth)] = colours[pi][0:3]+[alphas[alphaIndexes[p]]/255.0]
-				else: # BC1_UNORM
-					for p,pi in enumerate(pixelIndexes):
-						pixels[(blockRootPixelX + p % 4) + ((blockRootPixelY + p // 4) * virtImgWidth)] = colours[pi]
-			elif imgFormat == "BC4_UNORM" or imgFormat == "BC5_UNORM": # BC5 is just two BC4s stapled together
-				r0 = readAndParseInt(d,1)
-				r1 = readAndParseInt(d,1)
-				reds = [r0,r1]
-				if r0 > r1:
-					for r in range(6):
-						reds.append(((6-r)*r0+(r+1)*r1)/7.0)
-				else:
-					for r in range(4):
-						reds.append(((4-r)*r0+(r+1)*r1)/5.0)
-					reds.append(0.0)
-					reds.append(255.0)
-				redIndexes0 = int.from_bytes(d.read(3),"little") # can't use readAndParseInt for these since 3 is a weird size
-				redIndexes1 = int.from_bytes(d.read(3),"little")
-				redIndexes = []
-				for r in range(8):
-					redIndexes.append((redIndexes0 & (0b111 << r*3)) >> r*3)
-				for r in range(8):
-					redIndexes.append((redIndexes1 & (0b111 << r*3)) >> r*3)
-				if imgFormat == "BC4_UNORM":
-					pixelIndexes = [redIndexes[i] for i in [12,13,14,15,8,9,10,11,4,5,6,7,0,1,2,3]]
-					for p,pi in enumerate(pixelIndexes):
-						value = reds[pi]/255.0
-						colour = [value,value,value,1]
-						pixels[(blockRootPixelX + p % 4) + ((blockRootPixelY + p // 4) * virtImgWidth)] = colour
-				else: # is BC5_UNORM
-					g0 = readAndParseInt(d,1)
-					g1 = readAndParseInt(d,1)
-					greens = [g0,g1]
-					if g0 > g1:
-						for g in range(6):
-							greens.append(((6-g)*g0+(g+1)*g1)/7.0)
-					else:
-						for g in range(4):
-							greens.append(((4-g)*g0+(g+1)*g1)/5.0)
-						greens.append(0.0)
-						greens.append(255.0)
-					greenIndexes0 = int.from_bytes(d.read(3),"little")
-					greenIndexes1 = int.from_bytes(d.read(3),"little")
-					greenIndexes = []
-					for g in range(8):
-						greenIndexes.append((greenIndexes0 & (0b111 << g*3)) >> g*3)
-					for g in range(8):
-						greenIndexes.append((greenIndexes1 & (0b111 << g*3)) >> g*3)
-					pixelIndexes = [[redIndexes[i],greenIndexes[i]] for i in [12,13,14,15,8,9,10,11,4,5,6,7,0,1,2,3]]
-					for p,pi in enumerate(pixelIndexes):
-						if blueBC5: # calculate blue channel for normal mapping (length of [r,g,b] is 1.0)
-							r = (reds[pi[0]]-128)/128.0
-							g = (greens[pi[1]]-128)/128.0
-							try:
-								b = (math.sqrt(1-r**2-g**2))/2+0.5
-							except ValueError: # r**2-g**2 > 1, thus sqrt tries to operate on a negative
-								b = 0.5
-						else:
-							b = 0
-						colour = [reds[pi[0]]/255.0,greens[pi[1]]/255.0,b,1]
-						pixels[(blockRootPixelX + p % 4) + ((blockRootPixelY + p // 4) * virtImgWidth)] = colour
-			elif imgFormat == "BC7_UNORM":
-				block = d.read(16)
-				bits = BitReader(block,reverse=True)
-				mode = 0
-				for i in range(8):
-					modeBit = bits.readbits(1)
-					if modeBit:
-						break
-					mode += 1
-				if mode >= 8: # reserved, ought to never happen but returning [0,0,0,0] is da rulez
-					bc7Mode8Flag = True
-					for p in range(16):
-						pixels[(blockRootPixelX + p % 4) + ((blockRootPixelY + p // 4) * virtImgWidth)] = [0,0,0,0]
-					continue
-				subsetCount,partitionBits,rotationBits,indexSelectionBits,colourBits,alphaBits,endpointPBits,sharedPBits,indexBits,index2Bits = bc7ModeData[mode]
-				partitionPattern = 0
-				if partitionBits > 0:
-					partitionPattern = bits.readbits(partitionBits)
-				rotationPattern = 0
-				if rotationBits > 0:
-					rotationPattern = bits.readbits(rotationBits)
-				indexSelectionPattern = 0
-				if indexSelectionBits > 0:
-					indexSelectionPattern = bits.readbits(indexSelectionBits)
-				partitionMap = [0]*16
-				if subsetCount == 2:
-					bitstring = format(bc7PartitionMaps[2][partitionPattern],"016b")
-					partitionMap = [int(x,2) for x in bitstring]
-				elif subsetCount == 3:
-					bitstring = format(bc7PartitionMaps[3][partitionPattern],"032b")
-					partitionMap = [int(bitstring[x*2:x*2+2],2) for x in range(16)]
-				# must be reversed because it's just safer to leave the copy-pasted map data as-is than to reverse it all manually
-				partitionMap.reverse()
-				endpointsR = []
-				endpointsG = []
-				endpointsB = []
-				endpointsA = []
-				endpointsP = []
-				subsetsP = []
-				colourIndexes = []
-				alphaIndexes = []
-				indexSizes = [indexBits,indexBits] # colour, alpha
-				# this copy-paste of all the fors is annoying but necessary because things must be read in order
-				subIter = range(subsetCount)
-				for s in subIter:
-					endpointsR.append([bits.readbits(colourBits),bits.readbits(colourBits)])
-				for s in subIter:
-					endpointsG.append([bits.readbits(colourBits),bits.readbits(colourBits)])
-				for s in subIter:
-					endpointsB.append([bits.readbits(colourBits),bits.readbits(colourBits)])
-				for s in subIter:
-					endpointsA.append([bits.readbits(alphaBits),bits.readbits(alphaBits)])
-				for s in subIter:
-					endpointsP.append([bits.readbits(endpointPBits),bits.readbits(endpointPBits)])
-				for s in subIter:
-					subsetsP.append(bits.readbits(sharedPBits))
-				for p in range(16):
-					subset = partitionMap[p]
-					anchorIndex = bc7AnchorIndexes[str(subset+1)+"/"+str(subsetCount)][partitionPattern]
-					indexSizeMod = 0
-					if p == anchorIndex:
-						indexSizeMod = -1
-					if indexSelectionPattern:
-						alphaIndexes.append(bits.readbits(indexBits+indexSizeMod))
-					else:
-						colourIndexes.append(bits.readbits(indexBits+indexSizeMod))
-				if index2Bits > 0:
-					for p in range(16):
-						subset = partitionMap[p]
-						anchorIndex = bc7AnchorIndexes[str(subset+1)+"/"+str(subsetCount)][partitionPattern]
-						indexSizeMod = 0
-						if p == anchorIndex:
-							indexSizeMod = -1
-						if indexSelectionPattern: # reminder: this is the reverse of the first
-							colourIndexes.append(bits.readbits(index2Bits+indexSizeMod))
-							indexSizes[0] = index2Bits
-						else:
-							alphaIndexes.append(bits.readbits(index2Bits+indexSizeMod))
-							indexSizes[1] = index2Bits
-				# reading done, now for endpoint interpolation
-				reds = []
-				greens = []
-				blues = []
-				alphas = []
-				for s in subIter:
-					ra = []
-					ga = []
-					ba = []
-					aa = []
-					for ep in [0,1]:
-						r = endpointsR[s][ep]
-						g = endpointsG[s][ep]
-						b = endpointsB[s][ep]
-						a = endpointsA[s][ep]
-						if endpointPBits > 0:
-							r = (r << 1) | endpointsP[s][ep]
-							g = (g << 1) | endpointsP[s][ep]
-							b = (b << 1) | endpointsP[s][ep]
-							if alphaBits > 0:
-								a = (a << 1) | endpointsP[s][ep]
-						if sharedPBits > 0:
-							r = (r << 1) | subsetsP[s]
-							g = (g << 1) | subsetsP[s]
-							b = (b << 1) | subsetsP[s]
-							if alphaBits > 0:
-								a = (a << 1) | subsetsP[s]
-						cb = colourBits+endpointPBits+sharedPBits
-						ab = alphaBits+endpointPBits+sharedPBits if alphaBits > 0 else 0
-						r = (r << (8 - cb)) | ((r << (8 - cb)) >> cb)
-						g = (g << (8 - cb)) | ((g << (8 - cb)) >> cb)
-						b = (b << (8 - cb)) | ((b << (8 - cb)) >> cb)
-						if alphaBits > 0:
-							a = (a << (8 - ab)) | ((a << (8 - ab)) >> ab)
-						ra.append(r)
-						ga.append(g)
-						ba.append(b)
-						if alphaBits > 0:
-							aa.append(a)
-						else:
-							aa.append(255)
-					cw = bc7Weights[indexSizes[0]]
-					aw = bc7Weights[indexSizes[1]]
-					reds.append([((64-w)*ra[0]+w*ra[1]+32) >> 6 for w in cw])
-					greens.append([((64-w)*ga[0]+w*ga[1]+32) >> 6 for w in cw])
-					blues.append([((64-w)*ba[0]+w*ba[1]+32) >> 6 for w in cw])
-					alphas.append([((64-w)*aa[0]+w*aa[1]+32) >> 6 for w in aw])
-				# and now finally actually setting the pixels
-				for p in range(16):
-					subset = partitionMap[p]
-					r = reds[subset][colourIndexes[p]]
-					g = greens[subset][colourIndexes[p]]
-					b = blues[subset][colourIndexes[p]]
-					if alphaIndexes:
-						a = alphas[subset][alphaIndexes[p]]
-					else:
-						a = 255
-					if rotationPattern == 1:
-						r,a = a,r
-					elif rotationPattern == 2:
-						g,a = a,g
-					elif rotationPattern == 3:
-						b,a = a,b
-					pi = [12,13,14,15,8,9,10,11,4,5,6,7,0,1,2,3][p]
-					pixels[(blockRootPixelX + pi % 4) + ((blockRootPixelY + pi // 4) * virtImgWidth)] = [r/255.0,g/255.0,b/255.0,a/255.0]
-	if printProgress:
-		print_progress_bar(tileCount,tileCount,textureNamePlusSize)
-	if unassignedCount > 0:
-		print_error("Texture "+textureNamePlusSize+" didn't complete deswizzling correctly: "+str(unassignedCount)+" / "+str(tileCountY*tileCountX)+" tiles unassigned")
-	if bc7Mode8Flag:
-		print_warning("Texture "+textureNamePlusSize+" contained illegal BC7 blocks (rendered as transparent black)")
-	d.close()
-	
 	finalImages = [[newImage,pixels]]
-
 	if dechannelise:
+		# detect channels that are entirely black or white and don't include them
+		# if a channel is entirely some sort of grey, that's still worth including
+		# todo: make this a config option
+		channelMins = pixels.min(axis=0)
+		channelMaxes = pixels.max(axis=0)
 		for i,c in enumerate(["r","g","b","a"]):
+			if channelMins[i] == channelMaxes[i] and channelMins[i] in [0,255]:
+				if printProgress:
+					print_info(textureName+": excluding channel "+c.upper()+" (all pixels "+str(channelMins[i]/255)+")")
+				continue
 			splitName = textureName+"_"+c
-			doReplace = False
-			existingSplitImage = None
-			try:
-				existingSplitImage = bpy.data.images[splitName]
-				if splitName in existingImageNames:
-					if overwrite == "ADD":
-						pass # make a new copy, it all just works
-					elif overwrite == "USE": # shouldn't happen, we wouldn't have got this far
-						print_error("got to unreachable code via "+splitName)
-					elif overwrite == "REPLACE":
-						doReplace = True
-				else: # there's an image by this name, but it wasn't there before this import started - replace
-					bpy.data.images.remove(existingSplitImage)
-			except KeyError as e: # no existing image of the same name
-				pass # fine, move on
-			newSplitImage = bpy.data.images.new(splitName,imgWidth,imgHeight)
-			if doReplace and existingSplitImage:
-				existingSplitImage.user_remap(newSplitImage)
-				bpy.data.images.remove(existingSplitImage)
-				newSplitImage.name = splitName
+			newSplitImage = new_texture_image(splitName,imgWidth,imgHeight,overwrite,existingImageNames)
 			# don't really want to do any of this until the end, but apparently setting the filepath after setting the pixels clears the image for no good reason
 			newSplitImage.file_format = "PNG"
 			if saveTo:
 				newSplitImage.filepath = os.path.join(saveTo,newSplitImage.name+".png")
-			# detect channels that are entirely black or white and don't include them
-			# if a channel is entirely some sort of grey, that's still worth including
-			# todo: make this a config option
-			mono = True
-			first = pixels[0][i]
-			if first != 0 and first != 1:
-				mono = False
-			# this check is quick enough even on big images it can be done separately
-			for j,p in enumerate(pixels):
-				if p[i] != first:
-					mono = False
-					break
-			if mono:
-				if printProgress:
-					print("Excluding channel "+c.upper()+" (all pixels "+str(first)+")")
-				bpy.data.images.remove(newSplitImage)
-				continue
-			
-			# assign the selected single channel to the RGB channels
-			splitPixels = numpy.zeros([virtImgHeight*virtImgWidth,4],dtype=numpy.float32)
-			splitPixels[:,0] = pixels[:,i]
-			splitPixels[:,1] = pixels[:,i]
-			splitPixels[:,2] = pixels[:,i]
-			splitPixels[:,3] = 1.0
-			
-			finalImages.append([newSplitImage,splitPixels])
+			# the selected single channel goes to the RGB channels (set_image_pixels takes care of that, so this is just a view)
+			finalImages.append([newSplitImage,pixels[:,i]])
 	
-	# final pixel data must be flattened to 1D (and, if necessary, cropped)
 	for fi,px in finalImages:
-		# fast pixel updates using foreach_set:
-		# https://projects.blender.org/blender/blender/commit/9075ec8269e7cb029f4fab6c1289eb2f1ae2858a
-		pixel_buffer = px.reshape([virtImgHeight,virtImgWidth,4])[0:imgHeight,0:imgWidth].reshape(-1)
-		fi.pixels.foreach_set(pixel_buffer)
+		set_image_pixels(fi,px)
 		fi.update()
 		
 		if saveTo:
@@ -760,6 +719,160 @@ def parse_texture_wismt(textureName,imgVersion,imgType,imgWidth,imgHeight,rawDat
 	
 	return newImage.name # pass back whatever the final name of the image ended up being
 
+# the alternative to decoding: the blocks just get deswizzled and saved as a .dds, which Blender can read by itself
+# [DXGI format number] (in the DX10 header)
+# https://learn.microsoft.com/en-us/windows/win32/api/dxgiformat/ne-dxgiformat-dxgi_format
+ddsImageFormats = {
+					66:71, # BC1_UNORM
+					67:74, # BC2_UNORM
+					68:77, # BC3_UNORM
+					73:80, # BC4_UNORM
+					75:83, # BC5_UNORM
+					77:98, # BC7_UNORM
+				}
+
+# whether a texture can go straight to .dds instead of being decoded
+# Blender always makes up a blue channel for BC5 itself, so that's only the same thing if blueBC5 was wanted anyway
+# dechannelising needs the actual pixels, so that can't be done this way at all
+def can_save_texture_dds(imgType,blueBC5,dechannelise):
+	if imgType not in ddsImageFormats or dechannelise:
+		return False
+	if modernImageFormats[imgType][0] == "BC5_UNORM" and not blueBC5:
+		return False
+	return True
+
+# https://learn.microsoft.com/en-us/windows/win32/direct3ddds/dds-header
+def dds_header(dxgiFormat,imgWidth,imgHeight,dataSize):
+	flags = 0x1 | 0x2 | 0x4 | 0x1000 | 0x80000 # caps, height, width, pixel format, linear size
+	header = struct.pack("<4s7L44x",b"DDS ",124,flags,imgHeight,imgWidth,dataSize,0,1)
+	header += struct.pack("<2L4s5L",32,0x4,b"DX10",0,0,0,0,0) # pixel format: just "see the DX10 header"
+	header += struct.pack("<5L",0x1000,0,0,0,0) # caps: texture
+	header += struct.pack("<5L",dxgiFormat,3,0,1,0) # DX10 header: 2D texture, one of it
+	return header
+
+def write_texture_dds(path,imgType,imgWidth,imgHeight,rawData):
+	bytesPerBlock = modernImageFormats[imgType][1]*2
+	blocks,valid = deswizzle_blocks(rawData,ceildiv(imgWidth,4),ceildiv(imgHeight,4),bytesPerBlock)
+	with open(path,"wb") as f:
+		f.write(dds_header(ddsImageFormats[imgType],imgWidth,imgHeight,blocks.nbytes))
+		f.write(blocks.tobytes())
+	return len(valid)-int(numpy.count_nonzero(valid)) # how many blocks were missing from the data (and so left as zeroes)
+
+# like create_texture_wismt, but from the raw data, and the image gets loaded from the .dds rather than having its pixels filled in
+def create_texture_wismt_dds(textureName,imgType,imgWidth,imgHeight,rawData,overwrite="ADD",saveTo=None,existingImageNames=[]):
+	reusedName = reused_image_name(textureName,overwrite,existingImageNames)
+	if reusedName:
+		print_info(textureName+" already exists, using the existing copy")
+		return reusedName # pretend you imported it and point to the existing copy
+	
+	newImage = new_texture_image(textureName,imgWidth,imgHeight,overwrite,existingImageNames,alpha=True)
+	ddsPath = os.path.join(saveTo,newImage.name+".dds")
+	os.makedirs(os.path.dirname(ddsPath),exist_ok=True) # the name can have a folder in it (e.g. res0/ for keepAllResolutions), which Blender would make for a PNG but open() won't
+	missingCount = write_texture_dds(ddsPath,imgType,imgWidth,imgHeight,rawData)
+	if missingCount > 0:
+		print_error("Texture "+textureName+f" ({imgWidth}x{imgHeight})"+" didn't complete deswizzling correctly: "+str(missingCount)+" / "+str(ceildiv(imgWidth,4)*ceildiv(imgHeight,4))+" blocks missing from the data")
+	newImage.source = "FILE"
+	newImage.filepath = ddsPath
+	return newImage.name
+
+def wismt_texture_cache_key(imgType,imgWidth,imgHeight,rawData,blueBC5):
+	return content_cache_key(rawData,"wismt",textureCacheVersion,imgType,imgWidth,imgHeight,blueBC5)
+
+def parse_texture_wismt(textureName,imgVersion,imgType,imgWidth,imgHeight,rawData,blueBC5,printProgress,overwrite="ADD",saveTo=None,dechannelise=False,existingImageNames=[],cache=None,saveFormat="PNG"):
+	if saveTo and saveFormat == "DDS" and can_save_texture_dds(imgType,blueBC5,dechannelise):
+		return create_texture_wismt_dds(textureName,imgType,imgWidth,imgHeight,rawData,overwrite=overwrite,saveTo=saveTo,existingImageNames=existingImageNames)
+	pixels = None
+	if not reused_image_name(textureName,overwrite,existingImageNames):
+		if cache:
+			cacheKey = wismt_texture_cache_key(imgType,imgWidth,imgHeight,rawData,blueBC5)
+			pixels = get_cached_texture(cache,cacheKey,imgWidth,imgHeight)
+		if pixels is None:
+			pixels,messages = decode_texture_wismt(textureName,imgType,imgWidth,imgHeight,rawData,blueBC5)
+			print_texture_messages(messages)
+			if cache and pixels is not None:
+				put_cached_texture(cache,cacheKey,pixels)
+	return create_texture_wismt(textureName,imgWidth,imgHeight,pixels,printProgress,overwrite,saveTo,dechannelise,existingImageNames)
+
+# 0 means one per CPU
+def texture_decode_worker_count(context):
+	workerCount = context.scene.monado_forge_main.textureDecodeWorkers
+	return workerCount if workerCount > 0 else (os.cpu_count() or 1)
+
+# decodes textures in background threads, while the main thread only makes the Blender images (which has to happen there) as the results come in
+# results are handed to onDecoded in the same order they were submitted in, so it's no different to decoding them one after another
+# threads rather than processes: NumPy lets go of the GIL for most of the heavy parts, and forking a running Blender isn't safe
+# (spawned processes would need the decoders in a module that can be imported without bpy, which they aren't)
+# workerCount = 1 just decodes everything immediately on the main thread
+class TextureDecodeQueue():
+	def __init__(self,workerCount,maxInFlight=None,cache=None):
+		self.workerCount = workerCount
+		self.cache = cache # textures found in here don't get decoded at all, and newly-decoded ones get added to it
+		self.maxInFlight = maxInFlight if maxInFlight else workerCount*2 # enough to keep every worker busy, but not so much as to hoard memory
+		self.pool = None
+		self.queued = collections.deque()
+
+	def __enter__(self):
+		return self
+	def __exit__(self,excType,excValue,traceback):
+		if excType is None:
+			self.finish()
+		else:
+			self.abandon()
+
+	# rawData = None means there's nothing to decode (e.g. the image is going to be reused), and onDecoded just gets None as usual for a failure
+	def submit(self,textureName,imgType,imgWidth,imgHeight,rawData,blueBC5,onDecoded):
+		cacheKey = None
+		if rawData is not None and self.cache:
+			cacheKey = wismt_texture_cache_key(imgType,imgWidth,imgHeight,rawData,blueBC5)
+			pixels = get_cached_texture(self.cache,cacheKey,imgWidth,imgHeight)
+			if pixels is not None:
+				self.queued.append([None,pixels,[],onDecoded,None])
+				self.collect()
+				return
+		if rawData is None or imgType not in modernImageFormats or self.workerCount <= 1:
+			pixels,messages = None,[]
+			if rawData is not None:
+				pixels,messages = decode_texture_wismt(textureName,imgType,imgWidth,imgHeight,rawData,blueBC5)
+			self.queued.append([None,pixels,messages,onDecoded,cacheKey])
+			self.collect()
+			return
+		if not self.pool:
+			self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.workerCount)
+		future = self.pool.submit(decode_texture_wismt,textureName,imgType,imgWidth,imgHeight,rawData,blueBC5)
+		self.queued.append([future,None,None,onDecoded,cacheKey])
+		self.collect(self.maxInFlight)
+
+	# hands over everything that's finished (in order), first waiting for enough to finish that no more than maxInFlight are left
+	def collect(self,maxInFlight=None):
+		while self.queued and ((maxInFlight is not None and len(self.queued) > maxInFlight) or self.queued[0][0] is None or self.queued[0][0].done()):
+			future,pixels,messages,onDecoded,cacheKey = self.queued.popleft()
+			if future is not None:
+				pixels,messages = future.result()
+			print_texture_messages(messages)
+			if cacheKey is not None and pixels is not None:
+				put_cached_texture(self.cache,cacheKey,pixels)
+			onDecoded(pixels)
+
+	def finish(self):
+		self.collect(0)
+		if self.pool:
+			self.pool.shutdown()
+			self.pool = None
+
+	# for when things have gone wrong: drop everything without handing any of it over
+	def abandon(self):
+		for future,pixels,messages,onDecoded,cacheKey in self.queued:
+			if future is not None:
+				future.cancel()
+		if self.pool:
+			self.pool.shutdown(wait=True)
+			self.pool = None
+		self.queued.clear()
+
+	def __del__(self): # in case an import died partway through without finishing
+		if self.pool or self.queued:
+			self.abandon()
+
 def register():
 	pass
 
@@ -0,0 +1,125 @@
+import collections
+import math
+import numpy
+import threading
+
+from . utils import *
+
+# the Switch (Tegra X1) stores textures in "block linear" layout
+# the surface is cut into GOBs ("groups of bytes"), each 64 bytes wide and 8 rows tall, which are stacked vertically into blocks of blockHeight GOBs
+# the blocks then go left-to-right, top-to-bottom, with each one's GOBs top-to-bottom inside it
+# inside a GOB, the bytes are in 16-byte-wide, 2-row-tall chunks in a fixed z-ish order
+# a "row" here is a row of image blocks (e.g. 4 pixels tall for BCn), not a row of pixels
+# everything gets padded out to whole GOBs/blocks, which is what makes non-power-of-two sizes work
+# references:
+# 	https://github.com/ScanMountGoat/tegra_swizzle
+# 	NVIDIA Tegra X1 TRM, "Block Linear Memory Format"
+
+gobWidth = 64 # in bytes
+gobHeight = 8 # in rows
+gobSize = gobWidth*gobHeight
+
+# the block height (in GOBs) used for the base mip level, based on how many rows the image has
+def block_height_mip0(rowCount):
+	heightAndHalf = rowCount + rowCount // 2
+	for blockHeight,minimum in [[16,128],[8,64],[4,32],[2,16]]:
+		if heightAndHalf >= minimum:
+			return blockHeight
+	return 1
+
+# how many bytes the swizzled image takes up (including all the padding)
+def swizzled_surface_size(widthInBlocks,heightInBlocks,bytesPerBlock,blockHeight=None):
+	if blockHeight is None:
+		blockHeight = block_height_mip0(heightInBlocks)
+	gobCountX = ceildiv(widthInBlocks*bytesPerBlock,gobWidth)
+	gobCountY = ceildiv(ceildiv(heightInBlocks,gobHeight),blockHeight)*blockHeight
+	return gobCountX*gobCountY*gobSize
+
+# for each (row-major) unit of the unswizzled image, which unit of the swizzled data it comes from
+# a "unit" is the largest chunk that can't be split by the swizzle (the GOB's 16-byte chunks), i.e. gcd(bytesPerBlock,16) bytes
+# the address splits neatly into a part that only depends on the row and a part that only depends on the column, so it's just one outer sum
+# memoised since most textures come in a handful of sizes (see deswizzleMapCache)
+def deswizzle_map(widthInBlocks,heightInBlocks,bytesPerBlock,blockHeight=None):
+	if blockHeight is None:
+		blockHeight = block_height_mip0(heightInBlocks)
+	blockHeightShift = blockHeight.bit_length()-1
+	if blockHeight != 1 << blockHeightShift:
+		raise ValueError("block height must be a power of two, not "+str(blockHeight))
+	unitBytes = math.gcd(bytesPerBlock,16)
+	rowBytes = widthInBlocks*bytesPerBlock
+	# the map only depends on the layout in bytes, so e.g. BC1 and BC4 of the same size share one
+	key = (rowBytes,unitBytes,heightInBlocks,blockHeight)
+	unitMap = deswizzleMapCache.get(key)
+	if unitMap is not None:
+		return unitMap
+	gobCountX = ceildiv(rowBytes,gobWidth)
+	x = numpy.arange(0,rowBytes,unitBytes,dtype=numpy.int64) # in bytes
+	y = numpy.arange(heightInBlocks,dtype=numpy.int64) # in rows
+	gobY = y >> 3
+	rowAddresses = ((((gobY >> blockHeightShift)*gobCountX) << blockHeightShift) + (gobY & (blockHeight-1)))*gobSize + ((y & 0x6) << 5) + ((y & 0x1) << 4)
+	columnAddresses = ((x >> 6) << blockHeightShift)*gobSize + ((x & 0x20) << 3) + ((x & 0x10) << 1) + (x & 0xF)
+	# a unit index never gets anywhere near needing 64 bits, and halving the size matters when the map is as big as the image
+	indexType = numpy.uint32 if swizzled_surface_size(widthInBlocks,heightInBlocks,bytesPerBlock,blockHeight)//unitBytes <= 1 << 32 else numpy.int64
+	unitMap = ((rowAddresses[:,None] + columnAddresses[None,:]) // unitBytes).astype(indexType).reshape(-1)
+	unitMap.flags.writeable = False # shared by everyone who asks for this size
+	deswizzleMapCache.put(key,unitMap)
+	return unitMap
+
+# least-recently-used, but bounded by the total size of the maps rather than how many there are, since each is as big as the image
+# (a 4096x4096 RGBA8 map alone is 64 MB)
+# maps bigger than the whole budget are just not kept
+# locked, since textures get decoded on several threads at once (see TextureDecodeQueue)
+class DeswizzleMapCache():
+	def __init__(self,maxBytes):
+		self.maxBytes = maxBytes
+		self.totalBytes = 0
+		self.maps = collections.OrderedDict()
+		self._lock = threading.Lock()
+	def get(self,key):
+		with self._lock:
+			unitMap = self.maps.get(key)
+			if unitMap is not None:
+				self.maps.move_to_end(key)
+			return unitMap
+	def put(self,key,unitMap):
+		if unitMap.nbytes > self.maxBytes:
+			return
+		with self._lock:
+			if key in self.maps: # another thread got there first
+				return
+			self.maps[key] = unitMap
+			self.totalBytes += unitMap.nbytes
+			while self.totalBytes > self.maxBytes:
+				oldKey,oldMap = self.maps.popitem(last=False)
+				self.totalBytes -= oldMap.nbytes
+	def clear(self):
+		with self._lock:
+			self.maps.clear()
+			self.totalBytes = 0
+
+deswizzleMapCache = DeswizzleMapCache(128*1024*1024)
+
+# no reason to keep the maps around between imports
+def clear_deswizzle_maps():
+	deswizzleMapCache.clear()
+
+# the blocks of a swizzled image, put back into plain row-major order as an (N,bytesPerBlock) array, all in one gather
+# blocks that are beyond the end of the data (i.e. it's been cut short) are left as zeroes and flagged as not valid
+def deswizzle_blocks(rawData,widthInBlocks,heightInBlocks,bytesPerBlock,blockHeight=None):
+	unitBytes = math.gcd(bytesPerBlock,16)
+	unitsPerBlock = bytesPerBlock // unitBytes
+	unitMap = deswizzle_map(widthInBlocks,heightInBlocks,bytesPerBlock,blockHeight)
+	rawUnits = numpy.frombuffer(rawData,dtype=numpy.uint8)
+	rawUnits = rawUnits[0:len(rawUnits)//unitBytes*unitBytes].reshape(-1,unitBytes)
+	if len(rawUnits) > 0 and unitMap.max() < len(rawUnits): # the usual case: nothing missing
+		return rawUnits[unitMap].reshape(-1,bytesPerBlock),numpy.ones(widthInBlocks*heightInBlocks,dtype=bool)
+	unitValid = unitMap < len(rawUnits)
+	units = numpy.zeros([len(unitMap),unitBytes],dtype=numpy.uint8)
+	units[unitValid] = rawUnits[unitMap[unitValid]]
+	return units.reshape(-1,bytesPerBlock),unitValid.reshape(-1,unitsPerBlock).all(axis=1)
+
+def register():
+	pass
+
+def unregister():
+	pass